@@ -11,6 +11,7 @@
 
 import express, { Request, Response, Application } from "express";
 import http from "http";
+import type { Database } from "bun:sqlite";
 import * as fs from "fs";
 import path from "path";
 import { logger } from "../../utils/logger.js";
@@ -44,6 +45,8 @@ export interface ServerOptions {
   onShutdown: () => Promise<void>;
   /** Restart function for admin endpoints */
   onRestart: () => Promise<void>;
+  /** Worker database once it is open (null before initialization) */
+  getDatabase?: () => Database | null;
 }
 
 /**
@@ -128,7 +131,7 @@ export class Server {
    * Setup Express middleware
    */
   private setupMiddleware(): void {
-    const middlewares = createMiddleware(summarizeRequestBody);
+    const middlewares = createMiddleware(summarizeRequestBody, this.options.getDatabase);
     middlewares.forEach((mw) => this.app.use(mw));
 
     this.app.use(rateLimitMiddleware(1000, 60000));
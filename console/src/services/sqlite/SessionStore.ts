@@ -46,6 +46,7 @@ export class SessionStore {
     this.ensureSessionPlansTable();
     this.createProjectRootsTable();
     this.ensureNotificationsTable();
+    this.ensureIdempotencyKeysTable();
   }
 
   /**
@@ -881,6 +882,32 @@ export class SessionStore {
       .run(24, new Date().toISOString());
   }
 
+  private ensureIdempotencyKeysTable(): void {
+    const applied = this.db
+      .prepare("SELECT version FROM schema_versions WHERE version = ?")
+      .get(25) as SchemaVersion | undefined;
+    if (applied) return;
+
+    this.db.run(`
+      CREATE TABLE IF NOT EXISTS idempotency_keys (
+        key TEXT PRIMARY KEY,
+        status INTEGER NOT NULL,
+        body TEXT NOT NULL,
+        expires_at_epoch INTEGER NOT NULL
+      )
+    `);
+
+    this.db.run(
+      "CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires ON idempotency_keys(expires_at_epoch)",
+    );
+
+    this.db
+      .prepare(
+        "INSERT OR IGNORE INTO schema_versions (version, applied_at) VALUES (?, ?)",
+      )
+      .run(25, new Date().toISOString());
+  }
+
   /** Insert or update a project's root path. */
   upsertProjectRoot(project: string, rootPath: string): void {
     this.db
@@ -0,0 +1,41 @@
+/**
+ * Idempotency key store - remembers the first successful response per key.
+ */
+
+import { Database } from "bun:sqlite";
+
+export interface StoredResponse {
+  status: number;
+  body: any;
+}
+
+/** Get the stored response for a key, or undefined if unknown or expired. */
+export function getStoredResponse(
+  db: Database,
+  key: string,
+  nowEpoch: number,
+): StoredResponse | undefined {
+  const row = db
+    .prepare(
+      "SELECT status, body FROM idempotency_keys WHERE key = ? AND expires_at_epoch > ?",
+    )
+    .get(key, nowEpoch) as { status: number; body: string } | undefined;
+  if (!row) return undefined;
+  return { status: row.status, body: JSON.parse(row.body) };
+}
+
+/** Store the response for a key and drop keys that have expired. */
+export function storeResponse(
+  db: Database,
+  key: string,
+  response: StoredResponse,
+  expiresAtEpoch: number,
+  nowEpoch: number,
+): void {
+  db.prepare(
+    `INSERT OR REPLACE INTO idempotency_keys (key, status, body, expires_at_epoch)
+     VALUES (?, ?, ?, ?)`,
+  ).run(key, response.status, JSON.stringify(response.body ?? null), expiresAtEpoch);
+
+  db.prepare("DELETE FROM idempotency_keys WHERE expires_at_epoch <= ?").run(nowEpoch);
+}
@@ -79,6 +79,7 @@ import { VaultRoutes } from "./worker/http/routes/VaultRoutes.js";
 import { VexorRoutes } from "./worker/http/routes/VexorRoutes.js";
 import { SettingsRoutes } from "./worker/http/routes/SettingsRoutes.js";
 import { MetricsService } from "./worker/MetricsService.js";
+import { spawnOutboxDrain } from "./worker/OutboxDrain.js";
 import {
   startRetentionScheduler,
   stopRetentionScheduler,
@@ -194,6 +195,8 @@ export class WorkerService {
       getMcpReady: () => this.mcpReady,
       onShutdown: () => this.shutdown(),
       onRestart: () => this.shutdown(),
+      getDatabase: () =>
+        this.coreReady ? this.dbManager.getSessionStore().db : null,
     });
 
     this.registerRoutes();
@@ -333,6 +336,8 @@ export class WorkerService {
       pid: process.pid,
     });
 
+    spawnOutboxDrain();
+
     this.initializeBackground().catch((error) => {
       logger.error(
         "SYSTEM",
@@ -0,0 +1,45 @@
+/**
+ * OutboxDrain
+ *
+ * Hooks queue worker writes in ~/.pilot/outbox and deliver them with a
+ * detached Python drainer. Entries queued while the worker was down would
+ * otherwise wait for the next hook that spawns a drainer, so the worker
+ * starts one itself once it is listening.
+ */
+
+import path from "path";
+import { existsSync } from "fs";
+import { spawn } from "child_process";
+import { getPackageRoot } from "../../shared/paths.js";
+import { logger } from "../../utils/logger.js";
+
+const PYTHON_CANDIDATES = ["python3", "python"];
+
+/**
+ * Start the hooks' outbox drainer in the background.
+ * Returns false if the drainer script is not installed next to the worker.
+ */
+export function spawnOutboxDrain(): boolean {
+  const script = path.join(getPackageRoot(), "hooks", "_outbox.py");
+  if (!existsSync(script)) {
+    logger.debug("QUEUE", "Outbox drainer not found, skipping", { script });
+    return false;
+  }
+
+  const trySpawn = (index: number): void => {
+    if (index >= PYTHON_CANDIDATES.length) {
+      logger.warn("QUEUE", "No Python interpreter found for outbox drain");
+      return;
+    }
+    const child = spawn(PYTHON_CANDIDATES[index], [script], {
+      detached: true,
+      stdio: "ignore",
+      windowsHide: true,
+    });
+    child.on("error", () => trySpawn(index + 1));
+    child.unref();
+  };
+
+  trySpawn(0);
+  return true;
+}
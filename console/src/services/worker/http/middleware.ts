@@ -11,6 +11,9 @@ import cookieParser from "cookie-parser";
 import path from "path";
 import { getPackageRoot } from "../../../shared/paths.js";
 import { logger } from "../../../utils/logger.js";
+import type { Database } from "bun:sqlite";
+import { getStoredResponse, storeResponse } from "../../sqlite/idempotency/store.js";
+import type { StoredResponse } from "../../sqlite/idempotency/store.js";
 
 const LOCALHOST_PATTERNS = [
   /^https?:\/\/localhost(:\d+)?$/,
@@ -24,18 +27,92 @@ export function isAllowedOrigin(origin: string | undefined): boolean {
   return LOCALHOST_PATTERNS.some((pattern) => pattern.test(origin));
 }
 
+/**
+ * How long a key is remembered. The hooks' outbox (pilot/hooks/_outbox.py)
+ * retries undelivered entries for up to 7 days, so keys must outlive that.
+ */
+const IDEMPOTENCY_TTL_MS = 8 * 24 * 60 * 60 * 1000;
+const IDEMPOTENCY_MAX_ENTRIES = 1000;
+
+/**
+ * Replay the first successful response for POSTs that repeat an Idempotency-Key header.
+ * Hooks drain their local outbox with at-least-once delivery, so a retried batch
+ * must not save the same memory or notification twice.
+ *
+ * Keys are kept in the worker database so they survive restarts. Until the
+ * database is open, `getDb` returns null and keys fall back to a bounded
+ * in-memory map.
+ */
+export function createIdempotencyMiddleware(
+  getDb: () => Database | null = () => null,
+  ttlMs: number = IDEMPOTENCY_TTL_MS,
+  maxEntries: number = IDEMPOTENCY_MAX_ENTRIES,
+): RequestHandler {
+  const seen = new Map<string, StoredResponse & { expiresAt: number }>();
+
+  const lookup = (db: Database | null, cacheKey: string, now: number): StoredResponse | undefined => {
+    if (db) return getStoredResponse(db, cacheKey, now);
+    const cached = seen.get(cacheKey);
+    return cached && cached.expiresAt > now ? cached : undefined;
+  };
+
+  const remember = (db: Database | null, cacheKey: string, response: StoredResponse, now: number): void => {
+    if (db) {
+      storeResponse(db, cacheKey, response, now + ttlMs, now);
+      return;
+    }
+    if (seen.size >= maxEntries) {
+      const oldest = seen.keys().next().value;
+      if (oldest !== undefined) seen.delete(oldest);
+    }
+    seen.set(cacheKey, { ...response, expiresAt: now + ttlMs });
+  };
+
+  return (req: Request, res: Response, next: NextFunction) => {
+    const key = req.method === "POST" ? req.get("Idempotency-Key") : undefined;
+    if (!key) return next();
+
+    const cacheKey = `${req.path}:${key}`;
+    const now = Date.now();
+    const db = getDb();
+    const cached = lookup(db, cacheKey, now);
+    if (cached) {
+      res.status(cached.status).json(cached.body);
+      return;
+    }
+
+    const originalJson = res.json.bind(res);
+    res.json = function (body: any) {
+      if (res.statusCode >= 200 && res.statusCode < 300) {
+        try {
+          remember(db, cacheKey, { status: res.statusCode, body }, now);
+        } catch (error) {
+          logger.warn("DB", "Failed to record idempotency key", { path: req.path }, error as Error);
+        }
+      }
+      return originalJson(body);
+    };
+
+    next();
+  };
+}
+
 /**
  * Create all middleware for the worker service
  * @param summarizeRequestBody - Function to summarize request bodies for logging
+ * @param getDb - Worker database once it is open, used to persist idempotency keys
  * @returns Array of middleware functions
  */
 export function createMiddleware(
   summarizeRequestBody: (method: string, path: string, body: any) => string,
+  getDb: () => Database | null = () => null,
 ): RequestHandler[] {
   const middlewares: RequestHandler[] = [];
 
   middlewares.push(express.json({ limit: "50mb" }));
 
+  middlewares.push(createIdempotencyMiddleware(getDb));
+
   middlewares.push(
     cors({
       origin: (origin, callback) => {
@@ -10,6 +10,8 @@ import { execFileSync } from "child_process";
 import { existsSync, readFileSync } from "fs";
 import path from "path";
 import { BaseRouteHandler } from "../BaseRouteHandler.js";
+import { WorktreeDiffCache } from "./utils/worktreeDiffCache.js";
+import type { ChangedFilesStream } from "./utils/worktreeDiffCache.js";
 
 export interface WorktreeStatus {
   active: boolean;
@@ -27,6 +29,8 @@ export interface WorktreeFileChange {
 }
 
 export class WorktreeRoutes extends BaseRouteHandler {
+  private diffCache = new WorktreeDiffCache();
+
   setupRoutes(app: express.Application): void {
     app.get("/api/worktree/status", this.handleGetStatus.bind(this));
     app.get("/api/worktree/diff", this.handleGetDiff.bind(this));
@@ -42,16 +46,29 @@ export class WorktreeRoutes extends BaseRouteHandler {
     res.json(status);
   });
 
-  /** Get list of changed files between worktree branch and base branch. */
-  private handleGetDiff = this.wrapHandler((_req: Request, res: Response): void => {
+  /**
+   * Get list of changed files between worktree branch and base branch.
+   * Pass `?format=ndjson` to stream one JSON object per line for huge diffs.
+   */
+  private handleGetDiff = this.wrapHandler((req: Request, res: Response): void => {
     const projectRoot = process.env.CLAUDE_PROJECT_ROOT || process.cwd();
     const status = this.getWorktreeStatus(projectRoot);
+    const ndjson = req.query.format === "ndjson";
 
     if (!status.active || !status.branch || !status.baseBranch) {
+      if (ndjson) {
+        this.writeNdjson(res, { active: false, count: 0 }, []);
+        return;
+      }
       res.json({ active: false, files: [] });
       return;
     }
 
+    if (ndjson) {
+      const stream = this.streamChangedFiles(projectRoot, status.baseBranch, status.branch);
+      this.writeNdjson(res, { active: true, count: stream.count }, stream.files);
+      return;
+    }
     const files = this.getChangedFiles(projectRoot, status.baseBranch, status.branch);
     res.json({ active: true, files });
   });
@@ -192,8 +209,45 @@ export class WorktreeRoutes extends BaseRouteHandler {
     }
   }
 
-  /** Get changed files between two branches. */
+  /**
+   * Write a header line followed by one line per file as NDJSON, each written
+   * as soon as the iterable produces it. A failure after the header is sent
+   * ends the stream with an error line.
+   */
+  private writeNdjson(res: Response, header: Record<string, unknown>, files: Iterable<WorktreeFileChange>): void {
+    res.setHeader("Content-Type", "application/x-ndjson");
+    res.write(JSON.stringify(header) + "\n");
+    try {
+      for (const file of files) {
+        res.write(JSON.stringify(file) + "\n");
+      }
+    } catch {
+      res.write(JSON.stringify({ error: "Failed to compute diff stats" }) + "\n");
+    }
+    res.end();
+  }
+
+  /** Stream changed files from the diff cache, falling back to a full uncached diff. */
+  private streamChangedFiles(projectRoot: string, baseBranch: string, branch: string): ChangedFilesStream {
+    try {
+      return this.diffCache.streamChangedFiles(projectRoot, baseBranch, branch);
+    } catch {
+      const files = this.getChangedFilesUncached(projectRoot, baseBranch, branch);
+      return { count: files.length, files };
+    }
+  }
+
+  /** Get changed files between two branches, reusing cached merge-base and per-blob stats. */
   private getChangedFiles(projectRoot: string, baseBranch: string, branch: string): WorktreeFileChange[] {
+    try {
+      return this.diffCache.getChangedFiles(projectRoot, baseBranch, branch);
+    } catch {
+      return this.getChangedFilesUncached(projectRoot, baseBranch, branch);
+    }
+  }
+
+  /** Get changed files between two branches with a full name-status + numstat diff. */
+  private getChangedFilesUncached(projectRoot: string, baseBranch: string, branch: string): WorktreeFileChange[] {
     try {
       const nameStatus = execFileSync(
         "git", ["diff", "--name-status", `${baseBranch}...${branch}`],
@@ -0,0 +1,191 @@
+/**
+ * Incremental worktree diff summaries.
+ * Caches the merge-base per (base, branch) commit pair and per-file line stats
+ * per (old blob, new blob) pair, so repeated /api/worktree/diff calls only
+ * run `git diff --numstat` for files whose content changed since the last call.
+ * Stats are computed in pathspec batches and yielded per file, so callers can
+ * stream results before the whole diff is done.
+ */
+
+import { execFileSync } from "child_process";
+
+export interface DiffFileStats {
+  path: string;
+  status: string;
+  additions: number;
+  deletions: number;
+}
+
+export interface DiffTreeEntry {
+  status: string;
+  path: string;
+  oldPath: string | null;
+  blobKey: string;
+}
+
+export interface ChangedFilesStream {
+  count: number;
+  files: Iterable<DiffFileStats>;
+}
+
+export type GitRunner = (args: string[], cwd: string) => string;
+
+export type LineStats = { additions: number; deletions: number };
+
+const MAX_CACHED_BLOB_PAIRS = 20_000;
+const MAX_CACHED_MERGE_BASES = 1_000;
+const MAX_PATHSPEC_FILES = 500;
+const NO_CHANGES: LineStats = { additions: 0, deletions: 0 };
+
+const defaultGitRunner: GitRunner = (args, cwd) =>
+  execFileSync("git", args, { cwd, encoding: "utf-8", timeout: 10000, maxBuffer: 64 * 1024 * 1024 }).toString();
+
+/** Parse `git diff-tree -r -z` raw output into entries keyed by blob IDs. */
+export function parseDiffTreeRaw(raw: string): DiffTreeEntry[] {
+  const tokens = raw.split("\0");
+  const entries: DiffTreeEntry[] = [];
+  let i = 0;
+  while (i < tokens.length) {
+    const header = tokens[i];
+    if (!header.startsWith(":")) {
+      i++;
+      continue;
+    }
+    const fields = header.slice(1).split(" ");
+    if (fields.length < 5) {
+      i++;
+      continue;
+    }
+    const [, , oldBlob, newBlob, statusField] = fields;
+    const status = statusField.charAt(0);
+    if (status === "R" || status === "C") {
+      entries.push({ status, oldPath: tokens[i + 1], path: tokens[i + 2], blobKey: `${oldBlob}:${newBlob}` });
+      i += 3;
+    } else {
+      entries.push({ status, oldPath: null, path: tokens[i + 1], blobKey: `${oldBlob}:${newBlob}` });
+      i += 2;
+    }
+  }
+  return entries;
+}
+
+/** Parse `git diff --numstat -z` output into a path -> stats map (renames keyed by new path). */
+export function parseNumstatZ(output: string): Map<string, LineStats> {
+  const tokens = output.split("\0");
+  const stats = new Map<string, LineStats>();
+  let i = 0;
+  while (i < tokens.length) {
+    const parts = tokens[i].split("\t");
+    if (parts.length < 3) {
+      i++;
+      continue;
+    }
+    const counts = { additions: parseInt(parts[0], 10) || 0, deletions: parseInt(parts[1], 10) || 0 };
+    if (parts[2] === "") {
+      stats.set(tokens[i + 2], counts);
+      i += 3;
+    } else {
+      stats.set(parts[2], counts);
+      i += 1;
+    }
+  }
+  return stats;
+}
+
+export class WorktreeDiffCache {
+  private mergeBases = new Map<string, string>();
+  private statsByBlobPair = new Map<string, LineStats>();
+  private lastResults = new Map<string, { commitKey: string; files: DiffFileStats[] }>();
+
+  constructor(private runGit: GitRunner = defaultGitRunner) {}
+
+  /** Changed files between the merge-base of baseBranch/branch and branch, recomputing only changed blobs. */
+  getChangedFiles(projectRoot: string, baseBranch: string, branch: string): DiffFileStats[] {
+    return [...this.streamChangedFiles(projectRoot, baseBranch, branch).files];
+  }
+
+  /**
+   * Same files as getChangedFiles, with the count known up front and each file
+   * yielded as soon as its batch of line stats is computed.
+   */
+  streamChangedFiles(projectRoot: string, baseBranch: string, branch: string): ChangedFilesStream {
+    const [baseSha, branchSha] = this.runGit(["rev-parse", baseBranch, branch], projectRoot).trim().split("\n");
+    const commitKey = `${baseSha}:${branchSha}`;
+
+    const previous = this.lastResults.get(projectRoot);
+    if (previous && previous.commitKey === commitKey) {
+      return { count: previous.files.length, files: previous.files };
+    }
+
+    const mergeBase = this.getMergeBase(projectRoot, commitKey, baseSha, branchSha);
+    const entries = parseDiffTreeRaw(
+      this.runGit(["diff-tree", "-r", "-z", "-M", "--no-commit-id", mergeBase, branchSha], projectRoot),
+    );
+    return {
+      count: entries.length,
+      files: this.statEntries(projectRoot, commitKey, mergeBase, branchSha, entries),
+    };
+  }
+
+  private getMergeBase(projectRoot: string, commitKey: string, baseSha: string, branchSha: string): string {
+    let mergeBase = this.mergeBases.get(commitKey);
+    if (!mergeBase) {
+      mergeBase = this.runGit(["merge-base", baseSha, branchSha], projectRoot).trim();
+      if (this.mergeBases.size >= MAX_CACHED_MERGE_BASES) {
+        this.mergeBases.clear();
+      }
+      this.mergeBases.set(commitKey, mergeBase);
+    }
+    return mergeBase;
+  }
+
+  private *statEntries(
+    projectRoot: string,
+    commitKey: string,
+    mergeBase: string,
+    branchSha: string,
+    entries: DiffTreeEntry[],
+  ): Generator<DiffFileStats> {
+    const files: DiffFileStats[] = [];
+    for (let start = 0; start < entries.length; start += MAX_PATHSPEC_FILES) {
+      const batch = entries.slice(start, start + MAX_PATHSPEC_FILES);
+      const computed = this.computeMissingStats(projectRoot, mergeBase, branchSha, batch);
+      for (const entry of batch) {
+        const stats = computed.get(entry.blobKey) || this.statsByBlobPair.get(entry.blobKey) || NO_CHANGES;
+        const file = { path: entry.path, status: entry.status, additions: stats.additions, deletions: stats.deletions };
+        files.push(file);
+        yield file;
+      }
+    }
+    this.lastResults.set(projectRoot, { commitKey, files });
+  }
+
+  /** Run numstat for the batch entries whose blob pair is not cached; returns their stats by blob key. */
+  private computeMissingStats(
+    projectRoot: string,
+    mergeBase: string,
+    branchSha: string,
+    batch: DiffTreeEntry[],
+  ): Map<string, LineStats> {
+    const computed = new Map<string, LineStats>();
+    const missing = batch.filter((entry) => !this.statsByBlobPair.has(entry.blobKey));
+    if (missing.length === 0) {
+      return computed;
+    }
+
+    const paths = missing.flatMap((entry) => (entry.oldPath ? [entry.oldPath, entry.path] : [entry.path]));
+    const numstat = parseNumstatZ(
+      this.runGit(["diff", "--numstat", "-z", "-M", mergeBase, branchSha, "--", ...paths], projectRoot),
+    );
+    if (this.statsByBlobPair.size + missing.length > MAX_CACHED_BLOB_PAIRS) {
+      this.statsByBlobPair.clear();
+      this.mergeBases.clear();
+    }
+    for (const entry of missing) {
+      const stats = numstat.get(entry.path) || NO_CHANGES;
+      computed.set(entry.blobKey, stats);
+      this.statsByBlobPair.set(entry.blobKey, stats);
+    }
+    return computed;
+  }
+}
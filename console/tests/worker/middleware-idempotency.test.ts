@@ -0,0 +1,123 @@
+/**
+ * Tests for Idempotency-Key replay middleware
+ *
+ * Mock Justification:
+ * - Express req/res: minimal objects exposing only what the middleware touches
+ * - Database: real SQLite with ':memory:'
+ */
+import { describe, it, expect, beforeEach, afterEach } from "bun:test";
+import { createIdempotencyMiddleware } from "../../src/services/worker/http/middleware.js";
+import { SessionStore } from "../../src/services/sqlite/SessionStore.js";
+
+function makeReq(key: string | undefined, method = "POST", path = "/api/notifications"): any {
+  return { method, path, get: (name: string) => (name === "Idempotency-Key" ? key : undefined) };
+}
+
+function makeRes(): any {
+  const res: any = { statusCode: 200, sent: [] as any[] };
+  res.status = (code: number) => {
+    res.statusCode = code;
+    return res;
+  };
+  res.json = (body: any) => {
+    res.sent.push({ status: res.statusCode, body });
+    return res;
+  };
+  return res;
+}
+
+function runHandler(middleware: any, req: any, res: any, handler: (res: any) => void): boolean {
+  let calledNext = false;
+  middleware(req, res, () => {
+    calledNext = true;
+    handler(res);
+  });
+  return calledNext;
+}
+
+describe("createIdempotencyMiddleware", () => {
+  it("should pass through requests without a key", () => {
+    const middleware = createIdempotencyMiddleware();
+    const calls = [0, 1].map(() => runHandler(middleware, makeReq(undefined), makeRes(), (r) => r.status(201).json({})));
+    expect(calls).toEqual([true, true]);
+  });
+
+  it("should replay the first successful response for a repeated key", () => {
+    const middleware = createIdempotencyMiddleware();
+    let handled = 0;
+    const handler = (res: any) => {
+      handled++;
+      res.status(201).json({ id: handled });
+    };
+
+    runHandler(middleware, makeReq("k1"), makeRes(), handler);
+    const replay = makeRes();
+    const calledNext = runHandler(middleware, makeReq("k1"), replay, handler);
+
+    expect(calledNext).toBe(false);
+    expect(handled).toBe(1);
+    expect(replay.sent).toEqual([{ status: 201, body: { id: 1 } }]);
+  });
+
+  it("should not cache failed responses", () => {
+    const middleware = createIdempotencyMiddleware();
+    runHandler(middleware, makeReq("k2"), makeRes(), (r) => r.status(500).json({ error: "boom" }));
+
+    const calledNext = runHandler(middleware, makeReq("k2"), makeRes(), (r) => r.status(201).json({}));
+
+    expect(calledNext).toBe(true);
+  });
+
+  it("should scope keys by path", () => {
+    const middleware = createIdempotencyMiddleware();
+    runHandler(middleware, makeReq("k3", "POST", "/api/memory/save"), makeRes(), (r) => r.json({ ok: true }));
+
+    const calledNext = runHandler(middleware, makeReq("k3"), makeRes(), (r) => r.status(201).json({}));
+
+    expect(calledNext).toBe(true);
+  });
+
+  it("should forget entries after the TTL", () => {
+    const middleware = createIdempotencyMiddleware(() => null, -1);
+    runHandler(middleware, makeReq("k4"), makeRes(), (r) => r.status(201).json({}));
+
+    const calledNext = runHandler(middleware, makeReq("k4"), makeRes(), (r) => r.status(201).json({}));
+
+    expect(calledNext).toBe(true);
+  });
+});
+
+describe("createIdempotencyMiddleware with a database", () => {
+  let store: SessionStore;
+
+  beforeEach(() => {
+    store = new SessionStore(":memory:");
+  });
+
+  afterEach(() => {
+    store.close();
+  });
+
+  it("should replay responses recorded before a restart", () => {
+    const first = createIdempotencyMiddleware(() => store.db);
+    runHandler(first, makeReq("k5"), makeRes(), (r) => r.status(201).json({ id: 7 }));
+
+    const restarted = createIdempotencyMiddleware(() => store.db);
+    const replay = makeRes();
+    const calledNext = runHandler(restarted, makeReq("k5"), replay, (r) => r.status(201).json({ id: 8 }));
+
+    expect(calledNext).toBe(false);
+    expect(replay.sent).toEqual([{ status: 201, body: { id: 7 } }]);
+  });
+
+  it("should prune expired keys", () => {
+    const middleware = createIdempotencyMiddleware(() => store.db, -1);
+    runHandler(middleware, makeReq("k6"), makeRes(), (r) => r.status(201).json({}));
+
+    const calledNext = runHandler(middleware, makeReq("k6"), makeRes(), (r) => r.status(201).json({}));
+    const row = store.db.prepare("SELECT COUNT(*) AS n FROM idempotency_keys").get() as { n: number };
+
+    expect(calledNext).toBe(true);
+    expect(row.n).toBe(0);
+  });
+});
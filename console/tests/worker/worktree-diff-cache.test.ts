@@ -0,0 +1,207 @@
+/**
+ * Tests for WorktreeDiffCache
+ *
+ * Uses a fake git runner that records invocations, so caching behavior is
+ * verified by which git commands run rather than by running real git.
+ */
+import { describe, it, expect } from "bun:test";
+import {
+  WorktreeDiffCache,
+  parseDiffTreeRaw,
+  parseNumstatZ,
+} from "../../src/services/worker/http/routes/utils/worktreeDiffCache.js";
+
+const BLOB_A1 = "a".repeat(40);
+const BLOB_A2 = "b".repeat(40);
+const BLOB_B1 = "c".repeat(40);
+const BLOB_B2 = "d".repeat(40);
+const ZERO = "0".repeat(40);
+
+function rawLine(oldBlob: string, newBlob: string, status: string, ...paths: string[]): string {
+  return `:100644 100644 ${oldBlob} ${newBlob} ${status}\0${paths.join("\0")}\0`;
+}
+
+function fakeGit(state: { branchSha: string; diffTree: string; numstat: string }) {
+  const calls: string[][] = [];
+  const runner = (args: string[]): string => {
+    calls.push(args);
+    switch (args[0]) {
+      case "rev-parse":
+        return `base000\n${state.branchSha}\n`;
+      case "merge-base":
+        return "mergebase\n";
+      case "diff-tree":
+        return state.diffTree;
+      case "diff":
+        return state.numstat;
+      default:
+        throw new Error(`unexpected git ${args.join(" ")}`);
+    }
+  };
+  return { calls, runner };
+}
+
+describe("parseDiffTreeRaw", () => {
+  it("should parse modified, added and renamed entries", () => {
+    const raw =
+      rawLine(BLOB_A1, BLOB_A2, "M", "src/a.ts") +
+      rawLine(ZERO, BLOB_B1, "A", "src/new.ts") +
+      rawLine(BLOB_B1, BLOB_B1, "R100", "src/old.ts", "src/moved.ts");
+
+    const entries = parseDiffTreeRaw(raw);
+
+    expect(entries).toHaveLength(3);
+    expect(entries[0]).toEqual({ status: "M", oldPath: null, path: "src/a.ts", blobKey: `${BLOB_A1}:${BLOB_A2}` });
+    expect(entries[1].status).toBe("A");
+    expect(entries[2]).toEqual({
+      status: "R",
+      oldPath: "src/old.ts",
+      path: "src/moved.ts",
+      blobKey: `${BLOB_B1}:${BLOB_B1}`,
+    });
+  });
+
+  it("should return empty array for empty output", () => {
+    expect(parseDiffTreeRaw("")).toEqual([]);
+  });
+});
+
+describe("parseNumstatZ", () => {
+  it("should parse plain and renamed entries", () => {
+    const stats = parseNumstatZ("1\t0\tadd.txt\x002\t3\tm.txt\x000\t0\t\x00old.txt\x00new.txt\x00");
+
+    expect(stats.get("add.txt")).toEqual({ additions: 1, deletions: 0 });
+    expect(stats.get("m.txt")).toEqual({ additions: 2, deletions: 3 });
+    expect(stats.get("new.txt")).toEqual({ additions: 0, deletions: 0 });
+  });
+
+  it("should treat binary files as zero counts", () => {
+    const stats = parseNumstatZ("-\t-\timage.png\x00");
+    expect(stats.get("image.png")).toEqual({ additions: 0, deletions: 0 });
+  });
+});
+
+describe("WorktreeDiffCache", () => {
+  it("should compute stats on first call", () => {
+    const state = {
+      branchSha: "head1",
+      diffTree: rawLine(BLOB_A1, BLOB_A2, "M", "src/a.ts"),
+      numstat: "4\t1\tsrc/a.ts\x00",
+    };
+    const { runner } = fakeGit(state);
+    const cache = new WorktreeDiffCache(runner);
+
+    const files = cache.getChangedFiles("/repo", "main", "spec/x");
+
+    expect(files).toEqual([{ path: "src/a.ts", status: "M", additions: 4, deletions: 1 }]);
+  });
+
+  it("should skip all diff work when commits are unchanged", () => {
+    const state = {
+      branchSha: "head1",
+      diffTree: rawLine(BLOB_A1, BLOB_A2, "M", "src/a.ts"),
+      numstat: "4\t1\tsrc/a.ts\x00",
+    };
+    const { calls, runner } = fakeGit(state);
+    const cache = new WorktreeDiffCache(runner);
+
+    cache.getChangedFiles("/repo", "main", "spec/x");
+    calls.length = 0;
+    cache.getChangedFiles("/repo", "main", "spec/x");
+
+    expect(calls.map((c) => c[0])).toEqual(["rev-parse"]);
+  });
+
+  it("should only run numstat for files whose blobs changed", () => {
+    const state = {
+      branchSha: "head1",
+      diffTree: rawLine(BLOB_A1, BLOB_A2, "M", "src/a.ts"),
+      numstat: "4\t1\tsrc/a.ts\x00",
+    };
+    const { calls, runner } = fakeGit(state);
+    const cache = new WorktreeDiffCache(runner);
+    cache.getChangedFiles("/repo", "main", "spec/x");
+
+    state.branchSha = "head2";
+    state.diffTree = rawLine(BLOB_A1, BLOB_A2, "M", "src/a.ts") + rawLine(BLOB_B1, BLOB_B2, "M", "src/b.ts");
+    state.numstat = "7\t2\tsrc/b.ts\x00";
+    calls.length = 0;
+
+    const files = cache.getChangedFiles("/repo", "main", "spec/x");
+
+    const numstatCall = calls.find((c) => c[0] === "diff");
+    expect(numstatCall).toBeDefined();
+    expect(numstatCall!.slice(numstatCall!.indexOf("--") + 1)).toEqual(["src/b.ts"]);
+    expect(files).toEqual([
+      { path: "src/a.ts", status: "M", additions: 4, deletions: 1 },
+      { path: "src/b.ts", status: "M", additions: 7, deletions: 2 },
+    ]);
+  });
+
+  it("should not run numstat when every blob pair is cached", () => {
+    const state = {
+      branchSha: "head1",
+      diffTree: rawLine(BLOB_A1, BLOB_A2, "M", "src/a.ts"),
+      numstat: "4\t1\tsrc/a.ts\x00",
+    };
+    const { calls, runner } = fakeGit(state);
+    const cache = new WorktreeDiffCache(runner);
+    cache.getChangedFiles("/repo", "main", "spec/x");
+
+    state.branchSha = "head2";
+    calls.length = 0;
+    cache.getChangedFiles("/repo", "main", "spec/x");
+
+    expect(calls.some((c) => c[0] === "diff")).toBe(false);
+  });
+
+  it("should reuse the merge-base for the same commit pair across projects", () => {
+    const state = { branchSha: "head1", diffTree: "", numstat: "" };
+    const { calls, runner } = fakeGit(state);
+    const cache = new WorktreeDiffCache(runner);
+
+    cache.getChangedFiles("/repo-a", "main", "spec/x");
+    cache.getChangedFiles("/repo-b", "main", "spec/x");
+
+    expect(calls.filter((c) => c[0] === "merge-base")).toHaveLength(1);
+  });
+
+  it("should bound the merge-base cache", () => {
+    const state = { branchSha: "head0", diffTree: "", numstat: "" };
+    const { calls, runner } = fakeGit(state);
+    const cache = new WorktreeDiffCache(runner);
+
+    for (let i = 0; i <= 1000; i++) {
+      state.branchSha = `head${i}`;
+      cache.getChangedFiles("/repo", "main", "spec/x");
+    }
+    calls.length = 0;
+    state.branchSha = "head0";
+    cache.getChangedFiles("/repo", "main", "spec/x");
+
+    expect(calls.filter((c) => c[0] === "merge-base")).toHaveLength(1);
+  });
+
+  it("should yield the first batch of files before computing the next", () => {
+    const blob = (i: number) => i.toString(16).padStart(40, "0");
+    const paths = Array.from({ length: 501 }, (_, i) => `src/f${i}.ts`);
+    const state = {
+      branchSha: "head1",
+      diffTree: paths.map((p, i) => rawLine(blob(2 * i + 1), blob(2 * i + 2), "M", p)).join(""),
+      numstat: paths.map((p) => `1\t0\t${p}\x00`).join(""),
+    };
+    const { calls, runner } = fakeGit(state);
+    const cache = new WorktreeDiffCache(runner);
+
+    const stream = cache.streamChangedFiles("/repo", "main", "spec/x");
+    const files = stream.files[Symbol.iterator]();
+
+    expect(stream.count).toBe(501);
+    expect(files.next().value).toEqual({ path: "src/f0.ts", status: "M", additions: 1, deletions: 0 });
+    expect(calls.filter((c) => c[0] === "diff")).toHaveLength(1);
+    let rest = 0;
+    for (let next = files.next(); !next.done; next = files.next()) rest++;
+    expect(rest).toBe(500);
+    expect(calls.filter((c) => c[0] === "diff")).toHaveLength(2);
+  });
+});
@@ -8,9 +8,11 @@ import subprocess
 import sys
 from pathlib import Path
 
-from installer import __build__
+from installer import __build__, __version__
 from installer.context import InstallContext
 from installer.errors import FatalInstallError, InstallationCancelled
+from installer.profiling import emit_span_tree, span
+from installer.staging import StagingError, apply_staged_release, is_staged, stage_release
 from installer.steps.base import BaseStep
 from installer.steps.claude_files import ClaudeFilesStep
 from installer.steps.config_files import ConfigFilesStep
@@ -20,6 +22,7 @@ from installer.steps.prerequisites import PrerequisitesStep
 from installer.steps.shell_config import ShellConfigStep
 from installer.steps.vscode_extensions import VSCodeExtensionsStep
 from installer.ui import Console
+from installer.updates import get_cached_update, mark_check_failed, run_refresh_job, spawn_background_refresh
 
 
 def get_all_steps() -> list[BaseStep]:
@@ -224,17 +227,20 @@ def run_installation(ctx: InstallContext) -> None:
         if ui:
             ui.step(step.name.replace("_", " ").title())
 
-        if step.check(ctx):
-            if ui:
-                ui.info(f"Already complete, skipping")
-            continue
+        with span(f"step:{step.name}"):
+            if step.check(ctx):
+                if ui:
+                    ui.info(f"Already complete, skipping")
+                continue
 
-        try:
-            step.run(ctx)
-        except KeyboardInterrupt:
-            raise InstallationCancelled(step.name) from None
+            try:
+                step.run(ctx)
+            except KeyboardInterrupt:
+                raise InstallationCancelled(step.name) from None
         ctx.mark_completed(step.name)
 
+    emit_span_tree()
+
 
 def _prompt_license_key(
     console: Console,
@@ -387,6 +393,64 @@ def cmd_version(_args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_check_update(args: argparse.Namespace) -> int:
+    """Report a newer release from the cache and refresh it in the background.
+
+    Without --refresh this never blocks on the network: it reads the cached
+    release metadata and, if the cache is stale, spawns a detached refresh
+    that also stages the newer release.
+    """
+    current_version = args.current_version or __version__
+
+    if args.refresh:
+
+        def stage_update() -> None:
+            update = get_cached_update(current_version, args.cache_path)
+            if update:
+                try:
+                    stage_release(update["version"])
+                except (StagingError, OSError):
+                    mark_check_failed(args.cache_path)
+
+        run_refresh_job(args.cache_path, stage_update if args.current_version else None)
+        return 0
+
+    update = get_cached_update(current_version, args.cache_path)
+    if not args.no_background:
+        spawn_background_refresh(args.cache_path, current_version)
+
+    if args.json:
+        payload: dict[str, object] = {"update_available": update is not None}
+        if update:
+            payload.update({k: update.get(k, "") for k in ("version", "notes", "url", "published_at")})
+            payload["staged"] = is_staged(update["version"])
+        print(json.dumps(payload))
+    elif update:
+        print(f"Pilot Shell v{update['version']} is available")
+    return 0
+
+
+def cmd_apply_staged(args: argparse.Namespace) -> int:
+    """Apply a staged release (binary swap + plugin files + settings merge)."""
+    console = Console(non_interactive=True, quiet=args.quiet)
+    version = args.target_version
+    if not version:
+        update = get_cached_update(__version__)
+        version = update["version"] if update else None
+    if not version or not is_staged(version):
+        console.error("No staged release available - run the full installer instead")
+        return 1
+
+    try:
+        apply_staged_release(version, Path.cwd(), ui=console)
+    except (StagingError, OSError) as e:
+        console.error(f"Applying staged release failed: {e}")
+        return 1
+
+    console.success(f"Updated to v{version}")
+    return 0
+
+
 def find_pilot_binary() -> Path | None:
     """Find the pilot binary in ~/.pilot/bin/."""
     binary_path = Path.home() / ".pilot" / "bin" / "pilot"
@@ -399,11 +463,14 @@ def cmd_launch(args: argparse.Namespace) -> int:
     """Launch Claude Code via pilot binary."""
     claude_args = args.args or []
 
-    pilot_path = find_pilot_binary()
-    if pilot_path:
-        cmd = [str(pilot_path)] + claude_args
-    else:
-        cmd = ["claude"] + claude_args
+    with span("launch:prepare"):
+        with span("find_pilot_binary"):
+            pilot_path = find_pilot_binary()
+        if pilot_path:
+            cmd = [str(pilot_path)] + claude_args
+        else:
+            cmd = ["claude"] + claude_args
+    emit_span_tree()
 
     return subprocess.call(cmd)
 
@@ -464,6 +531,49 @@ def create_parser() -> argparse.ArgumentParser:
 
     subparsers.add_parser("version", help="Show version information")
 
+    check_update_parser = subparsers.add_parser("check-update", help="Check for a newer release (cache-only)")
+    check_update_parser.add_argument(
+        "--current-version",
+        type=str,
+        default=None,
+        help="Installed version to compare against (defaults to installer version)",
+    )
+    check_update_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output result as JSON",
+    )
+    check_update_parser.add_argument(
+        "--no-background",
+        action="store_true",
+        help="Do not spawn a background cache refresh",
+    )
+    check_update_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help=argparse.SUPPRESS,
+    )
+    check_update_parser.add_argument(
+        "--cache-path",
+        type=Path,
+        default=None,
+        help=argparse.SUPPRESS,
+    )
+
+    apply_staged_parser = subparsers.add_parser("apply-staged", help="Apply a pre-downloaded release")
+    apply_staged_parser.add_argument(
+        "--target-version",
+        type=str,
+        default=None,
+        help="Staged version to apply (defaults to the cached latest release)",
+    )
+    apply_staged_parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="Minimal output",
+    )
+
     launch_parser = subparsers.add_parser("launch", help="Launch Claude Code via pilot binary")
     launch_parser.add_argument(
         "args",
@@ -485,6 +595,10 @@ def main() -> None:
         sys.exit(cmd_version(args))
     elif args.command == "launch":
         sys.exit(cmd_launch(args))
+    elif args.command == "check-update":
+        sys.exit(cmd_check_update(args))
+    elif args.command == "apply-staged":
+        sys.exit(cmd_apply_staged(args))
     else:
         parser.print_help()
         sys.exit(0)
@@ -0,0 +1,138 @@
+"""Launch profiling spans and on-disk memoization of deterministic probes.
+
+Set PILOT_PROFILE_LAUNCH=1 to record nested timing spans and print them as a
+tree on stderr. Spans cost a single environment check when disabled.
+
+Memoized values are stored under ~/.pilot/cache/memo/ keyed by a hash of
+their inputs (e.g. a binary's path, mtime and size), so unchanged launches
+skip the probe entirely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TextIO
+
+PROFILE_ENV_VAR = "PILOT_PROFILE_LAUNCH"
+
+
+@dataclass
+class Span:
+    """A timed region of the launch path."""
+
+    name: str
+    start: float
+    duration: float = 0.0
+    children: list[Span] = field(default_factory=list)
+
+
+_root_spans: list[Span] = []
+_stack: list[Span] = []
+
+
+def is_profiling_enabled() -> bool:
+    """Check if launch profiling was requested."""
+    return os.environ.get(PROFILE_ENV_VAR, "").strip() not in ("", "0", "false")
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Record the wall time of the enclosed block as a child of the current span."""
+    if not is_profiling_enabled():
+        yield
+        return
+
+    current = Span(name=name, start=time.perf_counter())
+    (_stack[-1].children if _stack else _root_spans).append(current)
+    _stack.append(current)
+    try:
+        yield
+    finally:
+        current.duration = time.perf_counter() - current.start
+        _stack.pop()
+
+
+def get_root_spans() -> list[Span]:
+    """Return recorded top-level spans."""
+    return list(_root_spans)
+
+
+def reset_spans() -> None:
+    """Discard all recorded spans."""
+    _root_spans.clear()
+    _stack.clear()
+
+
+def format_span_tree(spans: list[Span] | None = None) -> str:
+    """Format spans as an indented tree with durations and share of the parent."""
+    spans = _root_spans if spans is None else spans
+    lines: list[str] = []
+
+    def walk(node: Span, depth: int, parent_duration: float | None) -> None:
+        share = f" {node.duration / parent_duration * 100:5.1f}%" if parent_duration else ""
+        lines.append(f"{'  ' * depth}{node.name:<{max(40 - 2 * depth, 10)}} {node.duration * 1000:9.1f} ms{share}")
+        for child in node.children:
+            walk(child, depth + 1, node.duration or None)
+
+    for root in spans:
+        walk(root, 0, None)
+    return "\n".join(lines)
+
+
+def emit_span_tree(stream: TextIO | None = None) -> None:
+    """Print the span tree to stderr if profiling is enabled."""
+    if not is_profiling_enabled() or not _root_spans:
+        return
+    out = stream or sys.stderr
+    out.write(f"[{PROFILE_ENV_VAR}] launch profile\n{format_span_tree()}\n")
+
+
+def get_memo_dir() -> Path:
+    """Get directory holding memoized launch values."""
+    return Path.home() / ".pilot" / "cache" / "memo"
+
+
+def file_fingerprint(path: Path | str | None) -> list[Any]:
+    """Return a cache key component identifying a file's current contents."""
+    if not path:
+        return [None]
+    try:
+        resolved = Path(path).resolve()
+        stat = resolved.stat()
+        return [str(resolved), stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        return [str(path), None]
+
+
+def memoize_on_disk(namespace: str, key_parts: list[Any], compute: Callable[[], Any]) -> Any:
+    """Return the memoized value for key_parts, computing and storing it on a miss.
+
+    None results are not stored so transient failures are retried next time.
+    """
+    key = hashlib.sha256(json.dumps(key_parts, sort_keys=True, default=str).encode()).hexdigest()
+    memo_path = get_memo_dir() / f"{namespace}.json"
+    try:
+        entry = json.loads(memo_path.read_text())
+        if isinstance(entry, dict) and entry.get("key") == key:
+            return entry.get("value")
+    except (json.JSONDecodeError, OSError):
+        pass
+
+    value = compute()
+    if value is not None:
+        try:
+            memo_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = memo_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps({"key": key, "value": value}))
+            os.replace(tmp_path, memo_path)
+        except (OSError, TypeError):
+            pass
+    return value
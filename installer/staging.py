@@ -0,0 +1,289 @@
+"""Staged releases - pre-download the next version for instant upgrades.
+
+A staged release is a complete, verified copy of a version's pilot binary and
+plugin files under ~/.pilot/staged/<version>/. Staging runs in the background
+once a newer release is known; applying it later only switches the binary
+directory and reinstalls plugin files from local disk, so it works offline.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import shutil
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any
+
+from installer.context import InstallContext
+from installer.downloads import (
+    DownloadConfig,
+    FileInfo,
+    _get_ssl_context,
+    compute_git_blob_sha,
+    download_files_parallel,
+    get_repo_files,
+)
+from installer.errors import InstallError
+from installer.steps.claude_files import REPO_URL, ClaudeFilesStep
+
+STAGED_MANIFEST_FILE = "staged.json"
+
+
+class StagingError(InstallError):
+    """Staged release is missing, incomplete or failed verification."""
+
+    pass
+
+
+def get_staged_root() -> Path:
+    """Get base directory holding staged releases."""
+    return Path.home() / ".pilot" / "staged"
+
+
+def get_staged_dir(version: str) -> Path:
+    """Get directory for a staged release."""
+    return get_staged_root() / version
+
+
+def release_tag(version: str) -> str:
+    """Map a version to its release tag (dev builds are tagged verbatim)."""
+    return version if version.startswith("dev-") else f"v{version}"
+
+
+def get_platform_suffix() -> str | None:
+    """Return the release asset suffix for this platform (mirrors install.sh)."""
+    os_name = {"Linux": "linux", "Darwin": "darwin"}.get(platform.system())
+    machine = platform.machine().lower()
+    arch = {"x86_64": "x86_64", "amd64": "x86_64", "arm64": "arm64", "aarch64": "arm64"}.get(machine)
+    if not os_name or not arch:
+        return None
+    return f"{os_name}-{arch}"
+
+
+def get_local_so_name() -> str:
+    """Return the installed module filename for this platform (mirrors install.sh)."""
+    if platform.system() == "Darwin":
+        return "pilot.cpython-312-darwin.so"
+    machine = platform.machine().lower()
+    tag = "aarch64-linux-gnu" if machine in ("arm64", "aarch64") else "x86_64-linux-gnu"
+    return f"pilot.cpython-312-{tag}.so"
+
+
+def load_staged_manifest(version: str) -> dict | None:
+    """Load the manifest of a fully staged release, or None if not staged."""
+    manifest_path = get_staged_dir(version) / STAGED_MANIFEST_FILE
+    try:
+        data = json.loads(manifest_path.read_text())
+        return data if isinstance(data, dict) and data.get("version") == version else None
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
+def is_staged(version: str) -> bool:
+    """Check whether a version is fully staged and ready to apply."""
+    return load_staged_manifest(version) is not None
+
+
+def _download_asset(url: str, dest_path: Path) -> bool:
+    """Download a release asset, verifying the byte count against Content-Length."""
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        request = urllib.request.Request(url)
+        with urllib.request.urlopen(request, timeout=60.0, context=_get_ssl_context()) as response:
+            if response.status != 200:
+                return False
+            expected = int(response.headers.get("content-length", 0))
+            written = 0
+            with open(dest_path, "wb") as f:
+                while True:
+                    chunk = response.read(65536)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    written += len(chunk)
+        if written == 0 or (expected and written != expected):
+            dest_path.unlink(missing_ok=True)
+            return False
+        return True
+    except (urllib.error.URLError, OSError, TimeoutError, ValueError):
+        dest_path.unlink(missing_ok=True)
+        return False
+
+
+def _verify_files(repo_dir: Path, file_infos: list[FileInfo]) -> list[str]:
+    """Return paths whose content does not match the release tree SHA."""
+    mismatched: list[str] = []
+    for file_info in file_infos:
+        path = repo_dir / file_info.path
+        try:
+            if not path.is_file() or (file_info.sha and compute_git_blob_sha(path) != file_info.sha):
+                mismatched.append(file_info.path)
+        except OSError:
+            mismatched.append(file_info.path)
+    return mismatched
+
+
+def stage_release(version: str) -> Path:
+    """Download and verify a release into ~/.pilot/staged/<version>/.
+
+    Files are written to a temporary sibling directory and renamed into place
+    only after every file verified, so a staged directory is always complete.
+    Raises StagingError on any download or verification failure.
+    """
+    final_dir = get_staged_dir(version)
+    if is_staged(version):
+        return final_dir
+
+    suffix = get_platform_suffix()
+    if suffix is None:
+        raise StagingError("Unsupported platform for Pilot binary")
+
+    tag = release_tag(version)
+    partial_dir = final_dir.with_name(f"{version}.partial-{os.getpid()}")
+    shutil.rmtree(partial_dir, ignore_errors=True)
+    partial_dir.mkdir(parents=True)
+
+    try:
+        base_url = f"{REPO_URL}/releases/download/{tag}"
+        bin_dir = partial_dir / "bin"
+        if not _download_asset(f"{base_url}/pilot-{suffix}.so", bin_dir / get_local_so_name()):
+            raise StagingError(f"Failed to download pilot module for {tag}")
+        if not _download_asset(f"{base_url}/pilot", bin_dir / "pilot"):
+            raise StagingError(f"Failed to download pilot wrapper for {tag}")
+        for binary in bin_dir.iterdir():
+            binary.chmod(binary.stat().st_mode | 0o111)
+
+        config = DownloadConfig(repo_url=REPO_URL, repo_branch=tag)
+        file_infos = get_repo_files("pilot", config)
+        if not file_infos:
+            raise StagingError(f"No plugin files found for {tag}")
+        repo_dir = partial_dir / "repo"
+        results = download_files_parallel(file_infos, [repo_dir / fi.path for fi in file_infos], config)
+        failed = [fi.path for fi, ok in zip(file_infos, results) if not ok]
+        failed.extend(_verify_files(repo_dir, file_infos))
+        if failed:
+            raise StagingError(f"{len(failed)} plugin files failed to download or verify (e.g. {failed[0]})")
+
+        manifest: dict[str, Any] = {
+            "version": version,
+            "tag": tag,
+            "platform": suffix,
+            "staged_at": time.time(),
+            "files": [{"path": fi.path, "sha": fi.sha} for fi in file_infos],
+        }
+        (partial_dir / STAGED_MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+
+        shutil.rmtree(final_dir, ignore_errors=True)
+        os.replace(partial_dir, final_dir)
+    except BaseException:
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        raise
+
+    return final_dir
+
+
+def get_bin_versions_root() -> Path:
+    """Get base directory holding installed binary directories."""
+    return Path.home() / ".pilot" / "bin-versions"
+
+
+def _switch_bin_directory(new_dir: Path, version: str) -> None:
+    """Make a copy of new_dir the live ~/.pilot/bin with a single rename.
+
+    The copy goes to ~/.pilot/bin-versions/<version>.<pid>/ and ~/.pilot/bin
+    becomes a symlink to it, replaced with os.replace so the path always
+    resolves to a complete directory. A real bin directory written by
+    install.sh cannot be replaced by a symlink in one rename, so it is moved
+    aside first (once, on the first staged upgrade).
+    """
+    target = Path.home() / ".pilot" / "bin"
+    versions_root = get_bin_versions_root()
+    versions_root.mkdir(parents=True, exist_ok=True)
+    installed = versions_root / f"{version}.{os.getpid()}"
+    shutil.rmtree(installed, ignore_errors=True)
+    shutil.copytree(new_dir, installed, symlinks=True)
+
+    link = target.with_name(f".{target.name}.link-{os.getpid()}")
+    link.unlink(missing_ok=True)
+    os.symlink(Path(versions_root.name) / installed.name, link)
+
+    legacy = versions_root / f".legacy-{os.getpid()}"
+    if target.is_dir() and not target.is_symlink():
+        os.replace(target, legacy)
+    try:
+        os.replace(link, target)
+    except OSError:
+        link.unlink(missing_ok=True)
+        if legacy.exists():
+            os.replace(legacy, target)
+        raise
+
+    for entry in versions_root.iterdir():
+        if entry != installed:
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def _is_process_alive(pid: int) -> bool:
+    """Check whether a process with this pid exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def prune_staged(keep: str | None = None) -> None:
+    """Remove completed staged releases other than keep.
+
+    Partial downloads belong to an in-flight stage_release in another process
+    and are only removed once that process has exited.
+    """
+    root = get_staged_root()
+    if not root.exists():
+        return
+    for entry in root.iterdir():
+        if not entry.is_dir() or entry.name == keep:
+            continue
+        _, partial, pid = entry.name.partition(".partial-")
+        if partial:
+            if pid.isdigit() and not _is_process_alive(int(pid)):
+                shutil.rmtree(entry, ignore_errors=True)
+        elif load_staged_manifest(entry.name) is not None:
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def apply_staged_release(version: str, project_dir: Path, ui: Any = None) -> None:
+    """Install a staged release without touching the network.
+
+    Switches ~/.pilot/bin atomically, then runs the Claude files step against
+    the staged plugin files, which performs the settings and app config merge.
+    Other completed staged versions are pruned afterwards.
+    """
+    if load_staged_manifest(version) is None:
+        raise StagingError(f"Version {version} is not staged")
+
+    staged_dir = get_staged_dir(version)
+    _switch_bin_directory(staged_dir / "bin", version)
+
+    ctx = InstallContext(
+        project_dir=project_dir,
+        non_interactive=True,
+        local_mode=True,
+        local_repo_dir=staged_dir / "repo",
+        target_version=version,
+        ui=ui,
+    )
+    step = ClaudeFilesStep()
+    step.run(ctx)
+    # local_mode skips hooks.json processing (meant for dev checkouts), but a
+    # staged release needs the same path patching and interpreter rewrite as
+    # a network install.
+    step.update_hooks_config(Path.home() / ".claude" / "pilot", ui)
+
+    prune_staged(keep=version)
@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 import json
+import shlex
 import shutil
+import subprocess
+import time
 from pathlib import Path
 from typing import Any
 
@@ -45,6 +48,10 @@ SKIP_PATTERNS = (
 
 SKIP_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
 
+HOOK_COMMAND_PREFIX = "uv run python "
+HOOK_PYTHON_FLAGS = ("-S", "-E")
+HOOK_MIN_PYTHON = (3, 10)
+
 
 def patch_claude_paths(content: str) -> str:
     """Expand ~/.pilot/bin/ paths to absolute paths."""
@@ -53,6 +60,84 @@ def patch_claude_paths(content: str) -> str:
     return content.replace('"~/.pilot/bin/', '"' + abs_bin_path)
 
 
+def resolve_hook_python() -> str | None:
+    """Resolve the interpreter `uv run python` would pick, once, as an absolute path.
+
+    Hooks only use the standard library, so they can skip uv's per-call
+    environment resolution and run this interpreter directly.
+    """
+    candidates: list[str] = []
+    if shutil.which("uv"):
+        try:
+            result = subprocess.run(["uv", "python", "find"], capture_output=True, text=True, timeout=30)
+            if result.returncode == 0 and result.stdout.strip():
+                candidates.append(result.stdout.strip())
+        except (subprocess.SubprocessError, OSError):
+            pass
+    for name in ("python3", "python"):
+        found = shutil.which(name)
+        if found:
+            candidates.append(found)
+
+    check = f"import sys; sys.exit(0 if sys.version_info >= {HOOK_MIN_PYTHON} else 1)"
+    for candidate in candidates:
+        python = str(Path(candidate).resolve())
+        try:
+            result = subprocess.run([python, *HOOK_PYTHON_FLAGS, "-c", check], capture_output=True, timeout=10)
+        except (subprocess.SubprocessError, OSError):
+            continue
+        if result.returncode == 0:
+            return python
+    return None
+
+
+def rewrite_hook_commands(hooks_config: dict[str, Any], python: str) -> int:
+    """Point `uv run python` hook commands at python with fast-startup flags. Returns count rewritten."""
+    fast_prefix = " ".join([shlex.quote(python), *HOOK_PYTHON_FLAGS]) + " "
+    rewritten = 0
+    for matchers in hooks_config.get("hooks", {}).values():
+        for matcher in matchers:
+            for hook in matcher.get("hooks", []):
+                command = hook.get("command", "")
+                if command.startswith(HOOK_COMMAND_PREFIX):
+                    hook["command"] = fast_prefix + command[len(HOOK_COMMAND_PREFIX) :]
+                    rewritten += 1
+    return rewritten
+
+
+def precompile_hooks(python: str, hooks_dir: Path) -> bool:
+    """Byte-compile hook modules with the hook interpreter so imports skip compilation."""
+    try:
+        result = subprocess.run(
+            [python, *HOOK_PYTHON_FLAGS, "-m", "compileall", "-q", str(hooks_dir)],
+            capture_output=True,
+            timeout=60,
+        )
+    except (subprocess.SubprocessError, OSError):
+        return False
+    return result.returncode == 0
+
+
+def measure_hook_startup(python: str, hooks_dir: Path, runs: int = 3) -> float | None:
+    """Time starting python and importing the shared hook helpers. Returns best-of-runs seconds.
+
+    Returns None if the import fails, meaning the rewritten commands would not work.
+    """
+    code = f"import sys; sys.path.insert(0, {str(hooks_dir)!r}); import _util"
+    best: float | None = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        try:
+            result = subprocess.run([python, *HOOK_PYTHON_FLAGS, "-c", code], capture_output=True, timeout=10)
+        except (subprocess.SubprocessError, OSError):
+            return None
+        if result.returncode != 0:
+            return None
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
 def process_settings(settings_content: str) -> str:
     """Process settings JSON - parse and re-serialize with consistent formatting."""
     config: dict[str, Any] = json.loads(settings_content)
@@ -372,7 +457,7 @@ class ClaudeFilesStep(BaseStep):
         self._update_lsp_config(home_pilot_plugin_dir)
 
         if not ctx.local_mode:
-            self._update_hooks_config(home_pilot_plugin_dir)
+            self.update_hooks_config(home_pilot_plugin_dir, ui)
 
         self._merge_app_config()
         self._cleanup_stale_rules(ctx)
@@ -428,9 +513,15 @@ class ClaudeFilesStep(BaseStep):
         except (json.JSONDecodeError, OSError, IOError):
             pass
 
-    def _update_hooks_config(self, plugin_dir: Path) -> None:
-        """Process hooks config with path patching and consistent formatting."""
-        hooks_json_path = plugin_dir / "hooks" / "hooks.json"
+    def update_hooks_config(self, plugin_dir: Path, ui: Any = None) -> None:
+        """Process hooks config with path patching, fast hook runtime and consistent formatting.
+
+        Python hook commands are pointed at a concrete interpreter only after the
+        hook modules precompile and import cleanly with it; otherwise they keep
+        going through `uv run python`.
+        """
+        hooks_dir = plugin_dir / "hooks"
+        hooks_json_path = hooks_dir / "hooks.json"
         if not hooks_json_path.exists():
             return
 
@@ -438,8 +529,20 @@ class ClaudeFilesStep(BaseStep):
             hooks_content = hooks_json_path.read_text()
             hooks_content = patch_claude_paths(hooks_content)
             hooks_config = json.loads(hooks_content)
-            hooks_json_path.write_text(json.dumps(hooks_config, indent=2) + "\n")
         except (json.JSONDecodeError, OSError, IOError):
+            return
+
+        python = resolve_hook_python()
+        if python and precompile_hooks(python, hooks_dir):
+            startup = measure_hook_startup(python, hooks_dir)
+            if startup is not None:
+                rewritten = rewrite_hook_commands(hooks_config, python)
+                if rewritten and ui:
+                    ui.info(f"{rewritten} hooks run with {python} ({startup * 1000:.0f} ms startup)")
+
+        try:
+            hooks_json_path.write_text(json.dumps(hooks_config, indent=2) + "\n")
+        except (OSError, IOError):
             pass
 
     def _merge_app_config(self) -> None:
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import os
+import shutil
 import subprocess
 import time
 from pathlib import Path
@@ -11,6 +12,7 @@ from typing import Any
 
 from installer.context import InstallContext
 from installer.platform_utils import command_exists, is_linux_arm64, is_macos_arm64, npm_global_cmd
+from installer.profiling import file_fingerprint, memoize_on_disk
 from installer.steps.base import BaseStep
 
 VEXOR_FORK_URL = "https://github.com/maxritter/vexor.git"
@@ -122,8 +124,6 @@ def _get_forced_claude_version() -> str | None:
 
 def _clean_npm_stale_dirs() -> None:
     """Remove stale .claude-code-* temp dirs that cause npm ENOTEMPTY errors."""
-    import shutil
-
     if not command_exists("npm"):
         return
 
@@ -149,7 +149,16 @@ def _clean_npm_stale_dirs() -> None:
 
 
 def _get_installed_claude_version() -> str | None:
-    """Probe the actual installed Claude Code version via claude --version."""
+    """Probe the actual installed Claude Code version via claude --version.
+
+    Memoized on the claude binary's resolved path and mtime.
+    """
+    claude_path = shutil.which("claude")
+    return memoize_on_disk("claude-version", file_fingerprint(claude_path), _probe_claude_version)
+
+
+def _probe_claude_version() -> str | None:
+    """Run claude --version and return its output."""
     try:
         result = subprocess.run(
             ["claude", "--version"],
@@ -9,26 +9,41 @@ from pathlib import Path
 from installer import __version__
 from installer.context import InstallContext
 from installer.platform_utils import is_in_devcontainer
+from installer.profiling import file_fingerprint, memoize_on_disk
 from installer.steps.base import BaseStep
 
 
+def _probe_pilot_version(pilot_path: Path) -> str | None:
+    """Run pilot --version and parse the version string."""
+    try:
+        result = subprocess.run(
+            [str(pilot_path), "--version"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        if result.returncode == 0:
+            match = re.search(r" v(\S+)$", result.stdout.strip())
+            if match:
+                return match.group(1)
+    except Exception:
+        pass
+    return None
+
+
 def _get_pilot_version() -> str:
-    """Get version from Pilot binary, fallback to installer version."""
-    pilot_path = Path.home() / ".pilot" / "bin" / "pilot"
+    """Get version from Pilot binary, fallback to installer version.
+
+    Memoized on the fingerprints of the files in ~/.pilot/bin, so the binary
+    is only executed again after it changed.
+    """
+    bin_dir = Path.home() / ".pilot" / "bin"
+    pilot_path = bin_dir / "pilot"
     if pilot_path.exists():
-        try:
-            result = subprocess.run(
-                [str(pilot_path), "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                match = re.search(r" v(\S+)$", result.stdout.strip())
-                if match:
-                    return match.group(1)
-        except Exception:
-            pass
+        key = [file_fingerprint(path) for path in sorted(bin_dir.iterdir())]
+        version = memoize_on_disk("pilot-version", key, lambda: _probe_pilot_version(pilot_path))
+        if version:
+            return version
     return __version__
 
 
@@ -1004,3 +1004,110 @@ class TestResolveRepoUrl:
         result = step._resolve_repo_url("v5.0.0")
 
         assert result == "https://github.com/maxritter/pilot-shell"
+
+
+def _hooks_config(*commands: str) -> dict:
+    return {
+        "hooks": {"PostToolUse": [{"matcher": "Write", "hooks": [{"type": "command", "command": c} for c in commands]}]}
+    }
+
+
+class TestHookRuntime:
+    """Test install-time hook interpreter resolution and command rewriting."""
+
+    def test_rewrite_hook_commands_uses_fast_flags(self):
+        """uv run python commands are pointed at the resolved interpreter with -S -E."""
+        from installer.steps.claude_files import rewrite_hook_commands
+
+        config = _hooks_config(
+            'uv run python "${CLAUDE_PLUGIN_ROOT}/hooks/file_checker.py"',
+            'bun "${CLAUDE_PLUGIN_ROOT}/scripts/worker-service.cjs" hook claude-code context',
+        )
+
+        assert rewrite_hook_commands(config, "/opt/py 3/bin/python3") == 1
+
+        hooks = config["hooks"]["PostToolUse"][0]["hooks"]
+        assert hooks[0]["command"] == "'/opt/py 3/bin/python3' -S -E \"${CLAUDE_PLUGIN_ROOT}/hooks/file_checker.py\""
+        assert hooks[1]["command"].startswith("bun ")
+
+    def test_resolve_hook_python_prefers_uv_choice(self):
+        """The interpreter uv would use is preferred over PATH lookups."""
+        import sys
+
+        from installer.steps.claude_files import resolve_hook_python
+
+        uv_result = type("R", (), {"returncode": 0, "stdout": sys.executable + "\n"})()
+        with (
+            patch(
+                "installer.steps.claude_files.shutil.which", side_effect=lambda n: "/usr/bin/uv" if n == "uv" else None
+            ),
+            patch(
+                "installer.steps.claude_files.subprocess.run",
+                side_effect=[uv_result, type("R", (), {"returncode": 0})()],
+            ),
+        ):
+            assert resolve_hook_python() == str(Path(sys.executable).resolve())
+
+    def test_resolve_hook_python_returns_none_without_interpreter(self):
+        """No usable interpreter leaves hook commands unchanged."""
+        from installer.steps.claude_files import resolve_hook_python
+
+        with patch("installer.steps.claude_files.shutil.which", return_value=None):
+            assert resolve_hook_python() is None
+
+    def test_precompile_and_measure_with_real_interpreter(self, tmp_path: Path):
+        """Hooks are byte-compiled and the helper import is timed with the fast flags."""
+        import sys
+
+        from installer.steps.claude_files import measure_hook_startup, precompile_hooks
+
+        (tmp_path / "_util.py").write_text("VALUE = 1\n")
+
+        assert precompile_hooks(sys.executable, tmp_path) is True
+        assert list((tmp_path / "__pycache__").glob("_util.*.pyc"))
+        startup = measure_hook_startup(sys.executable, tmp_path, runs=1)
+        assert startup is not None and startup > 0
+
+    def test_measure_returns_none_when_helpers_fail_to_import(self, tmp_path: Path):
+        """A broken hook helper module fails verification."""
+        import sys
+
+        from installer.steps.claude_files import measure_hook_startup
+
+        (tmp_path / "_util.py").write_text("raise ImportError('boom')\n")
+
+        assert measure_hook_startup(sys.executable, tmp_path, runs=1) is None
+
+    def test_update_hooks_config_rewrites_when_verified(self, tmp_path: Path):
+        """hooks.json commands are rewritten after precompile and startup check succeed."""
+        import sys
+
+        from installer.steps.claude_files import ClaudeFilesStep
+
+        hooks_dir = tmp_path / "hooks"
+        hooks_dir.mkdir()
+        (hooks_dir / "_util.py").write_text("")
+        (hooks_dir / "hooks.json").write_text(json.dumps(_hooks_config('uv run python "x/file_checker.py"')))
+
+        with patch("installer.steps.claude_files.resolve_hook_python", return_value=sys.executable):
+            ClaudeFilesStep().update_hooks_config(tmp_path)
+
+        command = json.loads((hooks_dir / "hooks.json").read_text())["hooks"]["PostToolUse"][0]["hooks"][0]["command"]
+        assert command.endswith(' -S -E "x/file_checker.py"')
+
+    def test_update_hooks_config_keeps_uv_when_verification_fails(self, tmp_path: Path):
+        """Commands keep using uv run python if the hook helpers do not import."""
+        import sys
+
+        from installer.steps.claude_files import ClaudeFilesStep
+
+        hooks_dir = tmp_path / "hooks"
+        hooks_dir.mkdir()
+        (hooks_dir / "_util.py").write_text("import does_not_exist\n")
+        (hooks_dir / "hooks.json").write_text(json.dumps(_hooks_config('uv run python "x/file_checker.py"')))
+
+        with patch("installer.steps.claude_files.resolve_hook_python", return_value=sys.executable):
+            ClaudeFilesStep().update_hooks_config(tmp_path)
+
+        command = json.loads((hooks_dir / "hooks.json").read_text())["hooks"]["PostToolUse"][0]["hooks"][0]["command"]
+        assert command == 'uv run python "x/file_checker.py"'
@@ -0,0 +1,144 @@
+"""Tests for launch profiling spans and on-disk memoization."""
+
+from __future__ import annotations
+
+import io
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _clean_spans():
+    from installer.profiling import reset_spans
+
+    reset_spans()
+    yield
+    reset_spans()
+
+
+class TestSpans:
+    """Test span recording and rendering."""
+
+    def test_spans_not_recorded_when_disabled(self):
+        """Without PILOT_PROFILE_LAUNCH nothing is recorded."""
+        from installer.profiling import get_root_spans, span
+
+        with patch.dict(os.environ, {}, clear=True):
+            with span("outer"):
+                pass
+
+        assert get_root_spans() == []
+
+    def test_nested_spans_form_tree(self):
+        """Nested spans become children of the enclosing span."""
+        from installer.profiling import get_root_spans, span
+
+        with patch.dict(os.environ, {"PILOT_PROFILE_LAUNCH": "1"}):
+            with span("launch"):
+                with span("settings"):
+                    pass
+                with span("banner"):
+                    pass
+
+        roots = get_root_spans()
+        assert [r.name for r in roots] == ["launch"]
+        assert [c.name for c in roots[0].children] == ["settings", "banner"]
+        assert roots[0].duration >= roots[0].children[0].duration
+
+    def test_emit_prints_tree_to_stream(self):
+        """emit_span_tree writes names and millisecond timings."""
+        from installer.profiling import emit_span_tree, span
+
+        stream = io.StringIO()
+        with patch.dict(os.environ, {"PILOT_PROFILE_LAUNCH": "1"}):
+            with span("launch"):
+                with span("model_config"):
+                    pass
+            emit_span_tree(stream)
+
+        output = stream.getvalue()
+        assert "launch" in output
+        assert "  model_config" in output
+        assert " ms" in output
+
+    def test_span_closes_on_exception(self):
+        """Exceptions still close the span and propagate."""
+        from installer.profiling import get_root_spans, span
+
+        with patch.dict(os.environ, {"PILOT_PROFILE_LAUNCH": "1"}):
+            with pytest.raises(ValueError):
+                with span("failing"):
+                    raise ValueError("boom")
+            with span("next"):
+                pass
+
+        assert [r.name for r in get_root_spans()] == ["failing", "next"]
+
+
+class TestMemoizeOnDisk:
+    """Test on-disk memoization."""
+
+    def test_hit_skips_compute(self, tmp_path: Path):
+        """Same key returns the stored value without recomputing."""
+        from installer.profiling import memoize_on_disk
+
+        compute = MagicMock(return_value="2.1.0")
+        with patch("installer.profiling.Path.home", return_value=tmp_path):
+            assert memoize_on_disk("claude-version", ["a", 1], compute) == "2.1.0"
+            assert memoize_on_disk("claude-version", ["a", 1], compute) == "2.1.0"
+
+        compute.assert_called_once()
+
+    def test_changed_key_recomputes(self, tmp_path: Path):
+        """Different key inputs invalidate the memo."""
+        from installer.profiling import memoize_on_disk
+
+        with patch("installer.profiling.Path.home", return_value=tmp_path):
+            memoize_on_disk("claude-version", ["a", 1], lambda: "2.1.0")
+            assert memoize_on_disk("claude-version", ["a", 2], lambda: "2.2.0") == "2.2.0"
+
+    def test_none_not_stored(self, tmp_path: Path):
+        """None results are retried on the next call."""
+        from installer.profiling import memoize_on_disk
+
+        compute = MagicMock(side_effect=[None, "ok"])
+        with patch("installer.profiling.Path.home", return_value=tmp_path):
+            assert memoize_on_disk("probe", ["k"], compute) is None
+            assert memoize_on_disk("probe", ["k"], compute) == "ok"
+
+    def test_file_fingerprint_changes_with_mtime(self, tmp_path: Path):
+        """Touching a binary changes its fingerprint."""
+        from installer.profiling import file_fingerprint
+
+        binary = tmp_path / "claude"
+        binary.write_text("v1")
+        before = file_fingerprint(binary)
+        os.utime(binary, ns=(1, 1))
+
+        assert file_fingerprint(binary) != before
+        assert file_fingerprint(None) == [None]
+
+
+class TestMemoizedClaudeVersion:
+    """Test Claude version detection memoized by binary mtime."""
+
+    @patch("installer.steps.dependencies.subprocess.run")
+    def test_claude_version_probed_once_per_binary(self, mock_run, tmp_path: Path):
+        """claude --version runs only once while the binary is unchanged."""
+        from installer.steps.dependencies import _get_installed_claude_version
+
+        binary = tmp_path / "claude"
+        binary.write_text("#!/bin/sh")
+        mock_run.return_value = MagicMock(returncode=0, stdout="2.1.0 (Claude Code)\n")
+
+        with (
+            patch("installer.profiling.Path.home", return_value=tmp_path),
+            patch("installer.steps.dependencies.shutil.which", return_value=str(binary)),
+        ):
+            assert _get_installed_claude_version() == "2.1.0 (Claude Code)"
+            assert _get_installed_claude_version() == "2.1.0 (Claude Code)"
+
+        mock_run.assert_called_once()
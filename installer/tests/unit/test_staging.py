@@ -0,0 +1,262 @@
+"""Tests for staged release download and apply."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+def _fake_download_asset(url: str, dest_path: Path) -> bool:
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    dest_path.write_bytes(b"binary:" + url.encode())
+    return True
+
+
+def _fake_download_parallel(file_infos, dest_paths, config, max_workers=8):
+    for file_info, dest_path in zip(file_infos, dest_paths):
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        dest_path.write_text(f"content of {file_info.path}")
+    return [True] * len(file_infos)
+
+
+def _tree_files(tmp_path: Path) -> list:
+    from installer.downloads import FileInfo, compute_git_blob_sha
+
+    infos = []
+    for rel in ("pilot/hooks/hooks.json", "pilot/settings.json"):
+        probe = tmp_path / "probe" / rel
+        probe.parent.mkdir(parents=True, exist_ok=True)
+        probe.write_text(f"content of {rel}")
+        infos.append(FileInfo(path=rel, sha=compute_git_blob_sha(probe)))
+    return infos
+
+
+class TestReleaseTag:
+    """Test version to tag mapping."""
+
+    def test_release_version_prefixed(self):
+        """Release versions map to v-prefixed tags."""
+        from installer.staging import release_tag
+
+        assert release_tag("7.1.0") == "v7.1.0"
+
+    def test_dev_version_verbatim(self):
+        """Dev builds keep their tag."""
+        from installer.staging import release_tag
+
+        assert release_tag("dev-abc1234-20260124") == "dev-abc1234-20260124"
+
+
+class TestStageRelease:
+    """Test staging a release into ~/.pilot/staged/<version>/."""
+
+    @patch("installer.staging.get_platform_suffix", return_value="linux-x86_64")
+    @patch("installer.staging.download_files_parallel", side_effect=_fake_download_parallel)
+    @patch("installer.staging._download_asset", side_effect=_fake_download_asset)
+    @patch("installer.staging.get_repo_files")
+    def test_stages_verified_release(self, mock_files, _asset, _parallel, _suffix, tmp_path: Path):
+        """Binary and plugin files are staged with a manifest after verification."""
+        from installer.staging import get_local_so_name, is_staged, stage_release
+
+        mock_files.return_value = _tree_files(tmp_path)
+        with patch("installer.staging.Path.home", return_value=tmp_path):
+            staged_dir = stage_release("7.1.0")
+
+            assert is_staged("7.1.0")
+            assert staged_dir == tmp_path / ".pilot" / "staged" / "7.1.0"
+            assert (staged_dir / "bin" / "pilot").exists()
+            assert (staged_dir / "bin" / get_local_so_name()).exists()
+            assert (staged_dir / "repo" / "pilot" / "settings.json").exists()
+            manifest = json.loads((staged_dir / "staged.json").read_text())
+            assert manifest["tag"] == "v7.1.0"
+            assert len(manifest["files"]) == 2
+
+    @patch("installer.staging.get_platform_suffix", return_value="linux-x86_64")
+    @patch("installer.staging.download_files_parallel")
+    @patch("installer.staging._download_asset", side_effect=_fake_download_asset)
+    @patch("installer.staging.get_repo_files")
+    def test_sha_mismatch_leaves_nothing_staged(self, mock_files, _asset, mock_parallel, _suffix, tmp_path: Path):
+        """Corrupted plugin files fail verification and no staged dir remains."""
+        from installer.staging import StagingError, get_staged_root, is_staged, stage_release
+
+        mock_files.return_value = _tree_files(tmp_path)
+
+        def corrupt(file_infos, dest_paths, config, max_workers=8):
+            for dest_path in dest_paths:
+                dest_path.parent.mkdir(parents=True, exist_ok=True)
+                dest_path.write_text("tampered")
+            return [True] * len(file_infos)
+
+        mock_parallel.side_effect = corrupt
+        with patch("installer.staging.Path.home", return_value=tmp_path):
+            with pytest.raises(StagingError):
+                stage_release("7.1.0")
+
+            assert not is_staged("7.1.0")
+            assert list(get_staged_root().iterdir()) == []
+
+    @patch("installer.staging.get_platform_suffix", return_value="linux-x86_64")
+    @patch("installer.staging._download_asset", return_value=False)
+    def test_binary_download_failure_raises(self, _asset, _suffix, tmp_path: Path):
+        """Failed binary download raises StagingError."""
+        from installer.staging import StagingError, stage_release
+
+        with patch("installer.staging.Path.home", return_value=tmp_path):
+            with pytest.raises(StagingError):
+                stage_release("7.1.0")
+
+    @patch("installer.staging._download_asset")
+    def test_already_staged_is_noop(self, mock_asset, tmp_path: Path):
+        """An already staged version is not downloaded again."""
+        from installer.staging import stage_release
+
+        staged = tmp_path / ".pilot" / "staged" / "7.1.0"
+        staged.mkdir(parents=True)
+        (staged / "staged.json").write_text(json.dumps({"version": "7.1.0"}))
+        with patch("installer.staging.Path.home", return_value=tmp_path):
+            assert stage_release("7.1.0") == staged
+
+        mock_asset.assert_not_called()
+
+
+class TestApplyStagedRelease:
+    """Test applying a staged release offline."""
+
+    def test_swaps_bin_and_runs_local_claude_files_step(self, tmp_path: Path):
+        """Binary dir is replaced and plugin install uses the staged files."""
+        from installer.staging import apply_staged_release
+
+        staged = tmp_path / ".pilot" / "staged" / "7.1.0"
+        (staged / "bin").mkdir(parents=True)
+        (staged / "bin" / "pilot").write_text("new")
+        (staged / "repo" / "pilot").mkdir(parents=True)
+        (staged / "staged.json").write_text(json.dumps({"version": "7.1.0"}))
+        old_bin = tmp_path / ".pilot" / "bin"
+        old_bin.mkdir(parents=True)
+        (old_bin / "pilot").write_text("old")
+        (old_bin / "stale.so").write_text("old")
+
+        with (
+            patch("installer.staging.Path.home", return_value=tmp_path),
+            patch("installer.staging.ClaudeFilesStep") as mock_step_cls,
+        ):
+            apply_staged_release("7.1.0", tmp_path)
+
+        assert old_bin.is_symlink()
+        assert (old_bin / "pilot").read_text() == "new"
+        assert not (old_bin / "stale.so").exists()
+        step = mock_step_cls.return_value
+        ctx = step.run.call_args[0][0]
+        assert ctx.local_mode is True
+        assert ctx.local_repo_dir == staged / "repo"
+        step.update_hooks_config.assert_called_once_with(tmp_path / ".claude" / "pilot", None)
+        assert staged.exists()
+
+    def test_switching_bin_replaces_symlink_and_prunes_old_copies(self, tmp_path: Path):
+        """A second switch repoints the bin symlink and drops the previous copy."""
+        from installer.staging import _switch_bin_directory
+
+        for version in ("7.1.0", "7.2.0"):
+            (tmp_path / version).mkdir()
+            (tmp_path / version / "pilot").write_text(version)
+
+        with (
+            patch("installer.staging.Path.home", return_value=tmp_path),
+            patch("installer.staging.os.getpid", return_value=1),
+        ):
+            _switch_bin_directory(tmp_path / "7.1.0", "7.1.0")
+            _switch_bin_directory(tmp_path / "7.2.0", "7.2.0")
+
+        bin_dir = tmp_path / ".pilot" / "bin"
+        assert (bin_dir / "pilot").read_text() == "7.2.0"
+        assert [p.name for p in (tmp_path / ".pilot" / "bin-versions").iterdir()] == ["7.2.0.1"]
+
+    def test_prunes_other_completed_versions_only(self, tmp_path: Path):
+        """Applying keeps the applied version and in-flight partial downloads."""
+        from installer.staging import prune_staged
+
+        root = tmp_path / ".pilot" / "staged"
+        for version in ("7.0.9", "7.1.0"):
+            (root / version).mkdir(parents=True)
+            (root / version / "staged.json").write_text(json.dumps({"version": version}))
+        in_flight = root / "7.2.0.partial-12345"
+        abandoned = root / "7.2.0.partial-99999"
+        in_flight.mkdir()
+        abandoned.mkdir()
+
+        with (
+            patch("installer.staging.Path.home", return_value=tmp_path),
+            patch("installer.staging._is_process_alive", side_effect=lambda pid: pid == 12345),
+        ):
+            prune_staged(keep="7.1.0")
+
+        assert sorted(p.name for p in root.iterdir()) == ["7.1.0", "7.2.0.partial-12345"]
+
+    def test_unstaged_version_raises(self, tmp_path: Path):
+        """Applying a version that is not staged raises StagingError."""
+        from installer.staging import StagingError, apply_staged_release
+
+        with patch("installer.staging.Path.home", return_value=tmp_path):
+            with pytest.raises(StagingError):
+                apply_staged_release("7.1.0", tmp_path)
+
+
+class TestApplyStagedCommand:
+    """Test the apply-staged CLI command."""
+
+    @patch("installer.cli.is_staged", return_value=False)
+    def test_returns_error_when_nothing_staged(self, _is_staged):
+        """apply-staged fails cleanly without a staged release."""
+        from installer.cli import cmd_apply_staged, create_parser
+
+        args = create_parser().parse_args(["apply-staged", "--target-version", "7.1.0", "-q"])
+
+        assert cmd_apply_staged(args) == 1
+
+    @patch("installer.cli.apply_staged_release")
+    @patch("installer.cli.is_staged", return_value=True)
+    def test_applies_staged_version(self, _is_staged, mock_apply):
+        """apply-staged applies the requested version."""
+        from installer.cli import cmd_apply_staged, create_parser
+
+        args = create_parser().parse_args(["apply-staged", "--target-version", "7.1.0", "-q"])
+
+        assert cmd_apply_staged(args) == 0
+        assert mock_apply.call_args[0][0] == "7.1.0"
+
+    @patch("installer.cli.stage_release")
+    @patch("installer.updates.refresh_release_cache")
+    def test_refresh_stages_newer_release(self, _refresh, mock_stage, tmp_path: Path):
+        """Background refresh stages the newer release it found."""
+        from installer.cli import cmd_check_update, create_parser
+        from installer.updates import save_release_cache
+
+        cache_path = tmp_path / "release.json"
+        save_release_cache(cache_path, {"version": "7.1.0"})
+        args = create_parser().parse_args(
+            ["check-update", "--refresh", "--current-version", "7.0.6", "--cache-path", str(cache_path)]
+        )
+
+        assert cmd_check_update(args) == 0
+        mock_stage.assert_called_once_with("7.1.0")
+
+    @patch("installer.cli.stage_release", side_effect=OSError("disk full"))
+    @patch("installer.updates.refresh_release_cache")
+    def test_failed_staging_clears_check_timestamp(self, _refresh, _stage, tmp_path: Path):
+        """A failed staging is retried after the failure backoff, not the full cache TTL."""
+        from installer.cli import cmd_check_update, create_parser
+        from installer.updates import FAILURE_RETRY_SECONDS, is_cache_fresh, load_release_cache, save_release_cache
+
+        cache_path = tmp_path / "release.json"
+        save_release_cache(cache_path, {"version": "7.1.0", "checked_at": 1000.0})
+        args = create_parser().parse_args(
+            ["check-update", "--refresh", "--current-version", "7.0.6", "--cache-path", str(cache_path)]
+        )
+
+        assert cmd_check_update(args) == 0
+        cache = load_release_cache(cache_path)
+        assert "checked_at" not in cache
+        assert not is_cache_fresh(cache, now=cache["failed_at"] + FAILURE_RETRY_SECONDS + 1)
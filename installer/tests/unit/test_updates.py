@@ -0,0 +1,263 @@
+"""Tests for release metadata cache and background update checks."""
+
+from __future__ import annotations
+
+import io
+import json
+import time
+import urllib.error
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+
+def _mock_response(payload: dict, etag: str = '"abc"') -> MagicMock:
+    response = MagicMock()
+    response.read.return_value = json.dumps(payload).encode()
+    response.headers = {"ETag": etag}
+    response.__enter__.return_value = response
+    return response
+
+
+class TestVersionComparison:
+    """Test version parsing and comparison."""
+
+    def test_newer_version_detected(self):
+        """Higher semantic version is newer."""
+        from installer.updates import is_newer_version
+
+        assert is_newer_version("7.1.0", "7.0.6") is True
+        assert is_newer_version("v7.0.10", "7.0.9") is True
+
+    def test_same_or_older_version_not_newer(self):
+        """Equal and older versions are not newer."""
+        from installer.updates import is_newer_version
+
+        assert is_newer_version("7.0.6", "7.0.6") is False
+        assert is_newer_version("6.9.0", "7.0.6") is False
+
+    def test_dev_versions_never_newer(self):
+        """Dev builds cannot be compared and are never reported as outdated."""
+        from installer.updates import is_newer_version
+
+        assert is_newer_version("7.1.0", "dev-abc1234-20260124") is False
+        assert is_newer_version("dev-abc1234-20260124", "7.0.6") is False
+
+
+class TestCacheFreshness:
+    """Test TTL handling."""
+
+    def test_recent_check_is_fresh(self):
+        """Cache checked within TTL is fresh."""
+        from installer.updates import is_cache_fresh
+
+        assert is_cache_fresh({"checked_at": time.time() - 10}) is True
+
+    def test_expired_check_is_stale(self):
+        """Cache older than TTL is stale."""
+        from installer.updates import RELEASE_CACHE_TTL, is_cache_fresh
+
+        assert is_cache_fresh({"checked_at": time.time() - RELEASE_CACHE_TTL - 1}) is False
+
+    def test_recent_failure_suppresses_retry(self):
+        """A recent failed refresh counts as fresh (offline laptops)."""
+        from installer.updates import is_cache_fresh
+
+        assert is_cache_fresh({"failed_at": time.time() - 10}) is True
+
+    def test_empty_cache_is_stale(self):
+        """Missing metadata is stale."""
+        from installer.updates import is_cache_fresh
+
+        assert is_cache_fresh({}) is False
+
+
+class TestRefreshReleaseCache:
+    """Test conditional refresh of release metadata."""
+
+    @patch("installer.updates.urllib.request.urlopen")
+    def test_refresh_writes_release_metadata(self, mock_urlopen, tmp_path: Path):
+        """Successful fetch stores version, notes and ETag."""
+        from installer.updates import load_release_cache, refresh_release_cache
+
+        cache_path = tmp_path / "release.json"
+        mock_urlopen.return_value = _mock_response({"tag_name": "v7.1.0", "body": "Notes"}, etag='"e1"')
+
+        refresh_release_cache(cache_path, force=True)
+
+        cache = load_release_cache(cache_path)
+        assert cache["version"] == "7.1.0"
+        assert cache["notes"] == "Notes"
+        assert cache["etag"] == '"e1"'
+
+    @patch("installer.updates.urllib.request.urlopen")
+    def test_refresh_sends_if_none_match_and_handles_304(self, mock_urlopen, tmp_path: Path):
+        """Cached ETag is sent and a 304 keeps metadata while bumping checked_at."""
+        from installer.updates import load_release_cache, refresh_release_cache, save_release_cache
+
+        cache_path = tmp_path / "release.json"
+        save_release_cache(cache_path, {"version": "7.1.0", "etag": '"e1"', "checked_at": 0})
+        mock_urlopen.side_effect = urllib.error.HTTPError("url", 304, "Not Modified", {}, io.BytesIO())  # type: ignore[arg-type]
+
+        refresh_release_cache(cache_path)
+
+        request = mock_urlopen.call_args[0][0]
+        assert request.get_header("If-none-match") == '"e1"'
+        cache = load_release_cache(cache_path)
+        assert cache["version"] == "7.1.0"
+        assert cache["checked_at"] > 0
+
+    @patch("installer.updates.urllib.request.urlopen")
+    def test_refresh_records_failure_without_raising(self, mock_urlopen, tmp_path: Path):
+        """Network errors are recorded as failed_at and keep old metadata."""
+        from installer.updates import load_release_cache, refresh_release_cache, save_release_cache
+
+        cache_path = tmp_path / "release.json"
+        save_release_cache(cache_path, {"version": "7.0.9", "checked_at": 0})
+        mock_urlopen.side_effect = urllib.error.URLError("offline")
+
+        refresh_release_cache(cache_path)
+
+        cache = load_release_cache(cache_path)
+        assert cache["version"] == "7.0.9"
+        assert "failed_at" in cache
+
+    @patch("installer.updates.urllib.request.urlopen")
+    def test_fresh_cache_skips_network(self, mock_urlopen, tmp_path: Path):
+        """Fresh cache is returned without a request."""
+        from installer.updates import refresh_release_cache, save_release_cache
+
+        cache_path = tmp_path / "release.json"
+        save_release_cache(cache_path, {"version": "7.0.9", "checked_at": time.time()})
+
+        refresh_release_cache(cache_path)
+
+        mock_urlopen.assert_not_called()
+
+
+class TestCachedUpdate:
+    """Test the cache-only launch path."""
+
+    def test_returns_newer_release(self, tmp_path: Path):
+        """Newer cached version is reported."""
+        from installer.updates import get_cached_update, save_release_cache
+
+        cache_path = tmp_path / "release.json"
+        save_release_cache(cache_path, {"version": "7.1.0", "notes": "n"})
+
+        update = get_cached_update("7.0.6", cache_path)
+
+        assert update is not None
+        assert update["version"] == "7.1.0"
+
+    def test_returns_none_when_up_to_date(self, tmp_path: Path):
+        """Same version is not reported."""
+        from installer.updates import get_cached_update, save_release_cache
+
+        cache_path = tmp_path / "release.json"
+        save_release_cache(cache_path, {"version": "7.0.6"})
+
+        assert get_cached_update("7.0.6", cache_path) is None
+
+    def test_returns_none_without_cache(self, tmp_path: Path):
+        """Missing cache means no known update."""
+        from installer.updates import get_cached_update
+
+        assert get_cached_update("7.0.6", tmp_path / "missing.json") is None
+
+
+class TestBackgroundRefresh:
+    """Test detached refresh spawning."""
+
+    @patch("installer.updates.subprocess.Popen")
+    def test_spawns_detached_process_when_stale(self, mock_popen, tmp_path: Path):
+        """Stale cache spawns a detached refresh process."""
+        from installer.updates import spawn_background_refresh
+
+        cache_path = tmp_path / "release.json"
+
+        assert spawn_background_refresh(cache_path) is True
+        kwargs = mock_popen.call_args[1]
+        assert kwargs["start_new_session"] is True
+        assert "--refresh" in mock_popen.call_args[0][0]
+
+    @patch("installer.updates.subprocess.Popen")
+    def test_does_not_spawn_when_fresh(self, mock_popen, tmp_path: Path):
+        """Fresh cache does not spawn anything."""
+        from installer.updates import save_release_cache, spawn_background_refresh
+
+        cache_path = tmp_path / "release.json"
+        save_release_cache(cache_path, {"version": "7.0.6", "checked_at": time.time()})
+
+        assert spawn_background_refresh(cache_path) is False
+        mock_popen.assert_not_called()
+
+    @patch("installer.updates.subprocess.Popen")
+    def test_does_not_spawn_while_refresh_running(self, mock_popen, tmp_path: Path):
+        """A held refresh lock prevents duplicate background jobs."""
+        from installer.updates import spawn_background_refresh
+
+        cache_path = tmp_path / "release.json"
+        cache_path.with_suffix(".lock").write_text("123")
+
+        assert spawn_background_refresh(cache_path) is False
+        mock_popen.assert_not_called()
+
+    @patch("installer.updates.refresh_release_cache")
+    def test_refresh_job_releases_lock(self, mock_refresh, tmp_path: Path):
+        """Background job removes its lock when done."""
+        from installer.updates import run_refresh_job
+
+        cache_path = tmp_path / "release.json"
+        lock_path = cache_path.with_suffix(".lock")
+        lock_path.write_text("123")
+        mock_refresh.return_value = {}
+
+        run_refresh_job(cache_path)
+
+        assert not lock_path.exists()
+
+    @patch("installer.updates.refresh_release_cache", return_value={})
+    def test_refresh_with_current_version_holds_lock_through_staging(self, _refresh, tmp_path: Path):
+        """check-update --refresh --current-version keeps the lock until stage_release returns."""
+        from installer.cli import cmd_check_update, create_parser
+        from installer.updates import save_release_cache
+
+        cache_path = tmp_path / "release.json"
+        lock_path = cache_path.with_suffix(".lock")
+        lock_path.write_text("123")
+        save_release_cache(cache_path, {"version": "9.0.0"})
+        lock_held_during_stage: list[bool] = []
+        args = create_parser().parse_args(
+            ["check-update", "--refresh", "--current-version", "7.0.6", "--cache-path", str(cache_path)]
+        )
+
+        with patch(
+            "installer.cli.stage_release", side_effect=lambda _v: lock_held_during_stage.append(lock_path.exists())
+        ):
+            assert cmd_check_update(args) == 0
+
+        assert lock_held_during_stage == [True]
+        assert not lock_path.exists()
+
+
+class TestCheckUpdateCommand:
+    """Test the check-update CLI command."""
+
+    @patch("installer.cli.spawn_background_refresh")
+    def test_json_output_reports_cached_update(self, mock_spawn, tmp_path: Path, capsys):
+        """check-update --json prints cached update without network access."""
+        from installer.cli import cmd_check_update, create_parser
+        from installer.updates import save_release_cache
+
+        cache_path = tmp_path / "release.json"
+        save_release_cache(cache_path, {"version": "9.0.0", "notes": "Big release"})
+        args = create_parser().parse_args(
+            ["check-update", "--json", "--current-version", "7.0.6", "--cache-path", str(cache_path)]
+        )
+
+        assert cmd_check_update(args) == 0
+
+        output = json.loads(capsys.readouterr().out)
+        assert output["update_available"] is True
+        assert output["version"] == "9.0.0"
+        mock_spawn.assert_called_once()
@@ -0,0 +1,239 @@
+"""Release metadata cache for non-blocking update checks.
+
+The launch path only reads the cached release metadata. Refreshing it is a
+network call, so it runs in a detached background process that uses a
+conditional request (ETag) and writes the result to ~/.pilot/cache/.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Callable
+
+from installer.downloads import _get_ssl_context
+
+RELEASES_API_URL = "https://api.github.com/repos/maxritter/pilot-shell/releases/latest"
+
+RELEASE_CACHE_TTL = 6 * 60 * 60
+FAILURE_RETRY_SECONDS = 15 * 60
+REFRESH_LOCK_STALE_SECONDS = 15 * 60
+REQUEST_TIMEOUT = 10.0
+
+
+def get_release_cache_path() -> Path:
+    """Get path to the release metadata cache file."""
+    return Path.home() / ".pilot" / "cache" / "release.json"
+
+
+def load_release_cache(cache_path: Path | None = None) -> dict:
+    """Load cached release metadata from disk."""
+    if cache_path is None:
+        cache_path = get_release_cache_path()
+    if not cache_path.exists():
+        return {}
+    try:
+        data = json.loads(cache_path.read_text())
+        return data if isinstance(data, dict) else {}
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+
+def save_release_cache(cache_path: Path | None, cache_data: dict) -> None:
+    """Atomically write release metadata to disk."""
+    if cache_path is None:
+        cache_path = get_release_cache_path()
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(cache_data, indent=2))
+    os.replace(tmp_path, cache_path)
+
+
+def is_cache_fresh(cache: dict, ttl: float = RELEASE_CACHE_TTL, now: float | None = None) -> bool:
+    """Check whether cached metadata is recent enough to skip a refresh.
+
+    A recent failed refresh also counts as fresh so offline machines do not
+    retry on every launch.
+    """
+    now = time.time() if now is None else now
+    checked_at = cache.get("checked_at")
+    if isinstance(checked_at, (int, float)) and now - checked_at < ttl:
+        return True
+    failed_at = cache.get("failed_at")
+    if isinstance(failed_at, (int, float)) and now - failed_at < FAILURE_RETRY_SECONDS:
+        return True
+    return False
+
+
+def parse_version(version: str) -> tuple[int, ...] | None:
+    """Parse a release version like 'v7.0.6' into a comparable tuple."""
+    match = re.fullmatch(r"v?(\d+(?:\.\d+)*)", version.strip())
+    if not match:
+        return None
+    return tuple(int(part) for part in match.group(1).split("."))
+
+
+def is_newer_version(candidate: str, current: str) -> bool:
+    """Check if candidate is a newer release than current.
+
+    Dev builds (e.g. dev-abc1234-20260124) are never considered outdated.
+    """
+    candidate_parts = parse_version(candidate)
+    current_parts = parse_version(current)
+    if candidate_parts is None or current_parts is None:
+        return False
+    return candidate_parts > current_parts
+
+
+def refresh_release_cache(cache_path: Path | None = None, force: bool = False) -> dict:
+    """Fetch the latest release metadata and update the cache.
+
+    Sends If-None-Match with the cached ETag so unchanged releases cost a
+    304 response. Network failures are recorded but never raised.
+    """
+    if cache_path is None:
+        cache_path = get_release_cache_path()
+    cache = load_release_cache(cache_path)
+    if not force and is_cache_fresh(cache):
+        return cache
+
+    request = urllib.request.Request(RELEASES_API_URL, headers={"Accept": "application/vnd.github+json"})
+    cached_etag = cache.get("etag")
+    if cached_etag and cache.get("version"):
+        request.add_header("If-None-Match", cached_etag)
+
+    now = time.time()
+    try:
+        with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT, context=_get_ssl_context()) as response:
+            data = json.loads(response.read().decode("utf-8"))
+            tag = data.get("tag_name", "")
+            cache = {
+                "version": tag.removeprefix("v"),
+                "tag": tag,
+                "notes": data.get("body") or "",
+                "url": data.get("html_url", ""),
+                "published_at": data.get("published_at", ""),
+                "etag": response.headers.get("ETag"),
+                "checked_at": now,
+            }
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and cache.get("version"):
+            cache["checked_at"] = now
+            cache.pop("failed_at", None)
+        else:
+            cache["failed_at"] = now
+    except (urllib.error.URLError, json.JSONDecodeError, OSError, TimeoutError):
+        cache["failed_at"] = now
+
+    try:
+        save_release_cache(cache_path, cache)
+    except OSError:
+        pass
+    return cache
+
+
+def mark_check_failed(cache_path: Path | None = None) -> None:
+    """Forget the last successful check so the next launch retries after the failure backoff."""
+    cache = load_release_cache(cache_path)
+    cache.pop("checked_at", None)
+    cache["failed_at"] = time.time()
+    try:
+        save_release_cache(cache_path, cache)
+    except OSError:
+        pass
+
+
+def get_cached_update(current_version: str, cache_path: Path | None = None) -> dict | None:
+    """Return cached release metadata if it is newer than current_version.
+
+    Never touches the network — safe to call on the launch critical path.
+    """
+    cache = load_release_cache(cache_path)
+    version = cache.get("version")
+    if not isinstance(version, str) or not is_newer_version(version, current_version):
+        return None
+    return cache
+
+
+def _acquire_refresh_lock(lock_path: Path) -> bool:
+    """Create the refresh lock file, replacing it if a previous job died."""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        if time.time() - lock_path.stat().st_mtime > REFRESH_LOCK_STALE_SECONDS:
+            lock_path.unlink(missing_ok=True)
+    except OSError:
+        pass
+    try:
+        fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except OSError:
+        return False
+    os.write(fd, str(os.getpid()).encode())
+    os.close(fd)
+    return True
+
+
+def spawn_background_refresh(cache_path: Path | None = None, current_version: str | None = None) -> bool:
+    """Start a detached process that refreshes the release cache.
+
+    When current_version is given, the process also stages a newer release
+    for instant upgrades. Returns True if a process was started, False if the
+    cache is fresh or another refresh is already running.
+    """
+    if cache_path is None:
+        cache_path = get_release_cache_path()
+    if is_cache_fresh(load_release_cache(cache_path)):
+        return False
+
+    lock_path = cache_path.with_suffix(".lock")
+    if not _acquire_refresh_lock(lock_path):
+        return False
+
+    package_root = str(Path(__file__).resolve().parent.parent)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH", "")]))
+    cmd = [sys.executable, "-m", "installer", "check-update", "--refresh", "--cache-path", str(cache_path)]
+    if current_version:
+        cmd.extend(["--current-version", current_version])
+    try:
+        subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            env=env,
+        )
+    except OSError:
+        lock_path.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def run_refresh_job(cache_path: Path | None = None, on_refreshed: Callable[[], None] | None = None) -> dict:
+    """Body of the background refresh process — refreshes then releases the lock.
+
+    on_refreshed (staging the newer release) runs before the lock is released,
+    so a second launch cannot start a concurrent refresh that stages the same
+    release.
+    """
+    if cache_path is None:
+        cache_path = get_release_cache_path()
+    lock_path = cache_path.with_suffix(".lock")
+    try:
+        cache = refresh_release_cache(cache_path, force=True)
+        if on_refreshed is not None:
+            try:
+                os.utime(lock_path)
+            except OSError:
+                pass
+            on_refreshed()
+        return cache
+    finally:
+        lock_path.unlink(missing_ok=True)
@@ -0,0 +1,330 @@
+"""Latency budgets for checker tools, with demotion of consistently slow tools.
+
+Every linter/formatter call made by the file checkers goes through
+run_tool(), which gives it a timeout derived from that tool's moving p95 in
+the current project and records how long it took. A tool whose p95 stays
+over TOOL_BUDGET_SECONDS (or that keeps timing out) is demoted for
+DEMOTION_SECONDS:
+
+- read-only tools (linters) are deferred: file_checker re-runs them in a
+  detached background process and reports the results on a later edit;
+- tools that rewrite the file (formatters) are skipped, since running them
+  in the background would race with the agent's next edit.
+
+Every demotion, skip and timeout is returned as a notice so the hook can
+surface it in additionalContext. Latency history lives in
+~/.pilot/cache/hook-budgets/<project-hash>.json; finish() replays this
+hook's runs onto the latest copy under a flock, so concurrent hooks do not
+drop each other's samples.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from _trace import traced_run
+from _util import _sessions_base, get_project_root
+
+TOOL_BUDGET_SECONDS = 5.0
+HOOK_BUDGET_SECONDS = 40.0
+MAX_TOOL_TIMEOUT = 30.0
+MIN_TOOL_TIMEOUT = 1.0
+DEFERRED_TIMEOUT = 120.0
+DEMOTION_SECONDS = 30 * 60
+WINDOW = 20
+MIN_SAMPLES = 5
+DEMOTE_MIN_OVERRUNS = 3
+DEMOTE_CONSECUTIVE_TIMEOUTS = 2
+
+DEFERRED_TOOLS_ENV = "PILOT_DEFERRED_TOOLS"
+
+_state: dict = {}
+
+
+def get_budget_dir() -> Path:
+    """Get the directory holding per-project tool latency history."""
+    return Path.home() / ".pilot" / "cache" / "hook-budgets"
+
+
+def get_deferred_dir() -> Path:
+    """Get the session directory holding results of background checker runs."""
+    session_id = os.environ.get("PILOT_SESSION_ID", "").strip() or "default"
+    return _sessions_base() / session_id / "deferred-checks"
+
+
+def _store_path(project: Path) -> Path:
+    digest = hashlib.sha1(str(project.resolve()).encode()).hexdigest()[:16]
+    return get_budget_dir() / f"{digest}.json"
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def _load_tools(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text())
+        tools = data.get("tools", {}) if isinstance(data, dict) else {}
+    except (OSError, json.JSONDecodeError):
+        tools = {}
+    return tools if isinstance(tools, dict) else {}
+
+
+def start(project: Path | None = None, hook_budget: float = HOOK_BUDGET_SECONDS) -> None:
+    """Begin a hook invocation: load the project's latency history and start the hook deadline."""
+    path = _store_path(project or get_project_root())
+    tools = _load_tools(path)
+    deferred_env = os.environ.get(DEFERRED_TOOLS_ENV, "").strip()
+    _state.clear()
+    _state.update(
+        path=path,
+        tools=tools,
+        deadline=time.monotonic() + hook_budget,
+        deferred_only=set(deferred_env.split(",")) if deferred_env else None,
+        deferred=[],
+        notices=[],
+        touched=set(),
+        runs=[],
+    )
+
+
+def finish() -> tuple[list[str], list[str]]:
+    """End a hook invocation: persist latency history, return (notices, deferred tool names)."""
+    if not _state:
+        return [], []
+    if _state["touched"]:
+        _merge_history(_state["path"], _state["touched"], _state["runs"])
+    notices, deferred = _state["notices"], _state["deferred"]
+    _state.clear()
+    return notices, deferred
+
+
+def _merge_history(path: Path, touched: set[str], runs: list[tuple[str, float, bool]]) -> None:
+    """Replay this hook's runs onto the stored history under an exclusive lock and write it back."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path.with_suffix(".lock"), os.O_RDWR | os.O_CREAT, 0o600)
+    except OSError:
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        tools = _load_tools(path)
+        for name in touched:
+            _expire(_tool_stats(tools, name))
+        for name, seconds, timed_out in runs:
+            _apply_run(_tool_stats(tools, name), seconds, timed_out)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"tools": tools}))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _ensure_started() -> dict:
+    if not _state:
+        start()
+    return _state
+
+
+def _tool_stats(tools: dict, name: str) -> dict:
+    return tools.setdefault(name, {"samples": [], "timeouts": 0, "demoted_until": 0})
+
+
+def _stats(name: str) -> dict:
+    return _tool_stats(_state["tools"], name)
+
+
+def _expire(stats: dict) -> bool:
+    """Clear an expired demotion so the tool starts over with a clean window. Returns True if cleared."""
+    if not stats["demoted_until"] or stats["demoted_until"] > time.time():
+        return False
+    stats.update(samples=[], timeouts=0, demoted_until=0)
+    stats.pop("demoted_reason", None)
+    return True
+
+
+def is_demoted(name: str) -> bool:
+    """Check whether a tool is currently demoted; expired demotions start over with a clean window."""
+    _ensure_started()
+    stats = _stats(name)
+    if _expire(stats):
+        _state["touched"].add(name)
+    return bool(stats["demoted_until"])
+
+
+def tool_timeout(name: str) -> float:
+    """Get the timeout for the next run of a tool: 3x its p95, clamped, and within the hook deadline."""
+    _ensure_started()
+    samples = _stats(name)["samples"]
+    if len(samples) < MIN_SAMPLES:
+        timeout = MAX_TOOL_TIMEOUT
+    else:
+        timeout = min(max(3 * percentile(samples, 95), TOOL_BUDGET_SECONDS), MAX_TOOL_TIMEOUT)
+    return min(timeout, _state["deadline"] - time.monotonic())
+
+
+def _demotion_reason(stats: dict) -> str:
+    """Explain why a tool's history calls for demotion, or "" if it does not."""
+    if stats["timeouts"] >= DEMOTE_CONSECUTIVE_TIMEOUTS:
+        return f"timed out {stats['timeouts']} times in a row"
+    samples = stats["samples"]
+    if len(samples) < MIN_SAMPLES:
+        return ""
+    p95 = percentile(samples, 95)
+    overruns = sum(1 for s in samples if s > TOOL_BUDGET_SECONDS)
+    if p95 > TOOL_BUDGET_SECONDS and overruns >= DEMOTE_MIN_OVERRUNS:
+        return f"p95 {p95:.1f}s is over the {TOOL_BUDGET_SECONDS:.0f}s budget"
+    return ""
+
+
+def _apply_run(stats: dict, seconds: float, timed_out: bool) -> str:
+    """Add a run to a tool's history. Returns the reason if this run demoted the tool, else ""."""
+    stats["samples"] = [*stats["samples"], seconds][-WINDOW:]
+    stats["timeouts"] = stats["timeouts"] + 1 if timed_out else 0
+    if stats["demoted_until"]:
+        return ""
+    reason = _demotion_reason(stats)
+    if reason:
+        stats["demoted_until"] = time.time() + DEMOTION_SECONDS
+        stats["demoted_reason"] = reason
+    return reason
+
+
+def _record(name: str, seconds: float, timed_out: bool = False) -> None:
+    seconds = round(seconds, 3)
+    reason = _apply_run(_stats(name), seconds, timed_out)
+    _state["touched"].add(name)
+    _state["runs"].append((name, seconds, timed_out))
+    if reason:
+        _state["notices"].append(f"{name} demoted for {DEMOTION_SECONDS // 60} min: {reason} in this project")
+
+
+def _skip(name: str, mutates: bool, why: str) -> None:
+    if mutates:
+        _state["notices"].append(f"{name} skipped ({why}); run it manually before finishing")
+    else:
+        _state["deferred"].append(name)
+        _state["notices"].append(f"{name} deferred to a background run ({why}); results follow on a later edit")
+
+
+def run_tool(name: str, cmd: list[str], *, mutates: bool = False, **kwargs) -> subprocess.CompletedProcess | None:
+    """Run a checker tool under its latency budget.
+
+    Returns None when the tool was skipped, deferred or timed out, so callers
+    treat it like a tool that produced no findings.
+    """
+    state = _ensure_started()
+    if state["deferred_only"] is not None:
+        if name not in state["deferred_only"]:
+            return None
+        timeout = DEFERRED_TIMEOUT
+    elif is_demoted(name):
+        stats = _stats(name)
+        _skip(name, mutates, stats.get("demoted_reason") or f"p95 {percentile(stats['samples'] or [0.0], 95):.1f}s")
+        return None
+    else:
+        timeout = tool_timeout(name)
+        if timeout < MIN_TOOL_TIMEOUT:
+            _skip(name, mutates, "hook time budget used up")
+            return None
+
+    began = time.perf_counter()
+    try:
+        result = traced_run(cmd, timeout=timeout, check=False, **kwargs)
+    except subprocess.TimeoutExpired:
+        _record(name, timeout, timed_out=True)
+        state["notices"].append(f"{name} timed out after {timeout:.1f}s and was stopped")
+        return None
+    except OSError:
+        return None
+    _record(name, time.perf_counter() - began)
+    return result
+
+
+def _deferred_key(file_path: Path) -> str:
+    return hashlib.sha1(str(file_path.resolve()).encode()).hexdigest()[:16]
+
+
+def _content_hash(file_path: Path) -> str:
+    try:
+        return hashlib.sha1(file_path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+def spawn_deferred(hook_data: dict, file_path: Path, tools: list[str], script: Path) -> bool:
+    """Re-run a hook script detached with only the given tools enabled.
+
+    At most one background run per file is in flight; a newer request for the
+    same file is dropped until the running one finishes or goes stale.
+    """
+    deferred_dir = get_deferred_dir()
+    marker = deferred_dir / f"{_deferred_key(file_path)}.running"
+    try:
+        if time.time() - marker.stat().st_mtime < DEFERRED_TIMEOUT * 2:
+            return False
+    except OSError:
+        pass
+    try:
+        deferred_dir.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+        proc = subprocess.Popen(
+            [sys.executable, str(script)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env={**os.environ, DEFERRED_TOOLS_ENV: ",".join(sorted(set(tools)))},
+            start_new_session=True,
+        )
+        proc.stdin.write(json.dumps(hook_data).encode())
+        proc.stdin.close()
+    except OSError:
+        marker.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def write_deferred_result(file_path: Path, reason: str) -> None:
+    """Store the outcome of a background run, tagged with the file content it checked."""
+    deferred_dir = get_deferred_dir()
+    key = _deferred_key(file_path)
+    try:
+        deferred_dir.mkdir(parents=True, exist_ok=True)
+        tmp = deferred_dir / f"{key}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps({"file": str(file_path), "sha": _content_hash(file_path), "reason": reason}))
+        os.replace(tmp, deferred_dir / f"{key}.json")
+    except OSError:
+        pass
+    finally:
+        (deferred_dir / f"{key}.running").unlink(missing_ok=True)
+
+
+def collect_deferred_results() -> list[str]:
+    """Pop finished background results whose file is unchanged since it was checked."""
+    reasons = []
+    try:
+        entries = sorted(get_deferred_dir().glob("*.json"))
+    except OSError:
+        return []
+    for entry in entries:
+        try:
+            data = json.loads(entry.read_text())
+            entry.unlink()
+        except (OSError, json.JSONDecodeError):
+            continue
+        if data.get("reason") and data.get("sha") == _content_hash(Path(data.get("file", ""))):
+            reasons.append(f"Deferred check results (background run):\n{data['reason']}")
+    return reasons
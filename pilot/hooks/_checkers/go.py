@@ -2,15 +2,23 @@
 
 from __future__ import annotations
 
+import re
 import shutil
-import subprocess
 from pathlib import Path
 
+from _budget import run_tool
+from _diagnostics import split_new, unchanged_note
 from _util import check_file_length
 
+_GO_ISSUE = re.compile(r"^(?:vet: )?(.+?\.go):(\d+)(?::\d+)?: (.*)$")
+_LINTER = re.compile(r"\(([\w-]+)\)$")
 
-def check_go(file_path: Path) -> tuple[int, str]:
-    """Check Go file with gofmt, go vet, and golangci-lint. Returns (0, reason)."""
+
+def check_go(file_path: Path, lint: bool = True) -> tuple[int, str]:
+    """Check Go file with gofmt, go vet, and golangci-lint. Returns (0, reason).
+
+    With lint=False only gofmt runs; linting is left to the Stop-time batch pass.
+    """
     if file_path.name.endswith("_test.go"):
         return 0, ""
 
@@ -25,17 +33,22 @@ def check_go(file_path: Path) -> tuple[int, str]:
 
     if gofmt_bin:
         try:
-            subprocess.run([gofmt_bin, "-w", str(file_path)], capture_output=True, check=False)
+            run_tool("gofmt", [gofmt_bin, "-w", str(file_path)], mutates=True, capture_output=True)
         except Exception:
             pass
 
+    if not lint:
+        return 0, length_warning
+
     results: dict[str, tuple] = {}
     has_issues = False
+    ran = False
 
     try:
-        result = subprocess.run([go_bin, "vet", str(file_path)], capture_output=True, text=True, check=False)
-        output = result.stdout + result.stderr
-        if result.returncode != 0 or output.strip():
+        result = run_tool("go-vet", [go_bin, "vet", str(file_path)], capture_output=True, text=True)
+        ran = result is not None
+        output = result.stdout + result.stderr if result else ""
+        if result and result.returncode != 0 or output.strip():
             lines = [line.strip() for line in output.splitlines() if line.strip() and not line.strip().startswith("#")]
             if lines:
                 has_issues = True
@@ -45,11 +58,12 @@ def check_go(file_path: Path) -> tuple[int, str]:
 
     if golangci_lint_bin:
         try:
-            result = subprocess.run(
-                [golangci_lint_bin, "run", "--fast", str(file_path)], capture_output=True, text=True, check=False
+            result = run_tool(
+                "golangci-lint", [golangci_lint_bin, "run", "--fast", str(file_path)], capture_output=True, text=True
             )
-            output = result.stdout + result.stderr
-            if result.returncode != 0:
+            ran = ran or result is not None
+            if result and result.returncode != 0:
+                output = result.stdout + result.stderr
                 lines = [line.strip() for line in output.splitlines() if line.strip()]
                 issue_count = len([line for line in lines if ": " in line])
                 if issue_count > 0:
@@ -58,22 +72,63 @@ def check_go(file_path: Path) -> tuple[int, str]:
         except Exception:
             pass
 
-    if has_issues:
+    unchanged = _go_delta(file_path, results) if ran else 0
+    if has_issues and results:
         parts = []
         for tool_name, (count, _) in results.items():
             parts.append(f"{count} {tool_name}")
         reason = f"Go: {', '.join(parts)} in {file_path.name}"
-        details = _format_go_issues(file_path, results)
+        details = _format_go_issues(file_path, results, unchanged)
         if details:
             reason = f"{reason}\n{details}"
         if length_warning:
             reason = f"{reason}\n{length_warning}"
         return 0, reason
 
+    if unchanged:
+        reason = f"Go: {file_path.name} {unchanged_note(unchanged)}"
+        return 0, f"{reason}\n{length_warning}" if length_warning else reason
+
     return 0, length_warning
 
 
-def _format_go_issues(file_path: Path, results: dict[str, tuple]) -> str:
+def _go_delta(file_path: Path, results: dict[str, tuple], base: Path | None = None) -> int:
+    """Keep only go vet/golangci-lint issues not reported by the previous check; return the unchanged count.
+
+    Lines without a file:line location (golangci-lint source excerpts) stay
+    attached to the issue above them. Relative locations resolve against base
+    (default: cwd).
+    """
+    blocks: list[tuple[str, list[str]]] = []
+    for tool in ("vet", "lint"):
+        for line in results.get(tool, (0, []))[1]:
+            if _GO_ISSUE.match(line) or not blocks or blocks[-1][0] != tool:
+                blocks.append((tool, [line]))
+            else:
+                blocks[-1][1].append(line)
+
+    issues = []
+    for tool, lines in blocks:
+        match = _GO_ISSUE.match(lines[0])
+        if not match:
+            issues.append((tool, lines[0], "", 0))
+            continue
+        path, message = match.group(1), match.group(3)
+        linter = _LINTER.search(message)
+        issues.append((linter.group(1) if linter else tool, message, str((base or Path()) / path), int(match.group(2))))
+    is_new, unchanged = split_new(file_path, issues)
+
+    for tool in ("vet", "lint"):
+        lines = [line for (t, block), new in zip(blocks, is_new, strict=True) if t == tool and new for line in block]
+        count = len(lines) if tool == "vet" else len([line for line in lines if ": " in line])
+        if count:
+            results[tool] = (count, lines)
+        else:
+            results.pop(tool, None)
+    return unchanged
+
+
+def _format_go_issues(file_path: Path, results: dict[str, tuple], unchanged: int = 0) -> str:
     """Format Go diagnostic issues as plain text."""
     out: list[str] = []
     try:
@@ -99,6 +154,8 @@ def _format_go_issues(file_path: Path, results: dict[str, tuple]) -> str:
             out.append(f"  {line}")
         if len(lines) > 10:
             out.append(f"  ... and {len(lines) - 10} more lines")
+    if unchanged:
+        out.append(unchanged_note(unchanged))
 
     out.append("Fix Go issues above before continuing")
     return "\n".join(out)
@@ -4,14 +4,20 @@ from __future__ import annotations
 
 import re
 import shutil
-import subprocess
 from pathlib import Path
 
+from _budget import run_tool
+from _diagnostics import split_new, unchanged_note
 from _util import check_file_length
 
+_RUFF_ISSUE = re.compile(r"^(.+?):(\d+):\d+: ([A-Z]{1,3}\d+) (.*)$")
 
-def check_python(file_path: Path) -> tuple[int, str]:
-    """Check Python file with ruff. Returns (0, reason)."""
+
+def check_python(file_path: Path, lint: bool = True) -> tuple[int, str]:
+    """Check Python file with ruff. Returns (0, reason).
+
+    With lint=False only the fixers/formatter run; linting is left to the Stop-time batch pass.
+    """
     if "test_" in file_path.name or "spec" in file_path.name:
         return 0, ""
 
@@ -20,51 +26,75 @@ def check_python(file_path: Path) -> tuple[int, str]:
     ruff_bin = shutil.which("ruff")
     if ruff_bin:
         try:
-            subprocess.run(
-                [ruff_bin, "check", "--select", "I,RUF022", "--fix", str(file_path)], capture_output=True, check=False
+            run_tool(
+                "ruff-fix",
+                [ruff_bin, "check", "--select", "I,RUF022", "--fix", str(file_path)],
+                mutates=True,
+                capture_output=True,
             )
-            subprocess.run([ruff_bin, "format", str(file_path)], capture_output=True, check=False)
+            run_tool("ruff-format", [ruff_bin, "format", str(file_path)], mutates=True, capture_output=True)
         except Exception:
             pass
 
-    if not ruff_bin:
+    if not ruff_bin or not lint:
         return 0, length_warning
 
     results: dict[str, tuple] = {}
-    has_issues = False
 
     try:
-        result = subprocess.run(
-            [ruff_bin, "check", "--output-format=concise", str(file_path)],
-            capture_output=True,
-            text=True,
-            check=False,
+        result = run_tool(
+            "ruff-check", [ruff_bin, "check", "--output-format=concise", str(file_path)], capture_output=True, text=True
         )
+        if result is None:
+            return 0, length_warning
         output = result.stdout + result.stderr
         error_pattern = re.compile(r":\d+:\d+: [A-Z]{1,3}\d+")
         error_lines = [line for line in output.splitlines() if error_pattern.search(line)]
         if error_lines:
-            has_issues = True
             results["ruff"] = (len(error_lines), error_lines)
     except Exception:
         pass
 
-    if has_issues:
+    unchanged = _python_delta(file_path, results)
+    if results:
         parts = []
         for tool_name, (count, _) in results.items():
             parts.append(f"{count} {tool_name}")
         reason = f"Python: {', '.join(parts)} in {file_path.name}"
-        details = _format_python_issues(file_path, results)
+        details = _format_python_issues(file_path, results, unchanged)
         if details:
             reason = f"{reason}\n{details}"
         if length_warning:
             reason = f"{reason}\n{length_warning}"
         return 0, reason
 
+    if unchanged:
+        reason = f"Python: {file_path.name} {unchanged_note(unchanged)}"
+        return 0, f"{reason}\n{length_warning}" if length_warning else reason
+
     return 0, length_warning
 
 
-def _format_python_issues(file_path: Path, results: dict[str, tuple]) -> str:
+def _python_delta(file_path: Path, results: dict[str, tuple]) -> int:
+    """Keep only ruff issues not reported by the previous check of this file; return the unchanged count."""
+    _, error_lines = results.get("ruff", (0, []))
+    issues = []
+    for line in error_lines:
+        match = _RUFF_ISSUE.match(line)
+        issues.append(
+            (match.group(3), match.group(4), match.group(1), int(match.group(2))) if match else ("ruff", line, "", 0)
+        )
+    is_new, unchanged = split_new(file_path, issues)
+
+    new_lines = [line for line, new in zip(error_lines, is_new, strict=True) if new]
+    if new_lines:
+        results["ruff"] = (len(new_lines), new_lines)
+    else:
+        results.pop("ruff", None)
+    return unchanged
+
+
+def _format_python_issues(file_path: Path, results: dict[str, tuple], unchanged: int = 0) -> str:
     """Format Python diagnostic issues as plain text."""
     lines: list[str] = []
     try:
@@ -84,6 +114,8 @@ def _format_python_issues(file_path: Path, results: dict[str, tuple]) -> str:
                 msg = parts[1] if len(parts) > 1 else ""
                 msg = msg.replace("[*] ", "")
                 lines.append(f"  {code}: {msg}")
+    if unchanged:
+        lines.append(unchanged_note(unchanged))
 
     lines.append("Fix Python issues above before continuing")
     return "\n".join(lines)
@@ -5,10 +5,11 @@ from __future__ import annotations
 import json
 import os
 import shutil
-import subprocess
 import sys
 from pathlib import Path
 
+from _budget import run_tool
+from _diagnostics import split_new, unchanged_note
 from _util import BLUE, NC, check_file_length
 
 TS_EXTENSIONS = {".ts", ".tsx", ".js", ".jsx", ".mjs", ".mts"}
@@ -44,8 +45,11 @@ def find_tool(tool_name: str, project_root: Path | None) -> str | None:
     return shutil.which(tool_name)
 
 
-def check_typescript(file_path: Path) -> tuple[int, str]:
-    """Check TypeScript file with prettier and eslint. Returns (0, reason)."""
+def check_typescript(file_path: Path, lint: bool = True) -> tuple[int, str]:
+    """Check TypeScript file with prettier and eslint. Returns (0, reason).
+
+    With lint=False only prettier runs; linting is left to the Stop-time batch pass.
+    """
     if ".test." in file_path.name or ".spec." in file_path.name:
         return 0, ""
 
@@ -56,15 +60,19 @@ def check_typescript(file_path: Path) -> tuple[int, str]:
     prettier_bin = find_tool("prettier", project_root)
     if prettier_bin:
         try:
-            subprocess.run(
-                [prettier_bin, "--write", str(file_path)], capture_output=True, check=False, cwd=project_root
+            run_tool(
+                "prettier",
+                [prettier_bin, "--write", str(file_path)],
+                mutates=True,
+                capture_output=True,
+                cwd=project_root,
             )
         except Exception:
             pass
 
     eslint_bin = find_tool("eslint", project_root)
 
-    if not eslint_bin:
+    if not eslint_bin or not lint:
         return 0, length_warning
 
     results: dict[str, tuple] = {}
@@ -73,19 +81,24 @@ def check_typescript(file_path: Path) -> tuple[int, str]:
     if eslint_bin:
         has_issues, results = _run_eslint(eslint_bin, file_path, project_root, has_issues, results)
 
-    if has_issues:
+    unchanged = _typescript_delta(file_path, results) if "eslint" in results else 0
+    if results:
         parts = []
         if "eslint" in results:
             errs, warns, _ = results["eslint"]
             parts.append(f"{errs + warns} eslint")
         reason = f"TypeScript: {', '.join(parts)} in {file_path.name}"
-        details = _format_typescript_issues(file_path, results)
+        details = _format_typescript_issues(file_path, results, unchanged)
         if details:
             reason = f"{reason}\n{details}"
         if length_warning:
             reason = f"{reason}\n{length_warning}"
         return 0, reason
 
+    if unchanged:
+        reason = f"TypeScript: {file_path.name} {unchanged_note(unchanged)}"
+        return 0, f"{reason}\n{length_warning}" if length_warning else reason
+
     return 0, length_warning
 
 
@@ -96,22 +109,20 @@ def _run_eslint(
     has_issues: bool,
     results: dict[str, tuple],
 ) -> tuple[bool, dict[str, tuple]]:
-    """Run eslint and collect results."""
+    """Run eslint and collect results; results["eslint"] is set whenever eslint produced a report."""
     try:
-        result = subprocess.run(
-            [eslint_bin, "--format", "json", str(file_path)],
-            capture_output=True,
-            text=True,
-            check=False,
-            cwd=project_root,
+        result = run_tool(
+            "eslint", [eslint_bin, "--format", "json", str(file_path)], capture_output=True, text=True, cwd=project_root
         )
+        if result is None:
+            return has_issues, results
         try:
             data = json.loads(result.stdout)
             total_errors = sum(f.get("errorCount", 0) for f in data)
             total_warnings = sum(f.get("warningCount", 0) for f in data)
+            results["eslint"] = (total_errors, total_warnings, data)
             if total_errors > 0 or total_warnings > 0:
                 has_issues = True
-                results["eslint"] = (total_errors, total_warnings, data)
         except json.JSONDecodeError:
             pass
     except Exception:
@@ -119,7 +130,33 @@ def _run_eslint(
     return has_issues, results
 
 
-def _format_typescript_issues(file_path: Path, results: dict[str, tuple]) -> str:
+def _typescript_delta(file_path: Path, results: dict[str, tuple]) -> int:
+    """Keep only eslint messages not reported by the previous check of this file; return the unchanged count."""
+    _, _, data = results["eslint"]
+    issues = [
+        (msg.get("ruleId") or "eslint", msg.get("message", ""), file_result.get("filePath", ""), msg.get("line", 0))
+        for file_result in data
+        for msg in file_result.get("messages", [])
+    ]
+    flags, unchanged = split_new(file_path, issues)
+    is_new = iter(flags)
+
+    new_data, errors, warnings = [], 0, 0
+    for file_result in data:
+        messages = [msg for msg in file_result.get("messages", []) if next(is_new)]
+        file_errors = sum(1 for msg in messages if msg.get("severity", 0) == 2)
+        errors += file_errors
+        warnings += len(messages) - file_errors
+        new_data.append({**file_result, "messages": messages})
+
+    if errors or warnings:
+        results["eslint"] = (errors, warnings, new_data)
+    else:
+        results.pop("eslint")
+    return unchanged
+
+
+def _format_typescript_issues(file_path: Path, results: dict[str, tuple], unchanged: int = 0) -> str:
     """Format TypeScript diagnostic issues as plain text."""
     lines: list[str] = []
     try:
@@ -144,6 +181,8 @@ def _format_typescript_issues(file_path: Path, results: dict[str, tuple]) -> str
             if len(file_result.get("messages", [])) > 10:
                 remaining = len(file_result["messages"]) - 10
                 lines.append(f"  ... and {remaining} more issues")
+    if unchanged:
+        lines.append(unchanged_note(unchanged))
 
     lines.append("Fix TypeScript issues above before continuing")
     return "\n".join(lines)
@@ -0,0 +1,167 @@
+"""Context growth forecasting for context_monitor.
+
+Each unthrottled context check appends a (timestamp, tool, raw context %,
+calls) sample to a per-session ring buffer; calls is the number of tool calls
+since the previous sample, counting the ones the throttle skipped. The growth
+over the last RATE_WINDOW samples gives a rate per tool call and per minute,
+from which forecast() predicts how many calls (and minutes) remain before
+compaction. The monitor uses the forecast to size its throttle window and to
+warn early when a session is burning context fast.
+
+State lives in the session store as context-forecast.json, which the
+statusline (or anything else) can read for the current forecast:
+
+    {"samples": [[ts, tool, pct, calls], ...], "skipped": 0, "warned": false,
+     "forecast": {"pct": ..., "pct_per_call": ..., "pct_per_minute": ...,
+                  "calls_until_compaction": ..., "minutes_until_compaction": ...,
+                  "heaviest_tool": ..., "ts": ...}}
+
+Throttled calls only append one byte to a sibling context-skips file, so
+the cheap path stays a single append; collect_skips() folds that count into
+the state at the next sample.
+
+A drop of COMPACTION_DROP_PCT or more, or a gap longer than
+MAX_SAMPLE_GAP_SECONDS, restarts the buffer: the old rate no longer applies.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from pathlib import Path
+
+from _util import _sessions_base
+
+FORECAST_FILE = "context-forecast.json"
+SKIPS_FILE = "context-skips"
+MAX_SAMPLES = 20
+RATE_WINDOW = 8
+MIN_SAMPLES = 3
+COMPACTION_DROP_PCT = 10
+MAX_SAMPLE_GAP_SECONDS = 600
+
+THROTTLE_SECONDS = 30
+THROTTLE_MIN_SECONDS = 5
+THROTTLE_MAX_SECONDS = 120
+URGENT_CALLS = 5
+
+
+def get_forecast_path() -> Path:
+    """Get the session-scoped forecast state path."""
+    session_id = os.environ.get("PILOT_SESSION_ID", "").strip() or "default"
+    return _sessions_base() / session_id / FORECAST_FILE
+
+
+def load_state() -> dict:
+    """Load the sample buffer and last forecast, or an empty state."""
+    try:
+        state = json.loads(get_forecast_path().read_text())
+        if isinstance(state, dict) and isinstance(state.get("samples"), list):
+            return state
+    except (OSError, json.JSONDecodeError):
+        pass
+    return {"samples": [], "skipped": 0, "warned": False, "forecast": None}
+
+
+def save_state(state: dict) -> None:
+    """Write the forecast state atomically."""
+    path = get_forecast_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def record_skip() -> None:
+    """Count a tool call whose context check was throttled, with a single append."""
+    try:
+        fd = os.open(get_forecast_path().with_name(SKIPS_FILE), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    except OSError:
+        return
+    try:
+        os.write(fd, b".")
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def collect_skips(state: dict) -> None:
+    """Move the throttled-call count recorded since the last sample into state["skipped"]."""
+    path = get_forecast_path().with_name(SKIPS_FILE)
+    claimed = path.with_name(f"{SKIPS_FILE}.{os.getpid()}")
+    try:
+        os.replace(path, claimed)
+        count = claimed.stat().st_size
+        claimed.unlink()
+    except OSError:
+        return
+    state["skipped"] = int(state.get("skipped", 0)) + count
+
+
+def add_sample(state: dict, ts: float, tool: str, pct: float) -> None:
+    """Append a sample, restarting the buffer after compaction or a long pause."""
+    samples = state["samples"]
+    if samples and (pct <= samples[-1][2] - COMPACTION_DROP_PCT or ts - samples[-1][0] > MAX_SAMPLE_GAP_SECONDS):
+        samples.clear()
+        state["warned"] = False
+    samples.append([ts, tool, pct, int(state.get("skipped", 0)) + 1])
+    del samples[:-MAX_SAMPLES]
+    state["skipped"] = 0
+
+
+def forecast(samples: list, compaction_pct: float) -> dict | None:
+    """Predict calls and minutes until compaction from the recent growth rate; None with too few samples."""
+    window = samples[-RATE_WINDOW:]
+    if len(window) < MIN_SAMPLES:
+        return None
+    ts, _, pct, _ = window[-1]
+    growth = pct - window[0][2]
+    calls = sum(sample[3] for sample in window[1:])
+    seconds = ts - window[0][0]
+    per_call = growth / calls if growth > 0 and calls > 0 else 0.0
+    per_minute = growth / seconds * 60 if growth > 0 and seconds > 0 else 0.0
+    remaining = max(compaction_pct - pct, 0.0)
+
+    tool_growth: dict[str, float] = {}
+    for previous, sample in zip(window, window[1:]):
+        if sample[3] == 1 and sample[2] > previous[2]:
+            tool_growth[sample[1]] = tool_growth.get(sample[1], 0.0) + sample[2] - previous[2]
+
+    return {
+        "ts": ts,
+        "pct": pct,
+        "pct_per_call": round(per_call, 2),
+        "pct_per_minute": round(per_minute, 2),
+        "calls_until_compaction": math.ceil(remaining / per_call) if per_call else None,
+        "minutes_until_compaction": round(remaining / per_minute, 1) if per_minute else None,
+        "heaviest_tool": max(tool_growth, key=tool_growth.__getitem__) if tool_growth else None,
+    }
+
+
+def throttle_seconds(prediction: dict | None, pct: float, thresholds: list[float]) -> float:
+    """Size the throttle window so the next threshold crossing is not skipped.
+
+    Without a forecast or any measured growth the fixed THROTTLE_SECONDS
+    applies, so one large call after a flat stretch is still seen quickly. Close to compaction
+    (URGENT_CALLS or fewer calls left) nothing is throttled; otherwise the
+    window is a quarter of the predicted time to the next threshold, clamped
+    to [THROTTLE_MIN_SECONDS, THROTTLE_MAX_SECONDS].
+    """
+    if prediction is None:
+        return THROTTLE_SECONDS
+    calls = prediction["calls_until_compaction"]
+    if calls is not None and calls <= URGENT_CALLS:
+        return 0
+    per_minute = prediction["pct_per_minute"]
+    if not per_minute:
+        return THROTTLE_SECONDS
+    upcoming = [threshold for threshold in thresholds if threshold > pct]
+    if not upcoming:
+        return 0
+    seconds = (min(upcoming) - pct) / per_minute * 60
+    return max(THROTTLE_MIN_SECONDS, min(THROTTLE_MAX_SECONDS, seconds / 4))
@@ -1,14 +1,12 @@
 """Send notifications to the Console dashboard via HTTP API.
 
-Fire-and-forget — silently ignores all errors.
+Fire-and-forget — notifications are queued in the local outbox and delivered
+by a detached drainer, so callers never wait on the worker.
 """
 
 from __future__ import annotations
 
-import json
-import urllib.request
-
-CONSOLE_URL = "http://localhost:41777"
+from _outbox import enqueue, spawn_drain
 
 
 def send_dashboard_notification(
@@ -17,16 +15,12 @@ def send_dashboard_notification(
     message: str,
     plan_path: str | None = None,
 ) -> bool:
-    """POST a notification to the Console API. Returns True on success."""
-    url = f"{CONSOLE_URL}/api/notifications"
+    """Queue a notification for the Console API. Returns True once it is durably queued."""
     payload: dict[str, str] = {"type": type, "title": title, "message": message}
     if plan_path:
         payload["planPath"] = plan_path
 
-    data = json.dumps(payload).encode()
-    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"}, method="POST")
-    try:
-        resp = urllib.request.urlopen(req, timeout=3)
-        return resp.status == 201
-    except Exception:
+    if enqueue("/api/notifications", payload) is None:
         return False
+    spawn_drain()
+    return True
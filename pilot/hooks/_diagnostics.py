@@ -0,0 +1,105 @@
+"""Per-session diagnostic fingerprints, so checkers report only what changed.
+
+A fingerprint is rule + normalized message + the text of the line the issue
+points at. Line numbers are deliberately left out, so an untouched issue
+keeps its fingerprint when code above it moves; editing the flagged line
+changes the fingerprint and the issue is reported again.
+
+Each check of a file compares its issues with the fingerprints stored by the
+previous check of that file, then replaces them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from pathlib import Path
+
+from _util import _sessions_base
+
+_DIGITS = re.compile(r"\d+")
+_SPACE = re.compile(r"\s+")
+
+
+def get_diagnostics_dir() -> Path:
+    """Get the session directory holding per-file diagnostic fingerprints."""
+    session_id = os.environ.get("PILOT_SESSION_ID", "").strip() or "default"
+    return _sessions_base() / session_id / "diagnostics"
+
+
+def _store_path(file_path: Path) -> Path:
+    digest = hashlib.sha1(str(file_path.resolve()).encode()).hexdigest()[:16]
+    return get_diagnostics_dir() / f"{digest}.json"
+
+
+def normalize_message(message: str) -> str:
+    """Strip fix markers, numbers and spacing differences from a message."""
+    message = message.replace("[*] ", "")
+    return _SPACE.sub(" ", _DIGITS.sub("#", message)).strip()
+
+
+def fingerprint(rule: str, message: str, anchor: str) -> str:
+    """Fingerprint one issue from its rule, message and anchor line text."""
+    key = "\0".join((rule, normalize_message(message), _SPACE.sub(" ", anchor).strip()))
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def _anchor(lines_by_path: dict[str, list[str]], path: str, line: int) -> str:
+    if path not in lines_by_path:
+        try:
+            lines_by_path[path] = Path(path).read_text(errors="replace").splitlines()
+        except OSError:
+            lines_by_path[path] = []
+    lines = lines_by_path[path]
+    return lines[line - 1] if 0 < line <= len(lines) else ""
+
+
+def split_new(file_path: Path, issues: list[tuple[str, str, str, int]]) -> tuple[list[bool], int]:
+    """Compare issues with the previous check of file_path and remember them for the next one.
+
+    Args:
+        file_path: File (or package directory) the check ran on; keys the store.
+        issues: One (rule, message, path, line) per issue, where path/line
+            locate the anchor line (relative paths resolve against cwd).
+
+    Returns:
+        (is_new per issue, number of unchanged issues). Duplicate issues are
+        matched one-for-one, so a second copy of an existing issue is new.
+    """
+    store = _store_path(file_path)
+    try:
+        previous = Counter(json.loads(store.read_text()).get("fingerprints", []))
+    except (OSError, json.JSONDecodeError, AttributeError):
+        previous = Counter()
+
+    lines_by_path: dict[str, list[str]] = {}
+    prints = [fingerprint(rule, message, _anchor(lines_by_path, path, line)) for rule, message, path, line in issues]
+
+    is_new = []
+    for fp in prints:
+        if previous[fp] > 0:
+            previous[fp] -= 1
+            is_new.append(False)
+        else:
+            is_new.append(True)
+
+    try:
+        if prints:
+            store.parent.mkdir(parents=True, exist_ok=True)
+            tmp = store.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"file": str(file_path), "fingerprints": prints}))
+            os.replace(tmp, store)
+        else:
+            store.unlink(missing_ok=True)
+    except OSError:
+        pass
+    return is_new, is_new.count(False)
+
+
+def unchanged_note(unchanged: int) -> str:
+    """One-line summary of issues left out because they were already reported."""
+    plural = "issue" if unchanged == 1 else "issues"
+    return f"({unchanged} unchanged {plural} from the previous check not repeated)"
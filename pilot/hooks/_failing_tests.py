@@ -0,0 +1,205 @@
+"""Failing-test index across pytest, vitest/jest and go test.
+
+Test runners leave their last results on disk:
+- pytest: .pytest_cache/v/cache/lastfailed
+- vitest: its results cache under node_modules/.vite/vitest/ (or the older
+  node_modules/.vitest/)
+- jest/vitest JSON reporter (--json / --reporter=json) and `go test -json`
+  output saved to one of REPORT_NAMES
+
+Reports are looked for in every directory from the edited file up to the repo
+root. Each report's failing tests are parsed once and cached, keyed by the
+report's mtime and size, in ~/.pilot/cache/failing-tests/<repo-hash>.json, so
+a check costs a few stats and one small JSON read.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from _util import find_git_root
+
+INDEX_VERSION = 1
+MAX_WALK_UP = 10
+PYTEST_CACHE = ".pytest_cache/v/cache/lastfailed"
+VITEST_CACHES = ("node_modules/.vite/vitest", "node_modules/.vitest")
+REPORT_NAMES = (
+    "test-results.json",
+    "jest-results.json",
+    "vitest-results.json",
+    "go-test.json",
+    "go-test-results.json",
+)
+
+_JS_TEST_SUFFIX = re.compile(r"\.(test|spec)\.[cm]?[jt]sx?$")
+_GO_MODULE = re.compile(r"^module\s+(\S+)", re.MULTILINE)
+_CAMEL_BOUNDARY = re.compile(r"([a-z0-9])([A-Z])")
+
+
+def get_index_dir() -> Path:
+    """Get the directory holding per-repo failing-test indexes."""
+    return Path.home() / ".pilot" / "cache" / "failing-tests"
+
+
+def _search_dirs(start: Path) -> tuple[Path, list[Path]]:
+    """Return (index root, directories from start up to it)."""
+    root = find_git_root(start)
+    dirs = []
+    current = start
+    for _ in range(MAX_WALK_UP):
+        dirs.append(current)
+        if current == root or current.parent == current:
+            break
+        current = current.parent
+    return root or dirs[-1], dirs
+
+
+def _report_files(directory: Path) -> list[tuple[str, Path]]:
+    """List (kind, path) for the test reports present in directory."""
+    reports = []
+    pytest_cache = directory / PYTEST_CACHE
+    if pytest_cache.is_file():
+        reports.append(("pytest", pytest_cache))
+    for cache_dir in VITEST_CACHES:
+        base = directory / cache_dir
+        if base.is_dir():
+            reports += [("vitest", p) for p in (base / "results.json", *base.glob("*/results.json")) if p.is_file()]
+    reports += [("report", directory / name) for name in REPORT_NAMES if (directory / name).is_file()]
+    return reports
+
+
+def _parse_pytest(text: str, base: Path) -> tuple[list[str], list[str]]:
+    lastfailed = json.loads(text)
+    return sorted({str(base / node.split("::")[0]) for node in lastfailed}), []
+
+
+def _parse_vitest_cache(text: str, base: Path) -> tuple[list[str], list[str]]:
+    results = json.loads(text).get("results", {})
+    entries = results.items() if isinstance(results, dict) else results
+    files = set()
+    for key, result in entries:
+        if not isinstance(result, dict) or not result.get("failed"):
+            continue
+        if not key.startswith("/"):
+            key = key.split(":", 1)[-1]
+        files.add(str(base / key))
+    return sorted(files), []
+
+
+def _parse_go_json(text: str) -> list[str]:
+    """Get packages with a failing test or build from `go test -json` output."""
+    outcomes: dict[tuple[str, str], str] = {}
+    for line in text.splitlines():
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(event, dict) and event.get("Action") in ("pass", "fail", "skip") and event.get("Package"):
+            outcomes[(event["Package"], event.get("Test", ""))] = event["Action"]
+    return sorted({package for (package, _), action in outcomes.items() if action == "fail"})
+
+
+def _parse_report(text: str, base: Path) -> tuple[list[str], list[str]]:
+    """Parse a jest/vitest JSON report or `go test -json` output, told apart by content."""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return [], _parse_go_json(text)
+    if isinstance(data, dict) and isinstance(data.get("testResults"), list):
+        files = {
+            str(base / (result.get("name") or result.get("testFilePath") or ""))
+            for result in data["testResults"]
+            if isinstance(result, dict) and result.get("status") == "failed"
+        }
+        return sorted(files), []
+    return [], _parse_go_json(text)
+
+
+def _parse(kind: str, path: Path, base: Path) -> tuple[list[str], list[str]]:
+    """Return (failing test file paths, failing Go package import paths) from one report."""
+    try:
+        text = path.read_text(errors="replace")
+        if kind == "pytest":
+            return _parse_pytest(text, base)
+        if kind == "vitest":
+            return _parse_vitest_cache(text, base)
+        return _parse_report(text, base)
+    except (OSError, json.JSONDecodeError, AttributeError, TypeError, ValueError):
+        return [], []
+
+
+def load_failing(root: Path, dirs: list[Path]) -> tuple[set[str], set[str]]:
+    """Get failing test files and Go packages from the reports in dirs, cached per repo root."""
+    index_path = get_index_dir() / f"{hashlib.sha1(str(root).encode()).hexdigest()[:16]}.json"
+    try:
+        data = json.loads(index_path.read_text())
+        cached = data["sources"] if data.get("version") == INDEX_VERSION else {}
+    except (OSError, json.JSONDecodeError, KeyError, TypeError):
+        cached = {}
+
+    files: set[str] = set()
+    packages: set[str] = set()
+    changed = False
+    for directory in dirs:
+        for kind, path in _report_files(directory):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            key = str(path)
+            entry = cached.get(key)
+            if not entry or entry["sig"] != [st.st_mtime_ns, st.st_size]:
+                failing_files, failing_packages = _parse(kind, path, directory)
+                entry = {"sig": [st.st_mtime_ns, st.st_size], "files": failing_files, "packages": failing_packages}
+                cached[key] = entry
+                changed = True
+            files.update(entry["files"])
+            packages.update(entry["packages"])
+
+    if changed:
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = index_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"version": INDEX_VERSION, "root": str(root), "sources": cached}))
+            os.replace(tmp, index_path)
+        except OSError:
+            pass
+    return files, packages
+
+
+def _go_package(impl: Path, dirs: list[Path]) -> str | None:
+    for directory in dirs:
+        try:
+            match = _GO_MODULE.search((directory / "go.mod").read_text())
+        except OSError:
+            continue
+        if not match:
+            return None
+        rel = impl.parent.relative_to(directory).as_posix()
+        return match.group(1) if rel == "." else f"{match.group(1)}/{rel}"
+    return None
+
+
+def has_failing_test_for(impl_file: str) -> bool:
+    """Check whether a currently failing test targets the module in impl_file.
+
+    Python: a failing test_<module>.py or <module>_test.py. TS/JS: a failing
+    <module>.test.* or .spec.* (also kebab-case). Go: a failing test or build
+    in the file's own package.
+    """
+    impl = Path(impl_file).resolve()
+    root, dirs = _search_dirs(impl.parent)
+    files, packages = load_failing(root, dirs)
+    if impl.suffix == ".go":
+        return bool(packages) and _go_package(impl, dirs) in packages
+
+    stem = impl.stem
+    if impl.suffix == ".py":
+        names = {f"test_{stem}.py", f"{stem}_test.py"}
+        return any(Path(f).name in names for f in files)
+    kebab = _CAMEL_BOUNDARY.sub(r"\1-\2", stem).lower()
+    return any(_JS_TEST_SUFFIX.sub("", Path(f).name) in (stem, kebab) for f in files)
@@ -0,0 +1,79 @@
+"""Git work tree discovery read straight from disk.
+
+Finds the enclosing work tree by walking up to a `.git` entry — a directory
+for normal clones, a `gitdir:` file for linked worktrees and submodules —
+without spawning git. Results are memoized for the life of the hook process.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+
+
+def _read_gitdir_file(dot_git: Path) -> Path | None:
+    """Resolve the `gitdir:` pointer in a worktree or submodule `.git` file."""
+    try:
+        content = dot_git.read_text().strip()
+    except OSError:
+        return None
+    if not content.startswith("gitdir:"):
+        return None
+    git_dir = Path(content[len("gitdir:") :].strip())
+    if not git_dir.is_absolute():
+        git_dir = dot_git.parent / git_dir
+    return git_dir.resolve()
+
+
+def _resolve_git_dir(dot_git: Path) -> Path | None:
+    """Return the git directory a `.git` entry stands for, if it looks valid."""
+    git_dir = dot_git if dot_git.is_dir() else _read_gitdir_file(dot_git)
+    if git_dir is None or not (git_dir / "HEAD").is_file():
+        return None
+    return git_dir
+
+
+@lru_cache(maxsize=64)
+def _find_repo(start: Path) -> tuple[Path, Path] | None:
+    """Walk up from start to the nearest work tree. Returns (root, git_dir)."""
+    for directory in (start, *start.parents):
+        dot_git = directory / ".git"
+        if os.path.lexists(dot_git):
+            git_dir = _resolve_git_dir(dot_git)
+            if git_dir is not None:
+                return directory, git_dir
+    return None
+
+
+def _start_dir(start: Path | None) -> Path:
+    """Normalize a start path to an absolute directory."""
+    path = Path(start).resolve() if start is not None else Path.cwd().resolve()
+    return path if path.is_dir() else path.parent
+
+
+def _find_git_root_subprocess(start: Path) -> Path | None:
+    """Ask git for the work tree root (used when GIT_DIR/GIT_WORK_TREE override discovery)."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"],
+            capture_output=True,
+            text=True,
+            check=False,
+            cwd=start,
+        )
+        if result.returncode == 0:
+            return Path(result.stdout.strip())
+    except Exception:
+        pass
+    return None
+
+
+def find_git_root(start: Path | None = None) -> Path | None:
+    """Find the root of the work tree containing start (default: cwd)."""
+    directory = _start_dir(start)
+    if os.environ.get("GIT_DIR") or os.environ.get("GIT_WORK_TREE"):
+        return _find_git_root_subprocess(directory)
+    repo = _find_repo(directory)
+    return repo[0] if repo else None
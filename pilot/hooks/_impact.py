@@ -0,0 +1,295 @@
+"""Background targeted test runs for edited files.
+
+Opt-in via "impactTests": true in ~/.pilot/config.json (or PILOT_IMPACT_TESTS=1).
+After an edit, file_checker calls request_run(), which merges the edited
+file into the session's pending job and makes sure a detached worker
+(`python _impact.py <impact-dir>`) is running. The worker drains pending jobs
+one at a time: it updates the repo's import graph, selects the test files
+that transitively import the edited files, runs just those, and writes a
+result file. collect_results() pops finished results for the next hook to
+report through additionalContext.
+
+Edits made while a run is in progress coalesce into the next job, so a burst
+of edits costs one extra run, not one per edit.
+
+Usage: python _impact.py <impact-dir>
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from _import_graph import impacted_tests
+from _util import _read_config, _sessions_base
+
+RUN_TIMEOUT = 300
+MAX_TEST_FILES = 50
+OUTPUT_TAIL_LINES = 40
+COMMAND_LABEL_CHARS = 200
+PENDING_FILE = "pending.json"
+LOCK_FILE = "worker.lock"
+RESULT_PREFIX = "result-"
+
+
+def is_impact_enabled() -> bool:
+    """Check whether background targeted test runs are switched on."""
+    env = os.environ.get("PILOT_IMPACT_TESTS", "").strip().lower()
+    if env:
+        return env in ("1", "true", "on")
+    return _read_config().get("impactTests") is True
+
+
+def get_impact_dir() -> Path:
+    """Get the session directory holding pending jobs and results."""
+    session_id = os.environ.get("PILOT_SESSION_ID", "").strip() or "default"
+    return _sessions_base() / session_id / "impact"
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, path)
+
+
+def _worker_running(impact_dir: Path) -> bool:
+    try:
+        fd = os.open(impact_dir / LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o600)
+    except OSError:
+        return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return True
+    finally:
+        os.close(fd)
+    return False
+
+
+def request_run(root: Path, edited: Path, impact_dir: Path | None = None) -> bool:
+    """Queue a targeted test run for an edited file and start the worker if it is idle."""
+    impact_dir = impact_dir or get_impact_dir()
+    try:
+        rel = edited.resolve().relative_to(root.resolve()).as_posix()
+    except ValueError:
+        return False
+
+    pending_path = impact_dir / PENDING_FILE
+    try:
+        impact_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(impact_dir / f"{PENDING_FILE}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                job = json.loads(pending_path.read_text())
+            except (OSError, json.JSONDecodeError):
+                job = {}
+            if job.get("root") != str(root):
+                job = {"root": str(root), "edited": []}
+            if rel not in job["edited"]:
+                job["edited"].append(rel)
+            job["queued_at"] = time.time()
+            _write_json(pending_path, job)
+        finally:
+            os.close(fd)
+    except OSError:
+        return False
+
+    if _worker_running(impact_dir):
+        return True
+    try:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), str(impact_dir)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        return False
+    return True
+
+
+def _claim_pending(impact_dir: Path) -> dict | None:
+    pending_path = impact_dir / PENDING_FILE
+    claimed = impact_dir / f"running.{os.getpid()}.json"
+    fd = os.open(impact_dir / f"{PENDING_FILE}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        os.replace(pending_path, claimed)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    try:
+        return json.loads(claimed.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    finally:
+        claimed.unlink(missing_ok=True)
+
+
+def _python_runner(root: Path) -> list[str] | None:
+    for venv in (".venv", "venv"):
+        python = root / venv / "bin" / "python"
+        if python.exists():
+            return [str(python), "-m", "pytest"]
+    pytest_bin = shutil.which("pytest")
+    if pytest_bin:
+        return [pytest_bin]
+    uv_bin = shutil.which("uv")
+    if uv_bin and (root / "pyproject.toml").exists():
+        return [uv_bin, "run", "pytest"]
+    return None
+
+
+def _js_runner(project: Path) -> list[str] | None:
+    for name, args in (("vitest", ["run"]), ("jest", [])):
+        local = project / "node_modules" / ".bin" / name
+        if local.exists():
+            return [str(local), *args]
+    bun_bin = shutil.which("bun")
+    if bun_bin and ((project / "bun.lock").exists() or (project / "bun.lockb").exists()):
+        return [bun_bin, "test"]
+    return None
+
+
+def _nearest(start: Path, stop: Path, marker: str) -> Path | None:
+    current = start
+    while True:
+        if (current / marker).exists():
+            return current
+        if current == stop or current.parent == current:
+            return None
+        current = current.parent
+
+
+def test_commands(root: Path, tests: list[str]) -> list[tuple[list[str], Path]]:
+    """Build one (command, cwd) per test runner needed for the selected test files."""
+    py_tests = [t for t in tests if t.endswith(".py")]
+    go_dirs = sorted({os.path.dirname(t) for t in tests if t.endswith(".go")})
+    js_by_project: dict[Path, list[str]] = {}
+    for t in tests:
+        if not t.endswith((".py", ".go")):
+            project = _nearest((root / t).parent, root, "package.json")
+            if project:
+                js_by_project.setdefault(project, []).append(str(root / t))
+
+    commands = []
+    if py_tests:
+        runner = _python_runner(root)
+        if runner:
+            commands.append(([*runner, "-q", "-p", "no:cacheprovider", *py_tests], root))
+    for project, files in sorted(js_by_project.items()):
+        runner = _js_runner(project)
+        if runner:
+            commands.append(([*runner, *[os.path.relpath(f, project) for f in files]], project))
+    go_bin = shutil.which("go")
+    if go_bin:
+        for directory in go_dirs:
+            module_root = _nearest(root / directory, root, "go.mod")
+            if module_root:
+                package = "./" + os.path.relpath(root / directory, module_root).replace(os.sep, "/")
+                commands.append(([go_bin, "test", package], module_root))
+    return commands
+
+
+def run_job(job: dict) -> dict:
+    """Select and run the tests impacted by a job's edited files."""
+    root = Path(job["root"])
+    started = time.time()
+    tests = impacted_tests(root, job["edited"])
+    result = {"root": str(root), "edited": job["edited"], "tests": tests, "runs": [], "started": started}
+    if len(tests) > MAX_TEST_FILES:
+        result["skipped"] = f"{len(tests)} impacted test files exceed the limit of {MAX_TEST_FILES}"
+        return result
+
+    for cmd, cwd in test_commands(root, tests):
+        began = time.monotonic()
+        try:
+            proc = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=False, timeout=RUN_TIMEOUT)
+            code, output = proc.returncode, proc.stdout + proc.stderr
+        except subprocess.TimeoutExpired:
+            code, output = -1, f"timed out after {RUN_TIMEOUT}s"
+        except OSError as e:
+            code, output = -1, str(e)
+        result["runs"].append(
+            {
+                "command": " ".join([Path(cmd[0]).name, *cmd[1:]])[:COMMAND_LABEL_CHARS],
+                "exit_code": code,
+                "seconds": round(time.monotonic() - began, 1),
+                "tail": output.strip().splitlines()[-OUTPUT_TAIL_LINES:],
+            }
+        )
+    return result
+
+
+def run_worker(impact_dir: Path) -> None:
+    """Drain pending jobs; exits when none are left. Only one worker per session runs at a time."""
+    while True:
+        fd = os.open(impact_dir / LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return
+        try:
+            while (job := _claim_pending(impact_dir)) is not None:
+                result = run_job(job)
+                _write_json(impact_dir / f"{RESULT_PREFIX}{time.time_ns()}.json", result)
+        finally:
+            os.close(fd)
+        if not (impact_dir / PENDING_FILE).exists():
+            return
+
+
+def format_result(result: dict) -> str:
+    """Format one finished run as a short report."""
+    edited = ", ".join(Path(e).name for e in result["edited"])
+    if result.get("skipped"):
+        return f"Impacted tests for {edited}: not run ({result['skipped']})"
+    if not result["tests"]:
+        return f"Impacted tests for {edited}: no test file imports the edited code"
+    if not result["runs"]:
+        return (
+            f"Impacted tests for {edited}: {len(result['tests'])} test file(s) found, but no test runner is available"
+        )
+
+    failed = [run for run in result["runs"] if run["exit_code"] != 0]
+    seconds = sum(run["seconds"] for run in result["runs"])
+    if not failed:
+        return f"Impacted tests for {edited}: {len(result['tests'])} test file(s) passed in {seconds:.1f}s"
+    lines = [f"Impacted tests for {edited}: FAILED ({len(result['tests'])} test file(s), {seconds:.1f}s)"]
+    for run in failed:
+        lines.append(f"$ {run['command']} ... (exit {run['exit_code']})")
+        lines += [f"  {line}" for line in run["tail"]]
+    return "\n".join(lines)
+
+
+def collect_results(impact_dir: Path | None = None) -> list[str]:
+    """Pop finished results, oldest first, formatted for additionalContext."""
+    impact_dir = impact_dir or get_impact_dir()
+    reports = []
+    try:
+        entries = sorted(impact_dir.glob(f"{RESULT_PREFIX}*.json"))
+    except OSError:
+        return []
+    for entry in entries:
+        try:
+            result = json.loads(entry.read_text())
+            entry.unlink()
+        except (OSError, json.JSONDecodeError):
+            continue
+        reports.append(format_result(result))
+    return reports
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).parent))
+    run_worker(Path(sys.argv[1]))
@@ -0,0 +1,283 @@
+"""Per-repo import graph for Python, TypeScript/JavaScript and Go sources.
+
+The index maps every source file (repo-relative path) to the files it
+imports. It is cached in ~/.pilot/cache/import-graph/<repo-hash>.json and
+updated incrementally: a file is re-read only when its mtime or size
+changed, and re-parsed only when its content hash changed.
+
+Resolution is deliberately static:
+- Python: `import`/`from` statements via ast, matched against module paths
+  relative to the repo root or src/, then against unique dotted suffixes
+  (for tests that put a directory on sys.path); relative imports resolve
+  against the importing package.
+- TS/JS: relative specifiers in import/export/require/import() with the
+  usual extension and index-file fallbacks.
+- Go: import paths under the module declared in go.mod map to every
+  non-test file of that package; _test.go files also depend on their own
+  package's files.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+import re
+from collections import deque
+from pathlib import Path
+
+INDEX_VERSION = 1
+PY_EXTENSIONS = {".py"}
+TS_EXTENSIONS = {".ts", ".tsx", ".js", ".jsx", ".mjs", ".mts"}
+GO_EXTENSIONS = {".go"}
+SOURCE_EXTENSIONS = PY_EXTENSIONS | TS_EXTENSIONS | GO_EXTENSIONS
+SKIP_DIRS = {
+    ".git",
+    "node_modules",
+    ".venv",
+    "venv",
+    "__pycache__",
+    "dist",
+    "build",
+    ".next",
+    ".tox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    "vendor",
+    "coverage",
+}
+PYTHON_SOURCE_ROOTS = ("", "src/", "lib/")
+
+_TS_IMPORT = re.compile(
+    r"""(?:\bfrom\s*|\bimport\s*\(?\s*|\brequire\s*\(\s*|^\s*import\s+)['"]([^'"\n]+)['"]""", re.MULTILINE
+)
+_GO_IMPORT_BLOCK = re.compile(r"^import\s*\((.*?)^\)", re.MULTILINE | re.DOTALL)
+_GO_IMPORT_LINE = re.compile(r'^import\s+(?:[\w.]+\s+)?"([^"]+)"', re.MULTILINE)
+_GO_QUOTED = re.compile(r'"([^"]+)"')
+_GO_MODULE = re.compile(r"^module\s+(\S+)", re.MULTILINE)
+
+
+def get_index_dir() -> Path:
+    """Get the directory holding per-repo import indexes."""
+    return Path.home() / ".pilot" / "cache" / "import-graph"
+
+
+def _index_path(root: Path) -> Path:
+    digest = hashlib.sha1(str(root.resolve()).encode()).hexdigest()[:16]
+    return get_index_dir() / f"{digest}.json"
+
+
+def is_test_path(rel: str) -> bool:
+    """Check whether a repo-relative path is a test file."""
+    name = rel.rsplit("/", 1)[-1]
+    if name.endswith(".py"):
+        stem = name[:-3]
+        return stem.startswith("test_") or stem.endswith("_test")
+    if name.endswith("_test.go"):
+        return True
+    return bool(re.search(r"\.(test|spec)\.[cm]?[jt]sx?$", name))
+
+
+def _walk_sources(root: Path) -> dict[str, tuple[int, int]]:
+    """Map repo-relative source paths to (mtime_ns, size)."""
+    found = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+        for name in filenames:
+            if os.path.splitext(name)[1] in SOURCE_EXTENSIONS:
+                full = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(full)
+                except OSError:
+                    continue
+                found[os.path.relpath(full, root).replace(os.sep, "/")] = (st.st_mtime_ns, st.st_size)
+    return found
+
+
+def _python_imports(source: str) -> list[tuple[int, str]]:
+    """Extract (relative level, dotted name) pairs from Python source."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    imports = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports += [(0, alias.name) for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            imports.append((node.level, base))
+            imports += [(node.level, f"{base}.{alias.name}" if base else alias.name) for alias in node.names]
+    return imports
+
+
+def _ts_imports(source: str) -> list[str]:
+    """Extract relative module specifiers from TS/JS source."""
+    return [spec for spec in _TS_IMPORT.findall(source) if spec.startswith(".")]
+
+
+def _go_imports(source: str) -> list[str]:
+    """Extract import paths from Go source."""
+    paths = _GO_IMPORT_LINE.findall(source)
+    for block in _GO_IMPORT_BLOCK.findall(source):
+        paths += _GO_QUOTED.findall(block)
+    return paths
+
+
+def _parse(rel: str, source: str) -> list:
+    suffix = os.path.splitext(rel)[1]
+    if suffix in PY_EXTENSIONS:
+        return [list(item) for item in _python_imports(source)]
+    if suffix in TS_EXTENSIONS:
+        return _ts_imports(source)
+    return _go_imports(source)
+
+
+def update_index(root: Path) -> dict[str, dict]:
+    """Bring the cached raw-import index for root up to date and return its file entries."""
+    path = _index_path(root)
+    try:
+        data = json.loads(path.read_text())
+        files = data["files"] if data.get("version") == INDEX_VERSION else {}
+    except (OSError, json.JSONDecodeError, KeyError, TypeError):
+        files = {}
+
+    current = _walk_sources(root)
+    changed = False
+    for rel in list(files):
+        if rel not in current:
+            del files[rel]
+            changed = True
+    for rel, (mtime_ns, size) in current.items():
+        entry = files.get(rel)
+        if entry and entry["mtime_ns"] == mtime_ns and entry["size"] == size:
+            continue
+        try:
+            content = (root / rel).read_bytes()
+        except OSError:
+            continue
+        sha = hashlib.sha1(content).hexdigest()
+        if not entry or entry["sha"] != sha:
+            entry = {"sha": sha, "imports": _parse(rel, content.decode("utf-8", "replace"))}
+        files[rel] = {**entry, "mtime_ns": mtime_ns, "size": size}
+        changed = True
+
+    if changed:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"version": INDEX_VERSION, "root": str(root), "files": files}))
+            os.replace(tmp, path)
+        except OSError:
+            pass
+    return files
+
+
+def _python_modules(files: dict[str, dict]) -> tuple[dict[str, str], dict[str, list[str]]]:
+    """Map dotted module names to files: exact (from a source root) and by unique suffix."""
+    exact: dict[str, str] = {}
+    suffixes: dict[str, list[str]] = {}
+    for rel in files:
+        if not rel.endswith(".py"):
+            continue
+        parts = rel[:-3].split("/")
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        if not parts:
+            continue
+        dotted = ".".join(parts)
+        for prefix in PYTHON_SOURCE_ROOTS:
+            dotted_prefix = prefix.replace("/", ".")
+            if dotted.startswith(dotted_prefix):
+                exact.setdefault(dotted[len(dotted_prefix) :], rel)
+        for i in range(len(parts)):
+            suffixes.setdefault(".".join(parts[i:]), []).append(rel)
+    return exact, suffixes
+
+
+def _resolve_python(rel: str, level: int, name: str, files: dict[str, dict], modules: tuple) -> str | None:
+    exact, suffixes = modules
+    if level:
+        package = rel.split("/")[:-1]
+        if level > 1:
+            package = package[: -(level - 1)] if level - 1 <= len(package) else []
+        base = "/".join(package)
+        candidate = f"{base}/{name.replace('.', '/')}" if name else base
+        for option in (f"{candidate}.py", f"{candidate}/__init__.py"):
+            if option.lstrip("/") in files:
+                return option.lstrip("/")
+        return None
+    if name in exact:
+        return exact[name]
+    matches = suffixes.get(name, [])
+    return matches[0] if len(matches) == 1 else None
+
+
+def _resolve_ts(rel: str, spec: str, files: dict[str, dict]) -> str | None:
+    base = os.path.normpath(os.path.join(os.path.dirname(rel), spec)).replace(os.sep, "/")
+    stem, ext = os.path.splitext(base)
+    candidates = [base]
+    if ext in (".js", ".jsx", ".mjs"):
+        candidates += [stem + ".ts", stem + ".tsx", stem + ".mts"]
+    candidates += [base + e for e in (".ts", ".tsx", ".js", ".jsx", ".mjs", ".mts")]
+    candidates += [f"{base}/index{e}" for e in (".ts", ".tsx", ".js", ".jsx")]
+    return next((c for c in candidates if c in files), None)
+
+
+def _go_modules(root: Path, files: dict[str, dict]) -> list[tuple[str, str]]:
+    """Find (module path, repo-relative module dir) pairs from go.mod files next to Go sources."""
+    modules = []
+    for directory in sorted({os.path.dirname(rel) for rel in files if rel.endswith(".go")} | {""}):
+        try:
+            match = _GO_MODULE.search((root / directory / "go.mod").read_text())
+        except OSError:
+            continue
+        if match:
+            modules.append((match.group(1), directory))
+    return modules
+
+
+def build_reverse_graph(root: Path, files: dict[str, dict]) -> dict[str, set[str]]:
+    """Resolve raw imports and return file -> files that import it."""
+    py_modules = _python_modules(files)
+    go_modules = _go_modules(root, files)
+    go_packages: dict[str, list[str]] = {}
+    for rel in files:
+        if rel.endswith(".go") and not rel.endswith("_test.go"):
+            go_packages.setdefault(os.path.dirname(rel), []).append(rel)
+
+    reverse: dict[str, set[str]] = {}
+    for rel, entry in files.items():
+        targets: list[str | None] = []
+        if rel.endswith(".py"):
+            targets = [_resolve_python(rel, level, name, files, py_modules) for level, name in entry["imports"]]
+        elif rel.endswith(".go"):
+            for imported in entry["imports"]:
+                for module, module_dir in go_modules:
+                    if imported == module or imported.startswith(module + "/"):
+                        package_dir = "/".join(p for p in (module_dir, imported[len(module) :].strip("/")) if p)
+                        targets += go_packages.get(package_dir, [])
+            if rel.endswith("_test.go"):
+                targets += go_packages.get(os.path.dirname(rel), [])
+        else:
+            targets = [_resolve_ts(rel, spec, files) for spec in entry["imports"]]
+        for target in targets:
+            if target and target != rel:
+                reverse.setdefault(target, set()).add(rel)
+    return reverse
+
+
+def impacted_tests(root: Path, edited: list[str]) -> list[str]:
+    """Get test files that transitively import any of the edited repo-relative paths (or are edited tests)."""
+    files = update_index(root)
+    reverse = build_reverse_graph(root, files)
+    seen = set(edited)
+    queue = deque(edited)
+    while queue:
+        for dependent in reverse.get(queue.popleft(), ()):
+            if dependent not in seen:
+                seen.add(dependent)
+                queue.append(dependent)
+    return sorted(rel for rel in seen if rel in files and is_test_path(rel))
@@ -0,0 +1,197 @@
+"""Durable local outbox for hook → Console worker writes.
+
+Hooks append one JSON line per message to ~/.pilot/outbox/outbox.jsonl and
+return immediately; delivery never blocks on the worker. Appends are
+flushed to the OS at once and fsynced in a single batch when the hook
+process exits.
+
+A detached drainer (`python _outbox.py`) claims the active segment by
+renaming it, then POSTs its entries over one keep-alive connection with an
+Idempotency-Key header. Undelivered entries go back into the outbox, so
+delivery is at-least-once and the worker dedups retries by key. The worker
+keeps keys in its database for longer than MAX_ENTRY_AGE_SECONDS, so a
+retry of a request it already handled is replayed, not re-applied.
+"""
+
+from __future__ import annotations
+
+import atexit
+import fcntl
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from _worker_client import is_breaker_open, post_json
+
+ACTIVE_SEGMENT = "outbox.jsonl"
+DRAINING_PREFIX = "draining-"
+MAX_ENTRY_AGE_SECONDS = 7 * 24 * 3600
+DRAIN_BATCH_SIZE = 200
+
+_pending_fsync: set[Path] = set()
+
+
+def get_outbox_dir() -> Path:
+    """Get directory holding outbox segments."""
+    return Path.home() / ".pilot" / "outbox"
+
+
+def _append_lines(path: Path, data: bytes) -> None:
+    """Append data under an exclusive lock, following the segment if a drainer renamed it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    while True:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if os.fstat(fd).st_ino != current.st_ino:
+                continue
+            os.write(fd, data)
+            return
+        finally:
+            os.close(fd)
+
+
+def _fsync_pending() -> None:
+    """Fsync every segment this process appended to, once."""
+    for path in _pending_fsync:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    _pending_fsync.clear()
+
+
+def enqueue(endpoint: str, payload: dict, outbox_dir: Path | None = None) -> str | None:
+    """Queue a POST to endpoint. Returns the idempotency key, or None if the outbox is unwritable."""
+    outbox_dir = outbox_dir or get_outbox_dir()
+    key = uuid.uuid4().hex
+    entry = {"key": key, "endpoint": endpoint, "payload": payload, "created_at": time.time()}
+    path = outbox_dir / ACTIVE_SEGMENT
+    try:
+        _append_lines(path, (json.dumps(entry) + "\n").encode())
+    except OSError:
+        return None
+    if not _pending_fsync:
+        atexit.register(_fsync_pending)
+    _pending_fsync.add(path)
+    return key
+
+
+def _claim_segments(outbox_dir: Path) -> list[tuple[Path, int]]:
+    """Claim the active segment plus segments orphaned by crashed drainers. Returns (path, locked fd) pairs."""
+    try:
+        os.replace(outbox_dir / ACTIVE_SEGMENT, outbox_dir / f"{DRAINING_PREFIX}{time.time_ns()}-{os.getpid()}.jsonl")
+    except FileNotFoundError:
+        pass
+
+    claimed: list[tuple[Path, int]] = []
+    for path in sorted(outbox_dir.glob(f"{DRAINING_PREFIX}*.jsonl")):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            continue
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            continue
+        if not path.exists():
+            os.close(fd)
+            continue
+        claimed.append((path, fd))
+    return claimed
+
+
+def _read_entries(fd: int) -> list[dict]:
+    """Read outbox entries from a claimed segment, skipping torn or corrupt lines."""
+    with os.fdopen(os.dup(fd), "rb") as f:
+        raw = f.read()
+    entries = []
+    for line in raw.splitlines():
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(entry, dict) and entry.get("key") and entry.get("endpoint"):
+            entries.append(entry)
+    return entries
+
+
+def drain(outbox_dir: Path | None = None, batch_size: int = DRAIN_BATCH_SIZE) -> int:
+    """Deliver queued entries to the worker. Returns the number delivered.
+
+    Stops at the first unreachable or 5xx response and requeues the rest.
+    Entries rejected with 4xx or older than a week are dropped.
+    """
+    outbox_dir = outbox_dir or get_outbox_dir()
+    if not outbox_dir.is_dir():
+        return 0
+
+    delivered = 0
+    requeue: list[dict] = []
+    worker_down = False
+    for path, fd in _claim_segments(outbox_dir):
+        try:
+            for entry in _read_entries(fd):
+                if time.time() - float(entry.get("created_at", 0)) > MAX_ENTRY_AGE_SECONDS:
+                    continue
+                if worker_down or delivered >= batch_size:
+                    requeue.append(entry)
+                    continue
+                status = post_json(
+                    entry["endpoint"], entry.get("payload", {}), headers={"Idempotency-Key": entry["key"]}
+                )
+                if status is None or status >= 500:
+                    worker_down = True
+                    requeue.append(entry)
+                elif status < 400:
+                    delivered += 1
+            if requeue:
+                _append_lines(outbox_dir / ACTIVE_SEGMENT, "".join(json.dumps(e) + "\n" for e in requeue).encode())
+                requeue.clear()
+            path.unlink(missing_ok=True)
+        finally:
+            os.close(fd)
+
+    _pending_fsync.add(outbox_dir / ACTIVE_SEGMENT)
+    _fsync_pending()
+    return delivered
+
+
+def spawn_drain(outbox_dir: Path | None = None) -> bool:
+    """Start a detached drainer unless the worker is known to be down. Returns True if started."""
+    if is_breaker_open():
+        return False
+    cmd = [sys.executable, str(Path(__file__).resolve())]
+    if outbox_dir:
+        cmd.append(str(outbox_dir))
+    try:
+        subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    drain(Path(sys.argv[1]) if len(sys.argv) > 1 else None)
+    sys.exit(0)
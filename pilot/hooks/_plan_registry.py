@@ -0,0 +1,221 @@
+"""Session plan registry: each plan file parsed once per change into a compact record.
+
+The Stop hooks ask about the active plan on every stop. Rather than re-reading
+active_plan.json and the whole plan markdown each time, they go through this
+registry, stored in the session store as plan-registry.json. With nothing
+changed, a lookup costs a stat of active_plan.json and of the plan file plus
+one small JSON read. Files modified within the last RACY_SECONDS are read but
+not cached, since a second write in the same timestamp tick would otherwise go
+unnoticed. Parsing mirrors the Console's plan reader.
+
+The statusline and other session tools may read the file instead of parsing
+plans themselves. Its format (version 1):
+
+    {
+      "version": 1,
+      "active": {"sig": [mtime_ns, size], "plan_path": str} | null,
+      "plans": {"<plan file>": {"sig": [mtime_ns, size], "record": <record> | null}},
+      "dirs": {"<plans dir>": {"sig": mtime_ns, "names": [str, ...]}}
+    }
+
+"sig" is the stat signature the cached value was derived from; an entry is
+current only while the file still has that signature. "active" mirrors
+active_plan.json, whose plan_path may be relative to the project root. "dirs"
+lists the *.md names in each plans directory. A record is null for a plan
+file without a Status line, and otherwise:
+
+    {
+      "path": str,               plan file path
+      "name": str,               file stem without the YYYY-MM-DD- prefix
+      "status": str,             Status line, upper-cased (PENDING, COMPLETE, ...)
+      "approved": bool,          "Approved: Yes"
+      "iterations": int,         Iterations line, 0 when missing
+      "worktree": bool,          false only for "Worktree: No"
+      "type": str,               "Feature" or "Bugfix"
+      "tasks": [{"number": int, "title": str, "done": bool}, ...],
+      "completed": int,          tasks checked off
+      "total": int,              tasks in Progress Tracking
+      "current_task": int | null first unchecked task number
+    }
+
+REGISTRY_VERSION is bumped on any incompatible change to this format.
+Readers must ignore a file with a version they do not know; the hooks
+rebuild it from scratch.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from _util import _sessions_base, get_project_root, get_session_plan_path
+
+REGISTRY_VERSION = 1
+REGISTRY_FILE = "plan-registry.json"
+MAX_PLANS = 20
+RACY_SECONDS = 2
+
+_STATUS = re.compile(r"^Status:\s*(\w+)", re.MULTILINE)
+_APPROVED = re.compile(r"^Approved:\s*(\w+)", re.MULTILINE)
+_ITERATIONS = re.compile(r"^Iterations:\s*(\d+)", re.MULTILINE)
+_WORKTREE = re.compile(r"^Worktree:\s*(\w+)", re.MULTILINE)
+_TYPE = re.compile(r"^Type:\s*(\w+)", re.MULTILINE)
+_TASK = re.compile(r"^- \[([ xX])\] Task (\d+):\s*(.*)$", re.MULTILINE)
+
+
+def get_registry_path() -> Path:
+    """Get the session-scoped plan registry path."""
+    session_id = os.environ.get("PILOT_SESSION_ID", "").strip() or "default"
+    return _sessions_base() / session_id / REGISTRY_FILE
+
+
+def parse_plan(content: str, path: Path) -> dict | None:
+    """Parse plan markdown into a registry record; None when it has no Status line."""
+    status_match = _STATUS.search(content)
+    if not status_match:
+        return None
+    approved = _APPROVED.search(content)
+    iterations = _ITERATIONS.search(content)
+    worktree = _WORKTREE.search(content)
+    plan_type = _TYPE.search(content)
+    tasks = [
+        {"number": int(number), "title": title.strip(), "done": mark != " "}
+        for mark, number, title in _TASK.findall(content)
+    ]
+    current = next((task["number"] for task in tasks if not task["done"]), None)
+    return {
+        "path": str(path),
+        "name": re.sub(r"^\d{4}-\d{2}-\d{2}-", "", path.stem),
+        "status": status_match.group(1).upper(),
+        "approved": bool(approved) and approved.group(1).lower() == "yes",
+        "iterations": int(iterations.group(1)) if iterations else 0,
+        "worktree": worktree.group(1).lower() != "no" if worktree else True,
+        "type": "Bugfix" if plan_type and plan_type.group(1) == "Bugfix" else "Feature",
+        "tasks": tasks,
+        "completed": sum(task["done"] for task in tasks),
+        "total": len(tasks),
+        "current_task": current,
+    }
+
+
+def _signature(path: Path) -> list[int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _racy(mtime_ns: int) -> bool:
+    """Check whether a file changed too recently for its mtime to prove it has not changed since."""
+    return time.time_ns() - mtime_ns < RACY_SECONDS * 1_000_000_000
+
+
+def _load() -> dict:
+    try:
+        registry = json.loads(get_registry_path().read_text())
+        if registry.get("version") == REGISTRY_VERSION:
+            return registry
+    except (OSError, json.JSONDecodeError, AttributeError):
+        pass
+    return {"version": REGISTRY_VERSION, "active": None, "plans": {}, "dirs": {}}
+
+
+def _save(registry: dict) -> None:
+    path = get_registry_path()
+    plans = registry["plans"]
+    for stale in list(plans)[: max(0, len(plans) - MAX_PLANS)]:
+        del plans[stale]
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(registry))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _plan_record(registry: dict, plan_file: Path) -> tuple[dict | None, bool]:
+    """Get (record, registry changed) for a plan file, re-parsing only when it changed."""
+    sig = _signature(plan_file)
+    key = str(plan_file)
+    if sig is None:
+        return None, registry["plans"].pop(key, None) is not None
+    entry = registry["plans"].get(key)
+    if entry and entry["sig"] == sig:
+        return entry["record"], False
+    try:
+        record = parse_plan(plan_file.read_text(errors="replace"), plan_file)
+    except OSError:
+        return None, False
+    registry["plans"].pop(key, None)
+    if _racy(sig[0]):
+        return record, entry is not None
+    registry["plans"][key] = {"sig": sig, "record": record}
+    return record, True
+
+
+def plan_record(plan_file: Path) -> dict | None:
+    """Get the parsed record for a plan file."""
+    registry = _load()
+    record, changed = _plan_record(registry, plan_file)
+    if changed:
+        _save(registry)
+    return record
+
+
+def active_plan() -> dict | None:
+    """Get the record of the plan registered for this session (via active_plan.json)."""
+    registry = _load()
+    plan_json = get_session_plan_path()
+    sig = _signature(plan_json)
+    if sig is None:
+        return None
+
+    changed = False
+    active = registry.get("active")
+    if not active or active["sig"] != sig:
+        try:
+            data = json.loads(plan_json.read_text())
+            plan_path = data.get("plan_path", "") if isinstance(data, dict) else ""
+        except (OSError, json.JSONDecodeError):
+            return None
+        active = {"sig": sig, "plan_path": plan_path}
+        if not _racy(sig[0]):
+            registry["active"] = active
+            changed = True
+
+    record = None
+    if active["plan_path"]:
+        plan_file = Path(active["plan_path"])
+        if not plan_file.is_absolute():
+            plan_file = get_project_root() / plan_file
+        record, plan_changed = _plan_record(registry, plan_file)
+        changed = changed or plan_changed
+    if changed:
+        _save(registry)
+    return record
+
+
+def plans_for_day(plans_dir: Path, day: str) -> list[str] | None:
+    """List plan file names in plans_dir dated day (YYYY-MM-DD); None when the directory is missing."""
+    try:
+        sig = plans_dir.stat().st_mtime_ns
+    except OSError:
+        return None
+    registry = _load()
+    key = str(plans_dir)
+    entry = registry["dirs"].get(key)
+    if not entry or entry["sig"] != sig:
+        try:
+            names = sorted(name for name in os.listdir(plans_dir) if name.endswith(".md"))
+        except OSError:
+            return None
+        entry = {"sig": sig, "names": names}
+        if not _racy(sig):
+            registry["dirs"][key] = entry
+            _save(registry)
+    return [name for name in entry["names"] if name.startswith(f"{day}-")]
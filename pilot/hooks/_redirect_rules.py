@@ -0,0 +1,233 @@
+"""Declarative tool_redirect rules, compiled into a cached decision table.
+
+Rules come from tool_redirect_rules.json next to this file, then from the
+project's .claude/tool-redirect-rules.json. A project rule with the id of an
+earlier rule replaces it ("disabled": true removes it); other project rules
+are added after the defaults. Each rule:
+
+    {"id": "...", "tool": "Grep", "action": "block" | "hint",
+     "message": "...", "alternative": "...", "example": "...",
+     "when": {"field": "<tool_input key>", "equals": [...], "not_equals": [...],
+              "contains_any": [...], "contains_none": [...]}}
+
+Every condition in "when" must hold; a rule without "when" always matches.
+contains_* tests are case-insensitive substring tests. For one tool call a
+matching block wins over a hint, otherwise the first matching rule wins.
+
+Compiling groups rules by tool and folds every contains_* literal into one
+Aho-Corasick automaton, so each referenced field is scanned once however many
+phrases the rules list. The compiled table is cached in
+~/.pilot/cache/tool-redirect/<hash of the rule files>.json; editing a rule file
+changes the hash and triggers a recompile.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import deque
+from pathlib import Path
+
+COMPILED_VERSION = 1
+DEFAULT_RULES_PATH = Path(__file__).parent / "tool_redirect_rules.json"
+PROJECT_RULES_NAME = "tool-redirect-rules.json"
+ACTIONS = ("block", "hint")
+
+_tables: dict[str, dict] = {}
+
+
+def get_cache_dir() -> Path:
+    """Get the directory holding compiled rule tables."""
+    return Path.home() / ".pilot" / "cache" / "tool-redirect"
+
+
+def rule_sources(project_root: Path | None) -> list[Path]:
+    """List rule files in merge order: plugin defaults, then the project override."""
+    sources = [DEFAULT_RULES_PATH]
+    if project_root is not None:
+        sources.append(project_root / ".claude" / PROJECT_RULES_NAME)
+    return sources
+
+
+def merge_rules(rule_sets: list[list[dict]]) -> list[dict]:
+    """Merge rule lists by id; later lists replace or disable earlier rules."""
+    merged: dict[str, dict] = {}
+    for rules in rule_sets:
+        for position, rule in enumerate(rules):
+            if not isinstance(rule, dict):
+                continue
+            rule_id = str(rule.get("id") or f"{rule.get('tool')}#{position}")
+            if rule.get("disabled"):
+                merged.pop(rule_id, None)
+            else:
+                merged[rule_id] = {**rule, "id": rule_id}
+    return list(merged.values())
+
+
+def build_automaton(literals: list[str]) -> dict:
+    """Build an Aho-Corasick automaton over literals (goto, fail and output per state)."""
+    goto: list[dict[str, int]] = [{}]
+    out: list[list[int]] = [[]]
+    for index, literal in enumerate(literals):
+        state = 0
+        for char in literal:
+            if char not in goto[state]:
+                goto.append({})
+                out.append([])
+                goto[state][char] = len(goto) - 1
+            state = goto[state][char]
+        out[state].append(index)
+
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for char, child in goto[state].items():
+            queue.append(child)
+            fallback = fail[state]
+            while fallback and char not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[child] = goto[fallback].get(char, 0)
+            out[child] = out[child] + out[fail[child]]
+    return {"goto": goto, "fail": fail, "out": out}
+
+
+def scan(automaton: dict, text: str) -> set[int]:
+    """Return the indexes of every literal that occurs in text (already lowercased)."""
+    goto, fail, out = automaton["goto"], automaton["fail"], automaton["out"]
+    found: set[int] = set()
+    state = 0
+    for char in text:
+        while state and char not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(char, 0)
+        if out[state]:
+            found.update(out[state])
+    return found
+
+
+def compile_rules(rules: list[dict]) -> dict:
+    """Compile merged rules into a per-tool decision table sharing one automaton."""
+    literals: list[str] = []
+    literal_ids: dict[str, int] = {}
+
+    def intern(values: list) -> list[int]:
+        ids = []
+        for value in values:
+            literal = str(value).lower()
+            if literal not in literal_ids:
+                literal_ids[literal] = len(literals)
+                literals.append(literal)
+            ids.append(literal_ids[literal])
+        return ids
+
+    compiled: list[dict] = []
+    tools: dict[str, list[int]] = {}
+    for rule in rules:
+        if rule.get("action") not in ACTIONS or not rule.get("tool") or not rule.get("message"):
+            continue
+        when = rule.get("when") if isinstance(rule.get("when"), dict) else {}
+        tools.setdefault(str(rule["tool"]), []).append(len(compiled))
+        compiled.append(
+            {
+                "id": rule["id"],
+                "action": rule["action"],
+                "message": str(rule["message"]),
+                "alternative": str(rule.get("alternative", "")),
+                "example": str(rule.get("example", "")),
+                "field": str(when.get("field", "")),
+                "equals": [str(v) for v in when.get("equals", [])],
+                "not_equals": [str(v) for v in when.get("not_equals", [])],
+                "contains_any": intern(when.get("contains_any", [])),
+                "contains_none": intern(when.get("contains_none", [])),
+            }
+        )
+    return {
+        "version": COMPILED_VERSION,
+        "rules": compiled,
+        "tools": tools,
+        "literals": literals,
+        "automaton": build_automaton(literals),
+    }
+
+
+def _read_rules(path: Path) -> list[dict]:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+        return []
+    rules = data.get("rules") if isinstance(data, dict) else data
+    return rules if isinstance(rules, list) else []
+
+
+def load_table(project_root: Path | None = None) -> dict:
+    """Get the compiled decision table for the current rule files, compiling on a cache miss."""
+    sources = rule_sources(project_root)
+    digest = hashlib.sha256(str(COMPILED_VERSION).encode())
+    for path in sources:
+        try:
+            content = path.read_bytes()
+        except OSError:
+            content = b""
+        digest.update(hashlib.sha256(content).digest())
+    key = digest.hexdigest()[:24]
+    if key in _tables:
+        return _tables[key]
+
+    cache_path = get_cache_dir() / f"{key}.json"
+    try:
+        table = json.loads(cache_path.read_text())
+        if table.get("version") != COMPILED_VERSION:
+            raise ValueError("stale compiled table")
+    except (OSError, json.JSONDecodeError, AttributeError, ValueError):
+        table = compile_rules(merge_rules([_read_rules(path) for path in sources]))
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(table))
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass
+    _tables[key] = table
+    return table
+
+
+def rule_matches(table: dict, rule: dict, tool_input: dict, scanned: dict[str, set[int]] | None = None) -> bool:
+    """Check a compiled rule's condition against tool_input; scanned caches automaton hits per field."""
+    field = rule["field"]
+    if not field:
+        return True
+    value = tool_input.get(field, "")
+    value = value if isinstance(value, str) else ""
+    if rule["equals"] and value not in rule["equals"]:
+        return False
+    if value in rule["not_equals"]:
+        return False
+    if not rule["contains_any"] and not rule["contains_none"]:
+        return True
+    scanned = {} if scanned is None else scanned
+    if field not in scanned:
+        scanned[field] = scan(table["automaton"], value.lower())
+    hits = scanned[field]
+    if rule["contains_none"] and hits.intersection(rule["contains_none"]):
+        return False
+    return not rule["contains_any"] or bool(hits.intersection(rule["contains_any"]))
+
+
+def decide(table: dict, tool_name: str, tool_input: dict) -> dict | None:
+    """Pick the rule that applies to a tool call: the first matching block, else the first matching hint."""
+    first_hint = None
+    scanned: dict[str, set[int]] = {}
+    for index in table["tools"].get(tool_name, ()):
+        rule = table["rules"][index]
+        if (rule["action"] == "block" or first_hint is None) and rule_matches(table, rule, tool_input, scanned):
+            if rule["action"] == "block":
+                return rule
+            first_hint = rule
+    return first_hint
+
+
+def find_rule(table: dict, rule_id: str) -> dict | None:
+    """Get a compiled rule by id."""
+    return next((rule for rule in table["rules"] if rule["id"] == rule_id), None)
@@ -0,0 +1,99 @@
+"""Lease-based registry of live Pilot sessions.
+
+Each running session holds an exclusive flock on ~/.pilot/sessions/<id>.lease
+for its whole lifetime. The kernel drops the lock when the holder exits, so a
+lease that can be locked by someone else belongs to a dead session.
+
+Counting live sessions is a directory scan plus one non-blocking lock probe
+per lease — no subprocess, no launcher import. Stale leases are reaped as a
+side effect of counting.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import time
+from pathlib import Path
+
+LEASE_SUFFIX = ".lease"
+
+
+def _leases_dir() -> Path:
+    """Get directory holding session lease files."""
+    return Path.home() / ".pilot" / "sessions"
+
+
+def acquire_session_lease(session_id: str, leases_dir: Path | None = None) -> int:
+    """Create and lock the lease for session_id. Returns the open file descriptor.
+
+    The caller must keep the descriptor open for the session's lifetime. The
+    lease is locked before it becomes visible under its final name, so a
+    concurrent reaper can never mistake a starting session for a dead one.
+    """
+    leases_dir = leases_dir or _leases_dir()
+    leases_dir.mkdir(parents=True, exist_ok=True)
+    final_path = leases_dir / f"{session_id}{LEASE_SUFFIX}"
+    tmp_path = leases_dir / f".{session_id}.{os.getpid()}.tmp"
+
+    fd = os.open(tmp_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        payload = {"session_id": session_id, "pid": os.getpid(), "started_at": time.time()}
+        os.write(fd, json.dumps(payload).encode())
+        os.replace(tmp_path, final_path)
+    except OSError:
+        os.close(fd)
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return fd
+
+
+def release_session_lease(fd: int, session_id: str, leases_dir: Path | None = None) -> None:
+    """Remove the lease file and drop the lock."""
+    leases_dir = leases_dir or _leases_dir()
+    try:
+        (leases_dir / f"{session_id}{LEASE_SUFFIX}").unlink(missing_ok=True)
+    finally:
+        os.close(fd)
+
+
+def _is_lease_live(path: Path) -> bool:
+    """Probe a lease with a non-blocking lock; reap it if its holder is gone."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    except OSError:
+        return False
+    else:
+        path.unlink(missing_ok=True)
+        return False
+    finally:
+        os.close(fd)
+
+
+def has_session_leases(leases_dir: Path | None = None) -> bool:
+    """Check whether any lease files exist (i.e. the launcher maintains leases)."""
+    leases_dir = leases_dir or _leases_dir()
+    try:
+        with os.scandir(leases_dir) as entries:
+            return any(entry.name.endswith(LEASE_SUFFIX) for entry in entries)
+    except OSError:
+        return False
+
+
+def count_live_sessions(leases_dir: Path | None = None) -> int:
+    """Count sessions whose lease is still locked, reaping stale leases."""
+    leases_dir = leases_dir or _leases_dir()
+    try:
+        with os.scandir(leases_dir) as entries:
+            lease_paths = [Path(entry.path) for entry in entries if entry.name.endswith(LEASE_SUFFIX)]
+    except OSError:
+        return 0
+    return sum(1 for path in lease_paths if _is_lease_live(path))
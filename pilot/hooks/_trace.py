@@ -0,0 +1,217 @@
+"""Per-session hook tracing in a fixed-size binary ring buffer.
+
+Each hook process records one span for the whole hook, one per child
+process started through traced_run() and one per named region, then appends them all under a
+single flock to ~/.pilot/sessions/<id>/hook-trace.bin when it exits. The
+file never grows past HEADER + CAPACITY * RECORD bytes; the oldest records
+are overwritten first.
+
+Set PILOT_HOOK_TRACE=0 to disable recording.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import re
+import struct
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+MAGIC = b"PHTR"
+VERSION = 1
+CAPACITY = 4096
+HEADER = struct.Struct("<4sHHIQ")
+RECORD = struct.Struct("<dIIiB3x24s16s24s32s8x")
+
+KIND_HOOK = 0
+KIND_SUBPROCESS = 1
+KIND_SPAN = 2
+
+PEEK_BYTES = 4096
+
+_EVENT_RE = re.compile(r'"hook_event_name"\s*:\s*"([^"]{0,64})"')
+_TOOL_RE = re.compile(r'"tool_name"\s*:\s*"([^"]{0,64})"')
+
+_pending: list[tuple] = []
+_context = {"hook": "", "event": "", "tool": ""}
+
+
+def is_tracing_enabled() -> bool:
+    """Check whether hook tracing is on (default) for this process."""
+    return os.environ.get("PILOT_HOOK_TRACE", "").strip().lower() not in ("0", "false", "off")
+
+
+def get_trace_path(session_id: str | None = None) -> Path:
+    """Get the ring buffer path for a session."""
+    session_id = session_id or os.environ.get("PILOT_SESSION_ID", "").strip() or "default"
+    return Path.home() / ".pilot" / "sessions" / session_id / "hook-trace.bin"
+
+
+def _encode(value: str, size: int) -> bytes:
+    return value.encode("utf-8", "replace")[:size]
+
+
+def _record(kind: int, start: float, duration: float, label: str = "", exit_code: int = 0) -> None:
+    if not is_tracing_enabled():
+        return
+    _pending.append(
+        (
+            start,
+            min(int(duration * 1_000_000), 0xFFFFFFFF),
+            os.getpid(),
+            exit_code,
+            kind,
+            _encode(_context["hook"], 24),
+            _encode(_context["event"], 16),
+            _encode(_context["tool"], 24),
+            _encode(label, 32),
+        )
+    )
+
+
+@contextmanager
+def hook_span(label: str) -> Iterator[None]:
+    """Record the wall time of a named region inside the current hook."""
+    start = time.time()
+    began = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(KIND_SPAN, start, time.perf_counter() - began, label)
+
+
+def traced_run(args, *posargs, **kwargs) -> subprocess.CompletedProcess:
+    """subprocess.run that also records the child process with its duration and exit code."""
+    if not is_tracing_enabled():
+        return subprocess.run(args, *posargs, **kwargs)
+    start = time.time()
+    began = time.perf_counter()
+    exit_code = -1
+    try:
+        result = subprocess.run(args, *posargs, **kwargs)
+        exit_code = result.returncode
+        return result
+    finally:
+        argv = [str(args)] if isinstance(args, (str, bytes)) else [str(a) for a in args]
+        label = " ".join([Path(argv[0]).name, *argv[1:2]]) if argv else ""
+        _record(KIND_SUBPROCESS, start, time.perf_counter() - began, label, exit_code)
+
+
+def flush(path: Path | None = None) -> None:
+    """Append pending records to the ring buffer under an exclusive lock."""
+    if not _pending:
+        return
+    path = path or get_trace_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    except OSError:
+        _pending.clear()
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        header = os.pread(fd, HEADER.size, 0)
+        if len(header) == HEADER.size:
+            magic, version, record_size, capacity, next_seq = HEADER.unpack(header)
+        if len(header) != HEADER.size or (magic, version, record_size) != (MAGIC, VERSION, RECORD.size):
+            capacity, next_seq = CAPACITY, 0
+            os.ftruncate(fd, 0)
+            os.ftruncate(fd, HEADER.size + capacity * RECORD.size)
+        for fields in _pending:
+            offset = HEADER.size + (next_seq % capacity) * RECORD.size
+            os.pwrite(fd, RECORD.pack(*fields), offset)
+            next_seq += 1
+        os.pwrite(fd, HEADER.pack(MAGIC, VERSION, RECORD.size, capacity, next_seq), 0)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+        _pending.clear()
+
+
+def read_trace(path: Path | None = None) -> list[dict]:
+    """Read all records from a ring buffer, oldest first."""
+    path = path or get_trace_path()
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return []
+    if len(data) < HEADER.size:
+        return []
+    magic, version, record_size, capacity, next_seq = HEADER.unpack_from(data, 0)
+    if (magic, version, record_size) != (MAGIC, VERSION, RECORD.size):
+        return []
+
+    records = []
+    for seq in range(max(0, next_seq - capacity), next_seq):
+        offset = HEADER.size + (seq % capacity) * RECORD.size
+        if offset + RECORD.size > len(data):
+            break
+        start, duration_us, pid, exit_code, kind, hook, event, tool, label = RECORD.unpack_from(data, offset)
+        records.append(
+            {
+                "ts": start,
+                "duration_ms": duration_us / 1000,
+                "pid": pid,
+                "exit_code": exit_code,
+                "kind": kind,
+                "hook": hook.rstrip(b"\0").decode("utf-8", "replace"),
+                "event": event.rstrip(b"\0").decode("utf-8", "replace"),
+                "tool": tool.rstrip(b"\0").decode("utf-8", "replace"),
+                "label": label.rstrip(b"\0").decode("utf-8", "replace"),
+            }
+        )
+    return records
+
+
+def _peek_stdin() -> str:
+    """Return up to PEEK_BYTES from the head of stdin without consuming any of it."""
+    buffer = getattr(sys.stdin, "buffer", None)
+    try:
+        if buffer is not None and hasattr(buffer, "peek"):
+            return buffer.peek(PEEK_BYTES)[:PEEK_BYTES].decode("utf-8", "replace")
+        if sys.stdin.seekable():
+            position = sys.stdin.tell()
+            head = sys.stdin.read(PEEK_BYTES)
+            sys.stdin.seek(position)
+            return head
+    except (OSError, ValueError):
+        pass
+    return ""
+
+
+def traced_main(hook: str, main: Callable[[], int]) -> int:
+    """Run a hook entry point with tracing: hook span, then flush all records on exit.
+
+    Peeks at the buffered head of stdin to label records with the event and
+    tool; the hook still reads the original stream, so large payloads are
+    never copied.
+    """
+    if not is_tracing_enabled():
+        return main()
+
+    head = _peek_stdin()
+    event_match, tool_match = _EVENT_RE.search(head), _TOOL_RE.search(head)
+    _context.update(
+        hook=hook,
+        event=event_match.group(1) if event_match else "",
+        tool=tool_match.group(1) if tool_match else "",
+    )
+
+    start = time.time()
+    began = time.perf_counter()
+    exit_code = 0
+    try:
+        exit_code = main()
+        return exit_code
+    except SystemExit as e:
+        exit_code = 0 if e.code is None else e.code if isinstance(e.code, int) else 1
+        raise
+    finally:
+        _record(KIND_HOOK, start, time.perf_counter() - began, hook, exit_code or 0)
+        flush()
@@ -8,9 +8,13 @@ from __future__ import annotations
 
 import json
 import os
-import subprocess
+import re
 import sys
+from collections.abc import Iterable
 from pathlib import Path
+from typing import TextIO
+
+from _git import find_git_root as _find_git_root
 
 RED = "\033[0;31m"
 YELLOW = "\033[0;33m"
@@ -23,23 +27,40 @@ NC = "\033[0m"
 FILE_LENGTH_WARN = 300
 FILE_LENGTH_CRITICAL = 500
 
+LARGE_FILE_FORMAT_ONLY_BYTES = 1_000_000
+LARGE_FILE_SKIP_BYTES = 5_000_000
+HEAD_SAMPLE_BYTES = 64 * 1024
+MARKER_SAMPLE_BYTES = 4096
+MARKER_SAMPLE_LINES = 5
+COUNT_CHUNK_BYTES = 1 << 20
+MINIFIED_AVG_LINE_CHARS = 300
+MINIFIED_LONG_LINE_CHARS = 5_000
+GENERATED_MARKER = re.compile(rb"@generated|^// Code generated .* DO NOT EDIT\.\r?$", re.MULTILINE)
+
 _AUTOCOMPACT_BUFFER_TOKENS = 33_000
 
 
-def _read_model_from_config() -> str:
-    """Read user's main model from ~/.pilot/config.json.
+def _read_config() -> dict:
+    """Read ~/.pilot/config.json.
 
     Intentionally standalone — hooks cannot import from launcher.
-    Returns 'sonnet' (default) on any error.
+    Returns {} on any error.
     """
     try:
-        config_path = Path.home() / ".pilot" / "config.json"
-        data = json.loads(config_path.read_text())
-        model = data.get("model", "sonnet")
-        if isinstance(model, str) and model in ("sonnet", "sonnet[1m]", "opus", "opus[1m]"):
-            return model
+        data = json.loads((Path.home() / ".pilot" / "config.json").read_text())
     except Exception:
-        pass
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _read_model_from_config() -> str:
+    """Read user's main model from ~/.pilot/config.json.
+
+    Returns 'sonnet' (default) on any error.
+    """
+    model = _read_config().get("model", "sonnet")
+    if isinstance(model, str) and model in ("sonnet", "sonnet[1m]", "opus", "opus[1m]"):
+        return model
     return "sonnet"
 
 
@@ -82,20 +103,17 @@ def get_session_plan_path() -> Path:
     return _sessions_base() / session_id / "active_plan.json"
 
 
-def find_git_root() -> Path | None:
-    """Find git repository root."""
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        if result.returncode == 0:
-            return Path(result.stdout.strip())
-    except Exception:
-        pass
-    return None
+def find_git_root(start: Path | None = None) -> Path | None:
+    """Find git repository root containing start (default: cwd), without spawning git."""
+    return _find_git_root(start)
+
+
+def get_project_root() -> Path:
+    """Get project root: CLAUDE_PROJECT_ROOT, else the enclosing git work tree, else cwd."""
+    env_root = os.environ.get("CLAUDE_PROJECT_ROOT", "").strip()
+    if env_root:
+        return Path(env_root)
+    return find_git_root() or Path.cwd()
 
 
 def read_hook_stdin() -> dict:
@@ -112,6 +130,165 @@ def read_hook_stdin() -> dict:
         return {}
 
 
+_UNESCAPED_QUOTE = re.compile(r'"(?<!\\")')
+_SCALAR = re.compile(r"[^,}\]\s]+")
+_WHITESPACE = re.compile(r"\s*")
+_STRUCTURE = re.compile(r'["{}\[\]]')
+READ_CHUNK_CHARS = 64 * 1024
+
+
+class _AllFieldsFound(Exception):
+    """Raised to stop scanning once every requested field has been decoded."""
+
+
+def _skip_ws(text: str, i: int) -> int:
+    return _WHITESPACE.match(text, i).end()
+
+
+def _string_end(text: str, i: int) -> int:
+    """Return the index just past the JSON string opening at text[i], without decoding it.
+
+    The first quote not preceded by a backslash is found by one C-level regex
+    search. Only quotes preceded by an escaped backslash (a \\\\" sequence) can
+    close the string earlier, so just those are checked by counting the
+    backslash run in front of them.
+    """
+    j = i + 1
+    match = _UNESCAPED_QUOTE.search(text, j)
+    end = match.start() if match else len(text)
+    while True:
+        p = text.find('\\\\"', j, end)
+        if p < 0:
+            if match is None:
+                raise ValueError("unterminated string")
+            return end + 1
+        quote = p + 2
+        k = quote - 1
+        while text[k] == "\\":
+            k -= 1
+        if (quote - 1 - k) % 2 == 0:
+            return quote + 1
+        j = quote + 1
+
+
+def _value_end(text: str, i: int) -> int:
+    """Return the index just past the JSON value starting at text[i], without building it."""
+    if text[i] == '"':
+        return _string_end(text, i)
+    if text[i] in "{[":
+        depth = 0
+        while match := _STRUCTURE.search(text, i):
+            i = match.start()
+            if match.group() == '"':
+                i = _string_end(text, i)
+                continue
+            depth += 1 if match.group() in "{[" else -1
+            i += 1
+            if depth == 0:
+                return i
+        raise ValueError("unterminated container")
+    match = _SCALAR.match(text, i)
+    if not match:
+        raise ValueError(f"unexpected {text[i]!r}")
+    return match.end()
+
+
+def _extract_object(text: str, i: int, wanted: dict, fields: dict, pending: list[int]) -> int:
+    """Decode the wanted keys of the JSON object at text[i] into fields; return its end index."""
+    i = _skip_ws(text, i + 1)
+    if text[i] == "}":
+        return i + 1
+    while True:
+        if text[i] != '"':
+            raise ValueError("expected key")
+        key_end = _string_end(text, i)
+        key = json.loads(text[i:key_end])
+        i = _skip_ws(text, key_end)
+        if text[i] != ":":
+            raise ValueError("expected ':'")
+        i = _skip_ws(text, i + 1)
+        if key not in wanted:
+            i = _value_end(text, i)
+        elif wanted[key] and text[i] == "{":
+            fields[key] = {}
+            i = _extract_object(text, i, wanted[key], fields[key], pending)
+        else:
+            end = _value_end(text, i)
+            if end >= len(text):
+                raise IndexError("value may continue past the end of the text")
+            fields[key] = json.loads(text[i:end])
+            i = end
+            pending[0] -= 1
+            if pending[0] == 0:
+                raise _AllFieldsFound
+        i = _skip_ws(text, i)
+        if text[i] == "}":
+            return i + 1
+        if text[i] != ",":
+            raise ValueError("expected ',' or '}'")
+        i = _skip_ws(text, i + 1)
+
+
+def _scan_fields(text: str, paths: Iterable[str]) -> dict | None:
+    """Decode the given field paths from text; None when text ends (or breaks) before they are known."""
+    wanted: dict = {}
+    pending = [0]
+    for path in paths:
+        node = wanted
+        *parents, leaf = path.split(".")
+        for part in parents:
+            node = node.setdefault(part, {})
+        if leaf not in node:
+            node[leaf] = {}
+            pending[0] += 1
+    fields: dict = {}
+    try:
+        i = _skip_ws(text, 0)
+        if text[i] != "{":
+            return {}
+        _extract_object(text, i, wanted, fields, pending)
+    except _AllFieldsFound:
+        pass
+    except (ValueError, IndexError):
+        return None
+    return fields
+
+
+def extract_json_fields(text: str, paths: Iterable[str]) -> dict:
+    """Decode only the given dotted field paths (e.g. "tool_input.file_path") of a JSON object.
+
+    Everything else is skipped by a scanner that finds where each value ends
+    without decoding it, and scanning stops as soon as every path has been
+    found, so a multi-MB string after the wanted fields (a Write's
+    tool_input.content) is never touched. Skipped parts are not validated.
+    Returns {} for anything that is not a JSON object.
+    """
+    fields = _scan_fields(text, paths)
+    return {} if fields is None else fields
+
+
+def read_json_fields(stream: TextIO, paths: Iterable[str], head: str = "") -> tuple[dict, str]:
+    """Like extract_json_fields, but reads stream only as far as the wanted fields.
+
+    Reads chunks of at least READ_CHUNK_CHARS, doubling the amount read each
+    time, and rescans after each chunk until every path has been found or the
+    object ends. A large value after the wanted fields stays unread in the
+    pipe. Returns (fields, text read so far); pass that text back as head to
+    look up further paths from the same stream.
+    """
+    paths = tuple(paths)
+    text = head
+    while True:
+        if text:
+            fields = _scan_fields(text, paths)
+            if fields is not None:
+                return fields, text
+        chunk = stream.read(max(len(text), READ_CHUNK_CHARS))
+        if not chunk:
+            return {}, text
+        text += chunk
+
+
 def get_edited_file_from_stdin() -> Path | None:
     """Get the edited file path from PostToolUse hook stdin."""
     try:
@@ -166,14 +343,74 @@ def is_waiting_for_user_input(transcript_path: str) -> bool:
         return False
 
 
+def count_lines(file_path: Path) -> int:
+    """Count lines in fixed-size chunks, without decoding or holding the file in memory.
+
+    Matches len(read_text().splitlines()) for LF-terminated text.
+    """
+    newlines = 0
+    last = b""
+    with file_path.open("rb") as f:
+        while chunk := f.read(COUNT_CHUNK_BYTES):
+            newlines += chunk.count(b"\n")
+            last = chunk[-1:]
+    return newlines + (last not in (b"", b"\n"))
+
+
+def _size_threshold(key: str, default: int) -> int:
+    value = _read_config().get(key)
+    return value if isinstance(value, int) and value > 0 else default
+
+
+def assess_file(file_path: Path) -> tuple[str, str]:
+    """Decide how much checking a file can afford, from its size and a sample of its head.
+
+    Returns (mode, note): mode is "full", "format" (formatters only) or
+    "skip" (no formatters or linters); note explains any mode but "full".
+    Size limits come from "largeFileFormatOnlyBytes" and "largeFileSkipBytes"
+    in ~/.pilot/config.json.
+    """
+    try:
+        size = file_path.stat().st_size
+        with file_path.open("rb") as f:
+            head = f.read(HEAD_SAMPLE_BYTES)
+    except OSError:
+        return "full", ""
+
+    header = b"\n".join(head[:MARKER_SAMPLE_BYTES].split(b"\n", MARKER_SAMPLE_LINES)[:MARKER_SAMPLE_LINES])
+    if GENERATED_MARKER.search(header):
+        return "skip", f"{file_path.name} is marked as generated; formatting and linting skipped"
+
+    lines = head.split(b"\n")
+    if len(lines) > 1 and not lines[-1]:
+        lines.pop()
+    longest = max(len(line) for line in lines) if lines else 0
+    if len(head) >= 1024 and (len(head) / len(lines) > MINIFIED_AVG_LINE_CHARS or longest > MINIFIED_LONG_LINE_CHARS):
+        return "skip", f"{file_path.name} looks minified (lines up to {longest} chars); formatting and linting skipped"
+
+    skip_bytes = _size_threshold("largeFileSkipBytes", LARGE_FILE_SKIP_BYTES)
+    if size >= skip_bytes:
+        return (
+            "skip",
+            f"{file_path.name} is {size / 1e6:.1f} MB (>= {skip_bytes / 1e6:.1f} MB); formatting and linting skipped",
+        )
+    format_only_bytes = _size_threshold("largeFileFormatOnlyBytes", LARGE_FILE_FORMAT_ONLY_BYTES)
+    if size >= format_only_bytes:
+        return (
+            "format",
+            f"{file_path.name} is {size / 1e6:.1f} MB (>= {format_only_bytes / 1e6:.1f} MB); formatted only, linting skipped",
+        )
+    return "full", ""
+
+
 def check_file_length(file_path: Path) -> str:
     """Check if file exceeds length thresholds.
 
     Returns a plain-text warning message or empty string if OK.
     """
     try:
-        line_count = len(file_path.read_text().splitlines())
-    except Exception:
+        line_count = count_lines(file_path)
+    except (OSError, ValueError):
         return ""
 
     if line_count > FILE_LENGTH_CRITICAL:
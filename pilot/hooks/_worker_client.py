@@ -0,0 +1,146 @@
+"""Shared HTTP client for hook → Console worker calls.
+
+Keeps one keep-alive connection per hook process and remembers worker-down
+state in a short-lived breaker file (~/.pilot/cache/worker-breaker.json).
+While the breaker is open, every hook skips the network and fails over
+immediately instead of waiting out a connect or read timeout. Once it
+expires, a cheap /api/health probe decides whether to close it again.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import time
+from pathlib import Path
+
+from _trace import hook_span
+
+WORKER_HOST = "localhost"
+WORKER_PORT = 41777
+
+CONNECT_TIMEOUT = 0.5
+HEALTH_TIMEOUT = 0.5
+BREAKER_BASE_SECONDS = 15.0
+BREAKER_MAX_SECONDS = 300.0
+
+_connection: http.client.HTTPConnection | None = None
+
+
+def _breaker_path() -> Path:
+    """Get path of the worker-down breaker file."""
+    return Path.home() / ".pilot" / "cache" / "worker-breaker.json"
+
+
+def _read_breaker() -> dict | None:
+    """Read breaker state, or None when the worker is not known to be down."""
+    try:
+        state = json.loads(_breaker_path().read_text())
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def _open_breaker(previous: dict | None) -> None:
+    """Mark the worker as down, doubling the backoff on repeated failures."""
+    backoff = BREAKER_BASE_SECONDS
+    if previous:
+        backoff = min(float(previous.get("backoff", BREAKER_BASE_SECONDS)) * 2, BREAKER_MAX_SECONDS)
+    path = _breaker_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"open_until": time.time() + backoff, "backoff": backoff}))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def _close_breaker() -> None:
+    """Forget worker-down state."""
+    try:
+        _breaker_path().unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def _get_connection() -> http.client.HTTPConnection:
+    """Return the process-wide keep-alive connection, connecting if needed."""
+    global _connection
+    if _connection is None:
+        _connection = http.client.HTTPConnection(WORKER_HOST, WORKER_PORT, timeout=CONNECT_TIMEOUT)
+    if _connection.sock is None:
+        _connection.connect()
+    return _connection
+
+
+def _reset_connection() -> None:
+    """Drop the keep-alive connection after an error."""
+    global _connection
+    if _connection is not None:
+        _connection.close()
+    _connection = None
+
+
+def _request(method: str, path: str, body: bytes | None, timeout: float, extra_headers: dict | None = None) -> int:
+    """Send one request over the keep-alive connection and return the status code.
+
+    A reused connection the worker already closed is retried once on a fresh one.
+    """
+    reused = _connection is not None and _connection.sock is not None
+    conn = _get_connection()
+    conn.sock.settimeout(timeout)
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    headers.update(extra_headers or {})
+    try:
+        with hook_span(f"worker {path}"):
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+    except (ConnectionError, http.client.RemoteDisconnected, http.client.BadStatusLine):
+        _reset_connection()
+        if not reused:
+            raise
+        return _request(method, path, body, timeout, extra_headers)
+    except (OSError, http.client.HTTPException):
+        _reset_connection()
+        raise
+    if resp.will_close:
+        _reset_connection()
+    return resp.status
+
+
+def is_breaker_open() -> bool:
+    """Check whether the worker is currently known to be down, without touching the network."""
+    breaker = _read_breaker()
+    return bool(breaker) and time.time() < float(breaker.get("open_until", 0))
+
+
+def is_worker_available() -> bool:
+    """Check worker health, consulting the breaker before touching the network."""
+    breaker = _read_breaker()
+    if breaker and time.time() < float(breaker.get("open_until", 0)):
+        return False
+    try:
+        healthy = _request("GET", "/api/health", None, HEALTH_TIMEOUT) == 200
+    except (OSError, http.client.HTTPException):
+        healthy = False
+    if healthy:
+        if breaker:
+            _close_breaker()
+    else:
+        _open_breaker(breaker)
+    return healthy
+
+
+def post_json(path: str, payload: dict, timeout: float = 5.0, headers: dict | None = None) -> int | None:
+    """POST payload to the worker. Returns the HTTP status, or None if the worker is unreachable."""
+    breaker = _read_breaker()
+    if breaker and not is_worker_available():
+        return None
+    try:
+        return _request("POST", path, json.dumps(payload).encode(), timeout, headers)
+    except (OSError, http.client.HTTPException):
+        _open_breaker(_read_breaker())
+        return None
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Turn-level batched linting at Stop.
+
+Opt-in via "batchLint": true in ~/.pilot/config.json (or PILOT_BATCH_LINT=1).
+In batch mode file_checker only formats on each edit and records the file
+here; this Stop hook then lints every file touched during the turn with one
+invocation per tool (ruff over all Python files, eslint per package.json
+project, go vet and golangci-lint per package) and reports the consolidated
+findings through stop_block. Like the per-edit checks, it reports only
+issues that are new since the previous check of each file.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from _checkers.go import _format_go_issues, _go_delta
+from _checkers.python import _format_python_issues, _python_delta
+from _checkers.typescript import (
+    TS_EXTENSIONS,
+    _format_typescript_issues,
+    _typescript_delta,
+    find_project_root,
+    find_tool,
+)
+from _trace import traced_main, traced_run
+from _util import (
+    _read_config,
+    _sessions_base,
+    assess_file,
+    get_project_root,
+    is_waiting_for_user_input,
+    stop_block,
+)
+
+STOP_BUDGET_SECONDS = 50.0
+TOUCHED_FILE = "touched-files.txt"
+
+_RUFF_LINE = re.compile(r"^(.+?):\d+:\d+: [A-Z]{1,3}\d+")
+
+
+def is_batch_lint_enabled() -> bool:
+    """Check whether turn-level batched linting is switched on."""
+    env = os.environ.get("PILOT_BATCH_LINT", "").strip().lower()
+    if env:
+        return env in ("1", "true", "on")
+    return _read_config().get("batchLint") is True
+
+
+def get_touched_path() -> Path:
+    """Get the session-scoped list of files edited since the last Stop."""
+    session_id = os.environ.get("PILOT_SESSION_ID", "").strip() or "default"
+    return _sessions_base() / session_id / TOUCHED_FILE
+
+
+def record_touched(file_path: Path) -> None:
+    """Append an edited file to the session's touched list (atomic O_APPEND line write)."""
+    path = get_touched_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        try:
+            os.write(fd, (str(file_path.resolve()) + "\n").encode())
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def pop_touched() -> list[Path]:
+    """Claim and clear the touched list, returning existing files in first-touched order."""
+    path = get_touched_path()
+    claimed = path.with_name(f"{TOUCHED_FILE}.{os.getpid()}")
+    try:
+        os.replace(path, claimed)
+        lines = claimed.read_text().splitlines()
+        claimed.unlink()
+    except OSError:
+        return []
+    return [Path(p) for p in dict.fromkeys(lines) if p and Path(p).is_file()]
+
+
+def _remaining(deadline: float) -> float:
+    return max(deadline - time.monotonic(), 1.0)
+
+
+def _run(cmd: list[str], deadline: float, cwd: Path | None = None) -> subprocess.CompletedProcess | None:
+    try:
+        return traced_run(cmd, capture_output=True, text=True, check=False, cwd=cwd, timeout=_remaining(deadline))
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+
+
+def lint_python(files: list[Path], deadline: float) -> list[str]:
+    """Lint all Python files with a single ruff invocation."""
+    files = [f for f in files if "test_" not in f.name and "spec" not in f.name]
+    ruff_bin = shutil.which("ruff")
+    if not files or not ruff_bin:
+        return []
+    result = _run([ruff_bin, "check", "--output-format=concise", *map(str, files)], deadline)
+    if result is None:
+        return []
+
+    by_file: dict[Path, list[str]] = {}
+    for line in (result.stdout + result.stderr).splitlines():
+        match = _RUFF_LINE.match(line)
+        if match:
+            by_file.setdefault(Path(match.group(1)).resolve(), []).append(line)
+
+    reasons = []
+    for f in files:
+        lines = by_file.get(f.resolve(), [])
+        results: dict[str, tuple] = {"ruff": (len(lines), lines)} if lines else {}
+        unchanged = _python_delta(f, results)
+        if results:
+            reasons.append(_format_python_issues(f, results, unchanged))
+    return reasons
+
+
+def lint_typescript(files: list[Path], deadline: float) -> list[str]:
+    """Lint TypeScript/JavaScript files with one eslint invocation per package.json project."""
+    projects: dict[Path | None, list[Path]] = {}
+    for f in files:
+        if ".test." not in f.name and ".spec." not in f.name:
+            projects.setdefault(find_project_root(f), []).append(f)
+
+    reasons = []
+    for project_root, project_files in projects.items():
+        eslint_bin = find_tool("eslint", project_root)
+        if not eslint_bin:
+            continue
+        result = _run([eslint_bin, "--format", "json", *map(str, project_files)], deadline, cwd=project_root)
+        try:
+            data = json.loads(result.stdout) if result else []
+        except json.JSONDecodeError:
+            continue
+        for file_result in data:
+            path = Path(file_result.get("filePath", ""))
+            results: dict[str, tuple] = {
+                "eslint": (file_result.get("errorCount", 0), file_result.get("warningCount", 0), [file_result])
+            }
+            unchanged = _typescript_delta(path, results)
+            if results:
+                reasons.append(_format_typescript_issues(path, results, unchanged))
+    return reasons
+
+
+def lint_go(files: list[Path], deadline: float) -> list[str]:
+    """Run go vet and golangci-lint once per touched package."""
+    go_bin = shutil.which("go")
+    if not go_bin:
+        return []
+    golangci_lint_bin = shutil.which("golangci-lint")
+    packages = dict.fromkeys(f.parent for f in files if not f.name.endswith("_test.go"))
+
+    reasons = []
+    for package in packages:
+        results: dict[str, tuple] = {}
+        vet = _run([go_bin, "vet", "."], deadline, cwd=package)
+        if vet is not None:
+            lines = [
+                line.strip()
+                for line in (vet.stdout + vet.stderr).splitlines()
+                if line.strip() and not line.strip().startswith("#")
+            ]
+            if lines:
+                results["vet"] = (len(lines), lines)
+        if golangci_lint_bin:
+            lint = _run([golangci_lint_bin, "run", "--fast", "."], deadline, cwd=package)
+            if lint is not None and lint.returncode != 0:
+                lines = [line.strip() for line in (lint.stdout + lint.stderr).splitlines() if line.strip()]
+                issue_count = len([line for line in lines if ": " in line])
+                if issue_count:
+                    results["lint"] = (issue_count, lines)
+        unchanged = _go_delta(package, results, base=package) if vet is not None else 0
+        if results:
+            reasons.append(_format_go_issues(package, results, unchanged))
+    return reasons
+
+
+def lint_files(files: list[Path], deadline: float) -> list[str]:
+    """Lint touched files grouped by language; returns one formatted block per file or package."""
+    return [
+        *lint_python([f for f in files if f.suffix == ".py"], deadline),
+        *lint_typescript([f for f in files if f.suffix in TS_EXTENSIONS], deadline),
+        *lint_go([f for f in files if f.suffix == ".go"], deadline),
+    ]
+
+
+def main() -> int:
+    """Lint everything edited this turn and block the stop if there are findings."""
+    try:
+        input_data = json.load(sys.stdin)
+    except json.JSONDecodeError:
+        return 0
+
+    if input_data.get("stop_hook_active", False) or not is_batch_lint_enabled():
+        return 0
+
+    transcript_path = input_data.get("transcript_path", "")
+    if transcript_path and is_waiting_for_user_input(transcript_path):
+        return 0
+
+    files = [f for f in pop_touched() if assess_file(f)[0] == "full"]
+    if not files:
+        return 0
+
+    os.chdir(get_project_root())
+    reasons = lint_files(files, time.monotonic() + STOP_BUDGET_SECONDS)
+    if reasons:
+        header = f"Lint findings in {len(reasons)} of {len(files)} file(s) edited this turn:"
+        print(stop_block("\n\n".join([header, *reasons])))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(traced_main("batch_lint", main))
@@ -0,0 +1,56 @@
+"""Run a hook script under instrumentation and record what it did.
+
+Usage: python [flags] _bootstrap.py <hook.py> [args...]
+
+Counts subprocesses the hook spawns (via audit events) and bytes it reads
+(/proc/self/io rchar delta, Linux only), then writes them as JSON to the
+path in PILOT_BENCH_STATS when the hook exits. Stdlib only, so it works
+under the same -S/-E flags the hooks run with.
+"""
+
+import atexit
+import json
+import os
+import runpy
+import sys
+
+_SPAWN_EVENTS = {"subprocess.Popen", "os.system", "os.posix_spawn", "os.spawn", "os.exec"}
+_stats = {"subprocesses": 0, "bytes_read": None}
+
+
+def _rchar() -> int | None:
+    try:
+        with open("/proc/self/io", "rb", buffering=0) as f:
+            for line in f.read().splitlines():
+                if line.startswith(b"rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _audit(event: str, _args: tuple) -> None:
+    if event in _SPAWN_EVENTS:
+        _stats["subprocesses"] += 1
+
+
+def _write_stats(start_rchar: int | None) -> None:
+    end_rchar = _rchar()
+    if start_rchar is not None and end_rchar is not None:
+        _stats["bytes_read"] = end_rchar - start_rchar
+    stats_path = os.environ.get("PILOT_BENCH_STATS")
+    if stats_path:
+        with open(stats_path, "w") as f:
+            json.dump(_stats, f)
+
+
+def main() -> None:
+    script = sys.argv[1]
+    sys.argv = sys.argv[1:]
+    atexit.register(_write_stats, _rchar())
+    sys.addaudithook(_audit)
+    runpy.run_path(script, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
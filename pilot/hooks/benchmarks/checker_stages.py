@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Benchmark file_checker's concurrent stages against running them one by one.
+
+Times each stage of the quality gate on its own (language formatter/linter,
+failing-test lookup, test-file lookup), then the whole file_checker.main,
+for Python and TypeScript edits in a synthetic repo with an isolated HOME.
+With concurrent stages the hook's wall time should track the slowest stage,
+not the sum of all of them.
+
+    python pilot/hooks/benchmarks/checker_stages.py --iterations 10
+    python pilot/hooks/benchmarks/checker_stages.py --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import _budget
+import file_checker
+from _budget import percentile
+from _failing_tests import has_failing_test_for
+from synthetic import make_repo
+
+STAGES = ("language", "failing_tests", "test_files")
+
+
+def _time(func, *args, **kwargs) -> float:
+    began = time.perf_counter()
+    func(*args, **kwargs)
+    return (time.perf_counter() - began) * 1000
+
+
+def _stage_times(target: Path) -> dict[str, float]:
+    """Run each stage sequentially and return its wall time in ms."""
+    _budget.start(target.parent)
+    times = {"language": _time(file_checker._language_check, target, True)}
+    _budget.finish()
+    times["failing_tests"] = _time(has_failing_test_for, str(target))
+    times["test_files"] = _time(file_checker._missing_test_reminder, str(target))
+    return times
+
+
+def _hook_time(target: Path) -> float:
+    """Run file_checker.main for a Write of target and return its wall time in ms."""
+    payload = {"tool_name": "Write", "tool_input": {"file_path": str(target), "content": target.read_text()}}
+    stdin = sys.stdin
+    sys.stdin = io.StringIO(json.dumps(payload))
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return _time(file_checker.main)
+    finally:
+        sys.stdin = stdin
+
+
+def run_benchmark(args: argparse.Namespace) -> dict[str, dict]:
+    """Benchmark one Python and one TypeScript edit."""
+    with tempfile.TemporaryDirectory(prefix="checker-stages-") as tmp:
+        tmp_path = Path(tmp)
+        os.environ.update(
+            {
+                "HOME": str(tmp_path / "home"),
+                "PILOT_SESSION_ID": "bench",
+                "PILOT_HOOK_TRACE": "0",
+                "PILOT_BATCH_LINT": "0",
+                "PILOT_IMPACT_TESTS": "0",
+            }
+        )
+        repo = make_repo(tmp_path / "repo", files=args.repo_files, lines=args.file_lines)
+        cwd = Path.cwd()
+        results = {}
+        try:
+            for label, target in (
+                ("python", repo / "src" / "module_0.py"),
+                ("typescript", repo / "web" / "component_0.ts"),
+            ):
+                _hook_time(target)
+                staged: dict[str, list[float]] = {stage: [] for stage in STAGES}
+                sums, maxes, hooks = [], [], []
+                for _ in range(args.iterations):
+                    times = _stage_times(target)
+                    for stage in STAGES:
+                        staged[stage].append(times[stage])
+                    sums.append(sum(times.values()))
+                    maxes.append(max(times.values()))
+                    hooks.append(_hook_time(target))
+                results[label] = {
+                    **{f"{stage}_p50_ms": round(percentile(staged[stage], 50), 2) for stage in STAGES},
+                    "sum_p50_ms": round(percentile(sums, 50), 2),
+                    "max_p50_ms": round(percentile(maxes, 50), 2),
+                    "hook_p50_ms": round(percentile(hooks, 50), 2),
+                }
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def format_report(results: dict[str, dict]) -> str:
+    """Format results as a fixed-width table."""
+    columns = [*(f"{stage}_p50_ms" for stage in STAGES), "sum_p50_ms", "max_p50_ms", "hook_p50_ms"]
+    header = f"{'edit':<12}" + "".join(f"{c.removesuffix('_p50_ms'):>15}" for c in columns)
+    lines = [header, "-" * len(header)]
+    for label, r in results.items():
+        lines.append(f"{label:<12}" + "".join(f"{r[c]:>15.1f}" for c in columns))
+    lines.append("p50 wall time in ms; hook runs the stages concurrently, sum is what running them in turn costs")
+    return "\n".join(lines)
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the benchmark argument parser."""
+    parser = argparse.ArgumentParser(description="Benchmark file_checker stage concurrency")
+    parser.add_argument("--iterations", type=int, default=10, help="Runs per edit")
+    parser.add_argument("--repo-files", type=int, default=20, help="Source files per language in the synthetic repo")
+    parser.add_argument("--file-lines", type=int, default=400, help="Lines per synthetic source file")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark."""
+    args = create_parser().parse_args(argv)
+    results = run_benchmark(args)
+    print(json.dumps(results, indent=2) if args.json else format_report(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Hook latency benchmark.
+
+Replays a JSONL corpus of hook payloads through every Python hook that
+hooks.json wires to the payload's event and matcher, inside a synthetic repo
+with an isolated HOME, and reports p50/p95/p99 wall time, subprocess count
+and bytes read per hook.
+
+    python pilot/hooks/benchmarks/hook_bench.py --iterations 20
+    python pilot/hooks/benchmarks/hook_bench.py --save-baseline bench.json
+    python pilot/hooks/benchmarks/hook_bench.py --baseline bench.json --max-regression 0.25
+
+With --baseline or --max-p95-ms the exit code is 1 when any hook exceeds
+its threshold, so the same command gates CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from _budget import percentile
+from synthetic import expand_payload, load_corpus, make_repo, make_transcript
+
+BENCH_DIR = Path(__file__).resolve().parent
+HOOKS_DIR = BENCH_DIR.parent
+PLUGIN_ROOT = HOOKS_DIR.parent
+BOOTSTRAP = BENCH_DIR / "_bootstrap.py"
+SESSION_ID = "bench"
+
+MATCHER_SUBJECT = {
+    "PreToolUse": "tool_name",
+    "PostToolUse": "tool_name",
+    "SessionStart": "source",
+    "PreCompact": "trigger",
+}
+
+
+def hook_commands(hooks_config: dict, event: str, payload: dict) -> list[str]:
+    """Return the commands hooks.json runs for this event and payload, in order."""
+    subject = str(payload.get(MATCHER_SUBJECT.get(event, ""), ""))
+    commands = []
+    for entry in hooks_config.get("hooks", {}).get(event, []):
+        matcher = entry.get("matcher", "")
+        if matcher in ("", "*") or re.fullmatch(matcher, subject):
+            commands += [hook["command"] for hook in entry.get("hooks", []) if hook.get("type") == "command"]
+    return commands
+
+
+def split_python_command(command: str, interpreter: list[str] | None) -> tuple[list[str], Path] | None:
+    """Split a hook command into (interpreter argv, script). None for non-Python hooks."""
+    argv = shlex.split(command.replace("${CLAUDE_PLUGIN_ROOT}", str(PLUGIN_ROOT)))
+    script_index = next((i for i, token in enumerate(argv) if token.endswith(".py")), None)
+    if script_index is None or script_index == 0:
+        return None
+    prefix = argv[:script_index]
+    if interpreter:
+        prefix = interpreter + [flag for flag in prefix if flag in ("-S", "-E", "-I", "-s")]
+    elif not shutil.which(prefix[0]):
+        prefix = [sys.executable]
+    return prefix, Path(argv[script_index])
+
+
+def _prepare_home(home: Path) -> None:
+    """Seed an isolated HOME so hooks never touch the real session state or a live Console."""
+    session_dir = home / ".pilot" / "sessions" / SESSION_ID
+    session_dir.mkdir(parents=True)
+    (session_dir / "context-pct.json").write_text(json.dumps({"pct": 42.0, "ts": time.time()}))
+    breaker = home / ".pilot" / "cache" / "worker-breaker.json"
+    breaker.parent.mkdir(parents=True)
+    breaker.write_text(json.dumps({"open_until": time.time() + 86400, "backoff": 300}))
+
+
+def run_hook(prefix: list[str], script: Path, payload: dict, cwd: Path, env: dict, stats_path: Path) -> dict:
+    """Run one hook invocation and return wall time and instrumentation stats."""
+    stats_path.unlink(missing_ok=True)
+    data = json.dumps(payload).encode()
+    start = time.perf_counter()
+    result = subprocess.run(
+        [*prefix, str(BOOTSTRAP), str(script)],
+        input=data,
+        capture_output=True,
+        cwd=cwd,
+        env={**env, "PILOT_BENCH_STATS": str(stats_path)},
+        timeout=120,
+    )
+    elapsed = time.perf_counter() - start
+    try:
+        stats = json.loads(stats_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        stats = {"subprocesses": None, "bytes_read": None}
+    return {"seconds": elapsed, "exit_code": result.returncode, "stdin_bytes": len(data), **stats}
+
+
+def run_benchmark(args: argparse.Namespace) -> dict[str, dict]:
+    """Replay the corpus and aggregate per (event, hook) results."""
+    hooks_config = json.loads(Path(args.hooks_json).read_text())
+    corpus = load_corpus(Path(args.corpus))
+    interpreter = shlex.split(args.interpreter) if args.interpreter else None
+
+    samples: dict[str, list[dict]] = {}
+    with tempfile.TemporaryDirectory(prefix="pilot-hook-bench-") as tmp:
+        tmp_path = Path(tmp)
+        repo = make_repo(tmp_path / "repo", files=args.repo_files, lines=args.file_lines)
+        transcript = make_transcript(tmp_path / "transcript.jsonl", messages=args.transcript_messages)
+        home = tmp_path / "home"
+        _prepare_home(home)
+        env = {
+            **os.environ,
+            "HOME": str(home),
+            "PILOT_SESSION_ID": SESSION_ID,
+            "CLAUDE_PROJECT_ROOT": str(repo),
+            "CLAUDE_PLUGIN_ROOT": str(PLUGIN_ROOT),
+        }
+
+        for entry in corpus:
+            payload = expand_payload(entry["payload"], repo, transcript)
+            for command in hook_commands(hooks_config, entry["event"], payload):
+                split = split_python_command(command, interpreter)
+                if split is None:
+                    continue
+                prefix, script = split
+                key = f"{entry['event']}:{script.stem}"
+                for _ in range(args.iterations):
+                    sample = run_hook(prefix, script, payload, repo, env, tmp_path / "stats.json")
+                    samples.setdefault(key, []).append({**sample, "case": entry["name"]})
+
+    return {key: summarize(runs) for key, runs in samples.items()}
+
+
+def summarize(runs: list[dict]) -> dict:
+    """Aggregate samples for one hook."""
+    times_ms = [run["seconds"] * 1000 for run in runs]
+    spawned = [run["subprocesses"] for run in runs if run["subprocesses"] is not None]
+    read = [run["bytes_read"] for run in runs if run["bytes_read"] is not None]
+    return {
+        "runs": len(runs),
+        "p50_ms": round(percentile(times_ms, 50), 2),
+        "p95_ms": round(percentile(times_ms, 95), 2),
+        "p99_ms": round(percentile(times_ms, 99), 2),
+        "subprocesses": round(sum(spawned) / len(spawned), 2) if spawned else None,
+        "bytes_read": int(sum(read) / len(read)) if read else None,
+        "stdin_bytes": max(run["stdin_bytes"] for run in runs),
+        "failures": sum(1 for run in runs if run["exit_code"] not in (0, 2)),
+    }
+
+
+def format_report(results: dict[str, dict]) -> str:
+    """Format results as a fixed-width table."""
+    header = f"{'hook':<34} {'runs':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'spawns':>7} {'KiB read':>9}"
+    lines = [header, "-" * len(header)]
+    for key, r in sorted(results.items()):
+        spawns = "-" if r["subprocesses"] is None else f"{r['subprocesses']:.1f}"
+        kib = "-" if r["bytes_read"] is None else f"{r['bytes_read'] / 1024:.0f}"
+        lines.append(
+            f"{key:<34} {r['runs']:>5} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {spawns:>7} {kib:>9}"
+        )
+    return "\n".join(lines)
+
+
+def check_thresholds(
+    results: dict[str, dict], baseline: dict[str, dict] | None, max_regression: float, max_p95_ms: float | None
+) -> list[str]:
+    """Return a description of every threshold violation."""
+    violations = []
+    for key, r in sorted(results.items()):
+        if r["failures"]:
+            violations.append(f"{key}: {r['failures']} runs exited with an error")
+        if max_p95_ms is not None and r["p95_ms"] > max_p95_ms:
+            violations.append(f"{key}: p95 {r['p95_ms']:.1f} ms exceeds {max_p95_ms:.1f} ms")
+        base = (baseline or {}).get(key)
+        if base and r["p95_ms"] > base["p95_ms"] * (1 + max_regression):
+            violations.append(
+                f"{key}: p95 {r['p95_ms']:.1f} ms regressed more than {max_regression:.0%} "
+                f"from baseline {base['p95_ms']:.1f} ms"
+            )
+    return violations
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the benchmark argument parser."""
+    parser = argparse.ArgumentParser(description="Benchmark Pilot hook latency")
+    parser.add_argument("--corpus", default=str(BENCH_DIR / "corpus.jsonl"), help="JSONL corpus of hook payloads")
+    parser.add_argument("--hooks-json", default=str(HOOKS_DIR / "hooks.json"), help="hooks.json to replay")
+    parser.add_argument("--iterations", type=int, default=10, help="Runs per hook per corpus entry")
+    parser.add_argument("--interpreter", help="Override the configured interpreter (e.g. '/usr/bin/python3')")
+    parser.add_argument("--repo-files", type=int, default=20, help="Source files per language in the synthetic repo")
+    parser.add_argument("--file-lines", type=int, default=400, help="Lines per synthetic source file")
+    parser.add_argument("--transcript-messages", type=int, default=2000, help="Messages in the synthetic transcript")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--save-baseline", help="Write results to this file for later comparison")
+    parser.add_argument("--baseline", help="Compare p95 against this baseline file")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="Allowed p95 increase over baseline")
+    parser.add_argument("--max-p95-ms", type=float, help="Absolute p95 limit per hook")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark and apply thresholds."""
+    args = create_parser().parse_args(argv)
+    results = run_benchmark(args)
+
+    print(json.dumps(results, indent=2) if args.json else format_report(results))
+
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(results, indent=2) + "\n")
+
+    baseline = json.loads(Path(args.baseline).read_text()) if args.baseline else None
+    if baseline is None and args.max_p95_ms is None:
+        return 0
+    violations = check_thresholds(results, baseline, args.max_regression, args.max_p95_ms)
+    for violation in violations:
+        print(f"FAIL {violation}", file=sys.stderr)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Synthetic repositories, transcripts and payload expansion for hook benchmarks.
+
+Corpus payloads are plain hook stdin JSON with a few placeholders:
+
+- "{repo}" / "{transcript}" inside strings expand to the synthetic repo and
+  transcript paths.
+- {"$file": "src/module_0.py"} expands to that repo file's content, so
+  Write/Edit payloads carry realistically large bodies.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+from pathlib import Path
+from typing import Any
+
+
+def _python_source(index: int, lines: int) -> str:
+    """Generate a typed Python module of roughly the given line count."""
+    out = ['"""Synthetic module for hook benchmarks."""', "", "from __future__ import annotations", ""]
+    fn = 0
+    while len(out) < lines:
+        out += [
+            "",
+            f"def handler_{index}_{fn}(items: list[int], factor: int = {fn + 1}) -> int:",
+            f'    """Sum scaled items for case {fn}."""',
+            "    total = 0",
+            "    for item in items:",
+            "        total += item * factor",
+            "    return total",
+        ]
+        fn += 1
+    return "\n".join(out[:lines]) + "\n"
+
+
+def _typescript_source(index: int, lines: int) -> str:
+    """Generate a TypeScript module of roughly the given line count."""
+    out = ["// Synthetic module for hook benchmarks.", ""]
+    fn = 0
+    while len(out) < lines:
+        out += [
+            "",
+            f"export function handler{index}_{fn}(items: number[], factor = {fn + 1}): number {{",
+            "  let total = 0;",
+            "  for (const item of items) {",
+            "    total += item * factor;",
+            "  }",
+            "  return total;",
+            "}",
+        ]
+        fn += 1
+    return "\n".join(out[:lines]) + "\n"
+
+
+def make_repo(root: Path, files: int = 20, lines: int = 400) -> Path:
+    """Create a committed git repo with Python and TypeScript sources plus tests."""
+    (root / "src").mkdir(parents=True, exist_ok=True)
+    (root / "web").mkdir(exist_ok=True)
+    (root / "tests").mkdir(exist_ok=True)
+    (root / "docs" / "plans").mkdir(parents=True, exist_ok=True)
+    for i in range(files):
+        (root / "src" / f"module_{i}.py").write_text(_python_source(i, lines))
+        (root / "web" / f"component_{i}.ts").write_text(_typescript_source(i, lines))
+        (root / "tests" / f"test_module_{i}.py").write_text(
+            f"from src.module_{i} import handler_{i}_0\n\n\ndef test_handler():\n    assert handler_{i}_0([1]) == 1\n"
+        )
+
+    git = ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com"]
+    try:
+        subprocess.run([*git, "init", "-q"], cwd=root, check=True, capture_output=True)
+        subprocess.run([*git, "add", "."], cwd=root, check=True, capture_output=True)
+        subprocess.run([*git, "commit", "-q", "-m", "synthetic"], cwd=root, check=True, capture_output=True)
+    except (subprocess.CalledProcessError, OSError):
+        pass
+    return root
+
+
+def make_transcript(path: Path, messages: int = 2000, tool_result_bytes: int = 2000) -> Path:
+    """Create a Claude Code style JSONL transcript with alternating turns and tool results."""
+    filler = "x" * tool_result_bytes
+    with path.open("w") as f:
+        for i in range(messages):
+            if i % 2 == 0:
+                entry = {"type": "user", "message": {"content": [{"type": "tool_result", "content": filler}]}}
+            else:
+                entry = {
+                    "type": "assistant",
+                    "message": {"content": [{"type": "tool_use", "name": "Edit", "input": {"file_path": f"f{i}.py"}}]},
+                }
+            f.write(json.dumps(entry) + "\n")
+    return path
+
+
+def expand_payload(value: Any, repo: Path, transcript: Path) -> Any:
+    """Expand corpus placeholders in a payload."""
+    if isinstance(value, str):
+        return value.replace("{repo}", str(repo)).replace("{transcript}", str(transcript))
+    if isinstance(value, list):
+        return [expand_payload(item, repo, transcript) for item in value]
+    if isinstance(value, dict):
+        if set(value) == {"$file"}:
+            return (repo / value["$file"]).read_text()
+        return {key: expand_payload(item, repo, transcript) for key, item in value.items()}
+    return value
+
+
+def load_corpus(path: Path) -> list[dict]:
+    """Load corpus entries, skipping blank lines."""
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Summarize a session's hook trace ring buffer.
+
+Reads ~/.pilot/sessions/<id>/hook-trace.bin (written by the hooks through
+_trace.traced_main) and reports the slowest hook invocations, overhead per
+hook and per tool, child process totals and a time series of hook cost.
+
+    python pilot/hooks/benchmarks/trace_report.py --session 1234
+    python pilot/hooks/benchmarks/trace_report.py --top 20 --bucket 300
+    python pilot/hooks/benchmarks/trace_report.py --file /tmp/hook-trace.bin --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from _budget import percentile
+from _trace import KIND_HOOK, KIND_SPAN, KIND_SUBPROCESS, get_trace_path, read_trace
+
+
+def _aggregate(records: list[dict], key: str) -> dict[str, dict]:
+    """Group records by a field and compute count/total/mean/p95 of their durations."""
+    groups: dict[str, list[float]] = {}
+    for record in records:
+        groups.setdefault(record[key] or "-", []).append(record["duration_ms"])
+    return {
+        name: {
+            "count": len(samples),
+            "total_ms": round(sum(samples), 3),
+            "mean_ms": round(sum(samples) / len(samples), 3),
+            "p95_ms": round(percentile(samples, 95), 3),
+        }
+        for name, samples in groups.items()
+    }
+
+
+def _timeline(hooks: list[dict], bucket_seconds: int) -> list[dict]:
+    """Sum hook wall time per fixed-size time bucket."""
+    buckets: dict[int, list[float]] = {}
+    for record in hooks:
+        buckets.setdefault(int(record["ts"] // bucket_seconds) * bucket_seconds, []).append(record["duration_ms"])
+    return [
+        {"start": start, "count": len(samples), "total_ms": round(sum(samples), 3)}
+        for start, samples in sorted(buckets.items())
+    ]
+
+
+def build_report(records: list[dict], top: int = 10, bucket_seconds: int = 60) -> dict:
+    """Build the full report from trace records."""
+    hooks = [r for r in records if r["kind"] == KIND_HOOK]
+    by_pid: dict[int, list[dict]] = {}
+    for record in records:
+        if record["kind"] != KIND_HOOK:
+            by_pid.setdefault(record["pid"], []).append(record)
+
+    slowest = []
+    for record in sorted(hooks, key=lambda r: r["duration_ms"], reverse=True)[:top]:
+        end = record["ts"] + record["duration_ms"] / 1000
+        children = [c for c in by_pid.get(record["pid"], []) if record["ts"] <= c["ts"] <= end]
+        slowest.append(
+            {
+                "ts": record["ts"],
+                "hook": record["hook"],
+                "event": record["event"],
+                "tool": record["tool"],
+                "duration_ms": round(record["duration_ms"], 3),
+                "exit_code": record["exit_code"],
+                "spans": [
+                    {"kind": "subprocess" if c["kind"] == KIND_SUBPROCESS else "span", **_brief(c)} for c in children
+                ],
+            }
+        )
+
+    return {
+        "records": len(records),
+        "invocations": len(hooks),
+        "total_ms": round(sum(r["duration_ms"] for r in hooks), 3),
+        "slowest": slowest,
+        "by_hook": _aggregate(hooks, "hook"),
+        "by_tool": _aggregate([r for r in hooks if r["tool"]], "tool"),
+        "subprocesses": _aggregate([r for r in records if r["kind"] == KIND_SUBPROCESS], "label"),
+        "spans": _aggregate([r for r in records if r["kind"] == KIND_SPAN], "label"),
+        "timeline": _timeline(hooks, bucket_seconds),
+    }
+
+
+def _brief(record: dict) -> dict:
+    return {"label": record["label"], "duration_ms": round(record["duration_ms"], 3), "exit_code": record["exit_code"]}
+
+
+def _format_table(title: str, groups: dict[str, dict]) -> list[str]:
+    if not groups:
+        return []
+    header = f"{title:<40} {'count':>6} {'total ms':>10} {'mean ms':>9} {'p95 ms':>9}"
+    lines = ["", header, "-" * len(header)]
+    for name, g in sorted(groups.items(), key=lambda item: item[1]["total_ms"], reverse=True):
+        lines.append(f"{name[:40]:<40} {g['count']:>6} {g['total_ms']:>10.1f} {g['mean_ms']:>9.1f} {g['p95_ms']:>9.1f}")
+    return lines
+
+
+def format_report(report: dict) -> str:
+    """Format a report as plain-text tables."""
+    lines = [f"{report['invocations']} hook invocations, {report['total_ms'] / 1000:.2f}s total"]
+
+    if report["slowest"]:
+        lines += ["", "Slowest invocations", "-" * 19]
+        for s in report["slowest"]:
+            when = time.strftime("%H:%M:%S", time.localtime(s["ts"]))
+            subject = f"{s['event']}:{s['tool']}" if s["tool"] else s["event"]
+            lines.append(f"{when} {s['duration_ms']:>9.1f} ms  {s['hook']} ({subject}) exit={s['exit_code']}")
+            for span in s["spans"]:
+                lines.append(f"{'':>10}{span['duration_ms']:>9.1f} ms    {span['kind']}: {span['label']}")
+
+    lines += _format_table("hook", report["by_hook"])
+    lines += _format_table("tool", report["by_tool"])
+    lines += _format_table("subprocess", report["subprocesses"])
+    lines += _format_table("span", report["spans"])
+
+    if report["timeline"]:
+        peak = max(b["total_ms"] for b in report["timeline"]) or 1
+        lines += ["", "Hook time per bucket", "-" * 20]
+        for b in report["timeline"]:
+            when = time.strftime("%H:%M:%S", time.localtime(b["start"]))
+            bar = "#" * max(1, round(b["total_ms"] / peak * 40))
+            lines.append(f"{when} {b['count']:>5} {b['total_ms']:>9.1f} ms {bar}")
+
+    return "\n".join(lines)
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(description="Report on Pilot hook traces")
+    parser.add_argument("--session", help="Session id (default: PILOT_SESSION_ID or 'default')")
+    parser.add_argument("--file", help="Read this trace file instead of the session's")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest invocations to list")
+    parser.add_argument("--bucket", type=int, default=60, help="Time series bucket size in seconds")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print the trace report for a session."""
+    args = create_parser().parse_args(argv)
+    path = Path(args.file) if args.file else get_trace_path(args.session)
+    records = read_trace(path)
+    if not records:
+        print(f"No hook trace records in {path}", file=sys.stderr)
+        return 1
+
+    report = build_report(records, top=args.top, bucket_seconds=max(args.bucket, 1))
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Context monitor - warns when context usage is high."""
+"""Context monitor - warns when context usage is high or growing fast enough to compact soon."""
 
 from __future__ import annotations
 
@@ -10,16 +10,29 @@ import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
+from _context_forecast import (
+    THROTTLE_SECONDS,
+    add_sample,
+    collect_skips,
+    forecast,
+    load_state,
+    record_skip,
+    save_state,
+    throttle_seconds,
+)
+from _trace import traced_main
 from _util import (
     _get_compaction_threshold_pct,
     _get_max_context_tokens,
     get_session_cache_path,
     post_tool_use_context,
+    read_json_fields,
 )
 
 THRESHOLD_WARN = 65
 THRESHOLD_AUTOCOMPACT = 75
 LEARN_THRESHOLDS = [40, 55, 65]
+FORECAST_WARN_CALLS = 10
 
 
 def _to_effective(raw_pct: float) -> float:
@@ -46,11 +59,16 @@ def get_session_flags(session_id: str) -> tuple[list[int], bool]:
 
 
 def save_cache(
-    tokens: int, session_id: str, shown_learn: list[int] | None = None, shown_80_warn: bool | None = None
+    tokens: int,
+    session_id: str,
+    shown_learn: list[int] | None = None,
+    shown_80_warn: bool | None = None,
+    throttle: float | None = None,
 ) -> None:
     """Save context calculation to cache with session ID."""
     existing_shown: list[int] = []
     existing_80_warn = False
+    existing_throttle = THROTTLE_SECONDS
     if get_session_cache_path().exists():
         try:
             with get_session_cache_path().open() as f:
@@ -58,6 +76,7 @@ def save_cache(
                 if cache.get("session_id") == session_id:
                     existing_shown = cache.get("shown_learn", [])
                     existing_80_warn = cache.get("shown_80_warn", False)
+                    existing_throttle = cache.get("throttle_seconds", THROTTLE_SECONDS)
         except (json.JSONDecodeError, OSError):
             pass
 
@@ -65,6 +84,8 @@ def save_cache(
         existing_shown = list(set(existing_shown + shown_learn))
     if shown_80_warn:
         existing_80_warn = True
+    if throttle is not None:
+        existing_throttle = throttle
 
     try:
         with get_session_cache_path().open("w") as f:
@@ -75,6 +96,7 @@ def save_cache(
                     "session_id": session_id,
                     "shown_learn": existing_shown,
                     "shown_80_warn": existing_80_warn,
+                    "throttle_seconds": existing_throttle,
                 },
                 f,
             )
@@ -109,10 +131,12 @@ def _is_throttled(session_id: str) -> bool:
     """Check if context monitoring should be throttled (skipped).
 
     Returns True if:
-    - Last check was < 30 seconds ago AND
+    - Last check was within the throttle window AND
     - Last cached context was below the warning threshold (~80% effective)
 
-    Always returns False at high context (never throttle when approaching compaction).
+    The window is sized from the growth forecast at the last check (30s until
+    there is one) and is 0 when compaction is a few calls away. Always
+    returns False at high context (never throttle when approaching compaction).
     """
     cache_path = get_session_cache_path()
     if not cache_path.exists():
@@ -128,7 +152,7 @@ def _is_throttled(session_id: str) -> bool:
             if timestamp is None:
                 return False
 
-            if time.time() - timestamp < 30:
+            if time.time() - timestamp < cache.get("throttle_seconds", THROTTLE_SECONDS):
                 tokens = cache.get("tokens", 0)
                 percentage = (tokens / _get_max_context_tokens()) * 100
                 if percentage < THRESHOLD_WARN:
@@ -139,6 +163,30 @@ def _is_throttled(session_id: str) -> bool:
         return False
 
 
+def _read_tool_name() -> str:
+    """Get the tool name from the hook payload without decoding the tool response."""
+    try:
+        return str(read_json_fields(sys.stdin, ("tool_name",))[0].get("tool_name", ""))
+    except (OSError, ValueError):
+        return ""
+
+
+def _update_forecast(percentage: float) -> tuple[dict | None, dict]:
+    """Record this check's sample and return (forecast, forecast state)."""
+    state = load_state()
+    collect_skips(state)
+    add_sample(state, time.time(), _read_tool_name(), percentage)
+    state["forecast"] = forecast(state["samples"], _get_compaction_threshold_pct())
+    return state["forecast"], state
+
+
+def _forecast_note(prediction: dict | None) -> str:
+    calls = prediction["calls_until_compaction"] if prediction else None
+    if calls is None:
+        return ""
+    return f" About {calls} tool calls left at the current rate (~{prediction['pct_per_call']:.1f}% per call)."
+
+
 def _resolve_context(session_id: str) -> tuple[float, int, list[int], bool] | None:
     """Resolve context percentage and tokens. Returns (pct, tokens, shown_learn, shown_80) or None.
     Uses the session-scoped statusline cache (context-pct.json) which is
@@ -157,6 +205,7 @@ def run_context_monitor() -> int:
     session_id = _get_pilot_session_id()
 
     if _is_throttled(session_id):
+        record_skip()
         return 0
 
     resolved = _resolve_context(session_id)
@@ -166,7 +215,9 @@ def run_context_monitor() -> int:
     percentage, total_tokens, shown_learn, shown_80_warn = resolved
     effective = _to_effective(percentage)
 
-    save_cache(total_tokens, session_id)
+    prediction, forecast_state = _update_forecast(percentage)
+    throttle = throttle_seconds(prediction, percentage, [*LEARN_THRESHOLDS, THRESHOLD_WARN, THRESHOLD_AUTOCOMPACT])
+    save_cache(total_tokens, session_id, throttle=throttle)
 
     new_learn_shown: list[int] = []
     if percentage < THRESHOLD_AUTOCOMPACT:
@@ -186,8 +237,10 @@ def run_context_monitor() -> int:
             post_tool_use_context(
                 f"Context at {effective:.0f}%. Auto-compact approaching — no rush, no context is lost. "
                 f"Complete current task with full quality. Do NOT cut corners or skip verification."
+                f"{_forecast_note(prediction)}"
             )
         )
+        save_state(forecast_state)
         return 0
 
     if percentage >= THRESHOLD_WARN and not shown_80_warn:
@@ -195,20 +248,38 @@ def run_context_monitor() -> int:
         print(
             post_tool_use_context(
                 f"Context at {effective:.0f}%. Auto-compact will handle context management automatically. No rush."
+                f"{_forecast_note(prediction)}"
             )
         )
+        save_state(forecast_state)
         return 0
 
     if percentage >= THRESHOLD_WARN and shown_80_warn:
         if new_learn_shown:
             save_cache(total_tokens, session_id, new_learn_shown)
+        save_state(forecast_state)
         return 0
 
     if new_learn_shown:
         save_cache(total_tokens, session_id, new_learn_shown)
+    elif (
+        prediction
+        and prediction["calls_until_compaction"] is not None
+        and prediction["calls_until_compaction"] <= FORECAST_WARN_CALLS
+        and not forecast_state.get("warned")
+    ):
+        forecast_state["warned"] = True
+        print(
+            post_tool_use_context(
+                f"Context {effective:.0f}% and growing fast — auto-compact expected within "
+                f"~{prediction['calls_until_compaction']} tool calls (~{prediction['pct_per_call']:.1f}% per call). "
+                f"Finish the current step before starting large reads or sub-agents."
+            )
+        )
 
+    save_state(forecast_state)
     return 0
 
 
 if __name__ == "__main__":
-    sys.exit(run_context_monitor())
+    sys.exit(traced_main("context_monitor", run_context_monitor))
@@ -3,46 +3,53 @@
 Runs both checks and produces one combined warning via additionalContext
 to avoid duplicate system-reminders from multiple hooks in the same group.
 Warnings are non-blocking — they inform but never prevent edits.
+
+With batch linting enabled (see batch_lint.py) only the formatters run here;
+the file is recorded and linted together with the turn's other edits at Stop.
+
+Files that are generated, minified or past the size limits in
+_util.assess_file get formatting only or no formatting/linting at all, and
+the output says so.
+
+With impacted-test runs enabled (see _impact.py) each edit also queues a
+background run of the tests that import the file; results arrive on a later edit.
 """
 
 from __future__ import annotations
 
-import json
 import os
 import sys
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
 sys.path.insert(0, str(Path(__file__).parent))
+import _budget
 from _checkers.go import check_go
 from _checkers.python import check_python
 from _checkers.typescript import TS_EXTENSIONS, check_typescript
-from _util import find_git_root, post_tool_use_context
+from _failing_tests import has_failing_test_for
+from _impact import collect_results, is_impact_enabled, request_run
+from _trace import hook_span, traced_main
+from _util import assess_file, check_file_length, find_git_root, get_project_root, post_tool_use_context
+from batch_lint import is_batch_lint_enabled, record_touched
 from tdd_enforcer import (
     has_go_test_file,
     has_python_test_file,
-    has_related_failing_test,
     has_typescript_test_file,
     is_test_file,
     is_trivial_edit,
+    read_edit_hook_input,
     should_skip,
 )
 
+STAGE_THREADS = 3
 
-def _tdd_check(tool_name: str, tool_input: dict, file_path: str) -> str:
-    """Run TDD enforcement, return warning message or empty string."""
-    if should_skip(file_path) or is_test_file(file_path):
-        return ""
-    if is_trivial_edit(tool_name, tool_input):
-        return ""
 
+def _missing_test_reminder(file_path: str) -> str:
+    """Return a TDD reminder when no test file exists for file_path, else an empty string."""
     if file_path.endswith(".py"):
-        path = Path(file_path).parent
-        for _ in range(10):
-            if has_related_failing_test(str(path), file_path):
-                return ""
-            if path.parent == path:
-                break
-            path = path.parent
         if has_python_test_file(file_path):
             return ""
         module_name = Path(file_path).stem
@@ -63,13 +70,51 @@ def _tdd_check(tool_name: str, tool_input: dict, file_path: str) -> str:
     return ""
 
 
+def _tdd_check(tool_name: str, tool_input: dict, file_path: str, pool: ThreadPoolExecutor | None = None) -> str:
+    """Run TDD enforcement, return warning message or empty string.
+
+    With a pool, the failing-test lookup runs alongside the test-file search
+    instead of gating it.
+    """
+    if should_skip(file_path) or is_test_file(file_path):
+        return ""
+    if is_trivial_edit(tool_name, tool_input):
+        return ""
+
+    if pool is None:
+        return "" if has_failing_test_for(file_path) else _missing_test_reminder(file_path)
+    failing = pool.submit(_traced, "failing_test_lookup", has_failing_test_for, file_path)
+    reminder = _missing_test_reminder(file_path)
+    return "" if failing.result() else reminder
+
+
+def _traced(label: str, func: Callable, *args, **kwargs) -> Any:
+    """Call func inside a trace span (for running stages on the pool)."""
+    with hook_span(label):
+        return func(*args, **kwargs)
+
+
+def _language_check(target_file: Path, lint: bool) -> str:
+    """Run the formatter/linter stage for the file's language; returns the reason text."""
+    if target_file.suffix == ".py":
+        return _traced("check_python", check_python, target_file, lint=lint)[1]
+    if target_file.suffix in TS_EXTENSIONS:
+        return _traced("check_typescript", check_typescript, target_file, lint=lint)[1]
+    if target_file.suffix == ".go":
+        return _traced("check_go", check_go, target_file, lint=lint)[1]
+    return ""
+
+
+def _length_check(target_file: Path) -> str:
+    """Run only the file-length check, for files whose language stage is skipped."""
+    if target_file.suffix in {".py", ".go", *TS_EXTENSIONS}:
+        return _traced("check_file_length", check_file_length, target_file)
+    return ""
+
+
 def main() -> int:
     """Single entry point — file quality + TDD in one pass."""
-    try:
-        hook_data = json.load(sys.stdin)
-    except (json.JSONDecodeError, OSError):
-        return 0
-
+    hook_data = read_edit_hook_input()
     tool_name = hook_data.get("tool_name", "")
     tool_input = hook_data.get("tool_input", {})
     file_path_str = tool_input.get("file_path", "")
@@ -80,21 +125,47 @@ def main() -> int:
     if not target_file.exists():
         return 0
 
-    git_root = find_git_root()
+    git_root = find_git_root(target_file.parent)
     if git_root:
         os.chdir(git_root)
 
-    file_reason = ""
-    if target_file.suffix == ".py":
-        _, file_reason = check_python(target_file)
-    elif target_file.suffix in TS_EXTENSIONS:
-        _, file_reason = check_typescript(target_file)
-    elif target_file.suffix == ".go":
-        _, file_reason = check_go(target_file)
+    deferred_run = bool(os.environ.get(_budget.DEFERRED_TOOLS_ENV))
+    earlier_results = [] if deferred_run else [*collect_results(), *_budget.collect_deferred_results()]
+    _budget.start(git_root or get_project_root())
+
+    mode, safe_mode_note = assess_file(target_file)
+    batch = not deferred_run and is_batch_lint_enabled()
+    if batch and mode == "full":
+        record_touched(target_file)
+    lint = not batch and mode == "full"
 
-    tdd_reason = _tdd_check(tool_name, tool_input, file_path_str)
+    if deferred_run:
+        file_reason = _language_check(target_file, lint) if mode != "skip" else ""
+        _budget.finish()
+        _budget.write_deferred_result(target_file, file_reason)
+        return 0
 
-    reasons = [r for r in (file_reason, tdd_reason) if r]
+    # The stages are independent, so the edit costs the slowest stage rather than
+    # their sum. The file-length check stays in the language stage: it must read
+    # the file before the formatter rewrites it, not during.
+    with ThreadPoolExecutor(max_workers=STAGE_THREADS) as pool:
+        if mode == "skip":
+            check = pool.submit(_length_check, target_file)
+        else:
+            check = pool.submit(_language_check, target_file, lint)
+        tdd = pool.submit(_traced, "tdd_check", _tdd_check, tool_name, tool_input, file_path_str, pool)
+        file_reason, tdd_reason = check.result(), tdd.result()
+
+    notices, deferred_tools = _budget.finish()
+    if deferred_tools:
+        _budget.spawn_deferred(hook_data, target_file, deferred_tools, Path(__file__).resolve())
+
+    if is_impact_enabled():
+        request_run(git_root or get_project_root(), target_file)
+
+    budget_reason = "Checker time budget:\n" + "\n".join(f"  {n}" for n in notices) if notices else ""
+    safe_mode_reason = f"Large file safe mode: {safe_mode_note}" if safe_mode_note else ""
+    reasons = [r for r in (*earlier_results, file_reason, safe_mode_reason, tdd_reason, budget_reason) if r]
     if reasons:
         print(post_tool_use_context("\n".join(reasons)))
 
@@ -102,4 +173,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(traced_main("file_checker", main))
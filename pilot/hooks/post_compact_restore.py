@@ -13,6 +13,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+from _trace import traced_main
 from _util import (
     get_session_plan_path,
     read_hook_stdin,
@@ -100,4 +101,4 @@ def run_post_compact_restore() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(run_post_compact_restore())
+    sys.exit(traced_main("post_compact_restore", run_post_compact_restore))
@@ -9,11 +9,12 @@ from __future__ import annotations
 import json
 import os
 import sys
-import urllib.request
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+from _outbox import enqueue, spawn_drain
+from _trace import traced_main
 from _util import (
     get_session_plan_path,
     read_hook_stdin,
@@ -66,9 +67,12 @@ def _capture_task_list() -> dict | None:
 
 
 def _save_to_worker_api(state: dict, session_id: str) -> bool:
-    """Save state to worker HTTP API.
+    """Queue state for the worker memory API via the local outbox.
 
-    Returns True if successful, False otherwise.
+    Returns True if queued and a drainer was started, False if the outbox is
+    unwritable or the worker is known to be down (the entry is still
+    delivered later once the worker is back). Either way delivery is not
+    confirmed, so callers must not rely on it for post-compaction restore.
     """
     try:
         text_parts = ["Pre-compaction state capture"]
@@ -99,15 +103,9 @@ def _save_to_worker_api(state: dict, session_id: str) -> bool:
             "project": project_name,
         }
 
-        data = json.dumps(payload).encode()
-        req = urllib.request.Request(
-            "http://localhost:41777/api/memory/save",
-            data=data,
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
-        resp = urllib.request.urlopen(req, timeout=5)
-        return resp.status == 200
+        if enqueue("/api/memory/save", payload) is None:
+            return False
+        return spawn_drain()
     except Exception as e:
         print(f"Warning: worker API save failed: {e}", file=sys.stderr)
         return False
@@ -140,8 +138,7 @@ def run_pre_compact() -> int:
     }
 
     saved_to_api = _save_to_worker_api(state, session_id)
-    if not saved_to_api:
-        _save_fallback_file(state, session_id)
+    _save_fallback_file(state, session_id)
 
     if saved_to_api:
         print("🔄 Compaction in progress — Pilot state captured to memory", file=sys.stderr)
@@ -152,4 +149,4 @@ def run_pre_compact() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(run_pre_compact())
+    sys.exit(traced_main("pre_compact", run_pre_compact))
@@ -15,14 +15,27 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
+from _session_leases import count_live_sessions, has_session_leases
+from _trace import traced_main, traced_run
 
 PILOT_BIN = Path.home() / ".pilot" / "bin" / "pilot"
 
 
 def _get_active_session_count() -> int:
+    """Get active session count from session leases.
+
+    Falls back to the pilot binary when no leases exist yet (launchers that
+    predate the lease registry).
+    """
+    if has_session_leases():
+        return count_live_sessions()
+    return _get_active_session_count_from_binary()
+
+
+def _get_active_session_count_from_binary() -> int:
     """Get active session count from the pilot binary."""
     try:
-        result = subprocess.run(
+        result = traced_run(
             [str(PILOT_BIN), "sessions", "--json"],
             capture_output=True,
             text=True,
@@ -48,7 +61,7 @@ def main() -> int:
 
     stop_script = Path(plugin_root) / "scripts" / "worker-service.cjs"
     try:
-        subprocess.run(
+        traced_run(
             ["bun", str(stop_script), "stop"],
             capture_output=True,
             text=True,
@@ -62,4 +75,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(traced_main("session_end", main))
@@ -5,12 +5,13 @@ from __future__ import annotations
 
 import datetime
 import json
-import os
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _util import is_waiting_for_user_input, stop_block
+from _plan_registry import plans_for_day
+from _trace import traced_main
+from _util import get_project_root, is_waiting_for_user_input, stop_block
 
 
 def main() -> int:
@@ -27,17 +28,17 @@ def main() -> int:
     if transcript_path and is_waiting_for_user_input(transcript_path):
         return 0
 
-    project_root = input_data.get("project_root") or os.environ.get("CLAUDE_PROJECT_ROOT") or str(Path.cwd())
+    project_root = input_data.get("project_root") or str(get_project_root())
     plans_dir = Path(project_root) / "docs" / "plans"
 
     today = datetime.date.today().strftime("%Y-%m-%d")
-    if not plans_dir.exists():
+    today_plans = plans_for_day(plans_dir, today)
+    if today_plans is None:
         print(
             stop_block("Plan file not created yet. spec-plan must create a plan file in docs/plans/ before stopping.")
         )
         return 0
 
-    today_plans = list(plans_dir.glob(f"{today}-*.md"))
     if not today_plans:
         print(stop_block(f"Plan file not created yet. Expected a plan file matching: docs/plans/{today}-*.md"))
         return 0
@@ -46,4 +47,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(traced_main("spec_plan_validator", main))
@@ -12,13 +12,14 @@ from __future__ import annotations
 
 import json
 import os
-import re
 import sys
 import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _util import _sessions_base, get_session_plan_path, is_waiting_for_user_input, stop_block
+from _plan_registry import active_plan
+from _trace import traced_main
+from _util import _sessions_base, is_waiting_for_user_input, stop_block
 
 COOLDOWN_SECONDS = 60
 
@@ -32,38 +33,11 @@ def get_stop_guard_path() -> Path:
 
 
 def find_active_plan() -> tuple[Path | None, str | None]:
-    """Find the active plan for THIS session via session-scoped active_plan.json."""
-    plan_json = get_session_plan_path()
-    if not plan_json.exists():
-        return None, None
-
-    try:
-        data = json.loads(plan_json.read_text())
-        plan_path_str = data.get("plan_path", "")
-    except (json.JSONDecodeError, OSError):
-        return None, None
-
-    if not plan_path_str:
-        return None, None
-
-    plan_file = Path(plan_path_str)
-    if not plan_file.is_absolute():
-        project_root = os.environ.get("CLAUDE_PROJECT_ROOT", str(Path.cwd()))
-        plan_file = Path(project_root) / plan_file
-    if not plan_file.exists():
-        return None, None
-
-    try:
-        content = plan_file.read_text()
-        status_match = re.search(r"^Status:\s*(\w+)", content, re.MULTILINE)
-        if not status_match:
-            return None, None
-        status = status_match.group(1).upper()
-        if status not in ("PENDING", "COMPLETE"):
-            return None, None
-        return plan_file, status
-    except OSError:
+    """Find the active plan for THIS session via the session plan registry."""
+    record = active_plan()
+    if record is None or record["status"] not in ("PENDING", "COMPLETE"):
         return None, None
+    return Path(record["path"]), record["status"]
 
 
 def main() -> int:
@@ -113,4 +87,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(traced_main("spec_stop_guard", main))
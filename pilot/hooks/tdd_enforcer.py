@@ -7,13 +7,14 @@ reminder is shown to Claude via decision:block to encourage TDD practices.
 
 from __future__ import annotations
 
-import json
 import re
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _util import post_tool_use_block
+from _failing_tests import has_failing_test_for
+from _trace import traced_main
+from _util import post_tool_use_block, read_json_fields
 
 EXCLUDED_EXTENSIONS = [
     ".md",
@@ -92,40 +93,6 @@ def is_test_file(file_path: str) -> bool:
     return False
 
 
-def has_related_failing_test(project_dir: str, impl_file: str) -> bool:
-    """Check if there's a failing test specifically for this module.
-
-    Looks for test files matching the implementation file name in the
-    pytest lastfailed cache. Only returns True if there's a failing test
-    that appears to be for the module being edited.
-    """
-    cache_file = Path(project_dir) / ".pytest_cache" / "v" / "cache" / "lastfailed"
-
-    if not cache_file.exists():
-        return False
-
-    impl_path = Path(impl_file)
-    module_name = impl_path.stem
-
-    try:
-        with cache_file.open() as f:
-            lastfailed = json.load(f)
-
-        if not lastfailed:
-            return False
-
-        for test_path in lastfailed:
-            test_file = test_path.split("::")[0]
-            test_name = Path(test_file).stem
-
-            if test_name == f"test_{module_name}" or test_name == f"{module_name}_test":
-                return True
-
-        return False
-    except (json.JSONDecodeError, OSError):
-        return False
-
-
 def _find_test_dirs(start: Path) -> list[Path]:
     """Walk up from start to find common test directories."""
     dirs: list[Path] = []
@@ -280,6 +247,27 @@ def is_trivial_edit(tool_name: str, tool_input: dict) -> bool:
     return False
 
 
+def read_edit_hook_input() -> dict:
+    """Read a Write/Edit hook payload from stdin, decoding only the fields the checks use.
+
+    tool_name and tool_input.file_path come first in the payload, so stdin is
+    read only up to them and a Write's file body is never read;
+    old_string/new_string are only read for Edit, where is_trivial_edit
+    needs them.
+    """
+    try:
+        hook_data, head = read_json_fields(sys.stdin, ("tool_name", "tool_input.file_path"))
+        if hook_data.get("tool_name") == "Edit":
+            hook_data, _ = read_json_fields(
+                sys.stdin,
+                ("tool_name", "tool_input.file_path", "tool_input.old_string", "tool_input.new_string"),
+                head,
+            )
+    except (OSError, ValueError):
+        return {}
+    return hook_data
+
+
 def warn(message: str, suggestion: str) -> int:
     """Output JSON block decision to stdout and return 0."""
     reason = f"TDD Reminder: {message}\n    {suggestion}"
@@ -289,11 +277,7 @@ def warn(message: str, suggestion: str) -> int:
 
 def run_tdd_enforcer() -> int:
     """Run TDD enforcement and return exit code."""
-    try:
-        hook_data = json.load(sys.stdin)
-    except (json.JSONDecodeError, OSError):
-        return 0
-
+    hook_data = read_edit_hook_input()
     tool_name = hook_data.get("tool_name", "")
     if tool_name not in ("Write", "Edit"):
         return 0
@@ -312,21 +296,10 @@ def run_tdd_enforcer() -> int:
     if is_trivial_edit(tool_name, tool_input):
         return 0
 
-    if file_path.endswith(".py"):
-        path = Path(file_path).parent
-        found_failing = False
-
-        for _ in range(10):
-            if has_related_failing_test(str(path), file_path):
-                found_failing = True
-                break
-            if path.parent == path:
-                break
-            path = path.parent
-
-        if found_failing:
-            return 0
+    if has_failing_test_for(file_path):
+        return 0
 
+    if file_path.endswith(".py"):
         if has_python_test_file(file_path):
             return 0
 
@@ -360,4 +333,4 @@ def run_tdd_enforcer() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(run_tdd_enforcer())
+    sys.exit(traced_main("tdd_enforcer", run_tdd_enforcer))
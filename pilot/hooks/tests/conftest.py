@@ -1,8 +1,43 @@
-"""Configure sys.path so hook modules are importable in tests."""
+"""Configure sys.path so hook modules are importable in tests, and isolate shared hook state."""
 
+import os
 import sys
 from pathlib import Path
 
+import pytest
+
 _hooks_dir = str(Path(__file__).resolve().parent.parent)
 if _hooks_dir not in sys.path:
     sys.path.insert(0, _hooks_dir)
+
+# Hook processes started by tests inherit this, so they never write trace
+# files into the real ~/.pilot/sessions.
+os.environ["PILOT_HOOK_TRACE"] = "0"
+
+
+@pytest.fixture(autouse=True)
+def isolated_budgets(tmp_path, monkeypatch):
+    """Keep hook caches, latency history, session records and impact runs out of the real home directory."""
+    import _budget
+    import _context_forecast
+    import _diagnostics
+    import _failing_tests
+    import _impact
+    import _import_graph
+    import _plan_registry
+    import _redirect_rules
+
+    monkeypatch.setattr(_budget, "get_budget_dir", lambda: tmp_path / "hook-budgets")
+    monkeypatch.setattr(_budget, "get_deferred_dir", lambda: tmp_path / "deferred-checks")
+    monkeypatch.setattr(_context_forecast, "get_forecast_path", lambda: tmp_path / "context-forecast.json")
+    monkeypatch.setattr(_diagnostics, "get_diagnostics_dir", lambda: tmp_path / "diagnostics")
+    monkeypatch.setattr(_failing_tests, "get_index_dir", lambda: tmp_path / "failing-tests")
+    monkeypatch.setattr(_impact, "get_impact_dir", lambda: tmp_path / "impact")
+    monkeypatch.setattr(_import_graph, "get_index_dir", lambda: tmp_path / "import-graph")
+    monkeypatch.setattr(_plan_registry, "get_registry_path", lambda: tmp_path / "plan-registry.json")
+    monkeypatch.setattr(_redirect_rules, "get_cache_dir", lambda: tmp_path / "tool-redirect")
+    _budget._state.clear()
+    _redirect_rules._tables.clear()
+    yield
+    _budget._state.clear()
+    _redirect_rules._tables.clear()
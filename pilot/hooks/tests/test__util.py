@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import io
 import json
 import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import _util
 from _util import (
     BLUE,
     CYAN,
@@ -18,12 +20,15 @@ from _util import (
     RED,
     YELLOW,
     _sessions_base,
+    extract_json_fields,
     find_git_root,
     get_edited_file_from_stdin,
+    get_project_root,
     get_session_cache_path,
     get_session_plan_path,
     is_waiting_for_user_input,
     read_hook_stdin,
+    read_json_fields,
 )
 
 
@@ -235,6 +240,90 @@ class TestCheckFileLength:
         assert "\033[" not in result
 
 
+class TestCountLines:
+    """Tests for streaming line counting."""
+
+    def test_matches_splitlines(self, tmp_path: Path) -> None:
+        from _util import count_lines
+
+        for content in ("", "a", "a\n", "a\nb", "a\nb\n", "\n\n"):
+            f = tmp_path / "f.txt"
+            f.write_text(content)
+            assert count_lines(f) == len(content.splitlines())
+
+    def test_counts_across_chunks(self, tmp_path: Path) -> None:
+        from _util import count_lines
+
+        f = tmp_path / "f.txt"
+        f.write_text("x\n" * 10)
+        with patch("_util.COUNT_CHUNK_BYTES", 3):
+            assert count_lines(f) == 10
+
+
+class TestAssessFile:
+    """Tests for large/generated file safe mode decisions."""
+
+    def test_normal_file_gets_full_checks(self, tmp_path: Path) -> None:
+        from _util import assess_file
+
+        f = tmp_path / "a.py"
+        f.write_text("x = 1\n" * 500)
+        assert assess_file(f) == ("full", "")
+
+    def test_generated_marker_skips(self, tmp_path: Path) -> None:
+        from _util import assess_file
+
+        f = tmp_path / "api.pb.go"
+        f.write_text("// Code generated by protoc-gen-go. DO NOT EDIT.\npackage api\n")
+        mode, note = assess_file(f)
+        assert mode == "skip"
+        assert "generated" in note
+
+    def test_generated_tag_in_header_skips(self, tmp_path: Path) -> None:
+        from _util import assess_file
+
+        f = tmp_path / "schema.ts"
+        f.write_text("/**\n * @generated by graphql-codegen\n */\nexport type A = string;\n")
+        assert assess_file(f)[0] == "skip"
+
+    def test_prose_mentions_of_generation_do_not_skip(self, tmp_path: Path) -> None:
+        from _util import assess_file
+
+        f = tmp_path / "ids.py"
+        f.write_text('"""Store auto-generated IDs. DO NOT EDIT by hand."""\n# do not edit the list below\nIDS = []\n')
+        assert assess_file(f) == ("full", "")
+
+    def test_generated_tag_past_header_does_not_skip(self, tmp_path: Path) -> None:
+        from _util import assess_file
+
+        f = tmp_path / "codegen.py"
+        f.write_text("x = 1\n" * 10 + 'TAG = "@generated"\n')
+        assert assess_file(f) == ("full", "")
+
+    def test_hook_util_is_not_generated(self) -> None:
+        from _util import assess_file
+
+        assert assess_file(Path(__file__).resolve().parent.parent / "_util.py")[0] == "full"
+
+    def test_minified_file_skips(self, tmp_path: Path) -> None:
+        from _util import assess_file
+
+        f = tmp_path / "bundle.js"
+        f.write_text("var a=1;" * 2000)
+        mode, note = assess_file(f)
+        assert mode == "skip"
+        assert "minified" in note
+
+    def test_size_thresholds_from_config(self, tmp_path: Path) -> None:
+        from _util import assess_file
+
+        f = tmp_path / "fixture.ts"
+        f.write_text("export const x = 1;\n" * 100)
+        config = {"largeFileFormatOnlyBytes": 1000, "largeFileSkipBytes": 10_000}
+        with patch("_util._read_config", return_value=config):
+            assert assess_file(f)[0] == "format"
+            f.write_text("export const x = 1;\n" * 1000)
+            assert assess_file(f)[0] == "skip"
 
 
 class TestColorConstants:
@@ -260,8 +349,6 @@ class TestFileLengthConstants:
         assert FILE_LENGTH_CRITICAL == 500
 
 
-
-
 class TestSessionsBase:
     """Tests for _sessions_base()."""
 
@@ -299,29 +386,47 @@ class TestGetSessionPlanPath:
         assert path.name == "active_plan.json"
 
 
-
-
 class TestFindGitRoot:
     """Tests for find_git_root()."""
 
-    @patch("subprocess.run")
-    def test_returns_root_when_in_repo(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=0, stdout="/home/user/repo\n")
-        result = find_git_root()
-        assert result == Path("/home/user/repo")
+    def test_returns_root_when_in_repo(self, tmp_path, monkeypatch):
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+        (tmp_path / "src").mkdir()
+        monkeypatch.chdir(tmp_path / "src")
+        assert find_git_root() == tmp_path.resolve()
+
+    def test_returns_none_when_not_in_repo(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        assert find_git_root() is None
 
     @patch("subprocess.run")
-    def test_returns_none_when_not_in_repo(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=1, stdout="")
-        result = find_git_root()
-        assert result is None
+    def test_does_not_spawn_git(self, mock_run, tmp_path):
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+        find_git_root(tmp_path)
+        mock_run.assert_not_called()
+
 
-    @patch("subprocess.run", side_effect=Exception("Git not found"))
-    def test_handles_exception(self, mock_run):
-        result = find_git_root()
-        assert result is None
+class TestGetProjectRoot:
+    """Tests for get_project_root()."""
 
+    def test_prefers_env_var(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("CLAUDE_PROJECT_ROOT", str(tmp_path / "proj"))
+        assert get_project_root() == tmp_path / "proj"
 
+    def test_uses_git_root_from_subdirectory(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("CLAUDE_PROJECT_ROOT", raising=False)
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+        (tmp_path / "docs").mkdir()
+        monkeypatch.chdir(tmp_path / "docs")
+        assert get_project_root() == tmp_path.resolve()
+
+    def test_falls_back_to_cwd(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("CLAUDE_PROJECT_ROOT", raising=False)
+        monkeypatch.chdir(tmp_path)
+        assert get_project_root() == tmp_path
 
 
 class TestReadHookStdin:
@@ -344,6 +449,82 @@ class TestReadHookStdin:
         assert result == {}
 
 
+class TestExtractJsonFields:
+    """Tests for extract_json_fields()."""
+
+    def test_decodes_only_requested_paths(self):
+        payload = {
+            "session_id": "s",
+            "tool_name": "Edit",
+            "tool_input": {"file_path": "a.py", "old_string": 'x = "\\"q\\""', "new_string": "y", "n": [1, {"b": "]"}]},
+            "tool_response": {"originalFile": "z"},
+        }
+        paths = ("tool_name", "tool_input.file_path", "tool_input.old_string", "tool_input.new_string")
+        assert extract_json_fields(json.dumps(payload), paths) == {
+            "tool_name": "Edit",
+            "tool_input": {"file_path": "a.py", "old_string": payload["tool_input"]["old_string"], "new_string": "y"},
+        }
+
+    def test_skips_large_values_in_any_order(self):
+        content = 'line "quoted" \\ {not: json} ]\n' * 1000
+        payload = {
+            "tool_input": {"content": content, "file_path": "b.ts"},
+            "extra": [None, True, 1.5],
+            "tool_name": "Write",
+        }
+        result = extract_json_fields(json.dumps(payload), ("tool_name", "tool_input.file_path"))
+        assert result == {"tool_name": "Write", "tool_input": {"file_path": "b.ts"}}
+
+    def test_skips_strings_ending_in_backslashes(self):
+        for skipped in ("\\", '\\"', '\\\\"x', "a\\\\", '"'):
+            payload = {"skip": skipped, "keep": {"k": skipped}, "tool_name": "Edit"}
+            assert extract_json_fields(json.dumps(payload), ("tool_name",)) == {"tool_name": "Edit"}
+
+    def test_stops_once_all_fields_are_found(self):
+        text = '{"tool_name": "Write", "tool_input": {"file_path": "c.py", "content": "never scanned'
+        result = extract_json_fields(text, ("tool_name", "tool_input.file_path"))
+        assert result == {"tool_name": "Write", "tool_input": {"file_path": "c.py"}}
+
+    def test_returns_empty_dict_for_invalid_input(self):
+        assert extract_json_fields("", ("a",)) == {}
+        assert extract_json_fields("[1]", ("a",)) == {}
+        assert extract_json_fields('{"a": tru', ("a", "b")) == {}
+
+
+class TestReadJsonFields:
+    """Tests for read_json_fields()."""
+
+    def test_stops_reading_once_fields_are_found(self, monkeypatch):
+        monkeypatch.setattr(_util, "READ_CHUNK_CHARS", 16)
+        payload = {"tool_name": "Write", "tool_input": {"file_path": "a.py", "content": "x" * 10_000}}
+        stream = io.StringIO(json.dumps(payload))
+
+        fields, head = read_json_fields(stream, ("tool_name", "tool_input.file_path"))
+
+        assert fields == {"tool_name": "Write", "tool_input": {"file_path": "a.py"}}
+        assert stream.tell() == len(head) < 200
+
+    def test_does_not_decode_a_number_cut_at_a_chunk_boundary(self, monkeypatch):
+        monkeypatch.setattr(_util, "READ_CHUNK_CHARS", 8)
+        stream = io.StringIO('{"n": 1234567, "m": 1}')
+
+        assert read_json_fields(stream, ("n",))[0] == {"n": 1234567}
+
+    def test_continues_from_head(self, monkeypatch):
+        monkeypatch.setattr(_util, "READ_CHUNK_CHARS", 16)
+        payload = {"tool_name": "Edit", "tool_input": {"file_path": "a.py", "old_string": "a" * 100, "new_string": "b"}}
+        stream = io.StringIO(json.dumps(payload))
+
+        _, head = read_json_fields(stream, ("tool_name",))
+        fields, _ = read_json_fields(stream, ("tool_input.old_string", "tool_input.new_string"), head)
+
+        assert fields == {"tool_input": {"old_string": "a" * 100, "new_string": "b"}}
+
+    def test_returns_empty_dict_for_invalid_input(self):
+        assert read_json_fields(io.StringIO("not json"), ("a",))[0] == {}
+        assert read_json_fields(io.StringIO('{"a": 1'), ("a",))[0] == {}
+
+
 class TestGetEditedFileFromStdin:
     """Tests for get_edited_file_from_stdin()."""
 
@@ -371,8 +552,6 @@ class TestGetEditedFileFromStdin:
             assert result is None
 
 
-
-
 class TestIsWaitingForUserInput:
     """Tests for is_waiting_for_user_input()."""
 
@@ -380,11 +559,7 @@ class TestIsWaitingForUserInput:
         transcript = tmp_path / "transcript.jsonl"
         msg = {
             "type": "assistant",
-            "message": {
-                "content": [
-                    {"type": "tool_use", "name": "AskUserQuestion", "input": {}}
-                ]
-            },
+            "message": {"content": [{"type": "tool_use", "name": "AskUserQuestion", "input": {}}]},
         }
         transcript.write_text(json.dumps(msg) + "\n")
         assert is_waiting_for_user_input(str(transcript)) is True
@@ -393,9 +568,7 @@ class TestIsWaitingForUserInput:
         transcript = tmp_path / "transcript.jsonl"
         msg = {
             "type": "assistant",
-            "message": {
-                "content": [{"type": "tool_use", "name": "Write", "input": {}}]
-            },
+            "message": {"content": [{"type": "tool_use", "name": "Write", "input": {}}]},
         }
         transcript.write_text(json.dumps(msg) + "\n")
         assert is_waiting_for_user_input(str(transcript)) is False
@@ -412,17 +585,11 @@ class TestIsWaitingForUserInput:
         transcript = tmp_path / "transcript.jsonl"
         ask_msg = {
             "type": "assistant",
-            "message": {
-                "content": [
-                    {"type": "tool_use", "name": "AskUserQuestion", "input": {}}
-                ]
-            },
+            "message": {"content": [{"type": "tool_use", "name": "AskUserQuestion", "input": {}}]},
         }
         write_msg = {
             "type": "assistant",
-            "message": {
-                "content": [{"type": "tool_use", "name": "Write", "input": {}}]
-            },
+            "message": {"content": [{"type": "tool_use", "name": "Write", "input": {}}]},
         }
         lines = [json.dumps(ask_msg), json.dumps(write_msg)]
         transcript.write_text("\n".join(lines) + "\n")
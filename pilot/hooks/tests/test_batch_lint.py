@@ -0,0 +1,180 @@
+"""Tests for turn-level batched linting."""
+
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import batch_lint
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def touched_path(tmp_path, monkeypatch):
+    """Keep the touched-files list in tmp_path."""
+    path = tmp_path / "session" / "touched-files.txt"
+    monkeypatch.setattr(batch_lint, "get_touched_path", lambda: path)
+    monkeypatch.setenv("PILOT_BATCH_LINT", "1")
+    return path
+
+
+def _completed(stdout: str = "", returncode: int = 0) -> MagicMock:
+    result = MagicMock()
+    result.stdout = stdout
+    result.stderr = ""
+    result.returncode = returncode
+    return result
+
+
+class TestEnabled:
+    """Test the opt-in switch."""
+
+    def test_env_overrides_config(self, monkeypatch):
+        """Should honour PILOT_BATCH_LINT before the config file."""
+        monkeypatch.setenv("PILOT_BATCH_LINT", "0")
+        with patch("batch_lint._read_config", return_value={"batchLint": True}):
+            assert batch_lint.is_batch_lint_enabled() is False
+
+    def test_reads_config_key(self, monkeypatch):
+        """Should enable batch mode from ~/.pilot/config.json."""
+        monkeypatch.delenv("PILOT_BATCH_LINT")
+        with patch("batch_lint._read_config", return_value={"batchLint": True}):
+            assert batch_lint.is_batch_lint_enabled() is True
+        with patch("batch_lint._read_config", return_value={}):
+            assert batch_lint.is_batch_lint_enabled() is False
+
+
+class TestTouchedFiles:
+    """Test recording and claiming touched files."""
+
+    def test_pop_dedupes_and_clears(self, tmp_path):
+        """Should return each existing file once, in first-touched order, and clear the list."""
+        a, b = tmp_path / "a.py", tmp_path / "b.py"
+        a.write_text("")
+        b.write_text("")
+        for f in (b, a, b, tmp_path / "gone.py"):
+            batch_lint.record_touched(f)
+
+        assert batch_lint.pop_touched() == [b.resolve(), a.resolve()]
+        assert batch_lint.pop_touched() == []
+
+
+class TestLinting:
+    """Test one invocation per tool over all touched files."""
+
+    def test_python_single_ruff_call_split_per_file(self, tmp_path):
+        """Should lint all Python files in one ruff call and report per file."""
+        a, b = tmp_path / "a.py", tmp_path / "b.py"
+        output = f"{a}:1:8: F401 [*] `os` imported but unused\n{b}:2:1: E711 comparison to None\n{b}:3:1: E712 x\n"
+
+        with (
+            patch("batch_lint.shutil.which", return_value="/usr/bin/ruff"),
+            patch("batch_lint.subprocess.run", return_value=_completed(output, 1)) as run,
+        ):
+            reasons = batch_lint.lint_python([a, b], deadline=float("inf"))
+
+        run.assert_called_once()
+        assert run.call_args.args[0][-2:] == [str(a), str(b)]
+        assert len(reasons) == 2
+        assert "Ruff: 1 issue" in reasons[0]
+        assert "Ruff: 2 issues" in reasons[1]
+
+    def test_typescript_one_eslint_call_per_project(self, tmp_path):
+        """Should group files by package.json project and report only files with findings."""
+        (tmp_path / "package.json").write_text("{}")
+        a, b = tmp_path / "a.ts", tmp_path / "b.ts"
+        data = [
+            {"filePath": str(a), "errorCount": 1, "warningCount": 0, "messages": [
+                {"line": 3, "ruleId": "no-unused-vars", "message": "x is unused", "severity": 2}
+            ]},
+            {"filePath": str(b), "errorCount": 0, "warningCount": 0, "messages": []},
+        ]  # fmt: skip
+
+        with (
+            patch("batch_lint.find_tool", return_value="/bin/eslint"),
+            patch("batch_lint.subprocess.run", return_value=_completed(json.dumps(data), 1)) as run,
+        ):
+            reasons = batch_lint.lint_typescript([a, b], deadline=float("inf"))
+
+        run.assert_called_once()
+        assert run.call_args.kwargs["cwd"] == tmp_path
+        assert len(reasons) == 1
+        assert "no-unused-vars" in reasons[0]
+
+    def test_go_runs_once_per_package(self, tmp_path):
+        """Should vet each package once however many of its files were touched."""
+        files = [tmp_path / "a.go", tmp_path / "b.go", tmp_path / "a_test.go"]
+
+        with (
+            patch("batch_lint.shutil.which", side_effect=lambda name: "/usr/bin/go" if name == "go" else None),
+            patch("batch_lint.subprocess.run", return_value=_completed("", 0)) as run,
+        ):
+            assert batch_lint.lint_go(files, deadline=float("inf")) == []
+
+        run.assert_called_once()
+        assert run.call_args.kwargs["cwd"] == tmp_path
+
+
+class TestMain:
+    """Test the Stop hook entry point."""
+
+    def test_blocks_stop_with_consolidated_findings(self, tmp_path, capsys):
+        """Should lint touched files and report all findings in one stop_block."""
+        target = tmp_path / "a.py"
+        target.write_text("import os\n")
+        batch_lint.record_touched(target)
+
+        with (
+            patch("sys.stdin", io.StringIO("{}")),
+            patch("batch_lint.get_project_root", return_value=tmp_path),
+            patch("batch_lint.lint_files", return_value=["Python Issues found in: a.py"]) as lint,
+        ):
+            assert batch_lint.main() == 0
+
+        assert lint.call_args.args[0] == [target.resolve()]
+        output = json.loads(capsys.readouterr().out)
+        assert output["decision"] == "block"
+        assert output["reason"].startswith("Lint findings in 1 of 1 file(s)")
+
+    def test_skips_when_disabled_and_keeps_list(self, tmp_path, capsys, monkeypatch):
+        """Should do nothing and leave touched files alone when batch mode is off."""
+        monkeypatch.setenv("PILOT_BATCH_LINT", "0")
+        target = tmp_path / "a.py"
+        target.write_text("")
+        batch_lint.record_touched(target)
+
+        with patch("sys.stdin", io.StringIO("{}")):
+            assert batch_lint.main() == 0
+
+        assert capsys.readouterr().out == ""
+        assert batch_lint.pop_touched() == [target.resolve()]
+
+    def test_skips_when_stop_hook_active(self, capsys):
+        """Should not re-block a stop that a hook already blocked."""
+        with patch("sys.stdin", io.StringIO(json.dumps({"stop_hook_active": True}))):
+            assert batch_lint.main() == 0
+        assert capsys.readouterr().out == ""
+
+
+class TestFileCheckerBatchMode:
+    """Test that file_checker only formats and records files in batch mode."""
+
+    def test_formats_only_and_records(self, tmp_path):
+        """Should call the checker with lint=False and remember the file for Stop."""
+        from file_checker import main
+
+        target = tmp_path / "a.py"
+        target.write_text("x = 1\n")
+        payload = {"tool_name": "Edit", "tool_input": {"file_path": str(target)}}
+
+        with (
+            patch("sys.stdin", io.StringIO(json.dumps(payload))),
+            patch("file_checker.check_python", return_value=(0, "")) as check,
+            patch("file_checker._tdd_check", return_value=""),
+        ):
+            main()
+
+        check.assert_called_once_with(target, lint=False)
+        assert batch_lint.pop_touched() == [Path(target).resolve()]
@@ -0,0 +1,141 @@
+"""Tests for the hook latency benchmark harness."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+import hook_bench
+from synthetic import expand_payload, make_repo
+
+HOOKS_CONFIG = {
+    "hooks": {
+        "PostToolUse": [
+            {"matcher": "Write|Edit", "hooks": [{"type": "command", "command": 'uv run python "x/file_checker.py"'}]},
+            {"matcher": "*", "hooks": [{"type": "command", "command": "bun worker.cjs hook observation"}]},
+        ],
+        "Stop": [{"hooks": [{"type": "command", "command": 'uv run python "x/spec_stop_guard.py"'}]}],
+    }
+}
+
+
+class TestHookCommands:
+    """Test resolving hooks.json entries for an event."""
+
+    def test_matches_tool_name_and_wildcards(self):
+        """Should return commands whose matcher fits the tool, including '*' entries."""
+        commands = hook_bench.hook_commands(HOOKS_CONFIG, "PostToolUse", {"tool_name": "Edit"})
+        assert commands == ['uv run python "x/file_checker.py"', "bun worker.cjs hook observation"]
+
+    def test_matcher_must_match_whole_tool_name(self):
+        """Should not match a tool whose name only contains the matcher."""
+        commands = hook_bench.hook_commands(HOOKS_CONFIG, "PostToolUse", {"tool_name": "NotebookEdit"})
+        assert commands == ["bun worker.cjs hook observation"]
+
+    def test_events_without_matcher_always_run(self):
+        """Should run Stop hooks regardless of payload."""
+        assert hook_bench.hook_commands(HOOKS_CONFIG, "Stop", {}) == ['uv run python "x/spec_stop_guard.py"']
+
+
+class TestSplitPythonCommand:
+    """Test extracting interpreter and script from hook commands."""
+
+    def test_skips_non_python_hooks(self):
+        """Should ignore bun worker hooks."""
+        assert hook_bench.split_python_command("bun worker.cjs hook observation", None) is None
+
+    def test_keeps_fast_flags_with_interpreter_override(self):
+        """Should keep -S/-E from installer-rewritten commands when overriding the interpreter."""
+        prefix, script = hook_bench.split_python_command(
+            '/usr/bin/python3 -S -E "${CLAUDE_PLUGIN_ROOT}/hooks/a.py"', ["py"]
+        )
+        assert prefix == ["py", "-S", "-E"]
+        assert script == hook_bench.PLUGIN_ROOT / "hooks" / "a.py"
+
+
+class TestStatistics:
+    """Test percentiles and threshold checks."""
+
+    def test_percentile_nearest_rank(self):
+        """Should use nearest-rank percentiles."""
+        samples = [float(n) for n in range(1, 101)]
+        assert hook_bench.percentile(samples, 50) == 50
+        assert hook_bench.percentile(samples, 95) == 95
+        assert hook_bench.percentile([7.0], 99) == 7.0
+
+    def test_reports_regression_against_baseline(self):
+        """Should flag hooks whose p95 grew beyond the allowed regression."""
+        results = {"Stop:guard": {"p95_ms": 130.0, "failures": 0}, "Stop:ok": {"p95_ms": 50.0, "failures": 0}}
+        baseline = {"Stop:guard": {"p95_ms": 100.0}, "Stop:ok": {"p95_ms": 48.0}}
+
+        violations = hook_bench.check_thresholds(results, baseline, 0.25, None)
+
+        assert len(violations) == 1
+        assert violations[0].startswith("Stop:guard")
+
+    def test_reports_absolute_limit_and_failures(self):
+        """Should flag hooks over the absolute p95 limit and hooks that errored."""
+        results = {"Stop:slow": {"p95_ms": 300.0, "failures": 0}, "Stop:broken": {"p95_ms": 10.0, "failures": 2}}
+
+        violations = hook_bench.check_thresholds(results, None, 0.25, 200.0)
+
+        assert any(v.startswith("Stop:slow") for v in violations)
+        assert any(v.startswith("Stop:broken") for v in violations)
+
+
+class TestSynthetic:
+    """Test corpus expansion and synthetic repo generation."""
+
+    def test_expands_placeholders_and_file_content(self, tmp_path):
+        """Should substitute paths and inline repo file contents."""
+        repo = make_repo(tmp_path / "repo", files=1, lines=30)
+        payload = {"tool_input": {"file_path": "{repo}/src/module_0.py", "content": {"$file": "src/module_0.py"}}}
+
+        expanded = expand_payload(payload, repo, tmp_path / "t.jsonl")
+
+        assert expanded["tool_input"]["file_path"] == f"{repo}/src/module_0.py"
+        assert len(expanded["tool_input"]["content"].splitlines()) == 30
+
+
+class TestEndToEnd:
+    """Smoke test the full replay against the real hooks."""
+
+    def test_replays_corpus_through_configured_hooks(self, tmp_path, capsys):
+        """Should run the configured hook and pass a generous threshold."""
+        corpus = tmp_path / "corpus.jsonl"
+        entry = {
+            "name": "bash",
+            "event": "PreToolUse",
+            "payload": {"tool_name": "Bash", "tool_input": {"command": "ls"}},
+        }
+        corpus.write_text(json.dumps(entry) + "\n")
+
+        code = hook_bench.main(
+            ["--corpus", str(corpus), "--iterations", "1", "--repo-files", "1", "--json", "--max-p95-ms", "60000"]
+        )
+
+        results = json.loads(capsys.readouterr().out)
+        assert code == 0
+        assert results["PreToolUse:tool_redirect"]["runs"] == 1
+        assert results["PreToolUse:tool_redirect"]["failures"] == 0
+
+
+class TestCheckerStages:
+    """Smoke test the file_checker stage benchmark."""
+
+    def test_reports_stage_and_hook_times(self, tmp_path, capsys, monkeypatch):
+        """Should time every stage and the whole hook for each edit."""
+        import checker_stages
+
+        for name in ("HOME", "PILOT_SESSION_ID", "PILOT_HOOK_TRACE", "PILOT_BATCH_LINT", "PILOT_IMPACT_TESTS"):
+            monkeypatch.setenv(name, "")
+
+        code = checker_stages.main(["--iterations", "1", "--repo-files", "1", "--file-lines", "20", "--json"])
+
+        results = json.loads(capsys.readouterr().out)
+        assert code == 0
+        assert set(results) == {"python", "typescript"}
+        assert results["python"]["hook_p50_ms"] > 0
+        assert results["python"]["sum_p50_ms"] >= results["python"]["max_p50_ms"]
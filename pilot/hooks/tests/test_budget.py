@@ -0,0 +1,199 @@
+"""Tests for checker tool latency budgets."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import _budget
+import pytest
+
+
+def _seed(tmp_path: Path, tools: dict) -> None:
+    """Write latency history for tmp_path as the project."""
+    path = _budget._store_path(tmp_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"tools": tools}))
+
+
+class TestRunTool:
+    """Test running tools under their budget."""
+
+    def test_records_latency_and_persists(self, tmp_path):
+        """Should run the command and keep its duration in the project's history."""
+        _budget.start(tmp_path)
+
+        result = _budget.run_tool("echo", [sys.executable, "-c", "print('ok')"], capture_output=True, text=True)
+        notices, deferred = _budget.finish()
+
+        assert result.stdout.strip() == "ok"
+        assert (notices, deferred) == ([], [])
+        stored = json.loads(_budget._store_path(tmp_path).read_text())
+        assert len(stored["tools"]["echo"]["samples"]) == 1
+
+    def test_timeout_derived_from_p95(self, tmp_path):
+        """Should give a tool three times its p95, but at least the budget."""
+        _seed(tmp_path, {"eslint": {"samples": [2.0] * 10, "timeouts": 0, "demoted_until": 0}})
+        _budget.start(tmp_path)
+
+        with patch("_budget.subprocess.run", return_value=MagicMock(returncode=0)) as run:
+            _budget.run_tool("eslint", ["eslint"])
+
+        assert run.call_args.kwargs["timeout"] == pytest.approx(6.0)
+
+    def test_timeout_stops_tool_and_reports(self, tmp_path):
+        """Should return None and explain a timed out tool."""
+        _budget.start(tmp_path)
+
+        with patch("_budget.subprocess.run", side_effect=subprocess.TimeoutExpired("eslint", 30)):
+            assert _budget.run_tool("eslint", ["eslint"]) is None
+        notices, _ = _budget.finish()
+
+        assert any("eslint timed out" in n for n in notices)
+
+    def test_consistently_slow_tool_is_demoted(self, tmp_path):
+        """Should demote a tool whose p95 and repeated overruns exceed the budget."""
+        _seed(tmp_path, {"eslint": {"samples": [9.0, 9.0, 1.0, 1.0], "timeouts": 0, "demoted_until": 0}})
+        _budget.start(tmp_path)
+
+        with (
+            patch("_budget.subprocess.run", return_value=MagicMock(returncode=0)),
+            patch("_budget.time.perf_counter", side_effect=[0.0, 8.0]),
+        ):
+            _budget.run_tool("eslint", ["eslint"])
+        notices, _ = _budget.finish()
+
+        assert any("eslint demoted" in n for n in notices)
+        stored = json.loads(_budget._store_path(tmp_path).read_text())
+        assert stored["tools"]["eslint"]["demoted_until"] > time.time()
+
+    def test_demotion_by_timeouts_reports_timeouts(self, tmp_path):
+        """Should name consecutive timeouts, not the p95, when they caused the demotion."""
+        _seed(tmp_path, {"eslint": {"samples": [1.0, 1.0, 30.0], "timeouts": 1, "demoted_until": 0}})
+        _budget.start(tmp_path)
+
+        with patch("_budget.subprocess.run", side_effect=subprocess.TimeoutExpired("eslint", 30)):
+            _budget.run_tool("eslint", ["eslint"])
+        notices, _ = _budget.finish()
+
+        demotion = next(n for n in notices if "eslint demoted" in n)
+        assert "timed out 2 times in a row" in demotion
+        assert "p95" not in demotion
+
+    def test_concurrent_hooks_keep_each_others_samples(self, tmp_path):
+        """Should merge this hook's runs into history another hook wrote since start()."""
+        _budget.start(tmp_path)
+        with (
+            patch("_budget.subprocess.run", return_value=MagicMock(returncode=0)),
+            patch("_budget.time.perf_counter", side_effect=[0.0, 2.0]),
+        ):
+            _budget.run_tool("eslint", ["eslint"])
+        _seed(tmp_path, {"eslint": {"samples": [1.0], "timeouts": 0, "demoted_until": 0}})
+        _budget.finish()
+
+        stored = json.loads(_budget._store_path(tmp_path).read_text())
+        assert stored["tools"]["eslint"]["samples"] == [1.0, 2.0]
+
+    def test_single_slow_run_does_not_demote(self, tmp_path):
+        """Should tolerate an occasional slow run."""
+        _seed(tmp_path, {"eslint": {"samples": [1.0] * 6, "timeouts": 0, "demoted_until": 0}})
+        _budget.start(tmp_path)
+
+        with (
+            patch("_budget.subprocess.run", return_value=MagicMock(returncode=0)),
+            patch("_budget.time.perf_counter", side_effect=[0.0, 9.0]),
+        ):
+            _budget.run_tool("eslint", ["eslint"])
+
+        assert _budget.finish() == ([], [])
+
+
+class TestDemotedTools:
+    """Test how demoted tools are handled."""
+
+    def test_demoted_linter_is_deferred(self, tmp_path):
+        """Should skip a demoted read-only tool and ask for a background run."""
+        _seed(tmp_path, {"eslint": {"samples": [9.0] * 5, "timeouts": 0, "demoted_until": time.time() + 60}})
+        _budget.start(tmp_path)
+
+        with patch("_budget.subprocess.run") as run:
+            assert _budget.run_tool("eslint", ["eslint"]) is None
+        notices, deferred = _budget.finish()
+
+        run.assert_not_called()
+        assert deferred == ["eslint"]
+        assert "deferred to a background run" in notices[0]
+
+    def test_demoted_formatter_is_skipped_not_deferred(self, tmp_path):
+        """Should never defer a tool that rewrites the file."""
+        _seed(tmp_path, {"prettier": {"samples": [9.0] * 5, "timeouts": 0, "demoted_until": time.time() + 60}})
+        _budget.start(tmp_path)
+
+        assert _budget.run_tool("prettier", ["prettier"], mutates=True) is None
+        notices, deferred = _budget.finish()
+
+        assert deferred == []
+        assert "prettier skipped" in notices[0]
+
+    def test_expired_demotion_starts_over(self, tmp_path):
+        """Should run the tool again with a clean window once the demotion expires."""
+        _seed(tmp_path, {"eslint": {"samples": [9.0] * 5, "timeouts": 0, "demoted_until": time.time() - 1}})
+        _budget.start(tmp_path)
+
+        with patch("_budget.subprocess.run", return_value=MagicMock(returncode=0)) as run:
+            _budget.run_tool("eslint", ["eslint"])
+        _budget.finish()
+
+        run.assert_called_once()
+        stored = json.loads(_budget._store_path(tmp_path).read_text())
+        assert len(stored["tools"]["eslint"]["samples"]) == 1
+
+    def test_deferred_run_only_runs_requested_tools(self, tmp_path, monkeypatch):
+        """Should run only the deferred tools, with the long background timeout."""
+        monkeypatch.setenv(_budget.DEFERRED_TOOLS_ENV, "eslint")
+        _budget.start(tmp_path)
+
+        with patch("_budget.subprocess.run", return_value=MagicMock(returncode=0)) as run:
+            assert _budget.run_tool("prettier", ["prettier"], mutates=True) is None
+            _budget.run_tool("eslint", ["eslint"])
+
+        run.assert_called_once()
+        assert run.call_args.kwargs["timeout"] == _budget.DEFERRED_TIMEOUT
+
+
+class TestDeferredResults:
+    """Test handing background results back to a later hook."""
+
+    def test_collects_result_for_unchanged_file(self, tmp_path):
+        """Should report a finished background result once."""
+        target = tmp_path / "a.ts"
+        target.write_text("let x = 1;\n")
+        _budget.write_deferred_result(target, "TypeScript: 1 eslint in a.ts")
+
+        assert _budget.collect_deferred_results() == [
+            "Deferred check results (background run):\nTypeScript: 1 eslint in a.ts"
+        ]
+        assert _budget.collect_deferred_results() == []
+
+    def test_drops_result_for_edited_file(self, tmp_path):
+        """Should discard results that describe an older version of the file."""
+        target = tmp_path / "a.ts"
+        target.write_text("let x = 1;\n")
+        _budget.write_deferred_result(target, "TypeScript: 1 eslint in a.ts")
+        target.write_text("let x = 2;\n")
+
+        assert _budget.collect_deferred_results() == []
+
+    def test_one_background_run_per_file(self, tmp_path):
+        """Should not start a second background run while one is in flight."""
+        target = tmp_path / "a.ts"
+        target.write_text("x")
+        script = tmp_path / "noop.py"
+        script.write_text("import sys; sys.stdin.read()\n")
+
+        assert _budget.spawn_deferred({"tool_input": {}}, target, ["eslint"], script) is True
+        assert _budget.spawn_deferred({"tool_input": {}}, target, ["eslint"], script) is False
@@ -0,0 +1,106 @@
+"""Tests for _context_forecast — sample buffer, growth model and adaptive throttle."""
+
+from __future__ import annotations
+
+from _context_forecast import (
+    MAX_SAMPLES,
+    THROTTLE_MAX_SECONDS,
+    THROTTLE_MIN_SECONDS,
+    THROTTLE_SECONDS,
+    add_sample,
+    collect_skips,
+    forecast,
+    load_state,
+    record_skip,
+    save_state,
+    throttle_seconds,
+)
+
+
+def _state_with(samples: list[tuple[float, str, float]]) -> dict:
+    state = load_state()
+    for ts, tool, pct in samples:
+        add_sample(state, ts, tool, pct)
+    return state
+
+
+class TestSamples:
+    """Tests for the per-session ring buffer."""
+
+    def test_counts_throttled_calls_into_next_sample(self):
+        save_state(_state_with([(0, "Read", 10.0)]))
+        record_skip()
+        record_skip()
+        state = load_state()
+        collect_skips(state)
+        add_sample(state, 10, "Bash", 12.0)
+        assert state["samples"][-1] == [10, "Bash", 12.0, 3]
+        assert state["skipped"] == 0
+
+    def test_skips_are_collected_once(self):
+        record_skip()
+        state = load_state()
+        collect_skips(state)
+        collect_skips(state)
+        assert state["skipped"] == 1
+
+    def test_keeps_only_recent_samples(self):
+        state = _state_with([(i, "Read", 10 + i * 0.1) for i in range(MAX_SAMPLES + 5)])
+        assert len(state["samples"]) == MAX_SAMPLES
+        assert state["samples"][0][0] == 5
+
+    def test_compaction_drop_restarts_buffer(self):
+        state = _state_with([(0, "Read", 60.0), (5, "Read", 70.0)])
+        state["warned"] = True
+        add_sample(state, 10, "Read", 20.0)
+        assert [sample[2] for sample in state["samples"]] == [20.0]
+        assert state["warned"] is False
+
+    def test_long_pause_restarts_buffer(self):
+        state = _state_with([(0, "Read", 10.0), (5, "Read", 12.0)])
+        add_sample(state, 5000, "Read", 13.0)
+        assert len(state["samples"]) == 1
+
+
+class TestForecast:
+    """Tests for the growth-rate model."""
+
+    def test_needs_minimum_samples(self):
+        assert forecast(_state_with([(0, "Read", 10.0), (10, "Read", 13.0)])["samples"], 83.5) is None
+
+    def test_predicts_calls_until_compaction(self):
+        samples = _state_with([(0, "Read", 60.0), (10, "Read", 63.0), (20, "Read", 66.0)])["samples"]
+        prediction = forecast(samples, 83.5)
+        assert prediction["pct_per_call"] == 3.0
+        assert prediction["pct_per_minute"] == 18.0
+        assert prediction["calls_until_compaction"] == 6
+        assert prediction["minutes_until_compaction"] == 1.0
+        assert prediction["heaviest_tool"] == "Read"
+
+    def test_flat_context_has_no_prediction(self):
+        samples = _state_with([(0, "Bash", 30.0), (10, "Bash", 30.0), (20, "Bash", 30.0)])["samples"]
+        prediction = forecast(samples, 83.5)
+        assert prediction["calls_until_compaction"] is None
+        assert prediction["pct_per_call"] == 0.0
+
+
+class TestThrottleSeconds:
+    """Tests for sizing the throttle window from the forecast."""
+
+    def test_default_without_forecast(self):
+        assert throttle_seconds(None, 20.0, [40, 65]) == THROTTLE_SECONDS
+
+    def test_no_throttle_when_compaction_is_close(self):
+        prediction = {"calls_until_compaction": 3, "pct_per_minute": 10.0}
+        assert throttle_seconds(prediction, 20.0, [40, 65]) == 0
+
+    def test_flat_growth_uses_default_window(self):
+        prediction = {"calls_until_compaction": None, "pct_per_minute": 0.0}
+        assert throttle_seconds(prediction, 20.0, [40, 65]) == THROTTLE_SECONDS
+
+    def test_window_shrinks_as_next_threshold_nears(self):
+        prediction = {"calls_until_compaction": 50, "pct_per_minute": 1.0}
+        far = throttle_seconds(prediction, 20.0, [40, 65])
+        near = throttle_seconds(prediction, 39.0, [40, 65])
+        assert far == THROTTLE_MAX_SECONDS
+        assert near == max(THROTTLE_MIN_SECONDS, 15.0)
@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import json
 import time
+from io import StringIO
 from unittest.mock import patch
 
+from _context_forecast import collect_skips, load_state, save_state
 from context_monitor import _is_throttled, _resolve_context, run_context_monitor
 
 
@@ -111,8 +113,6 @@ class TestContextMonitorBelowThreshold:
         assert captured.out == ""
 
 
-
-
 class TestIsThrottled:
     """Tests for throttle logic based on cache freshness and context level."""
 
@@ -122,11 +122,15 @@ class TestIsThrottled:
         monkeypatch.setattr("context_monitor.get_session_cache_path", lambda: cache_file)
 
         session_id = "test-session-123"
-        cache_file.write_text(json.dumps({
-            "session_id": session_id,
-            "tokens": 100000,
-            "timestamp": time.time() - 5,
-        }))
+        cache_file.write_text(
+            json.dumps(
+                {
+                    "session_id": session_id,
+                    "tokens": 100000,
+                    "timestamp": time.time() - 5,
+                }
+            )
+        )
 
         assert _is_throttled(session_id) is True
 
@@ -136,11 +140,15 @@ class TestIsThrottled:
         monkeypatch.setattr("context_monitor.get_session_cache_path", lambda: cache_file)
 
         session_id = "test-session-123"
-        cache_file.write_text(json.dumps({
-            "session_id": session_id,
-            "tokens": 170000,
-            "timestamp": time.time() - 5,
-        }))
+        cache_file.write_text(
+            json.dumps(
+                {
+                    "session_id": session_id,
+                    "tokens": 170000,
+                    "timestamp": time.time() - 5,
+                }
+            )
+        )
 
         assert _is_throttled(session_id) is False
 
@@ -150,11 +158,15 @@ class TestIsThrottled:
         monkeypatch.setattr("context_monitor.get_session_cache_path", lambda: cache_file)
 
         session_id = "test-session-123"
-        cache_file.write_text(json.dumps({
-            "session_id": session_id,
-            "tokens": 100000,
-            "timestamp": time.time() - 35,
-        }))
+        cache_file.write_text(
+            json.dumps(
+                {
+                    "session_id": session_id,
+                    "tokens": 100000,
+                    "timestamp": time.time() - 35,
+                }
+            )
+        )
 
         assert _is_throttled(session_id) is False
 
@@ -170,15 +182,63 @@ class TestIsThrottled:
         cache_file = tmp_path / "context_cache.json"
         monkeypatch.setattr("context_monitor.get_session_cache_path", lambda: cache_file)
 
-        cache_file.write_text(json.dumps({
-            "session_id": "other-session-456",
-            "tokens": 100000,
-            "timestamp": time.time() - 5,
-        }))
+        cache_file.write_text(
+            json.dumps(
+                {
+                    "session_id": "other-session-456",
+                    "tokens": 100000,
+                    "timestamp": time.time() - 5,
+                }
+            )
+        )
 
         assert _is_throttled("test-session-123") is False
 
+    def test_throttle_window_comes_from_cache(self, tmp_path, monkeypatch):
+        """A forecast-sized window replaces the fixed 30s."""
+        cache_file = tmp_path / "context_cache.json"
+        monkeypatch.setattr("context_monitor.get_session_cache_path", lambda: cache_file)
+
+        cache = {"session_id": "s", "tokens": 40000, "timestamp": time.time() - 45, "throttle_seconds": 120}
+        cache_file.write_text(json.dumps(cache))
+        assert _is_throttled("s") is True
+
+        cache_file.write_text(json.dumps({**cache, "timestamp": time.time() - 1, "throttle_seconds": 0}))
+        assert _is_throttled("s") is False
+
+
+class TestContextMonitorForecast:
+    """Tests for growth forecasting in run_context_monitor."""
 
+    @patch("context_monitor.save_cache")
+    @patch("context_monitor._get_pilot_session_id", return_value="test-sess")
+    @patch("context_monitor._is_throttled", return_value=False)
+    @patch("context_monitor._resolve_context")
+    def test_warns_early_when_growth_is_fast(self, mock_resolve, mock_throttle, mock_sid, mock_save, capsys):
+        now = time.time()
+        save_state({"samples": [[now - 20, "Read", 48.0, 1], [now - 10, "Read", 52.0, 1]], "skipped": 0})
+        mock_resolve.return_value = (56.0, 112000, [40, 55], False)
+
+        with patch("sys.stdin", StringIO(json.dumps({"tool_name": "Read", "tool_response": "x" * 1000}))):
+            run_context_monitor()
+
+        context = json.loads(capsys.readouterr().out)["hookSpecificOutput"]["additionalContext"]
+        assert "growing fast" in context
+        state = load_state()
+        assert state["samples"][-1][1:] == ["Read", 56.0, 1]
+        assert state["forecast"]["pct_per_call"] == 4.0
+        assert state["warned"] is True
+        assert mock_save.call_args.kwargs["throttle"] < 30
+
+    @patch("context_monitor._get_pilot_session_id", return_value="test-sess")
+    @patch("context_monitor._is_throttled", return_value=True)
+    def test_throttled_call_is_counted_without_rewriting_state(self, mock_throttle, mock_sid):
+        with patch("context_monitor.save_state") as mock_save_state:
+            run_context_monitor()
+        mock_save_state.assert_not_called()
+        state = load_state()
+        collect_skips(state)
+        assert state["skipped"] == 1
 
 
 class TestResolveContext:
@@ -216,13 +276,17 @@ class TestResolveContext:
         monkeypatch.setattr("context_monitor._read_statusline_context_pct", lambda: 85.0)
 
         session_id = "test-session-123"
-        cache_file.write_text(json.dumps({
-            "session_id": session_id,
-            "tokens": 170000,
-            "timestamp": time.time() - 5,
-            "shown_learn": [40, 60],
-            "shown_80_warn": True,
-        }))
+        cache_file.write_text(
+            json.dumps(
+                {
+                    "session_id": session_id,
+                    "tokens": 170000,
+                    "timestamp": time.time() - 5,
+                    "shown_learn": [40, 60],
+                    "shown_80_warn": True,
+                }
+            )
+        )
 
         result = _resolve_context(session_id)
 
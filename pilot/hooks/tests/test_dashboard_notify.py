@@ -2,54 +2,48 @@
 
 from __future__ import annotations
 
-import json
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from _dashboard_notify import send_dashboard_notification
 
 
 class TestSendDashboardNotification:
-    @patch("_dashboard_notify.urllib.request.urlopen")
-    @patch("_dashboard_notify.urllib.request.Request")
-    def test_sends_notification_to_console_api(self, mock_request_cls, mock_urlopen):
-        """Should POST notification to Console API."""
-        mock_response = MagicMock()
-        mock_response.status = 201
-        mock_urlopen.return_value = mock_response
-
+    @patch("_dashboard_notify.spawn_drain")
+    @patch("_dashboard_notify.enqueue", return_value="key")
+    def test_queues_notification_for_console_api(self, mock_enqueue, mock_spawn):
+        """Should queue the notification for the Console API and start a drainer."""
         result = send_dashboard_notification("plan_approval", "Plan Review", "Needs approval")
 
         assert result is True
-        mock_request_cls.assert_called_once()
-        call_args = mock_request_cls.call_args
-        assert "http://localhost:41777/api/notifications" in call_args[0][0]
-        body = json.loads(call_args[1]["data"])
+        mock_enqueue.assert_called_once()
+        assert mock_enqueue.call_args[0][0] == "/api/notifications"
+        body = mock_enqueue.call_args[0][1]
         assert body["type"] == "plan_approval"
         assert body["title"] == "Plan Review"
         assert body["message"] == "Needs approval"
+        mock_spawn.assert_called_once()
 
-    @patch("_dashboard_notify.urllib.request.urlopen")
-    @patch("_dashboard_notify.urllib.request.Request")
-    def test_includes_optional_plan_path(self, mock_request_cls, mock_urlopen):
+    @patch("_dashboard_notify.spawn_drain")
+    @patch("_dashboard_notify.enqueue", return_value="key")
+    def test_includes_optional_plan_path(self, mock_enqueue, mock_spawn):
         """Should include planPath when provided."""
-        mock_urlopen.return_value = MagicMock(status=201)
-
         send_dashboard_notification("info", "Title", "Msg", plan_path="/plans/test.md")
 
-        body = json.loads(mock_request_cls.call_args[1]["data"])
+        body = mock_enqueue.call_args[0][1]
         assert body["planPath"] == "/plans/test.md"
 
-    @patch("_dashboard_notify.urllib.request.urlopen", side_effect=Exception("Connection refused"))
-    def test_silently_ignores_connection_errors(self, mock_urlopen):
-        """Should return False without raising on connection errors."""
-        result = send_dashboard_notification("info", "Title", "Msg")
-        assert result is False
-
-    @patch("_dashboard_notify.urllib.request.urlopen", side_effect=TimeoutError("timeout"))
-    def test_silently_ignores_timeout(self, mock_urlopen):
-        """Should return False without raising on timeout."""
-        result = send_dashboard_notification("info", "Title", "Msg")
-        assert result is False
+    @patch("_dashboard_notify.spawn_drain", return_value=False)
+    @patch("_dashboard_notify.enqueue", return_value="key")
+    def test_succeeds_while_worker_down(self, mock_enqueue, mock_spawn):
+        """Should report success once queued, even if no drainer could start."""
+        assert send_dashboard_notification("info", "Title", "Msg") is True
+
+    @patch("_dashboard_notify.spawn_drain")
+    @patch("_dashboard_notify.enqueue", return_value=None)
+    def test_returns_false_when_outbox_unwritable(self, mock_enqueue, mock_spawn):
+        """Should return False without raising when the outbox cannot be written."""
+        assert send_dashboard_notification("info", "Title", "Msg") is False
+        mock_spawn.assert_not_called()
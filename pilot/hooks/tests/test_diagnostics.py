@@ -0,0 +1,65 @@
+"""Tests for diagnostic delta reporting."""
+
+from __future__ import annotations
+
+from _diagnostics import fingerprint, normalize_message, split_new
+
+
+class TestFingerprint:
+    """Test issue fingerprints."""
+
+    def test_ignores_numbers_spacing_and_fix_marker(self):
+        """Should treat messages differing only in numbers, spacing or [*] as the same issue."""
+        assert normalize_message("[*] Line too long (130 > 120)") == normalize_message("Line too  long (125 > 120)")
+
+    def test_anchor_text_is_part_of_identity(self):
+        """Should give a different fingerprint when the flagged line changes."""
+        assert fingerprint("F401", "`os` unused", "import os") != fingerprint("F401", "`os` unused", "import os, sys")
+
+
+class TestSplitNew:
+    """Test comparing a check with the previous one."""
+
+    def test_first_check_reports_everything(self, tmp_path):
+        """Should treat every issue as new the first time a file is checked."""
+        target = tmp_path / "a.py"
+        target.write_text("import os\n")
+
+        assert split_new(target, [("F401", "`os` unused", str(target), 1)]) == ([True], 0)
+
+    def test_moved_issue_is_unchanged(self, tmp_path):
+        """Should recognise an issue whose line moved but whose text did not."""
+        target = tmp_path / "a.py"
+        target.write_text("import os\n")
+        split_new(target, [("F401", "`os` unused", str(target), 1)])
+        target.write_text('"""Doc."""\n\nimport os\n')
+
+        assert split_new(target, [("F401", "`os` unused", str(target), 3)]) == ([False], 1)
+
+    def test_edited_line_is_reported_again(self, tmp_path):
+        """Should report an issue again when its anchor line changed."""
+        target = tmp_path / "a.py"
+        target.write_text("import os\n")
+        split_new(target, [("F401", "`os` unused", str(target), 1)])
+        target.write_text("import os  # noqa-ish\n")
+
+        assert split_new(target, [("F401", "`os` unused", str(target), 1)]) == ([True], 0)
+
+    def test_duplicates_match_one_for_one(self, tmp_path):
+        """Should report a second identical issue as new."""
+        target = tmp_path / "a.py"
+        target.write_text("x\n")
+        issue = ("E1", "bad", str(target), 1)
+        split_new(target, [issue])
+
+        assert split_new(target, [issue, issue]) == ([False, True], 1)
+
+    def test_clean_check_forgets_history(self, tmp_path):
+        """Should report a reintroduced issue after a clean check."""
+        target = tmp_path / "a.py"
+        target.write_text("import os\n")
+        issue = ("F401", "`os` unused", str(target), 1)
+        split_new(target, [issue])
+        split_new(target, [])
+
+        assert split_new(target, [issue]) == ([True], 0)
@@ -0,0 +1,112 @@
+"""Tests for the failing-test index."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import _failing_tests
+from _failing_tests import has_failing_test_for
+
+
+def _write(root: Path, rel: str, content: str) -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+def _repo(root: Path) -> Path:
+    _write(root, ".git/HEAD", "ref: refs/heads/main\n")
+    return root
+
+
+class TestPytest:
+    """Test pytest lastfailed ingestion."""
+
+    def test_matches_failing_test_module(self, tmp_path):
+        """Should find a failing test_<module>.py recorded by pytest in a parent directory."""
+        _repo(tmp_path)
+        _write(tmp_path, ".pytest_cache/v/cache/lastfailed", json.dumps({"tests/test_calc.py::test_add": True}))
+        impl = _write(tmp_path, "src/pkg/calc.py", "")
+        other = _write(tmp_path, "src/pkg/other.py", "")
+
+        assert has_failing_test_for(str(impl))
+        assert not has_failing_test_for(str(other))
+
+    def test_reparses_only_when_report_changes(self, tmp_path):
+        """Should serve repeat lookups from the index and pick up a rewritten report."""
+        _repo(tmp_path)
+        cache = _write(tmp_path, ".pytest_cache/v/cache/lastfailed", json.dumps({"test_calc.py::test_add": True}))
+        impl = _write(tmp_path, "calc.py", "")
+        assert has_failing_test_for(str(impl))
+
+        with patch("_failing_tests._parse") as parse:
+            assert has_failing_test_for(str(impl))
+        parse.assert_not_called()
+
+        cache.write_text("{}")
+        assert not has_failing_test_for(str(impl))
+
+
+class TestJavaScript:
+    """Test vitest cache and JSON report ingestion."""
+
+    def test_vitest_results_cache(self, tmp_path):
+        """Should read failed entries from vitest's results cache, including kebab-case names."""
+        _repo(tmp_path)
+        results = {"version": "1.6.0", "results": [[":src/user-card.test.tsx", {"duration": 4, "failed": True}]]}
+        _write(tmp_path, "node_modules/.vite/vitest/results.json", json.dumps(results))
+        impl = _write(tmp_path, "src/UserCard.tsx", "")
+
+        assert has_failing_test_for(str(impl))
+
+    def test_jest_json_report(self, tmp_path):
+        """Should read failed test files from a jest/vitest JSON report."""
+        _repo(tmp_path)
+        report = {
+            "testResults": [
+                {"name": str(tmp_path / "src/api.test.ts"), "status": "failed"},
+                {"name": str(tmp_path / "src/db.test.ts"), "status": "passed"},
+            ]
+        }
+        _write(tmp_path, "test-results.json", json.dumps(report))
+
+        assert has_failing_test_for(str(_write(tmp_path, "src/api.ts", "")))
+        assert not has_failing_test_for(str(_write(tmp_path, "src/db.ts", "")))
+
+
+class TestGo:
+    """Test `go test -json` ingestion."""
+
+    def test_failing_package(self, tmp_path):
+        """Should match a Go file to failing tests in its own package only."""
+        _repo(tmp_path)
+        _write(tmp_path, "go.mod", "module example.com/app\n")
+        events = [
+            {"Action": "run", "Package": "example.com/app/util", "Test": "TestAdd"},
+            {"Action": "fail", "Package": "example.com/app/util", "Test": "TestAdd"},
+            {"Action": "fail", "Package": "example.com/app/api", "Test": "TestGet"},
+            {"Action": "pass", "Package": "example.com/app/api", "Test": "TestGet"},
+        ]
+        _write(tmp_path, "go-test.json", "\n".join(json.dumps(e) for e in events))
+
+        assert has_failing_test_for(str(_write(tmp_path, "util/add.go", "")))
+        assert not has_failing_test_for(str(_write(tmp_path, "api/get.go", "")))
+
+
+class TestSearchDirs:
+    """Test where reports are looked for."""
+
+    def test_stops_at_repo_root(self, tmp_path):
+        """Should not read reports above the repository root."""
+        _write(tmp_path, ".pytest_cache/v/cache/lastfailed", json.dumps({"test_calc.py::t": True}))
+        _repo(tmp_path / "repo")
+        impl = _write(tmp_path, "repo/calc.py", "")
+
+        root, dirs = _failing_tests._search_dirs(impl.parent)
+
+        assert root == tmp_path / "repo"
+        assert dirs == [tmp_path / "repo"]
+        assert not has_failing_test_for(str(impl))
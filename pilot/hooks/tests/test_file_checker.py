@@ -4,8 +4,11 @@ from __future__ import annotations
 
 import io
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
+import _budget
 from file_checker import main
 
 
@@ -25,7 +28,7 @@ def test_python_file_dispatches_to_python_checker(tmp_path):
             mock_check.return_value = (0, "")
             result = main()
 
-            mock_check.assert_called_once_with(py_file)
+            mock_check.assert_called_once_with(py_file, lint=True)
             assert result == 0
 
 
@@ -39,7 +42,7 @@ def test_typescript_file_dispatches_to_typescript_checker(tmp_path):
             mock_check.return_value = (0, "")
             result = main()
 
-            mock_check.assert_called_once_with(ts_file)
+            mock_check.assert_called_once_with(ts_file, lint=True)
             assert result == 0
 
 
@@ -53,7 +56,7 @@ def test_go_file_dispatches_to_go_checker(tmp_path):
             mock_check.return_value = (0, "")
             result = main()
 
-            mock_check.assert_called_once_with(go_file)
+            mock_check.assert_called_once_with(go_file, lint=True)
             assert result == 0
 
 
@@ -117,3 +120,139 @@ class TestContextOutput:
 
         captured = capsys.readouterr()
         assert captured.out == ""
+
+
+class TestTimeBudget:
+    """Test reporting and deferring of slow checker tools."""
+
+    def test_deferred_tool_is_reported_and_rerun_in_background(self, tmp_path, capsys):
+        """Should surface budget notices and hand deferred tools to a background run."""
+        ts_file = tmp_path / "app.ts"
+        ts_file.write_text("const x = 1;\n")
+
+        def check(_path, **_kwargs):
+            _budget._state["deferred"].append("eslint")
+            _budget._state["notices"].append("eslint deferred to a background run (p95 9.0s)")
+            return 0, ""
+
+        with (
+            patch("sys.stdin", _make_stdin("Edit", str(ts_file))),
+            patch("file_checker.check_typescript", side_effect=check),
+            patch("file_checker._budget.spawn_deferred") as spawn,
+        ):
+            main()
+
+        context = json.loads(capsys.readouterr().out)["hookSpecificOutput"]["additionalContext"]
+        assert "Checker time budget" in context
+        assert "eslint deferred" in context
+        assert spawn.call_args.args[1:3] == (ts_file, ["eslint"])
+
+    def test_background_run_stores_result_instead_of_printing(self, tmp_path, capsys, monkeypatch):
+        """Should hand the deferred result to the next hook rather than printing it."""
+        ts_file = tmp_path / "app.ts"
+        ts_file.write_text("const x = 1;\n")
+        monkeypatch.setenv(_budget.DEFERRED_TOOLS_ENV, "eslint")
+
+        with (
+            patch("sys.stdin", _make_stdin("Edit", str(ts_file))),
+            patch("file_checker.check_typescript", return_value=(0, "TypeScript: 2 eslint in app.ts")),
+        ):
+            main()
+
+        assert capsys.readouterr().out == ""
+        monkeypatch.delenv(_budget.DEFERRED_TOOLS_ENV)
+        assert _budget.collect_deferred_results() == [
+            "Deferred check results (background run):\nTypeScript: 2 eslint in app.ts"
+        ]
+
+
+class TestConcurrentStages:
+    """Test that independent stages overlap and merge in a fixed order."""
+
+    def test_stages_overlap(self, tmp_path, capsys):
+        """Should run the language check, test lookup and failing-test lookup concurrently."""
+        py_file = tmp_path / "calc.py"
+        py_file.write_text("x = 1\n")
+        # Each stage waits until all three are running; run one after another they would never meet.
+        all_running = threading.Barrier(3, timeout=10)
+
+        def overlapping(result):
+            def stage(*_args, **_kwargs):
+                all_running.wait()
+                return result
+
+            return stage
+
+        with (
+            patch("sys.stdin", _make_stdin("Write", str(py_file))),
+            patch("file_checker.check_python", side_effect=overlapping((0, "Python: 1 ruff in calc.py"))),
+            patch("file_checker.has_python_test_file", side_effect=overlapping(False)),
+            patch("file_checker.has_failing_test_for", side_effect=overlapping(False)),
+        ):
+            main()
+
+        assert not all_running.broken
+        context = json.loads(capsys.readouterr().out)["hookSpecificOutput"]["additionalContext"]
+        assert context.index("Python: 1 ruff") < context.index("TDD Reminder")
+
+    def test_failing_test_suppresses_reminder(self, tmp_path):
+        """Should drop the missing-test reminder when a failing test exists for the module."""
+        from file_checker import _tdd_check
+
+        with (
+            patch("file_checker.has_python_test_file", return_value=False),
+            patch("file_checker.has_failing_test_for", return_value=True),
+            ThreadPoolExecutor(max_workers=2) as pool,
+        ):
+            assert _tdd_check("Write", {}, str(tmp_path / "calc.py"), pool) == ""
+
+
+class TestSafeMode:
+    """Test bounded-cost handling of large and generated files."""
+
+    def test_generated_file_skips_checker_and_says_so(self, tmp_path, capsys):
+        """Should not run the language checker on a generated file and report why."""
+        py_file = tmp_path / "models_pb2.py"
+        py_file.write_text("# @generated by the protocol buffer compiler\nx = 1\n")
+
+        with (
+            patch("sys.stdin", _make_stdin("Write", str(py_file))),
+            patch("file_checker.check_python") as check,
+            patch("file_checker._tdd_check", return_value=""),
+        ):
+            main()
+
+        check.assert_not_called()
+        context = json.loads(capsys.readouterr().out)["hookSpecificOutput"]["additionalContext"]
+        assert context.startswith("Large file safe mode: models_pb2.py is marked as generated")
+
+    def test_skipped_file_still_gets_length_check(self, tmp_path, capsys):
+        """Should still warn about length when formatting and linting are skipped."""
+        py_file = tmp_path / "models_pb2.py"
+        py_file.write_text("# @generated\n" + "x = 1\n" * 600)
+
+        with (
+            patch("sys.stdin", _make_stdin("Write", str(py_file))),
+            patch("file_checker.check_python") as check,
+            patch("file_checker._tdd_check", return_value=""),
+        ):
+            main()
+
+        check.assert_not_called()
+        assert "FILE TOO LONG: models_pb2.py" in capsys.readouterr().out
+
+    def test_large_file_is_formatted_only(self, tmp_path, capsys):
+        """Should run the checker with lint=False past the format-only size."""
+        py_file = tmp_path / "big.py"
+        py_file.write_text("x = 1\n" * 100)
+
+        with (
+            patch("sys.stdin", _make_stdin("Write", str(py_file))),
+            patch("_util._read_config", return_value={"largeFileFormatOnlyBytes": 100}),
+            patch("file_checker.check_python", return_value=(0, "")) as check,
+            patch("file_checker._tdd_check", return_value=""),
+        ):
+            main()
+
+        check.assert_called_once_with(py_file, lint=False)
+        assert "formatted only, linting skipped" in capsys.readouterr().out
@@ -0,0 +1,75 @@
+"""Tests for _git on-disk repository metadata resolver."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from _git import find_git_root
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(cwd: Path, *args: str) -> str:
+    env_args = ["-c", "user.name=Test", "-c", "user.email=test@example.com", "-c", "protocol.file.allow=always"]
+    return subprocess.run(["git", *env_args, *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    root = tmp_path / "repo"
+    root.mkdir()
+    _git(root, "init", "-q", "-b", "main")
+    (root / "src").mkdir()
+    (root / "src" / "app.py").write_text("x = 1\n")
+    _git(root, "add", ".")
+    _git(root, "commit", "-q", "-m", "init")
+    return root
+
+
+@requires_git
+class TestFindGitRoot:
+    """Test work tree root discovery."""
+
+    def test_finds_root_from_nested_file(self, repo):
+        """Should walk up from a file to the repository root."""
+        assert find_git_root(repo / "src" / "app.py") == repo.resolve()
+
+    def test_matches_git_in_linked_worktree(self, repo, tmp_path):
+        """Should resolve a linked worktree to its own root, like git does."""
+        worktree = tmp_path / "wt"
+        _git(repo, "worktree", "add", "-q", "-b", "spec/feature", str(worktree))
+
+        assert find_git_root(worktree / "src") == worktree.resolve()
+        assert str(find_git_root(worktree)) == _git(worktree, "rev-parse", "--show-toplevel")
+
+    def test_matches_git_in_submodule(self, repo, tmp_path):
+        """Should stop at a submodule's gitdir file instead of the superproject."""
+        lib = tmp_path / "lib"
+        lib.mkdir()
+        _git(lib, "init", "-q", "-b", "main")
+        (lib / "lib.py").write_text("")
+        _git(lib, "add", ".")
+        _git(lib, "commit", "-q", "-m", "lib")
+        _git(repo, "submodule", "add", "-q", str(lib), "vendor/lib")
+
+        sub = repo / "vendor" / "lib"
+        assert find_git_root(sub / "lib.py") == sub.resolve()
+        assert str(find_git_root(sub)) == _git(sub, "rev-parse", "--show-toplevel")
+
+    def test_returns_none_outside_repo(self, tmp_path):
+        """Should return None when no .git entry exists above start."""
+        assert find_git_root(tmp_path) is None
+
+    def test_ignores_invalid_git_entry(self, repo):
+        """Should skip a .git file that is not a gitdir pointer."""
+        nested = repo / "nested"
+        nested.mkdir()
+        (nested / ".git").write_text("not a pointer\n")
+
+        assert find_git_root(nested) == repo.resolve()
@@ -19,15 +19,12 @@ class TestCheckGoVetCounting:
         mock_result = MagicMock()
         mock_result.returncode = 2
         mock_result.stdout = ""
-        mock_result.stderr = (
-            "# command-line-arguments\n"
-            "vet: ./main.go:5:6: x declared and not used\n"
-        )
+        mock_result.stderr = "# command-line-arguments\nvet: ./main.go:5:6: x declared and not used\n"
 
         with (
             patch("_checkers.go.check_file_length", return_value=""),
             patch("_checkers.go.shutil.which", side_effect=lambda name: f"/usr/bin/{name}" if name == "go" else None),
-            patch("_checkers.go.subprocess.run", return_value=mock_result),
+            patch("_budget.subprocess.run", return_value=mock_result),
         ):
             exit_code, reason = check_go(go_file)
 
@@ -51,7 +48,7 @@ class TestCheckGoVetCounting:
         with (
             patch("_checkers.go.check_file_length", return_value=""),
             patch("_checkers.go.shutil.which", side_effect=lambda name: f"/usr/bin/{name}" if name == "go" else None),
-            patch("_checkers.go.subprocess.run", return_value=mock_result),
+            patch("_budget.subprocess.run", return_value=mock_result),
         ):
             exit_code, reason = check_go(go_file)
 
@@ -71,7 +68,7 @@ class TestCheckGoVetCounting:
         with (
             patch("_checkers.go.check_file_length", return_value=""),
             patch("_checkers.go.shutil.which", side_effect=lambda name: f"/usr/bin/{name}" if name == "go" else None),
-            patch("_checkers.go.subprocess.run", return_value=mock_vet),
+            patch("_budget.subprocess.run", return_value=mock_vet),
         ):
             _, reason = check_go(go_file)
 
@@ -125,9 +122,38 @@ class TestCheckGoCleanFile:
         with (
             patch("_checkers.go.check_file_length", return_value=""),
             patch("_checkers.go.shutil.which", side_effect=lambda name: f"/usr/bin/{name}" if name == "go" else None),
-            patch("_checkers.go.subprocess.run", return_value=mock_result),
+            patch("_budget.subprocess.run", return_value=mock_result),
         ):
             exit_code, reason = check_go(go_file)
 
         assert exit_code == 0
         assert reason == ""
+
+
+class TestCheckGoDelta:
+    """Repeated checks report only new go vet findings."""
+
+    def test_known_vet_issue_is_not_repeated(self, tmp_path: Path) -> None:
+        """A new finding is listed while the previously reported one is only counted."""
+        go_file = tmp_path / "main.go"
+        go_file.write_text("package main\n")
+        first_vet = MagicMock(returncode=2, stdout="", stderr="vet: ./main.go:5:6: x declared and not used\n")
+        second_vet = MagicMock(
+            returncode=2,
+            stdout="",
+            stderr="vet: ./main.go:5:6: x declared and not used\nvet: ./main.go:6:2: y declared and not used\n",
+        )
+
+        with (
+            patch("_checkers.go.check_file_length", return_value=""),
+            patch("_checkers.go.shutil.which", side_effect=lambda name: f"/usr/bin/{name}" if name == "go" else None),
+            patch("_budget.subprocess.run", side_effect=[first_vet, second_vet]),
+        ):
+            _, first = check_go(go_file)
+            _, second = check_go(go_file)
+
+        assert "1 vet" in first
+        assert "1 vet" in second
+        assert "y declared" in second
+        assert "x declared" not in second
+        assert "1 unchanged issue" in second
@@ -0,0 +1,114 @@
+"""Tests for background targeted test runs."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import MagicMock, patch
+
+import _impact
+
+
+class TestEnabled:
+    """Test the opt-in switch."""
+
+    def test_env_overrides_config(self, monkeypatch):
+        """Should honour PILOT_IMPACT_TESTS before the config file."""
+        monkeypatch.setenv("PILOT_IMPACT_TESTS", "0")
+        with patch("_impact._read_config", return_value={"impactTests": True}):
+            assert _impact.is_impact_enabled() is False
+
+    def test_off_by_default(self, monkeypatch):
+        """Should stay off unless the config key is set."""
+        monkeypatch.delenv("PILOT_IMPACT_TESTS", raising=False)
+        with patch("_impact._read_config", return_value={}):
+            assert _impact.is_impact_enabled() is False
+        with patch("_impact._read_config", return_value={"impactTests": True}):
+            assert _impact.is_impact_enabled() is True
+
+
+class TestRequestRun:
+    """Test queueing runs and starting the worker."""
+
+    def test_merges_edits_into_one_pending_job(self, tmp_path):
+        """Should coalesce edits into a single pending job and spawn a detached worker."""
+        root = tmp_path / "repo"
+        root.mkdir()
+        impact_dir = tmp_path / "impact"
+
+        with patch("_impact.subprocess.Popen") as popen:
+            assert _impact.request_run(root, root / "a.py", impact_dir)
+            assert _impact.request_run(root, root / "b.py", impact_dir)
+            assert _impact.request_run(root, root / "a.py", impact_dir)
+
+        job = json.loads((impact_dir / "pending.json").read_text())
+        assert job["edited"] == ["a.py", "b.py"]
+        assert popen.call_args.kwargs["start_new_session"] is True
+
+    def test_ignores_files_outside_root(self, tmp_path):
+        """Should not queue files that are not under the repo root."""
+        with patch("_impact.subprocess.Popen") as popen:
+            assert not _impact.request_run(tmp_path / "repo", tmp_path / "elsewhere.py", tmp_path / "impact")
+        popen.assert_not_called()
+
+
+class TestWorker:
+    """Test draining pending jobs."""
+
+    def test_runs_selected_tests_and_writes_result(self, tmp_path):
+        """Should claim the pending job, run its impacted tests and leave a result file."""
+        impact_dir = tmp_path / "impact"
+        impact_dir.mkdir()
+        (impact_dir / "pending.json").write_text(json.dumps({"root": str(tmp_path), "edited": ["a.py"]}))
+        proc = MagicMock(returncode=0, stdout="1 passed\n", stderr="")
+
+        with (
+            patch("_impact.impacted_tests", return_value=["tests/test_a.py"]),
+            patch("_impact._python_runner", return_value=["pytest"]),
+            patch("_impact.subprocess.run", return_value=proc) as run,
+        ):
+            _impact.run_worker(impact_dir)
+
+        assert "tests/test_a.py" in run.call_args.args[0]
+        assert not (impact_dir / "pending.json").exists()
+        assert _impact.collect_results(impact_dir) == ["Impacted tests for a.py: 1 test file(s) passed in 0.0s"]
+        assert _impact.collect_results(impact_dir) == []
+
+
+class TestCommands:
+    """Test picking runners for the selected tests."""
+
+    def test_groups_by_language_and_project(self, tmp_path):
+        """Should run Python tests together and JS tests from their package.json project."""
+        web = tmp_path / "web"
+        (web / "node_modules" / ".bin").mkdir(parents=True)
+        (web / "node_modules" / ".bin" / "vitest").write_text("")
+        (web / "package.json").write_text("{}")
+
+        with (
+            patch("_impact._python_runner", return_value=["pytest"]),
+            patch("_impact.shutil.which", return_value=None),
+        ):
+            commands = _impact.test_commands(tmp_path, ["tests/test_a.py", "web/src/a.test.ts", "api/a_test.go"])
+
+        assert commands[0] == (["pytest", "-q", "-p", "no:cacheprovider", "tests/test_a.py"], tmp_path)
+        assert commands[1] == ([str(web / "node_modules/.bin/vitest"), "run", "src/a.test.ts"], web)
+        assert len(commands) == 2
+
+
+class TestFormatResult:
+    """Test result reports."""
+
+    def test_failure_includes_output_tail(self):
+        """Should report failing runs with their output tail."""
+        result = {
+            "edited": ["src/app/core.py"],
+            "tests": ["tests/test_api.py"],
+            "runs": [
+                {"command": "pytest -q tests/test_api.py", "exit_code": 1, "seconds": 2.0, "tail": ["FAILED test_x"]}
+            ],
+        }
+
+        report = _impact.format_result(result)
+
+        assert report.startswith("Impacted tests for core.py: FAILED (1 test file(s), 2.0s)")
+        assert "  FAILED test_x" in report
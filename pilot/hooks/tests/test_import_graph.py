@@ -0,0 +1,102 @@
+"""Tests for the import graph used to select impacted tests."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from _import_graph import impacted_tests, is_test_path, update_index
+
+
+def _write(root: Path, rel: str, content: str) -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+class TestIsTestPath:
+    """Test test-file detection."""
+
+    def test_recognises_each_language(self):
+        """Should recognise Python, Go and JS/TS test naming conventions."""
+        assert is_test_path("tests/test_api.py")
+        assert is_test_path("pkg/api_test.py")
+        assert is_test_path("pkg/api_test.go")
+        assert is_test_path("src/api.test.ts")
+        assert is_test_path("src/api.spec.tsx")
+        assert not is_test_path("src/api.ts")
+        assert not is_test_path("pkg/testing.py")
+
+
+class TestPython:
+    """Test Python import resolution."""
+
+    def test_transitive_and_relative_imports(self, tmp_path):
+        """Should follow absolute and relative imports through intermediate modules."""
+        _write(tmp_path, "src/app/__init__.py", "")
+        _write(tmp_path, "src/app/core.py", "X = 1\n")
+        _write(tmp_path, "src/app/api.py", "from .core import X\n")
+        _write(tmp_path, "src/app/other.py", "Y = 2\n")
+        _write(tmp_path, "tests/test_api.py", "from app.api import X\n")
+        _write(tmp_path, "tests/test_other.py", "import app.other\n")
+
+        assert impacted_tests(tmp_path, ["src/app/core.py"]) == ["tests/test_api.py"]
+
+    def test_sys_path_style_import_by_unique_suffix(self, tmp_path):
+        """Should resolve imports of modules put on sys.path by the tests themselves."""
+        _write(tmp_path, "tools/hooks/_util.py", "")
+        _write(tmp_path, "tools/hooks/tests/test_util.py", "from _util import x\n")
+
+        assert impacted_tests(tmp_path, ["tools/hooks/_util.py"]) == ["tools/hooks/tests/test_util.py"]
+
+    def test_edited_test_selects_itself(self, tmp_path):
+        """Should run an edited test file even if nothing imports it."""
+        _write(tmp_path, "tests/test_a.py", "")
+
+        assert impacted_tests(tmp_path, ["tests/test_a.py"]) == ["tests/test_a.py"]
+
+
+class TestTypeScriptAndGo:
+    """Test TS/JS and Go import resolution."""
+
+    def test_typescript_relative_imports(self, tmp_path):
+        """Should resolve extensionless and index imports."""
+        _write(tmp_path, "src/lib/index.ts", "export * from './math';\n")
+        _write(tmp_path, "src/lib/math.ts", "export const add = 1;\n")
+        _write(tmp_path, "src/lib.test.ts", "import { add } from './lib';\n")
+        _write(tmp_path, "src/unrelated.test.ts", "import React from 'react';\n")
+
+        assert impacted_tests(tmp_path, ["src/lib/math.ts"]) == ["src/lib.test.ts"]
+
+    def test_go_package_imports(self, tmp_path):
+        """Should map module import paths to packages and include same-package tests."""
+        _write(tmp_path, "go.mod", "module example.com/app\n\ngo 1.22\n")
+        _write(tmp_path, "util/util.go", "package util\n")
+        _write(tmp_path, "util/util_test.go", "package util\n")
+        _write(tmp_path, "api/api.go", 'package api\n\nimport (\n\t"fmt"\n\t"example.com/app/util"\n)\n')
+        _write(tmp_path, "api/api_test.go", "package api\n")
+
+        assert impacted_tests(tmp_path, ["util/util.go"]) == ["api/api_test.go", "util/util_test.go"]
+
+
+class TestIncrementalIndex:
+    """Test that the index only re-parses changed files."""
+
+    def test_reparses_only_changed_content(self, tmp_path):
+        """Should keep entries for untouched files and pick up new imports."""
+        _write(tmp_path, "a.py", "")
+        b = _write(tmp_path, "b.py", "")
+        test = _write(tmp_path, "test_b.py", "import b\n")
+        first = update_index(tmp_path)
+
+        test.write_text("import b\nimport a\n")
+        os.utime(test, ns=(1, 1))
+        second = update_index(tmp_path)
+
+        assert second["b.py"] == first["b.py"]
+        assert [0, "a"] in second["test_b.py"]["imports"]
+        assert impacted_tests(tmp_path, ["a.py"]) == ["test_b.py"]
+
+        b.unlink()
+        assert "b.py" not in update_index(tmp_path)
@@ -0,0 +1,59 @@
+"""Tests that every hook module imports under the oldest Python the installer accepts."""
+
+from __future__ import annotations
+
+import glob
+import os
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+HOOKS_DIR = Path(__file__).resolve().parent.parent
+CLAUDE_FILES_STEP = HOOKS_DIR.parent.parent / "installer" / "steps" / "claude_files.py"
+
+
+def _min_python() -> tuple[int, int]:
+    """Read HOOK_MIN_PYTHON from the installer so the two cannot drift apart."""
+    match = re.search(r"^HOOK_MIN_PYTHON = \((\d+), (\d+)\)", CLAUDE_FILES_STEP.read_text(), re.MULTILINE)
+    assert match, "HOOK_MIN_PYTHON not found in installer/steps/claude_files.py"
+    return int(match.group(1)), int(match.group(2))
+
+
+def _find_interpreter(version: tuple[int, int]) -> str | None:
+    name = f"python{version[0]}.{version[1]}"
+    pyenv_root = os.environ.get("PYENV_ROOT", str(Path.home() / ".pyenv"))
+    candidates = [
+        shutil.which(name),
+        *sorted(glob.glob(f"{pyenv_root}/versions/{version[0]}.{version[1]}.*/bin/{name}")),
+    ]
+    check = f"import sys; sys.exit(0 if sys.version_info[:2] == {version} else 1)"
+    for candidate in filter(None, candidates):
+        try:
+            if subprocess.run([candidate, "-c", check], capture_output=True, timeout=30).returncode == 0:
+                return candidate
+        except (subprocess.SubprocessError, OSError):
+            continue
+    return None
+
+
+class TestMinimumPython:
+    """Hooks run under whatever interpreter the installer resolved, which may be the minimum version."""
+
+    def test_hook_modules_import(self):
+        version = _min_python()
+        python = _find_interpreter(version)
+        if python is None:
+            pytest.skip(f"Python {version[0]}.{version[1]} is not installed")
+        modules = sorted(path.stem for path in HOOKS_DIR.glob("*.py"))
+        modules += sorted(f"_checkers.{path.stem}" for path in (HOOKS_DIR / "_checkers").glob("[!_]*.py"))
+        script = "import importlib, sys\nsys.path.insert(0, sys.argv[1])\nfor name in sys.argv[2:]:\n    importlib.import_module(name)\n"
+        result = subprocess.run(
+            [python, "-c", script, str(HOOKS_DIR), *modules],
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        assert result.returncode == 0, result.stderr
@@ -0,0 +1,141 @@
+"""Tests for _outbox durable queue and drainer."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import _outbox
+
+
+def _queued(outbox_dir: Path) -> list[dict]:
+    path = outbox_dir / _outbox.ACTIVE_SEGMENT
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestEnqueue:
+    """Test appending to the outbox."""
+
+    def test_appends_entry_with_idempotency_key(self, tmp_path):
+        """Should append one JSON line with a unique key."""
+        key1 = _outbox.enqueue("/api/notifications", {"title": "a"}, tmp_path)
+        key2 = _outbox.enqueue("/api/memory/save", {"text": "b"}, tmp_path)
+
+        entries = _queued(tmp_path)
+        assert [e["key"] for e in entries] == [key1, key2]
+        assert key1 != key2
+        assert entries[0]["endpoint"] == "/api/notifications"
+        assert entries[1]["payload"] == {"text": "b"}
+
+    def test_follows_segment_renamed_by_drainer(self, tmp_path):
+        """Should write to the new active segment after a drainer claimed the old one."""
+        _outbox.enqueue("/api/notifications", {"n": 1}, tmp_path)
+        os.replace(tmp_path / _outbox.ACTIVE_SEGMENT, tmp_path / "draining-1-1.jsonl")
+
+        _outbox.enqueue("/api/notifications", {"n": 2}, tmp_path)
+
+        assert [e["payload"] for e in _queued(tmp_path)] == [{"n": 2}]
+
+    def test_returns_none_when_unwritable(self, tmp_path):
+        """Should return None instead of raising when the outbox cannot be created."""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+
+        assert _outbox.enqueue("/api/notifications", {}, blocker / "outbox") is None
+
+
+class TestDrain:
+    """Test delivering queued entries."""
+
+    @patch("_outbox.post_json", return_value=201)
+    def test_delivers_with_idempotency_key_and_clears_outbox(self, mock_post, tmp_path):
+        """Should POST every entry with its key and leave nothing queued."""
+        key = _outbox.enqueue("/api/notifications", {"title": "a"}, tmp_path)
+
+        assert _outbox.drain(tmp_path) == 1
+
+        assert mock_post.call_args[0][:2] == ("/api/notifications", {"title": "a"})
+        assert mock_post.call_args[1]["headers"] == {"Idempotency-Key": key}
+        assert _queued(tmp_path) == []
+        assert list(tmp_path.glob("draining-*")) == []
+
+    @patch("_outbox.post_json")
+    def test_requeues_remaining_entries_when_worker_down(self, mock_post, tmp_path):
+        """Should stop at the first unreachable response and keep the rest queued in order."""
+        mock_post.side_effect = [201, None]
+        for n in range(4):
+            _outbox.enqueue("/api/notifications", {"n": n}, tmp_path)
+
+        assert _outbox.drain(tmp_path) == 1
+
+        assert mock_post.call_count == 2
+        assert [e["payload"]["n"] for e in _queued(tmp_path)] == [1, 2, 3]
+
+    @patch("_outbox.post_json", return_value=400)
+    def test_drops_rejected_entries(self, mock_post, tmp_path):
+        """Should drop entries the worker rejects with 4xx."""
+        _outbox.enqueue("/api/notifications", {}, tmp_path)
+
+        assert _outbox.drain(tmp_path) == 0
+        assert _queued(tmp_path) == []
+
+    @patch("_outbox.post_json", return_value=201)
+    def test_drops_expired_entries(self, mock_post, tmp_path):
+        """Should drop entries older than the retention window without sending them."""
+        stale = {"key": "k", "endpoint": "/api/notifications", "payload": {}, "created_at": time.time() - 30 * 86400}
+        (tmp_path / _outbox.ACTIVE_SEGMENT).write_text(json.dumps(stale) + "\n")
+
+        _outbox.drain(tmp_path)
+
+        mock_post.assert_not_called()
+
+    @patch("_outbox.post_json", return_value=201)
+    def test_skips_torn_lines_and_recovers_orphaned_segments(self, mock_post, tmp_path):
+        """Should deliver entries from segments left by a crashed drainer and ignore partial lines."""
+        entry = {"key": "k", "endpoint": "/api/memory/save", "payload": {"x": 1}, "created_at": time.time()}
+        (tmp_path / "draining-1-99999.jsonl").write_text(json.dumps(entry) + '\n{"key": "torn')
+
+        assert _outbox.drain(tmp_path) == 1
+        assert list(tmp_path.glob("draining-*")) == []
+
+    @patch("_outbox.post_json", return_value=201)
+    def test_respects_batch_size(self, mock_post, tmp_path):
+        """Should send at most batch_size entries per run and keep the rest queued."""
+        for n in range(3):
+            _outbox.enqueue("/api/notifications", {"n": n}, tmp_path)
+
+        assert _outbox.drain(tmp_path, batch_size=2) == 2
+        assert [e["payload"]["n"] for e in _queued(tmp_path)] == [2]
+
+    def test_missing_outbox_is_noop(self, tmp_path):
+        """Should return 0 when nothing was ever queued."""
+        assert _outbox.drain(tmp_path / "missing") == 0
+
+
+class TestSpawnDrain:
+    """Test starting the detached drainer."""
+
+    @patch("_outbox.subprocess.Popen")
+    @patch("_outbox.is_breaker_open", return_value=True)
+    def test_skips_when_worker_known_down(self, _breaker, mock_popen):
+        """Should not spawn a drainer while the breaker is open."""
+        assert _outbox.spawn_drain() is False
+        mock_popen.assert_not_called()
+
+    @patch("_outbox.subprocess.Popen")
+    @patch("_outbox.is_breaker_open", return_value=False)
+    def test_spawns_detached_drainer(self, _breaker, mock_popen, tmp_path):
+        """Should run this module as a detached process."""
+        assert _outbox.spawn_drain(tmp_path) is True
+
+        cmd = mock_popen.call_args[0][0]
+        assert cmd[1].endswith("_outbox.py")
+        assert cmd[2] == str(tmp_path)
+        assert mock_popen.call_args[1]["start_new_session"] is True
@@ -0,0 +1,180 @@
+"""Tests for _plan_registry — parsed plan records cached per file change."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import _plan_registry
+from _plan_registry import active_plan, parse_plan, plan_record, plans_for_day
+
+PLAN = """# Feature Implementation Plan
+
+Created: 2026-02-18
+Status: PENDING
+Approved: Yes
+Iterations: 1
+Worktree: No
+Type: Bugfix
+
+## Progress Tracking
+
+- [x] Task 1: Add parser
+- [ ] Task 2: Wire hooks
+- [ ] Task 3: Document
+
+**Total Tasks:** 3 | **Completed:** 1 | **Remaining:** 2
+"""
+
+
+def _age(path: Path, seconds: int = 60) -> None:
+    """Backdate a file so its mtime is not racy."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def _register(tmp_path: Path, plan_file: Path, monkeypatch) -> Path:
+    plan_json = tmp_path / "active_plan.json"
+    plan_json.write_text(json.dumps({"plan_path": str(plan_file), "status": "PENDING"}))
+    _age(plan_json)
+    monkeypatch.setattr(_plan_registry, "get_session_plan_path", lambda: plan_json)
+    return plan_json
+
+
+class TestParsePlan:
+    """Tests for turning plan markdown into a record."""
+
+    def test_parses_header_and_tasks(self):
+        record = parse_plan(PLAN, Path("/repo/docs/plans/2026-02-18-registry.md"))
+        assert record["name"] == "registry"
+        assert record["status"] == "PENDING"
+        assert record["approved"] is True
+        assert record["iterations"] == 1
+        assert record["worktree"] is False
+        assert record["type"] == "Bugfix"
+        assert (record["completed"], record["total"], record["current_task"]) == (1, 3, 2)
+        assert record["tasks"][0] == {"number": 1, "title": "Add parser", "done": True}
+
+    def test_no_status_line(self):
+        assert parse_plan("# Draft\n", Path("draft.md")) is None
+
+    def test_defaults(self):
+        record = parse_plan("Status: complete\n", Path("plan.md"))
+        assert record["status"] == "COMPLETE"
+        assert record["approved"] is False
+        assert record["worktree"] is True
+        assert record["current_task"] is None
+
+
+class TestPlanRecord:
+    """Tests for the per-file record cache."""
+
+    def test_parses_once_while_unchanged(self, tmp_path):
+        plan_file = tmp_path / "plan.md"
+        plan_file.write_text(PLAN)
+        _age(plan_file)
+        assert plan_record(plan_file)["current_task"] == 2
+        with patch.object(_plan_registry, "parse_plan") as parse_mock:
+            assert plan_record(plan_file)["current_task"] == 2
+        parse_mock.assert_not_called()
+
+    def test_reparses_after_edit(self, tmp_path):
+        plan_file = tmp_path / "plan.md"
+        plan_file.write_text(PLAN)
+        _age(plan_file)
+        plan_record(plan_file)
+        plan_file.write_text(PLAN.replace("- [ ] Task 2", "- [x] Task 2"))
+        _age(plan_file, 30)
+        assert plan_record(plan_file)["current_task"] == 3
+
+    def test_recently_modified_file_is_not_cached(self, tmp_path):
+        plan_file = tmp_path / "plan.md"
+        plan_file.write_text(PLAN)
+        plan_record(plan_file)
+        with patch.object(_plan_registry, "parse_plan", return_value=None) as parse_mock:
+            plan_record(plan_file)
+        parse_mock.assert_called_once()
+
+    def test_missing_file(self, tmp_path):
+        assert plan_record(tmp_path / "missing.md") is None
+
+
+class TestActivePlan:
+    """Tests for resolving the session's registered plan."""
+
+    def test_returns_registered_plan(self, tmp_path, monkeypatch):
+        plan_file = tmp_path / "plan.md"
+        plan_file.write_text(PLAN)
+        _age(plan_file)
+        _register(tmp_path, plan_file, monkeypatch)
+        assert active_plan()["path"] == str(plan_file)
+        registry = json.loads((tmp_path / "plan-registry.json").read_text())
+        assert registry["version"] == _plan_registry.REGISTRY_VERSION
+        assert registry["active"]["plan_path"] == str(plan_file)
+        assert str(plan_file) in registry["plans"]
+        assert set(registry["plans"][str(plan_file)]["record"]) == {
+            "path",
+            "name",
+            "status",
+            "approved",
+            "iterations",
+            "worktree",
+            "type",
+            "tasks",
+            "completed",
+            "total",
+            "current_task",
+        }
+
+    def test_unknown_version_is_rebuilt(self, tmp_path, monkeypatch):
+        plan_file = tmp_path / "plan.md"
+        plan_file.write_text(PLAN)
+        _age(plan_file)
+        _register(tmp_path, plan_file, monkeypatch)
+        registry_path = tmp_path / "plan-registry.json"
+        registry_path.write_text(json.dumps({"version": 99, "plans": {"stale.md": {}}}))
+
+        assert active_plan()["path"] == str(plan_file)
+        registry = json.loads(registry_path.read_text())
+        assert registry["version"] == _plan_registry.REGISTRY_VERSION
+        assert "stale.md" not in registry["plans"]
+
+    def test_relative_path_resolves_against_project_root(self, tmp_path, monkeypatch):
+        plan_file = tmp_path / "docs" / "plans" / "plan.md"
+        plan_file.parent.mkdir(parents=True)
+        plan_file.write_text(PLAN)
+        _register(tmp_path, Path("docs/plans/plan.md"), monkeypatch)
+        monkeypatch.setenv("CLAUDE_PROJECT_ROOT", str(tmp_path))
+        assert active_plan()["path"] == str(plan_file)
+
+    def test_no_registration(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(_plan_registry, "get_session_plan_path", lambda: tmp_path / "active_plan.json")
+        assert active_plan() is None
+
+
+class TestPlansForDay:
+    """Tests for the cached plans directory listing."""
+
+    def test_lists_plans_for_day(self, tmp_path):
+        plans_dir = tmp_path / "plans"
+        plans_dir.mkdir()
+        (plans_dir / "2026-02-18-a.md").touch()
+        (plans_dir / "2026-02-17-b.md").touch()
+        assert plans_for_day(plans_dir, "2026-02-18") == ["2026-02-18-a.md"]
+
+    def test_missing_directory(self, tmp_path):
+        assert plans_for_day(tmp_path / "nope", "2026-02-18") is None
+
+    def test_listing_cached_until_directory_changes(self, tmp_path):
+        plans_dir = tmp_path / "plans"
+        plans_dir.mkdir()
+        (plans_dir / "2026-02-18-a.md").touch()
+        _age(plans_dir)
+        plans_for_day(plans_dir, "2026-02-18")
+        with patch.object(_plan_registry.os, "listdir") as listdir_mock:
+            assert plans_for_day(plans_dir, "2026-02-18") == ["2026-02-18-a.md"]
+        listdir_mock.assert_not_called()
+        (plans_dir / "2026-02-18-b.md").touch()
+        assert plans_for_day(plans_dir, "2026-02-18") == ["2026-02-18-a.md", "2026-02-18-b.md"]
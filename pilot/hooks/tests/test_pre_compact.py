@@ -7,7 +7,9 @@ import os
 import sys
 import tempfile
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
+
+import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -15,11 +17,17 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 class TestPreCompactHook:
     """Test PreCompact hook state capture."""
 
-    @patch("pre_compact.urllib.request.urlopen")
+    @pytest.fixture(autouse=True)
+    def _isolated_sessions(self, tmp_path):
+        with patch("pre_compact._sessions_base", return_value=tmp_path / "sessions"):
+            yield
+
+    @patch("pre_compact.spawn_drain", return_value=True)
+    @patch("pre_compact.enqueue")
     @patch("pre_compact.read_hook_stdin")
     @patch("pre_compact.get_session_plan_path")
     @patch("os.environ", {"PILOT_SESSION_ID": "test123"})
-    def test_captures_active_plan_state(self, mock_plan_path, mock_stdin, mock_urlopen, capsys):
+    def test_captures_active_plan_state(self, mock_plan_path, mock_stdin, mock_enqueue, mock_spawn, capsys):
         """Should capture active plan state from session data."""
         from pre_compact import run_pre_compact
 
@@ -42,16 +50,13 @@ class TestPreCompactHook:
                 "custom_instructions": "",
             }
 
-            mock_response = MagicMock()
-            mock_response.status = 200
-            mock_urlopen.return_value = mock_response
+            mock_enqueue.return_value = "key"
 
             result = run_pre_compact()
 
-            assert mock_urlopen.called
-            call_args = mock_urlopen.call_args
-            req = call_args[0][0]
-            payload = json.loads(req.data.decode())
+            assert mock_enqueue.called
+            assert mock_enqueue.call_args[0][0] == "/api/memory/save"
+            payload = mock_enqueue.call_args[0][1]
             assert "PENDING" in payload["text"]
             assert "2026-02-16-test.md" in payload["text"]
 
@@ -59,15 +64,16 @@ class TestPreCompactHook:
             captured = capsys.readouterr()
             assert "Compaction in progress" in captured.err
 
-    @patch("pre_compact.urllib.request.urlopen")
+    @patch("pre_compact.spawn_drain", return_value=True)
+    @patch("pre_compact.enqueue")
     @patch("pre_compact.read_hook_stdin")
     @patch("pre_compact.get_session_plan_path")
     @patch("pre_compact._sessions_base")
     @patch("os.environ", {"PILOT_SESSION_ID": "test123"})
-    def test_fallback_to_local_file_on_http_failure(
-        self, mock_sessions_base, mock_plan_path, mock_stdin, mock_urlopen, capsys
+    def test_fallback_to_local_file_when_outbox_unwritable(
+        self, mock_sessions_base, mock_plan_path, mock_stdin, mock_enqueue, mock_spawn, capsys
     ):
-        """Should write to local file if HTTP API fails."""
+        """Should write to local file if the outbox cannot be written."""
         from pre_compact import run_pre_compact
 
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -82,7 +88,7 @@ class TestPreCompactHook:
                 "custom_instructions": "compress heavily",
             }
 
-            mock_urlopen.side_effect = Exception("Connection refused")
+            mock_enqueue.return_value = None
 
             result = run_pre_compact()
 
@@ -96,11 +102,54 @@ class TestPreCompactHook:
             captured = capsys.readouterr()
             assert "local file" in captured.err
 
-    @patch("pre_compact.urllib.request.urlopen")
+    @patch("pre_compact.spawn_drain", return_value=False)
+    @patch("pre_compact.enqueue", return_value="key")
+    @patch("pre_compact.read_hook_stdin")
+    @patch("pre_compact.get_session_plan_path")
+    @patch("os.environ", {"PILOT_SESSION_ID": "test123"})
+    def test_queues_and_writes_fallback_when_worker_down(
+        self, mock_plan_path, mock_stdin, mock_enqueue, mock_spawn, tmp_path, capsys
+    ):
+        """Should still queue the memory save but also write the local file while the worker is down."""
+        from pre_compact import run_pre_compact
+
+        mock_plan_path.return_value = tmp_path / "nonexistent.json"
+        mock_stdin.return_value = {"session_id": "test123", "trigger": "auto", "custom_instructions": ""}
+
+        with patch("pre_compact._sessions_base", return_value=tmp_path):
+            result = run_pre_compact()
+
+        assert result == 0
+        assert mock_enqueue.call_args[0][0] == "/api/memory/save"
+        assert (tmp_path / "test123" / "pre-compact-state.json").exists()
+        assert "worker unavailable" in capsys.readouterr().err
+
+    @patch("pre_compact.spawn_drain", return_value=True)
+    @patch("pre_compact.enqueue", return_value="key")
+    @patch("pre_compact.read_hook_stdin")
+    @patch("pre_compact.get_session_plan_path")
+    @patch("os.environ", {"PILOT_SESSION_ID": "test123"})
+    def test_writes_fallback_even_when_drain_started(
+        self, mock_plan_path, mock_stdin, mock_enqueue, mock_spawn, tmp_path
+    ):
+        """A started drainer does not mean delivery, so the restore file is always written."""
+        from pre_compact import run_pre_compact
+
+        mock_plan_path.return_value = tmp_path / "nonexistent.json"
+        mock_stdin.return_value = {"session_id": "test123", "trigger": "auto", "custom_instructions": ""}
+
+        with patch("pre_compact._sessions_base", return_value=tmp_path):
+            assert run_pre_compact() == 0
+
+        state = json.loads((tmp_path / "test123" / "pre-compact-state.json").read_text())
+        assert state["trigger"] == "auto"
+
+    @patch("pre_compact.spawn_drain", return_value=True)
+    @patch("pre_compact.enqueue")
     @patch("pre_compact.read_hook_stdin")
     @patch("pre_compact.get_session_plan_path")
     @patch("os.environ", {"PILOT_SESSION_ID": "test123"})
-    def test_captures_trigger_type(self, mock_plan_path, mock_stdin, mock_urlopen, capsys):
+    def test_captures_trigger_type(self, mock_plan_path, mock_stdin, mock_enqueue, mock_spawn, capsys):
         """Should capture whether compaction was manual or auto."""
         from pre_compact import run_pre_compact
 
@@ -111,23 +160,21 @@ class TestPreCompactHook:
             "custom_instructions": "focus on recent work",
         }
 
-        mock_response = MagicMock()
-        mock_response.status = 200
-        mock_urlopen.return_value = mock_response
+        mock_enqueue.return_value = "key"
 
         result = run_pre_compact()
 
-        req = mock_urlopen.call_args[0][0]
-        payload = json.loads(req.data.decode())
+        payload = mock_enqueue.call_args[0][1]
         assert "manual" in payload["text"]
 
         assert result == 0
 
-    @patch("pre_compact.urllib.request.urlopen")
+    @patch("pre_compact.spawn_drain", return_value=True)
+    @patch("pre_compact.enqueue")
     @patch("pre_compact.read_hook_stdin")
     @patch("pre_compact.get_session_plan_path")
     @patch("os.environ", {"PILOT_SESSION_ID": "test123"})
-    def test_handles_no_active_plan(self, mock_plan_path, mock_stdin, mock_urlopen):
+    def test_handles_no_active_plan(self, mock_plan_path, mock_stdin, mock_enqueue, mock_spawn):
         """Should handle case where no active plan exists."""
         from pre_compact import run_pre_compact
 
@@ -138,14 +185,12 @@ class TestPreCompactHook:
             "custom_instructions": "",
         }
 
-        mock_response = MagicMock()
-        mock_response.status = 200
-        mock_urlopen.return_value = mock_response
+        mock_enqueue.return_value = "key"
 
         result = run_pre_compact()
 
         assert result == 0
-        assert mock_urlopen.called
+        assert mock_enqueue.called
 
 
 class TestCaptureTaskList:
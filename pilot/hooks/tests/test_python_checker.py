@@ -81,7 +81,7 @@ class TestCheckPythonRuffIssues:
         with (
             patch("_checkers.python.check_file_length", return_value=""),
             patch("_checkers.python.shutil.which", side_effect=which_side_effect),
-            patch("_checkers.python.subprocess.run", side_effect=run_side_effect),
+            patch("_budget.subprocess.run", side_effect=run_side_effect),
         ):
             exit_code, reason = check_python(py_file)
 
@@ -103,7 +103,7 @@ class TestCheckPythonRuffIssues:
         with (
             patch("_checkers.python.check_file_length", return_value=""),
             patch("_checkers.python.shutil.which", side_effect=which_side_effect),
-            patch("_checkers.python.subprocess.run", return_value=mock_result),
+            patch("_budget.subprocess.run", return_value=mock_result),
         ):
             exit_code, reason = check_python(py_file)
 
@@ -149,9 +149,46 @@ class TestCheckPythonRuffOnly:
         with (
             patch("_checkers.python.check_file_length", return_value=""),
             patch("_checkers.python.shutil.which", side_effect=which_side_effect),
-            patch("_checkers.python.subprocess.run", side_effect=run_side_effect),
+            patch("_budget.subprocess.run", side_effect=run_side_effect),
         ):
             check_python(py_file)
 
         invoked_binaries = [cmd[0] for cmd in called_commands]
         assert not any("basedpyright" in b for b in invoked_binaries)
+
+
+class TestCheckPythonDelta:
+    """Repeated checks report only new issues."""
+
+    def test_second_check_reports_only_new_issue(self, tmp_path: Path) -> None:
+        """Issues from the previous check collapse into a one-line unchanged count."""
+        py_file = tmp_path / "app.py"
+        py_file.write_text("import os\nimport sys\n")
+        outputs = iter(
+            [
+                "app.py:1:8: F401 `os` imported but unused\n",
+                "app.py:1:8: F401 `os` imported but unused\n",
+                "app.py:1:8: F401 `os` imported but unused\napp.py:2:8: F401 `sys` imported but unused\n",
+            ]
+        )
+
+        def run_side_effect(cmd, **_kwargs):
+            if "--output-format=concise" in cmd:
+                return MagicMock(returncode=1, stdout=next(outputs), stderr="")
+            return MagicMock(returncode=0, stdout="", stderr="")
+
+        with (
+            patch("_checkers.python.check_file_length", return_value=""),
+            patch("_checkers.python.shutil.which", return_value="/usr/bin/ruff"),
+            patch("_budget.subprocess.run", side_effect=run_side_effect),
+        ):
+            _, first = check_python(py_file)
+            _, second = check_python(py_file)
+            _, third = check_python(py_file)
+
+        assert "`os` imported" in first
+        assert second == "Python: app.py (1 unchanged issue from the previous check not repeated)"
+        assert "1 ruff" in third
+        assert "`sys` imported" in third
+        assert "`os` imported" not in third
+        assert "1 unchanged issue" in third
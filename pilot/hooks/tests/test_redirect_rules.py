@@ -0,0 +1,144 @@
+"""Tests for _redirect_rules — rule merging, compilation and the cached decision table."""
+
+from __future__ import annotations
+
+import json
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+import _redirect_rules
+from _redirect_rules import build_automaton, compile_rules, decide, load_table, merge_rules, scan
+from tool_redirect import run_tool_redirect
+
+
+def _write_project_rules(root: Path, rules: list[dict]) -> None:
+    (root / ".claude").mkdir(parents=True, exist_ok=True)
+    (root / ".claude" / "tool-redirect-rules.json").write_text(json.dumps({"rules": rules}))
+
+
+class TestAutomaton:
+    """Tests for the combined Aho-Corasick matcher."""
+
+    def test_finds_overlapping_and_nested_literals(self):
+        literals = ["how do", "how does", "does", "he", "she", "hers"]
+        automaton = build_automaton(literals)
+        assert scan(automaton, "how does ushers") == {0, 1, 2, 3, 4, 5}
+
+    def test_no_match(self):
+        automaton = build_automaton(["where is", "what are"])
+        assert scan(automaton, "config loader") == set()
+
+    def test_empty_literal_list(self):
+        assert scan(build_automaton([]), "anything") == set()
+
+
+class TestMergeRules:
+    """Tests for merging default and project rule lists."""
+
+    def test_project_rule_replaces_default_with_same_id(self):
+        merged = merge_rules([[{"id": "a", "message": "old"}], [{"id": "a", "message": "new"}]])
+        assert merged == [{"id": "a", "message": "new"}]
+
+    def test_disabled_rule_removes_default(self):
+        merged = merge_rules([[{"id": "a"}, {"id": "b"}], [{"id": "a", "disabled": True}]])
+        assert [rule["id"] for rule in merged] == ["b"]
+
+    def test_new_project_rules_are_appended(self):
+        merged = merge_rules([[{"id": "a"}], [{"id": "b"}]])
+        assert [rule["id"] for rule in merged] == ["a", "b"]
+
+
+class TestDecide:
+    """Tests for evaluating compiled rules against a tool call."""
+
+    def test_block_wins_over_earlier_hint(self):
+        table = compile_rules(
+            [
+                {"id": "h", "tool": "Task", "action": "hint", "message": "hint"},
+                {"id": "b", "tool": "Task", "action": "block", "message": "block"},
+            ]
+        )
+        assert decide(table, "Task", {})["id"] == "b"
+
+    def test_contains_none_vetoes_contains_any(self):
+        rule = {
+            "id": "g",
+            "tool": "Grep",
+            "action": "hint",
+            "message": "m",
+            "when": {"field": "pattern", "contains_any": ["where is"], "contains_none": ["def "]},
+        }
+        table = compile_rules([rule])
+        assert decide(table, "Grep", {"pattern": "Where is the loader"})["id"] == "g"
+        assert decide(table, "Grep", {"pattern": "where is def load"}) is None
+
+    def test_rules_with_invalid_action_are_dropped(self):
+        table = compile_rules([{"id": "x", "tool": "Bash", "action": "warn", "message": "m"}])
+        assert decide(table, "Bash", {}) is None
+
+
+class TestLoadTable:
+    """Tests for rule file loading and the compiled table cache."""
+
+    def test_defaults_compile_and_are_cached(self, tmp_path):
+        table = load_table(None)
+        assert decide(table, "WebSearch", {})["action"] == "block"
+        cached = list((tmp_path / "tool-redirect").glob("*.json"))
+        assert len(cached) == 1
+
+        _redirect_rules._tables.clear()
+        with patch.object(_redirect_rules, "compile_rules") as compile_mock:
+            assert load_table(None) == table
+        compile_mock.assert_not_called()
+
+    def test_project_rules_override_defaults(self, tmp_path):
+        project = tmp_path / "project"
+        _write_project_rules(
+            project,
+            [
+                {"id": "web-fetch", "disabled": True},
+                {
+                    "id": "no-rm",
+                    "tool": "Bash",
+                    "action": "block",
+                    "message": "no rm",
+                    "when": {"field": "command", "contains_any": ["rm -rf"]},
+                },
+            ],
+        )
+        table = load_table(project)
+        assert decide(table, "WebFetch", {"url": "https://example.com"}) is None
+        assert decide(table, "Bash", {"command": "RM -RF /tmp/x"})["id"] == "no-rm"
+        assert decide(table, "WebSearch", {})["id"] == "web-search"
+
+    def test_editing_rule_file_recompiles(self, tmp_path):
+        project = tmp_path / "project"
+        _write_project_rules(project, [{"id": "web-search", "disabled": True}])
+        assert decide(load_table(project), "WebSearch", {}) is None
+        _write_project_rules(project, [])
+        assert decide(load_table(project), "WebSearch", {})["id"] == "web-search"
+
+    def test_malformed_project_file_falls_back_to_defaults(self, tmp_path):
+        project = tmp_path / "project"
+        (project / ".claude").mkdir(parents=True)
+        (project / ".claude" / "tool-redirect-rules.json").write_text("{not json")
+        assert decide(load_table(project), "WebFetch", {})["id"] == "web-fetch"
+
+
+class TestHookWithProjectRules:
+    """Tests for tool_redirect picking up project rules."""
+
+    def test_project_block_rule_is_enforced(self, tmp_path, monkeypatch, capsys):
+        _write_project_rules(tmp_path, [{"id": "no-glob", "tool": "Glob", "action": "block", "message": "Glob off"}])
+        monkeypatch.setenv("CLAUDE_PROJECT_ROOT", str(tmp_path))
+        with patch("sys.stdin", StringIO(json.dumps({"tool_name": "Glob", "tool_input": {"pattern": "*.py"}}))):
+            assert run_tool_redirect() == 2
+        assert "Glob off" in json.loads(capsys.readouterr().out)["reason"]
+
+    def test_grep_hint_example_includes_pattern(self, capsys):
+        payload = {"tool_name": "Grep", "tool_input": {"pattern": "where is config loaded"}}
+        with patch("sys.stdin", StringIO(json.dumps(payload))):
+            assert run_tool_redirect() == 0
+        context = json.loads(capsys.readouterr().out)["hookSpecificOutput"]["additionalContext"]
+        assert 'vexor search "where is config loaded"' in context
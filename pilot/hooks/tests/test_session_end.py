@@ -55,3 +55,29 @@ def test_stops_worker_when_zero_sessions():
 
     assert result == 0
     mock_run.assert_called_once()
+
+
+def test_session_count_uses_leases_when_present():
+    """Should count leases without spawning the pilot binary."""
+    with (
+        patch("session_end.has_session_leases", return_value=True),
+        patch("session_end.count_live_sessions", return_value=3),
+        patch("session_end.subprocess.run") as mock_run,
+    ):
+        assert session_end._get_active_session_count() == 3
+
+    mock_run.assert_not_called()
+
+
+def test_session_count_falls_back_to_binary_without_leases():
+    """Should ask the pilot binary when no lease files exist."""
+    with (
+        patch("session_end.has_session_leases", return_value=False),
+        patch(
+            "session_end.subprocess.run",
+            return_value=MagicMock(returncode=0, stdout='{"count": 2}'),
+        ) as mock_run,
+    ):
+        assert session_end._get_active_session_count() == 2
+
+    mock_run.assert_called_once()
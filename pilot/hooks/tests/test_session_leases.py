@@ -0,0 +1,94 @@
+"""Tests for _session_leases — flock-held session lease registry."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from _session_leases import (
+    acquire_session_lease,
+    count_live_sessions,
+    has_session_leases,
+    release_session_lease,
+)
+
+
+class TestAcquireSessionLease:
+    """Tests for acquire_session_lease()."""
+
+    def test_creates_locked_lease_with_metadata(self, tmp_path: Path) -> None:
+        fd = acquire_session_lease("abc", tmp_path)
+        try:
+            lease = tmp_path / "abc.lease"
+            assert lease.exists()
+            data = json.loads(lease.read_text())
+            assert data["session_id"] == "abc"
+            assert data["pid"] == os.getpid()
+            assert not list(tmp_path.glob(".*.tmp"))
+        finally:
+            release_session_lease(fd, "abc", tmp_path)
+
+    def test_release_removes_lease(self, tmp_path: Path) -> None:
+        fd = acquire_session_lease("abc", tmp_path)
+        release_session_lease(fd, "abc", tmp_path)
+
+        assert not (tmp_path / "abc.lease").exists()
+
+
+class TestCountLiveSessions:
+    """Tests for count_live_sessions()."""
+
+    def test_counts_held_leases(self, tmp_path: Path) -> None:
+        fds = [acquire_session_lease(sid, tmp_path) for sid in ("a", "b")]
+        try:
+            assert count_live_sessions(tmp_path) == 2
+        finally:
+            for sid, fd in zip(("a", "b"), fds):
+                release_session_lease(fd, sid, tmp_path)
+
+    def test_reaps_unlocked_leases(self, tmp_path: Path) -> None:
+        (tmp_path / "dead.lease").write_text(json.dumps({"pid": 999999}))
+        fd = acquire_session_lease("live", tmp_path)
+        try:
+            assert count_live_sessions(tmp_path) == 1
+            assert not (tmp_path / "dead.lease").exists()
+        finally:
+            release_session_lease(fd, "live", tmp_path)
+
+    def test_reaps_lease_of_exited_process(self, tmp_path: Path) -> None:
+        hooks_dir = str(Path(__file__).resolve().parent.parent)
+        script = (
+            f"import sys; sys.path.insert(0, {hooks_dir!r}); from pathlib import Path; "
+            f"from _session_leases import acquire_session_lease; acquire_session_lease('gone', Path({str(tmp_path)!r}))"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True)
+
+        assert (tmp_path / "gone.lease").exists()
+        assert count_live_sessions(tmp_path) == 0
+        assert not (tmp_path / "gone.lease").exists()
+
+    def test_ignores_session_directories(self, tmp_path: Path) -> None:
+        (tmp_path / "some-session").mkdir()
+
+        assert count_live_sessions(tmp_path) == 0
+        assert (tmp_path / "some-session").exists()
+
+    def test_missing_directory_counts_zero(self, tmp_path: Path) -> None:
+        assert count_live_sessions(tmp_path / "missing") == 0
+
+
+class TestHasSessionLeases:
+    """Tests for has_session_leases()."""
+
+    def test_false_without_leases(self, tmp_path: Path) -> None:
+        (tmp_path / "session-dir").mkdir()
+
+        assert has_session_leases(tmp_path) is False
+
+    def test_true_with_lease_file(self, tmp_path: Path) -> None:
+        (tmp_path / "x.lease").write_text("{}")
+
+        assert has_session_leases(tmp_path) is True
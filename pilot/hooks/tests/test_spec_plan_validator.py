@@ -23,7 +23,7 @@ class TestSpecPlanValidator:
                 "project_root": str(tmp_path),
             },
         ):
-            with patch("spec_plan_validator.os.environ", {"CLAUDE_PROJECT_ROOT": str(tmp_path)}):
+            with patch.dict("os.environ", {"CLAUDE_PROJECT_ROOT": str(tmp_path)}):
                 result = main()
 
         assert result == 0
@@ -47,7 +47,7 @@ class TestSpecPlanValidator:
                 "project_root": str(tmp_path),
             },
         ):
-            with patch("spec_plan_validator.os.environ", {"CLAUDE_PROJECT_ROOT": str(tmp_path)}):
+            with patch.dict("os.environ", {"CLAUDE_PROJECT_ROOT": str(tmp_path)}):
                 result = main()
 
         assert result == 0
@@ -75,7 +75,7 @@ class TestSpecPlanValidator:
                 "project_root": str(tmp_path),
             },
         ):
-            with patch("spec_plan_validator.os.environ", {"CLAUDE_PROJECT_ROOT": str(tmp_path)}):
+            with patch.dict("os.environ", {"CLAUDE_PROJECT_ROOT": str(tmp_path)}):
                 result = main()
 
         assert result == 0
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import io
 import json
 import tempfile
 from pathlib import Path
@@ -15,6 +16,7 @@ from tdd_enforcer import (
     has_typescript_test_file,
     is_test_file,
     is_trivial_edit,
+    read_edit_hook_input,
     should_skip,
     warn,
 )
@@ -449,3 +451,21 @@ class TestWarn:
         assert "No test file" in data["reason"]
         assert "Create test_foo.py first." in data["reason"]
         assert captured.err == ""
+
+
+class TestReadEditHookInput:
+    """Tests for reading only the needed Write/Edit payload fields."""
+
+    def test_write_skips_content(self, monkeypatch):
+        payload = {"tool_name": "Write", "tool_input": {"file_path": "a.py", "content": "x" * 100_000}}
+        monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps(payload)))
+        assert read_edit_hook_input() == {"tool_name": "Write", "tool_input": {"file_path": "a.py"}}
+
+    def test_edit_includes_strings_for_trivial_check(self, monkeypatch):
+        payload = {"tool_name": "Edit", "tool_input": {"file_path": "a.py", "old_string": "a", "new_string": "b"}}
+        monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps(payload)))
+        assert read_edit_hook_input() == payload
+
+    def test_invalid_json_is_empty(self, monkeypatch):
+        monkeypatch.setattr("sys.stdin", io.StringIO("not json"))
+        assert read_edit_hook_input() == {}
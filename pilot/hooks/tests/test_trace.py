@@ -0,0 +1,215 @@
+"""Tests for per-session hook tracing."""
+
+from __future__ import annotations
+
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import _trace
+import pytest
+from _trace import KIND_HOOK, KIND_SPAN, KIND_SUBPROCESS, flush, hook_span, read_trace, traced_main, traced_run
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+import trace_report
+
+
+@pytest.fixture(autouse=True)
+def isolated_trace(tmp_path, monkeypatch):
+    """Point trace output at tmp_path and reset module state."""
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    monkeypatch.setenv("PILOT_SESSION_ID", "s1")
+    monkeypatch.delenv("PILOT_HOOK_TRACE", raising=False)
+    _trace._pending.clear()
+    _trace._context.update(hook="", event="", tool="")
+    yield
+    _trace._pending.clear()
+
+
+class TestRingBuffer:
+    """Test writing and reading the fixed-size trace file."""
+
+    def test_records_round_trip(self, tmp_path):
+        """Should read back what was flushed, with labels and durations."""
+        _trace._context.update(hook="file_checker", event="PostToolUse", tool="Edit")
+        _trace._record(KIND_SPAN, 1000.0, 0.25, "check_python", 0)
+        flush()
+
+        records = read_trace()
+
+        assert _trace.get_trace_path() == tmp_path / ".pilot" / "sessions" / "s1" / "hook-trace.bin"
+        assert len(records) == 1
+        assert records[0]["hook"] == "file_checker"
+        assert records[0]["tool"] == "Edit"
+        assert records[0]["label"] == "check_python"
+        assert records[0]["duration_ms"] == 250.0
+
+    def test_wraps_and_keeps_newest(self, tmp_path):
+        """Should overwrite the oldest records once capacity is reached, keeping the file size fixed."""
+        path = tmp_path / "trace.bin"
+        with patch.object(_trace, "CAPACITY", 4):
+            for i in range(6):
+                _trace._record(KIND_SPAN, float(i), 0.001, f"span{i}")
+            flush(path)
+
+        records = read_trace(path)
+
+        assert [r["label"] for r in records] == ["span2", "span3", "span4", "span5"]
+        assert path.stat().st_size == _trace.HEADER.size + 4 * _trace.RECORD.size
+
+    def test_reinitializes_foreign_file(self, tmp_path):
+        """Should replace a file with an unknown header instead of appending to it."""
+        path = tmp_path / "trace.bin"
+        path.write_bytes(b"garbage" * 10)
+
+        _trace._record(KIND_SPAN, 1.0, 0.001, "fresh")
+        flush(path)
+
+        assert [r["label"] for r in read_trace(path)] == ["fresh"]
+
+    def test_missing_file_reads_empty(self, tmp_path):
+        """Should return no records for a missing file."""
+        assert read_trace(tmp_path / "none.bin") == []
+
+    def test_disabled_records_nothing(self, monkeypatch):
+        """Should skip recording when PILOT_HOOK_TRACE=0."""
+        monkeypatch.setenv("PILOT_HOOK_TRACE", "0")
+
+        with hook_span("ignored"):
+            pass
+
+        assert _trace._pending == []
+
+
+class TestTracedMain:
+    """Test the hook entry point wrapper."""
+
+    def test_records_hook_and_child_processes(self, monkeypatch):
+        """Should record the hook span, child processes run through traced_run and named regions."""
+        payload = {"hook_event_name": "PostToolUse", "tool_name": "Write", "tool_input": {}}
+        monkeypatch.setattr(sys, "stdin", io.StringIO(json.dumps(payload)))
+        seen = {}
+
+        def main():
+            seen["payload"] = json.load(sys.stdin)
+            with hook_span("region"):
+                traced_run([sys.executable, "-c", "raise SystemExit(3)"], check=False)
+            return 2
+
+        assert traced_main("file_checker", main) == 2
+        assert seen["payload"] == payload
+
+        records = read_trace()
+        kinds = {r["kind"]: r for r in records}
+        assert set(kinds) == {KIND_HOOK, KIND_SUBPROCESS, KIND_SPAN}
+        assert kinds[KIND_HOOK]["exit_code"] == 2
+        assert kinds[KIND_HOOK]["event"] == "PostToolUse"
+        assert kinds[KIND_HOOK]["tool"] == "Write"
+        assert kinds[KIND_SUBPROCESS]["exit_code"] == 3
+        assert kinds[KIND_SUBPROCESS]["label"].endswith("-c")
+
+    def test_leaves_subprocess_run_alone(self, monkeypatch):
+        """Should not patch subprocess.run, so mocks installed by callers stay in effect."""
+        monkeypatch.setattr(sys, "stdin", io.StringIO("{}"))
+        seen = {}
+
+        def main():
+            seen["run"] = subprocess.run
+            return 0
+
+        traced_main("file_checker", main)
+
+        assert seen["run"] is subprocess.run
+
+    def test_records_system_exit(self, monkeypatch):
+        """Should record the exit code of a hook that calls sys.exit and re-raise."""
+        monkeypatch.setattr(sys, "stdin", io.StringIO("{}"))
+
+        def main():
+            sys.exit(2)
+
+        with pytest.raises(SystemExit):
+            traced_main("tool_redirect", main)
+
+        assert read_trace()[0]["exit_code"] == 2
+
+    def test_system_exit_without_code_is_success(self, monkeypatch):
+        """Should record sys.exit() with no code as exit code 0."""
+        monkeypatch.setattr(sys, "stdin", io.StringIO("{}"))
+
+        def main():
+            sys.exit()
+
+        with pytest.raises(SystemExit):
+            traced_main("tool_redirect", main)
+
+        assert read_trace()[0]["exit_code"] == 0
+
+    def test_peeks_pipe_stdin_without_copying(self, monkeypatch):
+        """Should label from the buffered head and leave the original stream to the hook."""
+        payload = {"hook_event_name": "PostToolUse", "tool_name": "Write", "tool_input": {"content": "x" * 100_000}}
+        stdin = io.TextIOWrapper(io.BufferedReader(io.BytesIO(json.dumps(payload).encode())), encoding="utf-8")
+        monkeypatch.setattr(sys, "stdin", stdin)
+        seen = {}
+
+        def main():
+            seen["stdin"] = sys.stdin
+            seen["payload"] = json.load(sys.stdin)
+            return 0
+
+        assert traced_main("file_checker", main) == 0
+        assert seen["stdin"] is stdin
+        assert seen["payload"] == payload
+        record = read_trace()[0]
+        assert (record["event"], record["tool"]) == ("PostToolUse", "Write")
+
+    def test_disabled_runs_main_untouched(self, monkeypatch):
+        """Should not read stdin or write a trace when disabled."""
+        monkeypatch.setenv("PILOT_HOOK_TRACE", "off")
+        stdin = io.StringIO("{}")
+        monkeypatch.setattr(sys, "stdin", stdin)
+
+        assert traced_main("x", lambda: 0) == 0
+        assert stdin.tell() == 0
+        assert not _trace.get_trace_path().exists()
+
+
+class TestTraceReport:
+    """Test the trace report script."""
+
+    def test_report_groups_and_attributes_children(self):
+        """Should attach child spans to their hook and aggregate per hook, tool and subprocess."""
+        records = [
+            {"ts": 100.0, "duration_ms": 500.0, "pid": 1, "exit_code": 0, "kind": KIND_HOOK, "hook": "file_checker",
+             "event": "PostToolUse", "tool": "Edit", "label": "file_checker"},
+            {"ts": 100.1, "duration_ms": 400.0, "pid": 1, "exit_code": 1, "kind": KIND_SUBPROCESS, "hook": "file_checker",
+             "event": "PostToolUse", "tool": "Edit", "label": "ruff check"},
+            {"ts": 200.0, "duration_ms": 20.0, "pid": 2, "exit_code": 0, "kind": KIND_HOOK, "hook": "tool_redirect",
+             "event": "PreToolUse", "tool": "Bash", "label": "tool_redirect"},
+        ]  # fmt: skip
+
+        report = trace_report.build_report(records, top=1, bucket_seconds=60)
+
+        assert report["invocations"] == 2
+        assert report["slowest"][0]["hook"] == "file_checker"
+        assert report["slowest"][0]["spans"][0]["label"] == "ruff check"
+        assert report["by_tool"]["Edit"]["count"] == 1
+        assert report["subprocesses"]["ruff check"]["total_ms"] == 400.0
+        assert [b["start"] for b in report["timeline"]] == [60, 180]
+        assert "ruff check" in trace_report.format_report(report)
+
+    def test_main_reads_session_trace(self, capsys):
+        """Should report on the current session's trace file."""
+        _trace._context.update(hook="session_end", event="SessionEnd")
+        _trace._record(KIND_HOOK, 1.0, 0.01, "session_end")
+        flush()
+
+        assert trace_report.main(["--json"]) == 0
+        assert json.loads(capsys.readouterr().out)["by_hook"]["session_end"]["count"] == 1
+
+    def test_main_without_records(self, capsys):
+        """Should exit 1 when there is nothing to report."""
+        assert trace_report.main(["--session", "empty"]) == 1
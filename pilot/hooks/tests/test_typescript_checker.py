@@ -134,16 +134,20 @@ class TestCheckTypescriptEslintIssues:
         ts_file = tmp_path / "app.ts"
         ts_file.write_text("const x = 1;\n")
 
-        eslint_json = json.dumps([{
-            "filePath": str(ts_file),
-            "errorCount": 2,
-            "warningCount": 1,
-            "messages": [
-                {"line": 1, "ruleId": "no-unused-vars", "message": "x is unused", "severity": 2},
-                {"line": 2, "ruleId": "no-console", "message": "no console", "severity": 2},
-                {"line": 3, "ruleId": "semi", "message": "missing semi", "severity": 1},
-            ],
-        }])
+        eslint_json = json.dumps(
+            [
+                {
+                    "filePath": str(ts_file),
+                    "errorCount": 2,
+                    "warningCount": 1,
+                    "messages": [
+                        {"line": 1, "ruleId": "no-unused-vars", "message": "x is unused", "severity": 2},
+                        {"line": 2, "ruleId": "no-console", "message": "no console", "severity": 2},
+                        {"line": 3, "ruleId": "semi", "message": "missing semi", "severity": 1},
+                    ],
+                }
+            ]
+        )
 
         mock_prettier = MagicMock(returncode=0, stdout="", stderr="")
         mock_eslint = MagicMock(returncode=1, stdout=eslint_json, stderr="")
@@ -156,8 +160,11 @@ class TestCheckTypescriptEslintIssues:
         with (
             patch("_checkers.typescript.check_file_length", return_value=""),
             patch("_checkers.typescript.find_project_root", return_value=None),
-            patch("_checkers.typescript.find_tool", side_effect=lambda name, _: f"/usr/bin/{name}" if name in ("prettier", "eslint") else None),
-            patch("_checkers.typescript.subprocess.run", side_effect=run_side_effect),
+            patch(
+                "_checkers.typescript.find_tool",
+                side_effect=lambda name, _: f"/usr/bin/{name}" if name in ("prettier", "eslint") else None,
+            ),
+            patch("_budget.subprocess.run", side_effect=run_side_effect),
         ):
             exit_code, reason = check_typescript(ts_file)
 
@@ -186,8 +193,11 @@ class TestCheckTypescriptCleanFile:
         with (
             patch("_checkers.typescript.check_file_length", return_value=""),
             patch("_checkers.typescript.find_project_root", return_value=None),
-            patch("_checkers.typescript.find_tool", side_effect=lambda name, _: f"/usr/bin/{name}" if name in ("prettier", "eslint") else None),
-            patch("_checkers.typescript.subprocess.run", side_effect=run_side_effect),
+            patch(
+                "_checkers.typescript.find_tool",
+                side_effect=lambda name, _: f"/usr/bin/{name}" if name in ("prettier", "eslint") else None,
+            ),
+            patch("_budget.subprocess.run", side_effect=run_side_effect),
         ):
             exit_code, reason = check_typescript(ts_file)
 
@@ -237,9 +247,45 @@ class TestCheckTypescriptTscNotCalled:
             patch("_checkers.typescript.check_file_length", return_value=""),
             patch("_checkers.typescript.find_project_root", return_value=None),
             patch("_checkers.typescript.find_tool", side_effect=lambda name, _: f"/usr/bin/{name}"),
-            patch("_checkers.typescript.subprocess.run", side_effect=run_side_effect),
+            patch("_budget.subprocess.run", side_effect=run_side_effect),
         ):
             check_typescript(ts_file)
 
         invoked_binaries = [cmd[0] for cmd in called_commands]
         assert not any("tsc" in b for b in invoked_binaries)
+
+
+class TestCheckTypescriptDelta:
+    """Repeated checks report only new eslint messages."""
+
+    def test_unchanged_messages_are_not_repeated(self, tmp_path: Path) -> None:
+        """A second check with the same findings reports only the unchanged count."""
+        ts_file = tmp_path / "app.ts"
+        ts_file.write_text("const x = 1;\n")
+        eslint_json = json.dumps(
+            [
+                {
+                    "filePath": str(ts_file),
+                    "errorCount": 1,
+                    "warningCount": 0,
+                    "messages": [{"line": 1, "ruleId": "no-unused-vars", "message": "x is unused", "severity": 2}],
+                }
+            ]
+        )
+
+        def run_side_effect(cmd, **_kwargs):
+            if "eslint" in cmd[0]:
+                return MagicMock(returncode=1, stdout=eslint_json, stderr="")
+            return MagicMock(returncode=0, stdout="", stderr="")
+
+        with (
+            patch("_checkers.typescript.check_file_length", return_value=""),
+            patch("_checkers.typescript.find_project_root", return_value=None),
+            patch("_checkers.typescript.find_tool", side_effect=lambda name, _: f"/usr/bin/{name}"),
+            patch("_budget.subprocess.run", side_effect=run_side_effect),
+        ):
+            _, first = check_typescript(ts_file)
+            _, second = check_typescript(ts_file)
+
+        assert "1 eslint" in first
+        assert second == "TypeScript: app.ts (1 unchanged issue from the previous check not repeated)"
@@ -0,0 +1,152 @@
+"""Tests for _worker_client keep-alive client and circuit breaker."""
+
+from __future__ import annotations
+
+import json
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import _worker_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append(("GET", self.path, self.client_address[1]))
+        self._reply(200 if self.server.healthy else 503, b'{"status":"ok"}')
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length))
+        self.server.requests.append(("POST", self.path, self.client_address[1], body))
+        self._reply(201, b"{}")
+
+    def _reply(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def worker():
+    server = ThreadingHTTPServer(("localhost", 0), _Handler)
+    server.requests = []
+    server.healthy = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    with patch.object(_worker_client, "WORKER_PORT", server.server_address[1]):
+        yield server
+    _worker_client._reset_connection()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def breaker_file(tmp_path):
+    path = tmp_path / "worker-breaker.json"
+    with patch.object(_worker_client, "_breaker_path", return_value=path):
+        yield path
+    _worker_client._reset_connection()
+
+
+def _unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+class TestPostJson:
+    """Test posting to the worker."""
+
+    def test_posts_payload_and_returns_status(self, worker):
+        """Should POST JSON and return the HTTP status."""
+        status = _worker_client.post_json("/api/notifications", {"title": "hi"})
+
+        assert status == 201
+        assert worker.requests[0][:2] == ("POST", "/api/notifications")
+        assert worker.requests[0][3] == {"title": "hi"}
+
+    def test_reuses_connection_within_process(self, worker):
+        """Should send consecutive requests over one keep-alive connection."""
+        _worker_client.post_json("/api/notifications", {"n": 1})
+        _worker_client.post_json("/api/notifications", {"n": 2})
+
+        assert worker.requests[0][2] == worker.requests[1][2]
+
+    def test_reconnects_when_worker_closed_idle_connection(self, worker):
+        """Should retry once on a fresh connection if the kept-alive one was closed."""
+        _worker_client.post_json("/api/notifications", {"n": 1})
+        stale, peer = socket.socketpair()
+        peer.close()
+        _worker_client._connection.sock.close()
+        _worker_client._connection.sock = stale
+
+        assert _worker_client.post_json("/api/notifications", {"n": 2}) == 201
+        assert [req[3] for req in worker.requests] == [{"n": 1}, {"n": 2}]
+
+    def test_unreachable_worker_opens_breaker(self, breaker_file):
+        """Should return None and record worker-down state."""
+        with patch.object(_worker_client, "WORKER_PORT", _unused_port()):
+            assert _worker_client.post_json("/api/memory/save", {}) is None
+
+        state = json.loads(breaker_file.read_text())
+        assert state["open_until"] > time.time()
+
+    def test_open_breaker_skips_network(self, breaker_file):
+        """Should fail over without connecting while the breaker is open."""
+        breaker_file.write_text(json.dumps({"open_until": time.time() + 60, "backoff": 15}))
+
+        with patch.object(_worker_client, "_get_connection") as mock_conn:
+            assert _worker_client.post_json("/api/memory/save", {}) is None
+
+        mock_conn.assert_not_called()
+
+    def test_expired_breaker_probes_health_and_closes(self, worker, breaker_file):
+        """Should probe /api/health after the breaker expires and close it on success."""
+        breaker_file.write_text(json.dumps({"open_until": time.time() - 1, "backoff": 15}))
+
+        assert _worker_client.post_json("/api/notifications", {}) == 201
+
+        assert worker.requests[0][:2] == ("GET", "/api/health")
+        assert not breaker_file.exists()
+
+    def test_failed_health_probe_doubles_backoff(self, worker, breaker_file):
+        """Should reopen the breaker with a longer backoff when the worker is still unhealthy."""
+        worker.healthy = False
+        breaker_file.write_text(json.dumps({"open_until": time.time() - 1, "backoff": 15}))
+
+        assert _worker_client.post_json("/api/notifications", {}) is None
+
+        assert json.loads(breaker_file.read_text())["backoff"] == 30
+        assert all(req[0] == "GET" for req in worker.requests)
+
+
+class TestIsWorkerAvailable:
+    """Test health probing."""
+
+    def test_healthy_worker(self, worker):
+        """Should report a healthy worker as available."""
+        assert _worker_client.is_worker_available() is True
+
+    def test_backoff_is_capped(self, breaker_file):
+        """Should never back off longer than the maximum."""
+        breaker_file.write_text(json.dumps({"open_until": 0, "backoff": _worker_client.BREAKER_MAX_SECONDS}))
+
+        with patch.object(_worker_client, "WORKER_PORT", _unused_port()):
+            assert _worker_client.is_worker_available() is False
+
+        assert json.loads(breaker_file.read_text())["backoff"] == _worker_client.BREAKER_MAX_SECONDS
@@ -5,6 +5,10 @@ Two severity levels via JSON stdout:
 - BLOCK: permissionDecision=deny — tool is broken or conflicts with workflow.
 - HINT: additionalContext — better alternative exists but tool still works.
 
+Rules live in tool_redirect_rules.json; a project can override or disable
+them by id, or add its own, in .claude/tool-redirect-rules.json (see
+_redirect_rules).
+
 Note: Task management tools (TaskCreate, TaskList, etc.) are ALLOWED.
 """
 
@@ -15,43 +19,11 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _util import pre_tool_use_context, pre_tool_use_deny
-
-SEMANTIC_PHRASES = [
-    "where is",
-    "where are",
-    "how does",
-    "how do",
-    "how to",
-    "find the",
-    "find all",
-    "locate the",
-    "locate all",
-    "what is",
-    "what are",
-    "search for",
-    "looking for",
-]
-
-CODE_PATTERNS = [
-    "def ",
-    "class ",
-    "import ",
-    "from ",
-    "= ",
-    "==",
-    "!=",
-    "->",
-    "::",
-    "\\(",
-    "\\{",
-    "function ",
-    "const ",
-    "let ",
-    "var ",
-    "type ",
-    "interface ",
-]
+from _redirect_rules import decide, find_rule, load_table, rule_matches
+from _trace import traced_main
+from _util import get_project_root, pre_tool_use_context, pre_tool_use_deny
+
+SEMANTIC_RULE_ID = "grep-semantic-search"
 
 
 def is_semantic_pattern(pattern: str) -> bool:
@@ -60,80 +32,9 @@ def is_semantic_pattern(pattern: str) -> bool:
     Returns True for natural language queries like "where is config loaded"
     Returns False for code patterns like "def save_config" or "class Handler"
     """
-    pattern_lower = pattern.lower()
-
-    for code_pattern in CODE_PATTERNS:
-        if code_pattern in pattern_lower:
-            return False
-
-    return any(phrase in pattern_lower for phrase in SEMANTIC_PHRASES)
-
-
-EXPLORE_HINT = {
-    "message": "Consider using `vexor search` instead (better semantic ranking)",
-    "alternative": "vexor search for semantic codebase search, or Grep/Glob for exact patterns",
-    "example": 'vexor search "where is config loaded" --mode code --top 5',
-}
-
-HINTS: dict[str, dict] = {
-    "Grep": {
-        "message": "Semantic pattern detected — `vexor search` may give better results",
-        "alternative": "vexor search for intent-based file discovery",
-        "example": 'vexor search "<pattern>" --mode code --top 5',
-        "condition": lambda data: is_semantic_pattern(
-            data.get("tool_input", {}).get("pattern", "") if isinstance(data.get("tool_input"), dict) else ""
-        ),
-    },
-    "Task": {
-        "message": "Consider using Read, Grep, Glob, Bash directly (less context overhead)",
-        "alternative": "Direct tool calls avoid sub-agent context cost",
-        "example": "Read/Grep/Glob for exploration, TaskCreate for tracking",
-        "condition": lambda data: (
-            data.get("tool_input", {}).get("subagent_type", "")
-            not in (
-                "Explore",
-                "pilot:spec-reviewer-compliance",
-                "pilot:spec-reviewer-quality",
-                "pilot:plan-verifier",
-                "pilot:plan-challenger",
-                "claude-code-guide",
-            )
-            if isinstance(data.get("tool_input"), dict)
-            else True
-        ),
-    },
-}
-
-BLOCKS: dict[str, dict] = {
-    "WebSearch": {
-        "message": "WebSearch is blocked (use MCP alternative)",
-        "alternative": "Use ToolSearch to load mcp__plugin_pilot_web-search__search, then call it directly",
-        "example": 'ToolSearch(query="+web-search search") then mcp__plugin_pilot_web-search__search(query="...")',
-    },
-    "WebFetch": {
-        "message": "WebFetch is blocked (truncates at ~8KB)",
-        "alternative": "Use ToolSearch to load mcp__plugin_pilot_web-fetch__fetch_url, then call it directly",
-        "example": 'ToolSearch(query="+web-fetch fetch") then mcp__plugin_pilot_web-fetch__fetch_url(url="...")',
-    },
-    "EnterPlanMode": {
-        "message": "BLOCKED: EnterPlanMode is FORBIDDEN. Plan mode is completely disabled in this project.",
-        "alternative": "Do NOT use plan mode under any circumstances. Use /spec for structured planning, or execute directly for simple tasks",
-        "example": "Skill(skill='spec', args='task description')",
-    },
-    "ExitPlanMode": {
-        "message": "BLOCKED: ExitPlanMode is FORBIDDEN. Plan mode is completely disabled in this project.",
-        "alternative": "Do NOT use plan mode under any circumstances. Use /spec for structured planning, or execute directly for simple tasks",
-        "example": "Skill(skill='spec', args='task description')",
-    },
-    "Task": {
-        "message": "Task(subagent_type='Plan') is blocked (project uses /spec workflow)",
-        "alternative": "Do planning work directly with Read, Grep, Glob tools. Use /spec for structured planning.",
-        "example": "Read files directly, use AskUserQuestion for decisions, write plan to file",
-        "condition": lambda data: (
-            isinstance(data.get("tool_input"), dict) and data["tool_input"].get("subagent_type") == "Plan"
-        ),
-    },
-}
+    table = load_table(get_project_root())
+    rule = find_rule(table, SEMANTIC_RULE_ID)
+    return rule is not None and rule_matches(table, rule, {rule["field"]: pattern})
 
 
 def _format_example(redirect_info: dict, pattern: str | None = None) -> str:
@@ -170,26 +71,12 @@ def run_tool_redirect() -> int:
     tool_name = hook_data.get("tool_name", "")
     tool_input = hook_data.get("tool_input", {}) if isinstance(hook_data.get("tool_input"), dict) else {}
 
-    if tool_name == "Task" and tool_input.get("subagent_type") == "Explore":
-        return hint(EXPLORE_HINT)
-
-    if tool_name in BLOCKS:
-        redirect = BLOCKS[tool_name]
-        condition = redirect.get("condition")
-        if condition is None or condition(hook_data):
-            return block(redirect)
-
-    if tool_name in HINTS:
-        redirect = HINTS[tool_name]
-        condition = redirect.get("condition")
-        if condition is None or condition(hook_data):
-            pattern = None
-            if tool_name == "Grep":
-                pattern = tool_input.get("pattern", "") if isinstance(tool_input, dict) else ""
-            return hint(redirect, pattern)
-
-    return 0
+    rule = decide(load_table(get_project_root()), tool_name, tool_input)
+    if rule is None:
+        return 0
+    pattern = tool_input.get("pattern") if isinstance(tool_input.get("pattern"), str) else None
+    return block(rule, pattern) if rule["action"] == "block" else hint(rule, pattern)
 
 
 if __name__ == "__main__":
-    sys.exit(run_tool_redirect())
+    sys.exit(traced_main("tool_redirect", run_tool_redirect))